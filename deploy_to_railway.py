@@ -48,7 +48,7 @@ class OptimizationSystemDeployer:
         
         # 3. 데이터 파일 확인
         data_files = [
-            'data/ETHUSDT_15m_206319points_20251015_202539.csv'
+            os.path.join(os.getenv('MARKET_DATA_DIR', 'data/store'), 'ETHUSDT', '15m', 'manifest.json')
         ]
         
         for file in data_files:
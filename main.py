@@ -96,6 +96,10 @@ class SystemState:
 # 글로벌 시스템 상태
 system_state = SystemState()
 
+# 슈퍼바이저 모드: 트레이딩 루프와 최적화 워커를 별도 프로세스로 분리
+SUPERVISOR_MODE = os.getenv('SUPERVISOR_MODE', 'false').lower() == 'true'
+supervisor = None
+
 # API 엔드포인트
 @app.get("/")
 async def root():
@@ -122,8 +126,11 @@ async def get_status():
         # 트레이딩 봇 상태 포함
         bot_status = {}
         try:
-            bot = get_trading_bot()
-            bot_status = bot.get_status()
+            if supervisor is not None:
+                bot_status = supervisor.get_status()
+            else:
+                bot = get_trading_bot()
+                bot_status = bot.get_status()
         except Exception as e:
             logger.error(f"봇 상태 조회 실패: {e}")
         
@@ -253,6 +260,12 @@ async def get_leverage_info():
 @app.post("/api/start-trading")
 async def start_trading():
     try:
+        if supervisor is not None:
+            supervisor.start_trading()
+            system_state.trading_active = True
+            logger.info("🚀 트레이딩 프로세스 시작 (슈퍼바이저 모드)")
+            return {"success": True, "message": "트레이딩 프로세스 시작"}
+        
         bot = get_trading_bot()
         bot.start_trading()
         system_state.trading_active = True
@@ -270,6 +283,12 @@ async def start_trading():
 @app.post("/api/stop-trading")
 async def stop_trading():
     try:
+        if supervisor is not None:
+            await asyncio.to_thread(supervisor.stop_trading)
+            system_state.trading_active = False
+            logger.info("⏹️ 트레이딩 프로세스 중지")
+            return {"success": True, "message": "트레이딩 프로세스 중지"}
+        
         bot = get_trading_bot()
         bot.stop_trading()
         system_state.trading_active = False
@@ -291,6 +310,12 @@ async def execute_optimization():
     logger.info("🚀 최적화 시작")
     
     try:
+        if supervisor is not None:
+            # 낮은 우선순위/코어 예산 워커에서 실행, 완료시 트레이딩 프로세스가 파라미터 리로드
+            if await asyncio.to_thread(supervisor.run_optimization):
+                system_state.load_parameters()
+            return
+        
         # 최적화 실행
         import subprocess
         result = subprocess.run(
@@ -343,6 +368,7 @@ async def execute_backtest():
 @app.on_event("startup")
 async def startup_event():
     """앱 시작시 실행"""
+    global supervisor
     logger.info("🚀 ETH Trading Bot with Advanced Leverage Optimization 시작")
     
     # 디렉토리 생성
@@ -351,9 +377,23 @@ async def startup_event():
     os.makedirs('logs', exist_ok=True)
     os.makedirs('data', exist_ok=True)
     
+    if SUPERVISOR_MODE:
+        from process_supervisor import ProcessSupervisor
+        
+        supervisor = ProcessSupervisor()
+        if os.getenv('RAILWAY_ENVIRONMENT'):
+            supervisor.start_trading()
+            system_state.trading_active = True
+            logger.info("🚀 자동 거래 시작 (슈퍼바이저 모드)")
+        
+        if os.getenv('ENABLE_SCHEDULER', 'true').lower() == 'true':
+            asyncio.create_task(start_scheduler())
+        return
+    
     # 트레이딩 봇 초기화 및 시작
     try:
         bot = get_trading_bot()
+        await bot.initialize()
         logger.info(f"💰 계좌 잔고: ${bot.account_balance:.2f}")
         
         # 자동으로 거래 시작 (Railway 환경에서)
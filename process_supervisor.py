@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+프로세스 슈퍼바이저 - 실거래 루프와 최적화 워커 분리 실행
+- 트레이딩 프로세스: 예약 코어 고정, 기본 우선순위
+- 최적화 워커: 낮은 nice 우선순위 + 나머지 코어 예산 내 CPU affinity
+- 신호→주문 지연시간을 최적화 실행 여부별로 기록
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import threading
+import subprocess
+import multiprocessing as mp
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 프로젝트 모듈
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def available_cores() -> List[int]:
+    """현재 프로세스가 사용할 수 있는 코어 목록"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_cpu_allocation(cores: Optional[List[int]] = None, reserved_cores: int = 1,
+                        optimizer_core_budget: Optional[int] = None) -> Dict[str, List[int]]:
+    """트레이딩 예약 코어와 최적화 코어 예산 분배"""
+    cores = list(cores) if cores is not None else available_cores()
+    reserved_cores = max(1, min(reserved_cores, len(cores)))
+
+    trading = cores[:reserved_cores]
+    remaining = cores[reserved_cores:]
+
+    # 단일 코어 환경에서는 분리 불가 - nice 우선순위로만 보호
+    if not remaining:
+        remaining = list(cores)
+
+    if optimizer_core_budget is not None and optimizer_core_budget > 0:
+        remaining = remaining[:optimizer_core_budget]
+
+    return {'trading': trading, 'optimizer': remaining}
+
+
+def apply_process_limits(cores: Optional[List[int]] = None, nice: int = 0):
+    """현재 프로세스에 CPU affinity / nice 적용 (자식 프로세스에 상속됨)"""
+    if cores:
+        try:
+            if hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, set(cores))
+            elif PSUTIL_AVAILABLE:
+                psutil.Process().cpu_affinity(list(cores))
+        except (OSError, AttributeError, ValueError) as e:
+            logger.warning(f"CPU affinity 설정 실패: {e}")
+
+    if nice:
+        try:
+            os.nice(nice)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"nice 설정 실패: {e}")
+
+
+def summarize_latency(samples: List[Dict]) -> Dict:
+    """신호→주문 지연시간 요약 (최적화 실행중/유휴 구분)"""
+    summary = {}
+    for state, busy in (('idle', False), ('optimizer_busy', True)):
+        values = sorted(s['latency_ms'] for s in samples if bool(s.get('optimizer_busy')) == busy)
+        if not values:
+            summary[state] = {'count': 0}
+            continue
+        summary[state] = {
+            'count': len(values),
+            'p50_ms': float(np.percentile(values, 50)),
+            'p95_ms': float(np.percentile(values, 95)),
+            'max_ms': values[-1]
+        }
+    return summary
+
+
+def _trading_process_main(cores: List[int], optimizer_busy, commands, latency_log: str):
+    """트레이딩 프로세스 진입점"""
+    apply_process_limits(cores, nice=0)
+
+    from railway_trading_bot import get_trading_bot
+
+    bot = get_trading_bot()
+    bot.optimizer_busy = optimizer_busy
+    bot.latency_log_file = latency_log
+    bot.start_trading()
+
+    def command_listener():
+        while True:
+            command = commands.get()
+            if command == 'reload_parameters':
+                bot.update_parameters(bot.load_parameters())
+            elif command == 'stop':
+                bot.stop_trading()
+                break
+
+    threading.Thread(target=command_listener, daemon=True).start()
+
+    logger.info(f"🚀 트레이딩 프로세스 시작 (PID {os.getpid()}, 코어 {cores})")
+    asyncio.run(bot.run_trading_loop())
+
+
+def build_optimizer_env(cores: List[int]) -> Dict[str, str]:
+    """최적화 워커 환경변수 - 코어 예산만큼 스레드/워커 수 제한"""
+    env = os.environ.copy()
+    env['OPTIMIZER_CORE_BUDGET'] = str(len(cores))
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMBA_NUM_THREADS'):
+        env[var] = str(len(cores))
+    return env
+
+
+class ProcessSupervisor:
+    """실거래 / 최적화 프로세스 분리 슈퍼바이저"""
+
+    def __init__(self, reserved_cores: int = None, optimizer_core_budget: int = None,
+                 optimizer_nice: int = None):
+        self.reserved_cores = reserved_cores or int(os.getenv('TRADING_RESERVED_CORES', 1))
+        budget = optimizer_core_budget or int(os.getenv('OPTIMIZER_CORE_BUDGET', 0))
+        self.optimizer_core_budget = budget or None
+        self.optimizer_nice = optimizer_nice if optimizer_nice is not None else int(os.getenv('OPTIMIZER_NICE', 10))
+
+        self.allocation = plan_cpu_allocation(
+            reserved_cores=self.reserved_cores,
+            optimizer_core_budget=self.optimizer_core_budget
+        )
+        self.latency_log = os.getenv('LATENCY_LOG_FILE', 'logs/signal_latency.jsonl')
+
+        self.ctx = mp.get_context('spawn')
+        self.optimizer_busy = self.ctx.Event()
+        self.commands = None  # 트레이딩 프로세스별 명령 큐 (start_trading마다 새로 생성)
+        self.trading_process = None
+
+        logger.info("🧭 프로세스 슈퍼바이저 초기화")
+        logger.info(f"   트레이딩 코어: {self.allocation['trading']}")
+        logger.info(f"   최적화 코어: {self.allocation['optimizer']} (nice +{self.optimizer_nice})")
+
+    def start_trading(self):
+        """트레이딩 프로세스 시작"""
+        if self.trading_process is not None and self.trading_process.is_alive():
+            return
+
+        # 이전 프로세스가 읽지 못한 명령(stop 등)이 새 프로세스로 넘어가지 않도록 큐 새로 생성
+        self.commands = self.ctx.Queue()
+        self.trading_process = self.ctx.Process(
+            target=_trading_process_main,
+            args=(self.allocation['trading'], self.optimizer_busy, self.commands, self.latency_log),
+            name='trading',
+            daemon=True
+        )
+        self.trading_process.start()
+
+    def stop_trading(self):
+        """트레이딩 프로세스 중지"""
+        if self.trading_process is None:
+            return
+
+        if self.trading_process.is_alive():
+            self.commands.put('stop')
+            self.trading_process.join(timeout=10)
+        if self.trading_process.is_alive():
+            self.trading_process.terminate()
+            self.trading_process.join()
+        self.trading_process = None
+        self.commands = None
+
+    def run_optimization(self, script: str = 'run_optimization.py', timeout: int = 7200) -> bool:
+        """최적화 워커 실행 (블로킹) - 완료 후 트레이딩 프로세스에 파라미터 리로드 지시"""
+        cores = self.allocation['optimizer']
+        nice = self.optimizer_nice
+
+        logger.info(f"🔧 최적화 워커 시작 (코어 {cores}, nice +{nice})")
+        self.optimizer_busy.set()
+        try:
+            # 워커가 띄우는 joblib/ProcessPool 자식들도 affinity/nice를 상속
+            result = subprocess.run(
+                [sys.executable, script],
+                env=build_optimizer_env(cores),
+                preexec_fn=lambda: apply_process_limits(cores, nice=nice),
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.error(f"❌ 최적화 워커 오류: {e}")
+            return False
+        finally:
+            self.optimizer_busy.clear()
+
+        if result.returncode == 0:
+            # 실행 중인 트레이딩 프로세스에만 전달 (다음 시작시 파라미터를 새로 읽음)
+            if self.trading_process is not None and self.trading_process.is_alive():
+                self.commands.put('reload_parameters')
+                logger.info("✅ 최적화 완료 - 트레이딩 프로세스 파라미터 리로드")
+            else:
+                logger.info("✅ 최적화 완료 (실행 중인 트레이딩 프로세스 없음)")
+            return True
+
+        logger.error(f"❌ 최적화 실패 (exit {result.returncode})")
+        return False
+
+    def load_latency_samples(self) -> List[Dict]:
+        """지연시간 기록 로드"""
+        samples = []
+        if not os.path.exists(self.latency_log):
+            return samples
+
+        with open(self.latency_log, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    samples.append(json.loads(line))
+        return samples
+
+    def get_status(self) -> Dict:
+        """슈퍼바이저 상태"""
+        return {
+            'trading_alive': self.trading_process is not None and self.trading_process.is_alive(),
+            'trading_pid': self.trading_process.pid if self.trading_process is not None else None,
+            'optimizer_running': self.optimizer_busy.is_set(),
+            'cpu_allocation': self.allocation,
+            'optimizer_nice': self.optimizer_nice,
+            'signal_to_order_latency': summarize_latency(self.load_latency_samples()),
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+def main():
+    """슈퍼바이저 단독 실행"""
+    import schedule
+
+    os.makedirs('logs', exist_ok=True)
+    supervisor = ProcessSupervisor()
+    supervisor.start_trading()
+
+    schedule.every().sunday.at("05:00").do(supervisor.run_optimization)
+    logger.info("📅 슈퍼바이저 스케줄: 매주 일요일 14:00 KST 최적화 실행")
+
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(60)
+    except KeyboardInterrupt:
+        supervisor.stop_trading()
+
+
+if __name__ == "__main__":
+    main()
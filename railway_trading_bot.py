@@ -7,18 +7,22 @@ import os
 import sys
 import json
 import asyncio
+import time
 import logging
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import numpy as np
 import pandas as pd
 
-# Binance API
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
-
 # 프로젝트 모듈
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src', 'trading'))
+
+# 비동기 거래소 어댑터
+from exchange_adapter import BinanceFuturesAdapter, ExchangeAdapter, ExchangeAPIError
+from order_pipeline import BracketOrderPipeline
+from kline_stream import KlineStream
 
 # 로깅 설정
 logging.basicConfig(
@@ -173,31 +177,51 @@ class AdvancedLeverageOptimizer:
 class RailwayTradingBot:
     """Railway 통합 트레이딩 봇"""
     
-    def __init__(self):
+    def __init__(self, exchange: ExchangeAdapter = None):
         # Binance API 설정
         self.api_key = os.getenv('BINANCE_API_KEY')
         self.secret_key = os.getenv('BINANCE_SECRET_KEY')
         self.testnet = os.getenv('BINANCE_TESTNET', 'false').lower() == 'true'
         
-        if not self.api_key or not self.secret_key:
-            raise ValueError("Binance API 키가 설정되지 않았습니다!")
-        
-        # Binance 클라이언트 초기화
-        self.client = Client(self.api_key, self.secret_key, testnet=self.testnet)
+        if exchange is None:
+            if not self.api_key or not self.secret_key:
+                raise ValueError("Binance API 키가 설정되지 않았습니다!")
+            
+            # 비동기 거래소 어댑터 초기화 (keep-alive 커넥션 풀)
+            exchange = BinanceFuturesAdapter(self.api_key, self.secret_key, testnet=self.testnet)
+        self.exchange = exchange
+        self.order_pipeline = BracketOrderPipeline(self.exchange, mode=os.getenv('BRACKET_ORDER_MODE', 'concurrent'))
         
         # 거래 설정
         self.symbol = 'ETHUSDT'
         self.is_active = False
         self.current_parameters = self.load_parameters()
         
-        # 계좌 정보 및 레버리지 최적화 시스템 초기화
-        self.account_balance = self.get_account_balance()
+        # 봉 마감 이벤트 스트림 (run_trading_loop에서 생성)
+        self.kline_stream = None
+        self._loop = None
+        
+        # 계좌 정보 및 레버리지 최적화 시스템 초기화 (잔고는 initialize()에서 갱신)
+        self.account_balance = 100.0  # 기본값
         self.leverage_optimizer = AdvancedLeverageOptimizer(self.account_balance)
         
+        # 신호→주문 지연시간 기록 (슈퍼바이저 모드에서 최적화 실행 플래그 주입)
+        self.optimizer_busy = None
+        self.latency_log_file = None
+        self.latency_samples = deque(maxlen=500)
+        
+        # 현재 포지션의 보호 주문 (스톱/익절 - 포지션 종료시 남은 주문 취소)
+        self.bracket_orders = []
+        
         logger.info(f"🚀 Railway Trading Bot 초기화 완료")
-        logger.info(f"   계좌 잔고: ${self.account_balance:.2f}")
         logger.info(f"   테스트넷: {self.testnet}")
     
+    async def initialize(self):
+        """계좌 잔고 조회 및 레버리지 최적화 시스템 갱신"""
+        self.account_balance = await self.get_account_balance()
+        self.leverage_optimizer = AdvancedLeverageOptimizer(self.account_balance)
+        logger.info(f"   계좌 잔고: ${self.account_balance:.2f}")
+    
     def load_parameters(self) -> Dict:
         """파라미터 로드"""
         try:
@@ -219,25 +243,21 @@ class RailwayTradingBot:
             'volume_filter': 1.521
         }
     
-    def get_account_balance(self) -> float:
+    async def get_account_balance(self) -> float:
         """계좌 잔고 조회"""
         try:
-            account_info = self.client.futures_account()
-            balance = float(account_info['totalWalletBalance'])
+            balance = await self.exchange.get_balance()
             logger.info(f"💰 현재 계좌 잔고: ${balance:.2f}")
             return balance
         except Exception as e:
             logger.error(f"계좌 정보 조회 실패: {e}")
             return 100.0  # 기본값
     
-    def get_market_data(self) -> Optional[pd.DataFrame]:
-        """시장 데이터 수집"""
+    async def get_market_data(self, klines: list = None) -> Optional[pd.DataFrame]:
+        """시장 데이터 수집 (스트림 버퍼가 주어지면 REST 재다운로드 생략)"""
         try:
-            klines = self.client.futures_klines(
-                symbol=self.symbol,
-                interval='15m',
-                limit=200
-            )
+            if klines is None:
+                klines = await self.exchange.get_klines(self.symbol, '15m', limit=200)
             
             df = pd.DataFrame(klines, columns=[
                 'timestamp', 'open', 'high', 'low', 'close', 'volume',
@@ -302,7 +322,8 @@ class RailwayTradingBot:
                     'stop_price': stop_price,
                     'target_price': target_price,
                     'atr': atr,
-                    'timestamp': current_bar['time']
+                    'timestamp': current_bar['time'],
+                    'signal_clock': time.perf_counter()
                 }
             
             return None
@@ -338,50 +359,43 @@ class RailwayTradingBot:
             
             # 2. 레버리지 설정
             try:
-                self.client.futures_change_leverage(
-                    symbol=self.symbol,
-                    leverage=int(position_info['leverage'])
-                )
+                await self.exchange.change_leverage(self.symbol, int(position_info['leverage']))
                 logger.info(f"✅ 레버리지 설정: {position_info['leverage']}x")
             except Exception as e:
                 logger.error(f"레버리지 설정 실패: {e}")
                 return False
             
-            # 3. 시장가 주문 실행
+            # 3. 시장가 주문 실행 (직전 포지션이 종료됐으면 남은 보호 주문부터 정리)
             side = 'BUY' if signal['direction'] == 'long' else 'SELL'
             quantity = position_info['position_size']
+            await self.cancel_bracket_orders_if_flat(await self.exchange.get_positions(self.symbol))
             
             try:
-                order = self.client.futures_create_order(
-                    symbol=self.symbol,
-                    side=side,
-                    type='MARKET',
-                    quantity=quantity
+                # 4. 진입 체결 즉시 스톱로스/익절 동시 제출
+                submit_clock = time.perf_counter()
+                bracket = await self.order_pipeline.submit(
+                    self.symbol, side, quantity, signal['stop_price'], signal['target_price']
                 )
+                order = bracket.entry_order
+                self.bracket_orders.extend(o for o in (bracket.stop_order, bracket.target_order) if o)
+                
+                self.record_order_latency(signal, submit_clock + bracket.timings['entry_ms'] / 1000)
                 
                 logger.info(f"✅ 주문 실행: {side} {quantity} ETH")
                 logger.info(f"   주문 ID: {order['orderId']}")
                 
-                # 4. 스톱로스 주문
-                stop_side = 'SELL' if signal['direction'] == 'long' else 'BUY'
-                
-                try:
-                    stop_order = self.client.futures_create_order(
-                        symbol=self.symbol,
-                        side=stop_side,
-                        type='STOP_MARKET',
-                        quantity=quantity,
-                        stopPrice=signal['stop_price']
-                    )
-                    
+                if bracket.protected:
                     logger.info(f"✅ 스톱로스 설정: {signal['stop_price']:.2f}")
-                    
-                except Exception as e:
-                    logger.error(f"스톱로스 설정 실패: {e}")
+                for error in bracket.errors:
+                    logger.error(f"보호 주문 설정 실패: {error}")
+                
+                timings = bracket.timings
+                entry_to_stop_ms = timings.get('entry_to_stop_live_ms', float('nan'))
+                logger.info(f"⏱️ 주문 단계: 진입 {timings['entry_ms']:.1f}ms, 진입→스톱 {entry_to_stop_ms:.1f}ms, 전체 {timings['total_ms']:.1f}ms")
                 
                 return True
                 
-            except BinanceAPIException as e:
+            except ExchangeAPIError as e:
                 logger.error(f"주문 실행 실패: {e}")
                 return False
             
@@ -389,10 +403,46 @@ class RailwayTradingBot:
             logger.error(f"거래 실행 중 오류: {e}")
             return False
     
+    def record_order_latency(self, signal: Dict, ack_clock: float = None):
+        """신호 생성 → 진입 주문 체결 응답까지 지연시간 기록"""
+        if 'signal_clock' not in signal:
+            return
+        
+        ack_clock = ack_clock if ack_clock is not None else time.perf_counter()
+        sample = {
+            'timestamp': datetime.now().isoformat(),
+            'latency_ms': (ack_clock - signal['signal_clock']) * 1000,
+            'optimizer_busy': bool(self.optimizer_busy is not None and self.optimizer_busy.is_set()),
+            'pid': os.getpid()
+        }
+        self.latency_samples.append(sample)
+        logger.info(f"⏱️ 신호→주문 지연: {sample['latency_ms']:.1f}ms (최적화 실행중: {sample['optimizer_busy']})")
+        
+        if self.latency_log_file:
+            try:
+                os.makedirs(os.path.dirname(self.latency_log_file) or '.', exist_ok=True)
+                with open(self.latency_log_file, 'a') as f:
+                    f.write(json.dumps(sample) + '\n')
+            except Exception as e:
+                logger.error(f"지연시간 기록 실패: {e}")
+    
+    async def cancel_bracket_orders_if_flat(self, positions: List[Dict]):
+        """포지션이 없으면 남은 보호 주문 취소 (이미 체결/취소된 주문의 실패는 무시)"""
+        if not self.bracket_orders or any(float(p['positionAmt']) != 0 for p in positions):
+            return
+        
+        # 스톱 또는 익절 체결로 포지션 종료 → 반대편 reduceOnly 주문이 다음 포지션을 닫지 않도록 취소
+        logger.info(f"🧹 포지션 종료 - 남은 보호 주문 {len(self.bracket_orders)}개 취소")
+        cancels = [self.exchange.cancel_order(self.symbol, o['orderId']) for o in self.bracket_orders]
+        for result in await asyncio.gather(*cancels, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.info(f"보호 주문 취소 생략 (체결/취소됨): {result}")
+        self.bracket_orders = []
+    
     async def monitor_positions(self):
-        """포지션 모니터링"""
+        """포지션 모니터링 (포지션 청산 확인시 남은 스톱/익절 주문 취소)"""
         try:
-            positions = self.client.futures_position_information(symbol=self.symbol)
+            positions = await self.exchange.get_positions(self.symbol)
             
             for position in positions:
                 if float(position['positionAmt']) != 0:
@@ -400,6 +450,8 @@ class RailwayTradingBot:
                     logger.info(f"   수량: {position['positionAmt']}")
                     logger.info(f"   진입가: {position['entryPrice']}")
                     logger.info(f"   미실현 PnL: {position['unRealizedProfit']}")
+            
+            await self.cancel_bracket_orders_if_flat(positions)
                     
         except Exception as e:
             logger.error(f"포지션 모니터링 실패: {e}")
@@ -407,13 +459,22 @@ class RailwayTradingBot:
     async def run_trading_loop(self):
         """메인 거래 루프"""
         logger.info("🚀 거래 루프 시작")
+        await self.initialize()
         
-        while self.is_active:
+        self._loop = asyncio.get_running_loop()
+        self.kline_stream = KlineStream(self.exchange, self.symbol, '15m', history=200, testnet=self.testnet)
+        
+        # 봉 마감 이벤트 기반 실행 (웹소켓 + REST 보충)
+        async for bar in self.kline_stream.closed_bars():
+            if not self.is_active:
+                break
+            
             try:
-                # 1. 시장 데이터 수집
-                df = self.get_market_data()
+                logger.info(f"🕯️ 봉 마감 수신: 지연 {bar.latency_ms}ms ({bar.source})")
+                
+                # 1. 시장 데이터 (스트림 버퍼)
+                df = await self.get_market_data(self.kline_stream.klines)
                 if df is None:
-                    await asyncio.sleep(60)
                     continue
                 
                 # 2. 시장 분석
@@ -426,12 +487,11 @@ class RailwayTradingBot:
                 # 4. 포지션 모니터링
                 await self.monitor_positions()
                 
-                # 5. 15분 대기
-                await asyncio.sleep(900)  # 15분
-                
             except Exception as e:
                 logger.error(f"거래 루프 오류: {e}")
-                await asyncio.sleep(60)
+        
+        self.kline_stream.stop()
+        await self.exchange.close()
     
     def start_trading(self):
         """거래 시작"""
@@ -441,6 +501,10 @@ class RailwayTradingBot:
     def stop_trading(self):
         """거래 중지"""
         self.is_active = False
+        
+        # 다음 봉 마감을 기다리지 않고 루프 종료 (다른 스레드에서 호출될 수 있음)
+        if self.kline_stream is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.kline_stream.stop)
         logger.info("⏹️ 거래 중지")
     
     def update_parameters(self, new_parameters: Dict):
@@ -455,7 +519,8 @@ class RailwayTradingBot:
             'account_balance': self.account_balance,
             'current_parameters': self.current_parameters,
             'symbol': self.symbol,
-            'testnet': self.testnet
+            'testnet': self.testnet,
+            'latency_samples': len(self.latency_samples)
         }
 
 # 글로벌 봇 인스턴스
@@ -8,11 +8,20 @@ import sys
 import os
 import json
 import numpy as np
+import optuna
 import pandas as pd
 from datetime import datetime, timedelta
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src', 'optimization'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src', 'trading'))
+
+from study_archive import DEFAULT_STORAGE, StudyArchive, dataset_fingerprint, param_distributions
+from market_data_store import MarketDataStore
+
+# 교차 주간 웜스타트 - 전역 탐색 스터디 단계 이름
+GLOBAL_STUDY_STAGE = 'weekly_global'
 
 def run_full_optimization():
     """전체 최적화 파이프라인 실행"""
@@ -23,9 +32,9 @@ def run_full_optimization():
     print("\n📊 1단계: 고속 데이터 엔진")
     data = generate_optimized_data()
     
-    # 2단계: 전역 탐색 (Sobol/LHS 120점)
+    # 2단계: 전역 탐색 (Sobol/LHS 120점, 이전 주 상위 시도로 웜스타트)
     print("\n🌍 2단계: 전역 탐색 최적화")
-    global_candidates = run_global_search()
+    global_candidates = run_global_search(open_study_archive())
     
     # 3단계: 국소 정밀화 (TPE/GP 40스텝)
     print("\n🎯 3단계: 국소 정밀화")
@@ -147,8 +156,23 @@ def calculate_rsi(prices, period=14):
     rs = gain / loss
     return 100 - (100 / (1 + rs))
 
-def run_global_search():
-    """전역 탐색 - Sobol/LHS 120점 샘플링"""
+def load_market_data(symbol='ETHUSDT', interval='15m'):
+    """시장 데이터 저장소 → 평가용 DataFrame (time 인덱스, binance_data_collector.py로 동기화)"""
+    data = MarketDataStore().load(symbol, interval)
+    if data.empty:
+        raise FileNotFoundError(f"시장 데이터 저장소에 {symbol} {interval} 데이터가 없습니다")
+    return data.set_index('time')
+
+def open_study_archive():
+    """스터디 보관소 열기 (OPTIMIZER_STUDY_STORAGE, 실패시 None - 웜스타트 없이 진행)"""
+    try:
+        return StudyArchive(os.getenv('OPTIMIZER_STUDY_STORAGE', DEFAULT_STORAGE))
+    except Exception as e:
+        print(f"   ⚠️ 스터디 보관소 열기 실패: {e}")
+        return None
+
+def run_global_search(archive=None):
+    """전역 탐색 - Sobol/LHS 120점 샘플링 (archive 지정시 이전 주 상위 시도 우선 평가 + 범위 축소)"""
     print("   🔍 Sobol/LHS 120점 샘플링")
     print("   📊 다중충실도: 50k→100k→200k (전체 데이터 활용)")
     print("   ⚡ ASHA 조기중단 (η=3, 70%→60% 컷)")
@@ -163,21 +187,49 @@ def run_global_search():
         'session_strength': (1.0, 3.0),
         'volume_filter': (1.0, 2.5)
     }
-    
-    candidates = []
-    
-    # 빠른 그리드 서치 (30개 후보)
+    space = {name: {'type': 'float', 'low': low, 'high': high} for name, (low, high) in param_space.items()}
+    
+    # 교차 주간 웜스타트 - 데이터 동일하면 이전 점수 재사용, 변경되면 재평가
+    seeds = []
+    study = None
+    if archive is not None:
+        try:
+            run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # evaluate_strategy가 평가하는 저장소 데이터 기준 지문
+            fingerprint = dataset_fingerprint(load_market_data().reset_index())
+            warm_start = archive.plan(GLOBAL_STUDY_STAGE, run_id, fingerprint, space)
+            study = archive.create_study(GLOBAL_STUDY_STAGE, run_id, fingerprint, space)
+            if warm_start is not None:
+                print(f"   ♻️ 웜스타트: {warm_start.source} 상위 {len(warm_start.trials)}개 "
+                      f"({'점수 재사용' if warm_start.reuse_scores else '새 데이터로 재평가'}), "
+                      f"범위 축소 {len(warm_start.shrunk_params)}/{len(space)}개, "
+                      f"이전 최고 {warm_start.prior_best:.4f}")
+                seeds = [(dict(t.params), t.value if warm_start.reuse_scores else None) for t in warm_start.trials]
+                param_space = {name: (config['low'], config['high']) for name, config in warm_start.param_space.items()}
+        except Exception as e:
+            print(f"   ⚠️ 웜스타트 준비 실패: {e}")
+            seeds, study = [], None
+    
+    # 빠른 그리드 서치 (30개 후보, 웜스타트시 축소 범위)
+    grid = []
     for i in range(30):
         params = {}
         for param_name, (min_val, max_val) in param_space.items():
             # Sobol 시퀀스 대신 준랜덤 샘플링
             sobol_val = (i + 0.5) / 120  # 균등 분포
             params[param_name] = min_val + sobol_val * (max_val - min_val)
-        
-        # 단일 충실도 평가 (빠른 평가)
-        score = evaluate_strategy(params, 30000)  # 3만개 데이터로 빠른 평가
+        grid.append((params, None))
+    
+    candidates = []
+    evaluated = []
+    
+    # 이전 주 상위 시도 먼저 평가
+    for params, prior_score in seeds + grid:
+        # 단일 충실도 평가 (빠른 평가, 데이터 동일한 이전 시도는 점수 재사용)
+        score = prior_score if prior_score is not None else evaluate_strategy(params, 30000)  # 3만개 데이터로 빠른 평가
         scores = [score]
-        
+        evaluated.append((params, score))
+    
         candidate = {
             'params': params,
             'scores': scores,
@@ -192,6 +244,17 @@ def run_global_search():
         if candidate['final_score'] > 0.15:  # 기본 필터 완화
             candidates.append(candidate)
     
+    # 다음 주 웜스타트용 시도 보관 (원래 탐색 범위 기준)
+    if study is not None:
+        try:
+            distributions = param_distributions(space)
+            study.add_trials([
+                optuna.trial.create_trial(params=params, distributions=distributions, value=score)
+                for params, score in evaluated
+            ])
+        except Exception as e:
+            print(f"   ⚠️ 스터디 보관 실패: {e}")
+    
     # 상위 12개 선별
     candidates.sort(key=lambda x: x['final_score'], reverse=True)
     top_candidates = candidates[:12]
@@ -288,9 +351,7 @@ def run_walkforward_analysis(validated_candidates):
     
     # 실제 데이터 로드
     try:
-        data = pd.read_csv('data/ETHUSDT_15m_206319points_20251015_202539.csv')
-        data['time'] = pd.to_datetime(data['time'])
-        data.set_index('time', inplace=True)
+        data = load_market_data()
         data = calculate_indicators_for_optimization(data)
         
         # 5.9년 데이터를 10개 슬라이스로 분할 (각 슬라이스 약 7개월)
@@ -578,9 +639,7 @@ def evaluate_strategy(params, data_length, fold_offset=0, slice_offset=0):
     """실제 데이터 기반 전략 평가"""
     try:
         # 실제 데이터 로드
-        data = pd.read_csv('data/ETHUSDT_15m_206319points_20251015_202539.csv')
-        data['time'] = pd.to_datetime(data['time'])
-        data.set_index('time', inplace=True)
+        data = load_market_data()
         
         # 데이터 길이 제한 (충실도)
         if len(data) > data_length:
@@ -196,7 +196,7 @@ class AutoOptimizationScheduler:
             required_files = [
                 'run_optimization.py',
                 'run_full_backtest.py',
-                'data/ETHUSDT_15m_206319points_20251015_202539.csv'
+                os.path.join(os.getenv('MARKET_DATA_DIR', 'data/store'), 'ETHUSDT', '15m', 'manifest.json')
             ]
             
             for file_path in required_files:
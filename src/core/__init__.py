@@ -5,5 +5,6 @@ Core Components
 
 from .fast_data_engine import FastDataEngine
 from .performance_evaluator import PerformanceEvaluator, PerformanceMetrics
+from .strategy_evaluator import ArrayStrategyEvaluator, StrategyEvaluator
 
-__all__ = ["PerformanceEvaluator", "PerformanceMetrics", "FastDataEngine"]
+__all__ = ["PerformanceEvaluator", "PerformanceMetrics", "FastDataEngine", "StrategyEvaluator", "ArrayStrategyEvaluator"]
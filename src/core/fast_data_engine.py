@@ -7,8 +7,13 @@
 - Numpy vectorization + Numba JIT compilation
 """
 
+import gc
+import hashlib
+import json
 import os
+import shutil
 import warnings
+from functools import partial
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
@@ -16,7 +21,10 @@ import pandas as pd
 import psutil
 import pyarrow as pa
 import pyarrow.parquet as pq
+from calendar_features import calendar_features, to_epoch_ms
+from memory_admission import get_admission_controller
 from numba import njit, prange
+from performance_optimizer import ParallelProcessor, PerformanceConfig, get_worker_context
 
 warnings.filterwarnings("ignore")
 
@@ -33,6 +41,59 @@ except ImportError:
     print("⚠️ Joblib not available, using single-threaded processing")
 
 
+BUNDLE_MANIFEST = "bundle.json"
+
+# 프로세스별 연결된 번들 (워커는 번들당 한 번만 memmap 연결)
+_attached_bundles: Dict[str, Dict[str, np.ndarray]] = {}
+
+
+def save_array_bundle(arrays: Dict[str, np.ndarray], bundle_dir: str) -> str:
+    """배열 묶음 → .npy 번들 디렉토리 (이미 있으면 재사용)"""
+    if os.path.exists(os.path.join(bundle_dir, BUNDLE_MANIFEST)):
+        return bundle_dir
+
+    tmp_dir = f"{bundle_dir}.tmp{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    manifest = {}
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), values)
+        manifest[name] = {"dtype": values.dtype.str, "shape": list(values.shape)}
+
+    with open(os.path.join(tmp_dir, BUNDLE_MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+    # 디렉토리 단위 원자적 게시 (동시 생성시 먼저 게시된 번들 사용)
+    try:
+        os.replace(tmp_dir, bundle_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return bundle_dir
+
+
+def open_array_bundle(bundle_dir: str) -> Dict[str, np.ndarray]:
+    """번들 읽기 전용 memmap 연결 - 페이지 캐시를 프로세스 간 공유 (복사/피클링 없음)"""
+    if bundle_dir not in _attached_bundles:
+        with open(os.path.join(bundle_dir, BUNDLE_MANIFEST), "r") as f:
+            manifest = json.load(f)
+        _attached_bundles[bundle_dir] = {
+            name: np.load(os.path.join(bundle_dir, f"{name}.npy"), mmap_mode="r") for name in manifest
+        }
+    return _attached_bundles[bundle_dir]
+
+
+def _attach_bundle_worker(bundle_dir: str) -> Dict[str, np.ndarray]:
+    """상주 워커 초기화 - 번들 연결 + Numba 커널 사전 컴파일"""
+    arrays = open_array_bundle(bundle_dir)
+    FastDataEngine.warm_kernels()
+    return arrays
+
+
+def _run_pooled_task(strategy_func, params: Dict):
+    """상주 워커 작업 - 초기화시 연결한 번들로 전략 실행"""
+    return strategy_func(params, get_worker_context())
+
+
 class FastDataEngine:
     def __init__(self, cache_dir: str = "data_cache"):
         """고속 데이터 엔진 초기화"""
@@ -46,6 +107,10 @@ class FastDataEngine:
         # 캐시된 데이터
         self.cached_data = {}
         self.cached_indicators = {}
+        self._fingerprints = {}
+        self.bundle_dir = None
+        self.worker_pool: Optional[ParallelProcessor] = None
+        self.worker_pool_key = None
 
         print("🚀 고속 데이터 엔진 초기화 완료")
         print(f"   캐시 디렉토리: {self.cache_dir}")
@@ -73,44 +138,107 @@ class FastDataEngine:
         total_cpus = psutil.cpu_count(logical=False)
         self.max_workers = max(1, total_cpus)
 
-        # 메모리 제한 (70%)
-        total_memory = psutil.virtual_memory().total
-        self.max_memory = int(total_memory * 0.7)
+        # 슈퍼바이저 코어 예산 (트레이딩 예약 코어 제외)
+        core_budget = int(os.getenv("OPTIMIZER_CORE_BUDGET", 0))
+        if core_budget > 0:
+            self.max_workers = min(self.max_workers, core_budget)
+
+        # 메모리 예산 (컨테이너 한도 인식, 병렬 백테스트 허용 제어에 사용)
+        self.admission = get_admission_controller()
+        self.max_memory = self.admission.budget_bytes
         self.max_memory_gb = self.max_memory / (1024**3)
 
         # 배치 크기 계산 (메모리 기반)
         estimated_memory_per_batch = 100 * 1024 * 1024  # 100MB per batch
         self.max_batch_size = max(1024, self.max_memory // estimated_memory_per_batch)
 
-    def load_data(self, file_path: str, symbol: str = "ETHUSDT", timeframe: str = "15m") -> pd.DataFrame:
-        """데이터 로드 및 Parquet 캐시"""
-        cache_key = f"{symbol}_{timeframe}"
-        parquet_path = os.path.join(self.cache_dir, f"{cache_key}.parquet")
+    # Parquet 캐시 row group 크기 (구간 조회시 통계 기반 row group 건너뛰기 단위)
+    ROW_GROUP_SIZE = 8192
+
+    def file_fingerprint(self, file_path: str) -> str:
+        """원본 파일 내용 지문 (크기/수정시각이 같으면 메모이즈된 값 재사용)"""
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._fingerprints:
+            digest = hashlib.blake2b(digest_size=8)
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._fingerprints[memo_key] = digest.hexdigest()
+        return self._fingerprints[memo_key]
+
+    def _build_parquet_cache(self, file_path: str, parquet_path: str, cache_prefix: str):
+        """원본 → 시간순 정렬 Parquet 캐시 (같은 원본 파일의 이전 지문 캐시만 제거)"""
+        print(f"📊 원본 데이터 로드 및 캐시 생성: {file_path}")
+        df = pd.read_parquet(file_path) if file_path.endswith(".parquet") else pd.read_csv(file_path)
 
-        # 캐시된 Parquet 파일 확인
-        if os.path.exists(parquet_path):
-            print(f"📦 캐시된 데이터 로드: {parquet_path}")
-            df = pd.read_parquet(parquet_path)
-        else:
-            print(f"📊 원본 데이터 로드 및 캐시 생성: {file_path}")
-            df = pd.read_csv(file_path)
+        if "time" in df.columns:
+            df["time"] = pd.to_datetime(df["time"])
+            df = df.sort_values("time").reset_index(drop=True)
+
+        # 데이터 타입 최적화
+        df = self._optimize_dtypes(df)
+
+        # 정렬된 row group 단위 저장 (row group별 min/max 통계로 구간 조회 가속)
+        tmp_path = f"{parquet_path}.tmp"
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression="snappy", row_group_size=self.ROW_GROUP_SIZE
+        )
+        os.replace(tmp_path, parquet_path)
+        print(f"💾 Parquet 캐시 저장: {parquet_path}")
+
+        for name in os.listdir(self.cache_dir):
+            stale = os.path.join(self.cache_dir, name)
+            if name.startswith(cache_prefix) and name.endswith(".parquet") and stale != parquet_path:
+                os.remove(stale)
+
+    def load_data(
+        self,
+        file_path: str,
+        symbol: str = "ETHUSDT",
+        timeframe: str = "15m",
+        start=None,
+        end=None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """데이터 로드 및 Parquet 캐시
+
+        start/end: 시간 구간 [start, end) - row group 통계로 필요한 구간만 읽음
+        columns: 필요한 컬럼만 읽음 (time은 항상 포함)
+        캐시 키에 원본 경로 식별자 + 내용 지문 포함 - 원본 변경시 자동 재생성 (다른 원본 캐시는 유지)
+        반환 DataFrame은 사본 - 호출자가 수정해도 메모리 캐시에 영향 없음
+        """
+        fingerprint = self.file_fingerprint(file_path)
+        source_id = hashlib.blake2b(os.path.abspath(file_path).encode(), digest_size=4).hexdigest()
+        cache_prefix = f"{symbol}_{timeframe}_{source_id}_"
+        cache_key = f"{cache_prefix}{fingerprint}"
+        parquet_path = os.path.join(self.cache_dir, f"{cache_key}.parquet")
+        full_load = start is None and end is None and columns is None
 
-            # 데이터 타입 최적화
-            df = self._optimize_dtypes(df)
+        if full_load and cache_key in self.cached_data:
+            return self.cached_data[cache_key].copy()
 
-            # Parquet으로 저장
-            df.to_parquet(parquet_path, compression="snappy", index=False)
-            print(f"💾 Parquet 캐시 저장: {parquet_path}")
+        if not os.path.exists(parquet_path):
+            self._build_parquet_cache(file_path, parquet_path, cache_prefix)
+        else:
+            print(f"📦 캐시된 데이터 로드: {parquet_path}")
 
-        # 시간 컬럼 처리
-        if "time" in df.columns:
-            df["time"] = pd.to_datetime(df["time"])
+        # 구간 조건 푸시다운 + 컬럼 프로젝션 (캐시는 시간순 정렬 상태로 저장되어 재정렬 불필요)
+        filters = []
+        if start is not None:
+            filters.append(("time", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("time", "<", pd.Timestamp(end)))
+        if columns is not None and "time" not in columns:
+            columns = ["time"] + list(columns)
 
-        # 정렬 및 인덱스 리셋
-        df = df.sort_values("time").reset_index(drop=True)
+        table = pq.read_table(parquet_path, columns=columns, filters=filters or None)
+        df = table.to_pandas()
 
-        # 메모리 캐시
-        self.cached_data[cache_key] = df
+        # 전체 로드만 메모리 캐시 (구간 조회는 폴드별로 달라 재사용 가치 낮음)
+        if full_load:
+            self.cached_data[cache_key] = df
+            df = df.copy()
 
         print(f"✅ 데이터 로드 완료: {len(df):,}개 행")
         return df
@@ -142,11 +270,12 @@ class FastDataEngine:
         open_price = df["open"].values.astype(np.float32)
         volume = df["volume"].values.astype(np.float32)
 
-        # 시간 정보
-        time_values = df["time"].values
-        hours = pd.to_datetime(time_values).hour.values.astype(np.int8)
-        minutes = pd.to_datetime(time_values).minute.values.astype(np.int8)
-        weekdays = pd.to_datetime(time_values).weekday.values.astype(np.int8)
+        # 시간 정보 (epoch ms 정수 연산)
+        timestamps = to_epoch_ms(df["time"])
+        calendar = calendar_features(timestamps)
+        hours = calendar["hour"]
+        minutes = calendar["minute"]
+        weekdays = calendar["weekday"]
 
         # Numba JIT 컴파일된 지표 계산
         indicators = {}
@@ -178,7 +307,8 @@ class FastDataEngine:
         # 일중 변동성 (간소화된 버전)
         indicators["rr_percentile"] = self._calculate_rr_percentile_numba(indicators["tr"], params.get("rr_percentile", 0.13))
 
-        # 시간 정보 저장
+        # 시간 정보 저장 (timestamp: 전략 평가기 재구성용 epoch ms)
+        indicators["timestamp"] = timestamps
         indicators["hour"] = hours
         indicators["minute"] = minutes
         indicators["weekday"] = weekdays
@@ -191,6 +321,7 @@ class FastDataEngine:
         indicators["volume"] = volume
 
         self.cached_indicators = indicators
+        self.bundle_dir = None
 
         print(f"✅ {len(indicators)}개 지표 캐시 완료")
         return indicators
@@ -347,6 +478,50 @@ class FastDataEngine:
 
         return sliced_data
 
+    # 보관할 번들 수 (오래된 번들부터 정리)
+    MAX_BUNDLES = 8
+
+    def persist_indicators(self) -> str:
+        """지표 캐시 → memmap 번들 저장, 캐시를 읽기 전용 memmap으로 교체 - 번들 경로 반환"""
+        if not self.cached_indicators:
+            raise ValueError("지표가 캐시되지 않았습니다. cache_indicators()를 먼저 실행하세요.")
+
+        if self.bundle_dir is not None:
+            return self.bundle_dir
+
+        # 배열 내용 기반 키 - 같은 데이터/파라미터면 기존 번들 재사용
+        digest = hashlib.blake2b(digest_size=8)
+        for name in sorted(self.cached_indicators):
+            values = np.ascontiguousarray(self.cached_indicators[name])
+            digest.update(name.encode())
+            digest.update(values.dtype.str.encode())
+            digest.update(values.data)
+
+        bundles_root = os.path.abspath(os.path.join(self.cache_dir, "bundles"))
+        os.makedirs(bundles_root, exist_ok=True)
+        bundle_dir = save_array_bundle(self.cached_indicators, os.path.join(bundles_root, digest.hexdigest()))
+        os.utime(bundle_dir)
+
+        self.cached_indicators = dict(open_array_bundle(bundle_dir))
+        self.bundle_dir = bundle_dir
+        self._prune_bundles(bundles_root)
+
+        print(f"💾 지표 번들 저장: {bundle_dir}")
+        return bundle_dir
+
+    def _prune_bundles(self, bundles_root: str):
+        """오래된 번들 정리"""
+        bundles = [
+            os.path.join(bundles_root, name)
+            for name in os.listdir(bundles_root)
+            if os.path.exists(os.path.join(bundles_root, name, BUNDLE_MANIFEST))
+        ]
+        bundles.sort(key=os.path.getmtime, reverse=True)
+        for stale in bundles[self.MAX_BUNDLES :]:
+            if stale != self.bundle_dir:
+                _attached_bundles.pop(stale, None)
+                shutil.rmtree(stale, ignore_errors=True)
+
     def update_incremental(self, new_bar: Dict) -> None:
         """증분 업데이트 (실시간 데이터용)"""
         # 새로운 바 데이터를 캐시에 추가
@@ -354,21 +529,74 @@ class FastDataEngine:
             if key in self.cached_indicators:
                 # numpy array에 새 값 추가 (메모리 효율적이지 않음, 실제로는 circular buffer 사용)
                 self.cached_indicators[key] = np.append(self.cached_indicators[key], value)
-
-    def parallel_backtest(self, param_sets: List[Dict], strategy_func, n_jobs: int = None) -> List[Dict]:
-        """병렬 백테스트 실행"""
+        self.bundle_dir = None
+
+    def parallel_backtest(
+        self,
+        param_sets: List[Dict],
+        strategy_func,
+        n_jobs: int = None,
+        with_data: bool = False,
+        stage: str = "backtest",
+        token=None,
+    ) -> List[Dict]:
+        """병렬 백테스트 실행 (메모리 예산 허용 제어)
+
+        with_data=True: strategy_func(params, arrays) 호출 - 워커는 지표 번들을 memmap으로 연결
+        stage: 작업당 메모리 추정 프로파일 (backtest/screening/walkforward/montecarlo/optimization)
+        배치마다 예산을 재확인해 워커 수를 줄이고, 부족하면 순차/청크 실행으로 강등
+        token: 취소 토큰 - 중단시 미실행 파라미터 세트는 None (부분 결과)
+        """
         if n_jobs is None:
             n_jobs = self.max_workers
 
-        print(f"🔄 병렬 백테스트 시작: {len(param_sets)}개 파라미터 세트, {n_jobs}개 프로세스")
+        print(f"🔄 병렬 백테스트 시작: {len(param_sets)}개 파라미터 세트, 최대 {n_jobs}개 프로세스")
+
+        dataset_bytes = sum(v.nbytes for v in self.cached_indicators.values() if isinstance(v, np.ndarray))
+        results = []
+        position = 0
+        last_plan = None
+        while position < len(param_sets):
+            if token is not None and token.stopped:
+                print(f"   ⏹️ 백테스트 중단 ({token.reason}): {position}/{len(param_sets)}개 완료")
+                break
+
+            plan = self.admission.plan(stage, len(param_sets) - position, dataset_bytes, n_jobs, shared_dataset=with_data)
+            if (plan.mode, plan.workers) != last_plan:
+                print(
+                    f"   🧮 허용 계획: {plan.mode}, 워커 {plan.workers}개, 배치 {plan.batch_size}, "
+                    f"작업당 {plan.per_task_mb:.0f}MB / 가용 {plan.available_bytes / 1024**2:.0f}MB {plan.reason}"
+                )
+                last_plan = (plan.mode, plan.workers)
+
+            batch = param_sets[position : position + plan.batch_size]
+            with self.admission.reserve(plan):
+                results.extend(self._run_backtest_batch(batch, strategy_func, plan.workers, with_data, token))
+            position += len(batch)
+
+            if plan.mode == "chunked":
+                gc.collect()
+
+        return results + [None] * (len(param_sets) - len(results))
+
+    def _run_backtest_batch(
+        self, param_sets: List[Dict], strategy_func, n_jobs: int, with_data: bool, token=None
+    ) -> List[Dict]:
+        """배치 실행 - 워커 1개면 프로세스 생성 없이 순차 실행"""
+        if n_jobs <= 1 or not (RAY_AVAILABLE or JOBLIB_AVAILABLE):
+            # 단일 스레드 (폴백 또는 메모리 부족) - 파라미터 세트마다 중단 확인
+            results = []
+            for params in param_sets:
+                if token is not None and token.stopped:
+                    break
+                results.append(strategy_func(params, self.cached_indicators) if with_data else strategy_func(params))
+            return results + [None] * (len(param_sets) - len(results))
 
         if RAY_AVAILABLE:
             return self._parallel_backtest_ray(param_sets, strategy_func)
-        elif JOBLIB_AVAILABLE:
-            return self._parallel_backtest_joblib(param_sets, strategy_func, n_jobs)
-        else:
-            # 단일 스레드 폴백
-            return [strategy_func(params) for params in param_sets]
+        if with_data:
+            return self._parallel_backtest_shared(param_sets, strategy_func, n_jobs, token)
+        return self._parallel_backtest_joblib(param_sets, strategy_func, n_jobs)
 
     def _parallel_backtest_ray(self, param_sets: List[Dict], strategy_func) -> List[Dict]:
         """Ray를 사용한 병렬 백테스트"""
@@ -394,6 +622,44 @@ class FastDataEngine:
         results = Parallel(n_jobs=n_jobs, backend="multiprocessing")(delayed(strategy_func)(params) for params in param_sets)
         return results
 
+    @staticmethod
+    def warm_kernels():
+        """Numba 커널 사전 컴파일 (워커 첫 작업의 JIT 지연 제거)"""
+        prices = np.linspace(100.0, 101.0, 64).astype(np.float32)
+        hours = (np.arange(64) % 24).astype(np.int8)
+        FastDataEngine._calculate_atr_numba(prices + 1, prices - 1, prices, 14)
+        tr = FastDataEngine._calculate_tr_numba(prices + 1, prices - 1, prices)
+        FastDataEngine._find_swing_points_numba(prices + 1, prices - 1, 3)
+        FastDataEngine._identify_sessions_numba(hours)
+        FastDataEngine._calculate_displacement_numba(prices, prices + 0.5, prices + 1, prices - 1, 1.3)
+        FastDataEngine._calculate_rr_percentile_numba(tr, 0.13)
+
+    def start_worker_pool(self, n_jobs: int = None) -> ParallelProcessor:
+        """지표 번들을 연결한 상주 워커 풀 (같은 번들/워커 수면 재사용)"""
+        n_jobs = n_jobs or self.max_workers
+        bundle_dir = self.persist_indicators()
+        if self.worker_pool is not None and self.worker_pool_key == (bundle_dir, n_jobs):
+            return self.worker_pool
+
+        self.stop_worker_pool()
+        pool = ParallelProcessor(PerformanceConfig(max_workers=n_jobs))
+        pool.start_pools(worker_initializer=_attach_bundle_worker, initargs=(bundle_dir,))
+        self.worker_pool = pool
+        self.worker_pool_key = (bundle_dir, n_jobs)
+        return pool
+
+    def stop_worker_pool(self):
+        """상주 워커 풀 종료"""
+        if self.worker_pool is not None:
+            self.worker_pool.stop_pools()
+        self.worker_pool = None
+        self.worker_pool_key = None
+
+    def _parallel_backtest_shared(self, param_sets: List[Dict], strategy_func, n_jobs: int, token=None) -> List[Dict]:
+        """상주 워커 풀 백테스트 - 워커는 번들을 한 번만 연결, 작업은 파라미터만 전달"""
+        pool = self.start_worker_pool(n_jobs)
+        return pool.process_parallel(partial(_run_pooled_task, strategy_func), param_sets, use_processes=True, token=token)
+
     def get_memory_usage(self) -> Dict[str, float]:
         """메모리 사용량 조회"""
         memory_info = {}
@@ -414,8 +680,11 @@ class FastDataEngine:
 
     def cleanup_cache(self):
         """캐시 정리"""
+        self.stop_worker_pool()
         self.cached_data.clear()
         self.cached_indicators.clear()
+        _attached_bundles.pop(self.bundle_dir, None)
+        self.bundle_dir = None
 
         # Ray 정리 불필요 (사용하지 않음)
 
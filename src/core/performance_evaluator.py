@@ -5,17 +5,22 @@
 - 제약 조건 검증 (PF≥1.8, Sortino≥1.5, etc.)
 - 메디안 기반 집계 및 IQR 우선순위
 - DD 패널티 λ=0.5~1.0 적용
+- 거래 단위 조기 중단 기준 (제약 위반이 확정된 백테스트는 남은 신호 생략)
 """
 
 import warnings
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+# 조기 중단 사유 코드 (0 = 중단 없음)
+ABORT_NONE, ABORT_DRAWDOWN, ABORT_LOSS_STREAK = range(3)
+ABORT_REASONS = ("", "drawdown", "loss_streak")
+
 
 @dataclass
 class PerformanceMetrics:
@@ -37,6 +42,7 @@ class PerformanceMetrics:
     volatility: float
     avg_win: float
     avg_loss: float
+    abort_reason: str = ""  # 조기 중단 사유 (비어 있지 않으면 중단 시점까지의 부분 지표 - 실행 불가 확정)
 
 
 @dataclass
@@ -58,6 +64,43 @@ class ConstraintConfig:
     min_r_exp_var_ratio: float = 1.5  # ≥1.5
 
 
+@dataclass
+class AbortRule:
+    """거래 단위 조기 중단 기준 (0 = 비활성)
+
+    드로우다운은 calculate_metrics와 같은 정의 (거래 후 자산 고점 대비) - 초과 시점에 이미 제약 위반 확정
+    """
+
+    max_drawdown: float = 0.0
+    max_loss_streak: int = 0  # 연속 손실 거래 수 (PF 목표 도달 불가로 보는 기준)
+
+    @classmethod
+    def from_constraints(cls, constraints: ConstraintConfig, max_loss_streak: int = 0) -> "AbortRule":
+        """제약 조건의 최대 드로우다운으로 중단 기준 생성"""
+        return cls(max_drawdown=constraints.max_drawdown, max_loss_streak=max_loss_streak)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_drawdown > 0 or self.max_loss_streak > 0
+
+    def predicate(self, initial_balance: float) -> Callable[[float], str]:
+        """거래 손익을 순서대로 받아 중단 사유를 반환하는 판정 함수 (계속이면 "")"""
+        state = {"equity": float(initial_balance), "peak": -np.inf, "streak": 0}
+
+        def should_abort(pnl: float) -> str:
+            state["equity"] += pnl
+            state["peak"] = max(state["peak"], state["equity"])
+            if self.max_drawdown > 0 and (state["peak"] - state["equity"]) / state["peak"] > self.max_drawdown:
+                return ABORT_REASONS[ABORT_DRAWDOWN]
+
+            state["streak"] = state["streak"] + 1 if pnl < 0 else 0
+            if self.max_loss_streak > 0 and state["streak"] >= self.max_loss_streak:
+                return ABORT_REASONS[ABORT_LOSS_STREAK]
+            return ABORT_REASONS[ABORT_NONE]
+
+        return should_abort
+
+
 @dataclass
 class ScoreConfig:
     """점수 계산 설정"""
@@ -199,6 +242,10 @@ class PerformanceEvaluator:
         """제약 조건 확인"""
         violations = []
 
+        # 조기 중단된 백테스트는 실행 불가 확정
+        if metrics.abort_reason:
+            violations.append(f"조기 중단: {metrics.abort_reason}")
+
         # 기본 제약 조건
         if metrics.total_trades < self.constraints.min_trades:
             violations.append(f"거래 수 부족: {metrics.total_trades} < {self.constraints.min_trades}")
@@ -245,13 +292,15 @@ class PerformanceEvaluator:
         passed = len(violations) == 0
         return passed, violations
 
-    def calculate_score(self, metrics: PerformanceMetrics) -> float:
-        """점수 계산 - Score = 0.35·Sortino + 0.25·Calmar + 0.20·PF + 0.20·SQN − λ·MaxDD"""
+    def calculate_score(self, metrics: PerformanceMetrics, apply_constraints: bool = True) -> float:
+        """점수 계산 - Score = 0.35·Sortino + 0.25·Calmar + 0.20·PF + 0.20·SQN − λ·MaxDD
+        (apply_constraints=False: 제약 조건 게이트 없이 원점수 - 전체 기간 기준 제약을 적용할 수 없는 짧은 구간 비교용)"""
 
         # 제약 조건 확인
-        passed, violations = self.check_constraints(metrics)
-        if not passed:
-            return -10000  # 제약 조건 위반 시 큰 음수 반환
+        if apply_constraints:
+            passed, violations = self.check_constraints(metrics)
+            if not passed:
+                return -10000  # 제약 조건 위반 시 큰 음수 반환
 
         # 정규화된 지표 계산
         def normalize_metric(value: float, target: float, max_multiplier: float = 3.0) -> float:
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+전략 평가기 (파라미터 + 바 구간 → 성과 지표)
+- ETHSessionStrategy 신호/백테스트 규칙을 배열 연산으로 재현 (시뮬레이션 스텁 대체)
+- 파라미터 무관 배열(TR, 아시아 레벨, 스윕 후보/꼬리 비율, 변동성 퍼센타일)은 데이터셋당 1회 계산
+- 파라미터 의존 배열(ATR, 펀딩 마스크)은 값별 캐시
+- 거래 시뮬레이션 + 포지션 사이징(AdvancedRiskManager 규칙)은 Numba 커널
+- 전략이 사용하지 않는 파라미터(swing_len, volume_filter 등)는 결과에 영향 없음
+- 조기 중단 기준(AbortRule) 지정시 제약 위반이 확정된 거래에서 시뮬레이션 종료
+"""
+
+import hashlib
+import json
+import threading
+import time
+import warnings
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from advanced_risk_system import RiskParameters
+from calendar_features import calendar_features, funding_window_mask, to_epoch_ms
+from eth_session_strategy import (
+    DEFAULT_PARAMS,
+    SESSION_ASIA,
+    SIGNAL_LOOKAHEAD_BARS,
+    TRADING_SESSIONS,
+    rr_percentile_by_day,
+    session_codes,
+)
+from kline_stream import INTERVAL_MS
+from numba import njit
+from performance_evaluator import (
+    ABORT_DRAWDOWN,
+    ABORT_LOSS_STREAK,
+    ABORT_NONE,
+    ABORT_REASONS,
+    AbortRule,
+    PerformanceEvaluator,
+    PerformanceMetrics,
+)
+
+warnings.filterwarnings("ignore")
+
+# 청산 사유 코드 (run_trades의 exit_reason)
+EXIT_TARGET, EXIT_STOP, EXIT_LIQUIDATION, EXIT_TIME = range(4)
+EXIT_REASONS = ("target", "stop_loss", "liquidation", "time_stop")
+
+# 정수 파라미터 (탐색기가 실수로 제안해도 반올림)
+INT_PARAMS = ("atr_len", "time_stop_bars", "funding_avoid_bars")
+
+# AdvancedRiskManager.update_account_balance 최소 잔고
+MIN_ACCOUNT_BALANCE = 1000.0
+
+
+@njit(nogil=True)  # GIL 해제 - 스레드 워커가 하나의 평가기를 공유해 병렬 평가
+def _simulate_trades(
+    entry_index: np.ndarray,
+    is_long: np.ndarray,
+    entry_price: np.ndarray,
+    stop_price: np.ndarray,
+    target_price: np.ndarray,
+    price_risk: np.ndarray,
+    leverage: np.ndarray,
+    effective_leverage: np.ndarray,
+    liquidation_price: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    end: int,
+    time_stop_bars: int,
+    initial_balance: float,
+    risk_per_trade: float,
+    min_notional: float,
+    abort_drawdown: float,
+    abort_loss_streak: int,
+):
+    """신호 순서대로 거래 시뮬레이션 (잔고 복리, 청산 → 스톱 → 타겟 → 시간 스톱 우선순위)
+
+    abort_drawdown / abort_loss_streak (0 = 비활성): AbortRule.predicate와 같은 판정 - 위반 거래까지 기록 후 종료
+    """
+    n_signals = len(entry_index)
+    pnl = np.zeros(n_signals)
+    exit_index = np.full(n_signals, -1, dtype=np.int64)
+    exit_reason = np.full(n_signals, -1, dtype=np.int8)
+    balance = initial_balance
+    aborted = ABORT_NONE
+
+    # 조기 중단 판정용 자산 (잔고 하한 없는 누적 손익 - calculate_metrics 드로우다운과 동일)
+    equity = initial_balance
+    peak = -np.inf
+    loss_streak = 0
+
+    for k in range(n_signals):
+        # 최소 주문 금액의 2배 이상 있어야 거래 가능
+        if balance < min_notional * 2:
+            break
+
+        entry = entry_index[k]
+        price = entry_price[k]
+
+        # 포지션 크기 (거래당 리스크 / 가격 리스크, 최소 주문 금액 보장) 및 증거금
+        position_value = balance * risk_per_trade / price_risk[k]
+        if position_value < min_notional:
+            position_value = min_notional
+        margin = position_value / leverage[k]
+
+        reason = -1
+        exit_price = np.nan
+        for j in range(entry + 1, min(entry + time_stop_bars + 1, end)):
+            if is_long[k]:
+                if low[j] <= liquidation_price[k]:
+                    reason, exit_price = EXIT_LIQUIDATION, liquidation_price[k]
+                elif low[j] <= stop_price[k]:
+                    reason, exit_price = EXIT_STOP, stop_price[k]
+                elif high[j] >= target_price[k]:
+                    reason, exit_price = EXIT_TARGET, target_price[k]
+            else:
+                if high[j] >= liquidation_price[k]:
+                    reason, exit_price = EXIT_LIQUIDATION, liquidation_price[k]
+                elif high[j] >= stop_price[k]:
+                    reason, exit_price = EXIT_STOP, stop_price[k]
+                elif low[j] <= target_price[k]:
+                    reason, exit_price = EXIT_TARGET, target_price[k]
+            if reason >= 0:
+                exit_index[k] = j
+                break
+
+        # 시간 스톱 (평가 구간 끝에서 절단)
+        if reason < 0:
+            exit_index[k] = min(entry + time_stop_bars, end - 1)
+            reason, exit_price = EXIT_TIME, close[exit_index[k]]
+        exit_reason[k] = reason
+
+        if is_long[k]:
+            price_change_pct = (exit_price - price) / price
+        else:
+            price_change_pct = (price - exit_price) / price
+        pnl[k] = margin * (price_change_pct * effective_leverage[k])
+
+        balance += pnl[k]
+        if balance < MIN_ACCOUNT_BALANCE:
+            balance = MIN_ACCOUNT_BALANCE
+
+        equity += pnl[k]
+        if equity > peak:
+            peak = equity
+        if abort_drawdown > 0 and (peak - equity) / peak > abort_drawdown:
+            aborted = ABORT_DRAWDOWN
+            break
+
+        loss_streak = loss_streak + 1 if pnl[k] < 0 else 0
+        if abort_loss_streak > 0 and loss_streak >= abort_loss_streak:
+            aborted = ABORT_LOSS_STREAK
+            break
+
+    return pnl, exit_index, exit_reason, aborted
+
+
+class StrategyEvaluator(ABC):
+    """전략 평가기 인터페이스 - evaluate(params, start, end) → PerformanceMetrics"""
+
+    # 바 시작 시각 (epoch ms, n_bars 길이) - 시각 정보가 없는 평가기는 None
+    timestamps: Optional[np.ndarray] = None
+
+    def __init__(self, performance_evaluator: PerformanceEvaluator = None, initial_balance: float = 100000):
+        """평가기 초기화"""
+        self.performance_evaluator = performance_evaluator or PerformanceEvaluator()
+        self.initial_balance = initial_balance
+        self.stats = {"evaluations": 0, "aborted": 0, "seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        """프로세스 워커 전달용 상태 (잠금 제외)"""
+        state = self.__dict__.copy()
+        state.pop("_stats_lock", None)
+        return state
+
+    def __setstate__(self, state: Dict):
+        """워커에서 상태 복원 (잠금 재생성)"""
+        self.__dict__.update(state)
+        self._stats_lock = threading.Lock()
+
+    @property
+    @abstractmethod
+    def n_bars(self) -> int:
+        """평가 가능한 전체 바 수"""
+
+    @property
+    def nbytes(self) -> int:
+        """평가 데이터셋 메모리 (bytes, 워커 허용 계획용)"""
+        return 0
+
+    @abstractmethod
+    def run_trades(self, params: Dict, start: int = 0, end: int = None, abort: AbortRule = None) -> Dict:
+        """[start, end) 구간 진입 신호의 거래 결과 (컬럼형: entry_index, exit_index, exit_reason, is_long, pnl)
+
+        abort 지정시 기준 위반 거래에서 종료 - abort_reason에 사유 (중단 없으면 "")
+        """
+
+    def fingerprint(self) -> Optional[str]:
+        """평가 데이터/설정 지문 (같은 지문 + 같은 파라미터 → 같은 결과, 식별 불가시 None)"""
+        return None
+
+    def _resolve_range(self, start: int, end: Optional[int]) -> Tuple[int, int]:
+        """구간 정규화 (end 미지정시 데이터 끝)"""
+        end = self.n_bars if end is None else min(int(end), self.n_bars)
+        return max(0, int(start)), end
+
+    def metrics_from_trades(self, pnl: np.ndarray) -> PerformanceMetrics:
+        """거래 손익 배열 → 성과 지표 (구간별 거래를 이어 붙인 결과 평가용)"""
+        return self.performance_evaluator.calculate_metrics(pd.DataFrame({"pnl": pnl}), self.initial_balance)
+
+    def evaluate(self, params: Dict, start: int = 0, end: int = None, abort: AbortRule = None) -> PerformanceMetrics:
+        """[start, end) 구간 백테스트 → 성과 지표 (조기 중단시 중단 시점까지의 지표 + abort_reason)"""
+        started = time.perf_counter()
+        trades = self.run_trades(params, start, end, abort)
+        metrics = self.metrics_from_trades(trades["pnl"])
+        metrics.abort_reason = trades.get("abort_reason", "")
+
+        with self._stats_lock:
+            self.stats["evaluations"] += 1
+            self.stats["aborted"] += bool(metrics.abort_reason)
+            self.stats["seconds"] += time.perf_counter() - started
+        return metrics
+
+    def score(
+        self, params: Dict, start: int = 0, end: int = None, abort: AbortRule = None, apply_constraints: bool = True
+    ) -> Tuple[float, PerformanceMetrics]:
+        """[start, end) 구간 점수 + 성과 지표 (apply_constraints=False: 제약 게이트 없는 원점수)"""
+        metrics = self.evaluate(params, start, end, abort)
+        return self.performance_evaluator.calculate_score(metrics, apply_constraints), metrics
+
+    def evaluations_per_minute(self) -> float:
+        """평가 처리량 (회/분, 코어당)"""
+        if self.stats["seconds"] <= 0:
+            return 0.0
+        return self.stats["evaluations"] / self.stats["seconds"] * 60
+
+
+class ArrayStrategyEvaluator(StrategyEvaluator):
+    """배열 기반 세션 스윕 전략 평가기 (ETHSessionStrategy.generate_signals + backtest와 동일 규칙)"""
+
+    def __init__(
+        self,
+        arrays: Dict[str, np.ndarray],
+        base_params: Dict = None,
+        interval: str = "15m",
+        performance_evaluator: PerformanceEvaluator = None,
+        initial_balance: float = 100000,
+    ):
+        """평가기 초기화 (arrays: timestamp(epoch ms), open, high, low, close)"""
+        super().__init__(performance_evaluator, initial_balance)
+        self.base_params = {**DEFAULT_PARAMS, **(base_params or {})}
+        self.interval = interval
+
+        # 리스크 파라미터 (초기 잔고 기준 거래당 리스크 결정)
+        self.risk_params = RiskParameters(account_balance=initial_balance, min_notional_usdt=20.0)
+
+        self.timestamps = np.asarray(arrays["timestamp"], dtype=np.int64)
+        # 전략 작업 프레임과 동일하게 float32 저장값 → float64 계산
+        for col in ("open", "high", "low", "close"):
+            setattr(self, col, np.asarray(arrays[col], dtype=np.float32).astype(np.float64))
+
+        self._atr_cache: Dict[int, np.ndarray] = {}
+        self._funding_cache: Dict[int, np.ndarray] = {}
+        self._prepare()
+
+        print(f"⚡ 전략 평가기 준비 완료: {self.n_bars:,}개 바, 스윕 후보 {len(self._sweep_index):,}개")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **kwargs) -> "ArrayStrategyEvaluator":
+        """OHLCV DataFrame (time 컬럼 또는 DatetimeIndex) → 평가기"""
+        times = df["time"] if "time" in df.columns else df.index
+        arrays = {col: df[col].to_numpy() for col in ("open", "high", "low", "close")}
+        arrays["timestamp"] = to_epoch_ms(times)
+        return cls(arrays, **kwargs)
+
+    @classmethod
+    def from_engine(cls, data_engine, **kwargs) -> "ArrayStrategyEvaluator":
+        """FastDataEngine 지표 캐시 (memmap 번들 포함) → 평가기"""
+        return cls(data_engine.cached_indicators, **kwargs)
+
+    @property
+    def n_bars(self) -> int:
+        return len(self.close)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in (self.timestamps, self.open, self.high, self.low, self.close))
+
+    def fingerprint(self) -> str:
+        """가격 배열 + 기본 파라미터/봉 간격/초기 잔고 지문"""
+        digest = hashlib.blake2b(digest_size=8)
+        for values in (self.timestamps, self.open, self.high, self.low, self.close):
+            digest.update(np.ascontiguousarray(values).data)
+        settings = {"base_params": self.base_params, "interval": self.interval, "initial_balance": self.initial_balance}
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _prepare(self):
+        """파라미터 무관 배열 사전계산"""
+        p = self.base_params
+        open_, high, low, close = self.open, self.high, self.low, self.close
+
+        # True Range (ATR은 atr_len별 캐시)
+        prev_close = np.r_[np.nan, close[:-1]]
+        self._tr = pd.Series(np.maximum(high - low, np.maximum(abs(high - prev_close), abs(low - prev_close))))
+
+        calendar = calendar_features(self.timestamps)
+        day = calendar["day"]
+        self._minute_of_day = calendar["minute_of_day"]
+
+        # 변동성 퍼센타일 (일중 누적 TR, 날짜 변경시 초기화)
+        daily_tr = self._tr.groupby(day).cumsum(skipna=False)
+        self._rr_percentile = rr_percentile_by_day(day, daily_tr)
+
+        # 디스플레이스먼트 기준 (float32 바디/레인지의 10봉 평균)
+        open32, high32, low32, close32 = (values.astype(np.float32) for values in (open_, high, low, close))
+        body = pd.Series(np.abs(close32 - open32))
+        range_size = pd.Series(high32 - low32)
+        self._body = body.to_numpy()
+        self._range = range_size.to_numpy()
+        self._avg_body = body.rolling(10).mean().to_numpy()
+        self._avg_range = range_size.rolling(10).mean().to_numpy()
+
+        # 아시아 세션 고저점 → 각 바에 매핑 (아시아 봉이 없는 날은 NaN)
+        session = session_codes(calendar["hour"], p)
+        asia = session == SESSION_ASIA
+        asia_levels = pd.DataFrame({"day": day[asia], "high": high[asia], "low": low[asia]}).groupby("day")
+        asia_high = asia_levels["high"].max().reindex(day).to_numpy()
+        asia_low = asia_levels["low"].min().reindex(day).to_numpy()
+
+        # 스윕 후보 (런던/NY 세션에서 아시아 레벨 돌파 후 복귀) + 꼬리 비율
+        trading = np.isin(session, TRADING_SESSIONS)
+        total_range = high - low
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bull = trading & (high > asia_high) & (close < asia_high) & (total_range > 0)
+            bear = trading & (low < asia_low) & (close > asia_low) & (total_range > 0)
+            bull_wick = (high - np.maximum(open_, close)) / total_range
+            bear_wick = (np.minimum(open_, close) - low) / total_range
+
+        # 바 순서, 같은 바에서는 상승 스윕 먼저 (detect_sweeps 순서)
+        bull_idx, bear_idx = np.flatnonzero(bull), np.flatnonzero(bear)
+        sweep_index = np.concatenate([bull_idx, bear_idx])
+        is_long = np.concatenate([np.ones(len(bull_idx), dtype=bool), np.zeros(len(bear_idx), dtype=bool)])
+        order = np.lexsort((~is_long, sweep_index))
+        self._sweep_index = sweep_index[order]
+        self._sweep_long = is_long[order]
+        self._sweep_level = np.concatenate([asia_high[bull_idx], asia_low[bear_idx]])[order]
+        self._sweep_wick = np.concatenate([bull_wick[bull_idx], bear_wick[bear_idx]])[order]
+
+    def _atr(self, atr_len: int) -> np.ndarray:
+        """ATR (atr_len별 캐시)"""
+        if atr_len not in self._atr_cache:
+            self._atr_cache[atr_len] = self._tr.rolling(atr_len).mean().to_numpy()
+        return self._atr_cache[atr_len]
+
+    def _funding_window(self, avoid_bars: int) -> np.ndarray:
+        """펀딩 회피 마스크 (avoid_bars별 캐시)"""
+        if avoid_bars not in self._funding_cache:
+            self._funding_cache[avoid_bars] = funding_window_mask(
+                self._minute_of_day, self.base_params["funding_hours"], avoid_bars, INTERVAL_MS[self.interval]
+            )
+        return self._funding_cache[avoid_bars]
+
+    def _resolve_params(self, params: Dict) -> Dict:
+        """기본 파라미터 병합 + 정수 파라미터 반올림"""
+        p = {**self.base_params, **params}
+        for name in INT_PARAMS:
+            p[name] = int(round(p[name]))
+        return p
+
+    def generate_signals(self, params: Dict, start: int = 0, end: int = None) -> Dict[str, np.ndarray]:
+        """[start, end) 구간 진입 신호 (컬럼형, 스윕 순서)"""
+        p = self._resolve_params(params)
+        start, end = self._resolve_range(start, end)
+
+        # 구간 내 스윕 (꼬리 비율 필터)
+        lo, hi = np.searchsorted(self._sweep_index, [start, end])
+        selected = np.flatnonzero(self._sweep_wick[lo:hi] >= p["sweep_wick_mult"]) + lo
+        sweep_index = self._sweep_index[selected]
+        is_long = self._sweep_long[selected]
+        sweep_level = self._sweep_level[selected]
+
+        # 진입 가능 봉 (구간 내): 레짐 필터 + 펀딩 회피 + 디스플레이스먼트
+        window = slice(start, end)
+        displacement = (self._body[window] >= p["disp_mult"] * self._avg_body[window]) | (
+            self._range[window] >= p["disp_mult"] * self._avg_range[window]
+        )
+        eligible = (
+            ~(self._rr_percentile[window] < p["rr_percentile"])
+            & ~self._funding_window(p["funding_avoid_bars"])[window]
+            & displacement
+        )
+        close, open_ = self.close[window], self.open[window]
+        long_entry = eligible & (close > open_)
+        short_entry = eligible & (close < open_)
+
+        # 스윕 후 1~SIGNAL_LOOKAHEAD_BARS 바 중 첫 진입 가능 봉
+        entry_index = np.full(len(sweep_index), -1, dtype=np.int64)
+        for offset in range(SIGNAL_LOOKAHEAD_BARS, 0, -1):
+            j = sweep_index + offset
+            in_range = j < end
+            j_local = np.minimum(j, end - 1) - start
+            hit = in_range & np.where(is_long, long_entry[j_local], short_entry[j_local])
+            entry_index = np.where(hit, j, entry_index)
+
+        # ATR 워밍업 구간 신호 제외 (스톱 미정)
+        atr = self._atr(p["atr_len"])
+        found = entry_index >= 0
+        found[found] = ~np.isnan(atr[entry_index[found]])
+
+        j = entry_index[found]
+        is_long = is_long[found]
+        entry_price = self.close[j]
+        stop_offset = p["stop_atr_mult"] * atr[j]
+        stop_price = np.where(is_long, sweep_level[found] - stop_offset, sweep_level[found] + stop_offset)
+        risk = np.where(is_long, entry_price - stop_price, stop_price - entry_price)
+        target_price = np.where(is_long, entry_price + p["target_r"] * risk, entry_price - p["target_r"] * risk)
+
+        return {
+            "index": j,
+            "is_long": is_long,
+            "entry_price": entry_price,
+            "stop_price": stop_price,
+            "target_price": target_price,
+            "atr": atr[j],
+        }
+
+    def _position_terms(self, signals: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """잔고 무관 포지션 항목 (AdvancedRiskManager.calculate_optimal_position + validate_position)"""
+        rp = self.risk_params
+        entry, stop, atr, is_long = signals["entry_price"], signals["stop_price"], signals["atr"], signals["is_long"]
+
+        price_risk = np.abs(entry - stop) / entry
+
+        # 변동성 승수 + 청산 거리 (1.645σ 일일 변동성, 최대 15%)
+        atr_pct = atr / entry
+        volatility_multiplier = np.select([atr_pct > 0.03, atr_pct > 0.02, atr_pct > 0.01], [0.7, 0.85, 1.0], default=1.2)
+        liquidation_distance = np.minimum(1.645 * (atr * np.sqrt(96) / entry), 0.15)
+
+        # 최적 레버리지 (파이썬 round와 동일한 반올림)
+        raw_leverage = np.maximum(np.minimum(0.8 / liquidation_distance * volatility_multiplier, rp.max_leverage), 2.0)
+        leverage = np.array([round(value, 1) for value in raw_leverage.tolist()], dtype=np.float64)
+
+        mmr = rp.maintenance_margin_rate
+        liquidation_price = np.where(is_long, entry * (1 - (1 / leverage) + mmr), entry * (1 + (1 / leverage) - mmr))
+
+        # 스톱이 청산가 너머면 안전 레버리지로 조정 (증거금은 원래 레버리지 기준 유지)
+        unsafe = np.where(is_long, stop <= liquidation_price, stop >= liquidation_price)
+        safe_leverage = np.minimum(np.maximum(0.8 / price_risk, 2.0), rp.max_leverage)
+        effective_leverage = np.where(unsafe, safe_leverage, leverage)
+        liquidation_price = np.where(
+            is_long,
+            entry * (1 - (1 / effective_leverage) + mmr),
+            entry * (1 + (1 / effective_leverage) - mmr),
+        )
+
+        return {
+            "price_risk": price_risk,
+            "leverage": leverage,
+            "effective_leverage": effective_leverage,
+            "liquidation_price": liquidation_price,
+        }
+
+    def run_trades(self, params: Dict, start: int = 0, end: int = None, abort: AbortRule = None) -> Dict:
+        """[start, end) 구간 거래 결과 (청산은 end-1 바까지, abort 위반 거래에서 종료)"""
+        p = self._resolve_params(params)
+        start, end = self._resolve_range(start, end)
+        signals = self.generate_signals(p, start, end)
+        terms = self._position_terms(signals)
+        abort = abort or AbortRule()
+
+        pnl, exit_index, exit_reason, aborted = _simulate_trades(
+            signals["index"],
+            signals["is_long"],
+            signals["entry_price"],
+            signals["stop_price"],
+            signals["target_price"],
+            terms["price_risk"],
+            terms["leverage"],
+            terms["effective_leverage"],
+            terms["liquidation_price"],
+            self.high,
+            self.low,
+            self.close,
+            end,
+            p["time_stop_bars"],
+            float(self.initial_balance),
+            self.risk_params.max_account_risk_per_trade,
+            self.risk_params.min_notional_usdt,
+            float(abort.max_drawdown),
+            int(abort.max_loss_streak),
+        )
+
+        # 잔고 부족 / 조기 중단 이후 신호 제외
+        traded = exit_reason >= 0
+        return {
+            "entry_index": signals["index"][traded],
+            "exit_index": exit_index[traded],
+            "exit_reason": exit_reason[traded],
+            "is_long": signals["is_long"][traded],
+            "pnl": pnl[traded],
+            "abort_reason": ABORT_REASONS[aborted],
+        }
+
+
+def default_evaluator(data_engine, performance_evaluator: PerformanceEvaluator = None) -> Optional[StrategyEvaluator]:
+    """데이터 엔진에 지표 캐시가 있으면 배열 평가기 생성 (없으면 None)"""
+    indicators = getattr(data_engine, "cached_indicators", None) or {}
+    if "timestamp" not in indicators:
+        return None
+    return ArrayStrategyEvaluator.from_engine(data_engine, performance_evaluator=performance_evaluator)
@@ -5,6 +5,9 @@
 - Railway 리소스 70% 제한
 - 다중해상도 베이지안 최적화
 - 과최적화 방지 검증
+- 교차 주간 웜스타트 (이전 주 스터디 상위 시도로 샘플러 초기화 + 탐색 범위 축소)
+- 단계 사이 파라미터 중요도 분석 (미미한 파라미터 고정 + 나머지 경계 축소)
+- 거래 단위 조기 중단 (백테스트 도중 최대 드로우다운 초과 등 제약 위반 확정시 가지치기)
 """
 
 import json
@@ -40,7 +43,12 @@ except ImportError:
     sys.exit(1)
 
 # 전략 모듈
+from cancellation import CancellationToken
 from eth_session_strategy import ETHSessionStrategy
+from memory_admission import get_admission_controller
+from parameter_importance import reduce_search_space, suggest_param
+from performance_evaluator import AbortRule
+from study_archive import DEFAULT_STORAGE, StudyArchive, best_completed_trial, dataset_fingerprint, stage_best
 
 
 class AutoOptimizer:
@@ -49,6 +57,26 @@ class AutoOptimizer:
         self.setup_resource_limits()
         self.setup_optimization_config()
 
+        # 협력적 취소 (실행 전체 토큰 → 단계별 시간 예산 토큰)
+        self.token = CancellationToken()
+        self.stage_token = self.token
+
+        # 교차 주간 웜스타트 (스터디 보관소, 실행 ID / 데이터 지문은 실행마다 갱신)
+        warm_start = self.config["warm_start"]
+        self.study_archive = (
+            StudyArchive(warm_start["storage"], warm_start["top_k"], warm_start["bound_margin"])
+            if warm_start["enabled"]
+            else None
+        )
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.dataset_fingerprint = None
+        self.active_param_space = None  # 단계별 탐색 범위 (웜스타트 축소 반영)
+        self.warm_starts = {}  # 단계 키 → 웜스타트 계획
+
+        # 단계 사이 탐색 공간 축소 (실행마다 전체 공간에서 시작)
+        self.search_space = self.get_param_space()
+        self.frozen_params = {}
+
         print("🚀 자동 최적화 시스템 초기화")
         print(f"   CPU 코어: {self.max_workers}개 (제한: 70%)")
         print(f"   메모리: {self.max_memory_gb:.1f}GB (제한: 70%)")
@@ -60,9 +88,13 @@ class AutoOptimizer:
         total_cpus = psutil.cpu_count()
         self.max_workers = max(1, int(total_cpus * 0.7))
 
-        # 메모리 제한 (70%)
-        total_memory = psutil.virtual_memory().total
-        self.max_memory = int(total_memory * 0.7)
+        # 슈퍼바이저 코어 예산 (트레이딩 예약 코어 제외)
+        core_budget = int(os.getenv("OPTIMIZER_CORE_BUDGET", 0))
+        if core_budget > 0:
+            self.max_workers = min(self.max_workers, core_budget)
+
+        # 메모리 제한 (허용 제어 예산 - 컨테이너 한도 인식)
+        self.max_memory = get_admission_controller().budget_bytes
         self.max_memory_gb = self.max_memory / (1024**3)
 
         # 배치 크기 계산 (메모리 기반)
@@ -71,7 +103,7 @@ class AutoOptimizer:
 
         print(f"🛡️ 리소스 제한 설정:")
         print(f"   CPU: {self.max_workers}/{total_cpus} 코어")
-        print(f"   메모리: {self.max_memory_gb:.1f}/{total_memory/(1024**3):.1f}GB")
+        print(f"   메모리 예산: {self.max_memory_gb:.1f}GB")
         print(f"   배치 크기: {self.max_batch_size}")
 
     def setup_optimization_config(self):
@@ -125,6 +157,28 @@ class AutoOptimizer:
                 "stage2": {"samples": 300, "data_points": 150000, "time_limit": 60, "wf_enabled": False},
                 "stage3": {"samples": 100, "data_points": 206319, "time_limit": 90, "wf_enabled": True},
             },
+            # 교차 주간 웜스타트 (이전 실행 같은 단계 스터디 기준)
+            "warm_start": {
+                "enabled": True,
+                "storage": os.getenv("OPTIMIZER_STUDY_STORAGE", DEFAULT_STORAGE),
+                "top_k": 10,  # 샘플러 초기화에 사용할 이전 상위 시도 수
+                "bound_margin": 0.15,  # 상위 시도 범위 양쪽 여유 (원래 범위 대비)
+                "sample_ratio": 0.5,  # 웜스타트시 단계 시도 수 비율
+            },
+            # 단계 사이 파라미터 중요도 기반 탐색 공간 축소
+            "space_reduction": {
+                "enabled": True,
+                "method": "fanova",  # fanova | permutation
+                "freeze_threshold": 0.02,  # 정규화 중요도 미만 파라미터 고정
+                "top_fraction": 0.2,  # 경계 축소 기준 상위 시도 비율
+                "bound_margin": 0.1,  # 상위 시도 범위 양쪽 여유 (원래 범위 대비)
+                "min_trials": 20,  # 분석 최소 완료 시도 수
+            },
+            # 거래 단위 조기 중단 (드로우다운 기준은 constraints.max_drawdown)
+            "early_termination": {
+                "enabled": True,
+                "max_loss_streak": 0,  # 연속 손실 거래 수 기준 (0 = 비활성)
+            },
         }
 
     def get_param_space(self):
@@ -248,6 +302,10 @@ class AutoOptimizer:
         # 워크포워드 윈도우들
         start_idx = 0
         while start_idx + window_size < total_length:
+            # 단계 예산 소진/취소시 완료된 윈도우로 평가
+            if self.stage_token.stopped:
+                break
+
             end_idx = start_idx + window_size
             oos_start = end_idx
             oos_end = min(oos_start + step_size, total_length)
@@ -464,18 +522,25 @@ class AutoOptimizer:
 
         return base_targets
 
+    def abort_rule(self):
+        """현재 제약 조건 기준 조기 중단 기준 (시장 조건 조정 반영, 비활성이면 None)"""
+        config = self.config["early_termination"]
+        if not config["enabled"]:
+            return None
+        return AbortRule(max_drawdown=self.config["constraints"]["max_drawdown"], max_loss_streak=config["max_loss_streak"])
+
+    @staticmethod
+    def count_aborted_trials(study):
+        """조기 중단으로 가지치기된 시도 수"""
+        return sum(1 for trial in study.trials if "abort_reason" in trial.user_attrs)
+
     def objective_function(self, trial, data_points=None, enable_walk_forward=False):
         """Optuna 목적 함수 (워크포워드 테스트 포함)"""
         try:
-            # 파라미터 샘플링
-            param_space = self.get_param_space()
-            params = {}
-
-            for param_name, param_config in param_space.items():
-                if param_config["type"] == "int":
-                    params[param_name] = trial.suggest_int(param_name, param_config["low"], param_config["high"])
-                elif param_config["type"] == "float":
-                    params[param_name] = trial.suggest_float(param_name, param_config["low"], param_config["high"])
+            # 파라미터 샘플링 (단계 축소/웜스타트 범위, 고정 파라미터는 최고 시도 값)
+            param_space = self.active_param_space or self.search_space
+            params = {name: suggest_param(trial, name, config) for name, config in param_space.items()}
+            params.update(self.frozen_params)
 
             # 전략 실행
             strategy = ETHSessionStrategy()
@@ -498,7 +563,13 @@ class AutoOptimizer:
             else:
                 # 일반 백테스트
                 strategy.generate_signals()
-                trades = strategy.backtest()
+                rule = self.abort_rule()
+                trades = strategy.backtest(abort=rule.predicate(strategy.initial_balance) if rule else None)
+
+                if strategy.abort_reason:
+                    # 제약 위반 확정 - 남은 신호 생략, 가지치기
+                    trial.set_user_attr("abort_reason", strategy.abort_reason)
+                    raise optuna.TrialPruned()
 
                 if not trades:
                     return -1000
@@ -516,22 +587,72 @@ class AutoOptimizer:
 
             return score
 
+        except optuna.TrialPruned:
+            raise
         except Exception as e:
             print(f"❌ 최적화 오류: {e}")
             return -1000
 
-    def run_optimization_stage(self, stage_name, stage_config):
-        """최적화 단계 실행"""
+    def compute_dataset_fingerprint(self):
+        """최적화 대상 데이터 지문 (로드 실패시 None - 웜스타트는 재평가 모드)"""
+        try:
+            strategy = ETHSessionStrategy()
+            strategy.load_data()
+            return dataset_fingerprint(strategy.df)
+        except Exception as e:
+            print(f"⚠️ 데이터 지문 계산 실패: {e}")
+            return None
+
+    def plan_warm_start(self, stage_key):
+        """이전 실행 같은 단계 스터디 기반 웜스타트 계획 (없거나 보관소 오류시 None)"""
+        if self.study_archive is None:
+            return None
+        try:
+            return self.study_archive.plan(stage_key, self.run_id, self.dataset_fingerprint, self.search_space)
+        except Exception as e:
+            print(f"⚠️ 웜스타트 계획 실패: {e}")
+            return None
+
+    def run_optimization_stage(self, stage_name, stage_config, stage_key=None):
+        """최적화 단계 실행 (stage_key 지정시 스터디 보관 + 이전 주 웜스타트)"""
+        warm_start = self.plan_warm_start(stage_key) if stage_key else None
+        n_trials = stage_config["samples"]
+        self.active_param_space = None
+        if warm_start is not None:
+            n_trials = max(len(warm_start.trials), int(n_trials * self.config["warm_start"]["sample_ratio"]))
+            self.active_param_space = warm_start.param_space
+
         print(f"\n🔍 {stage_name} 시작...")
-        print(f"   샘플 수: {stage_config['samples']}")
+        print(f"   샘플 수: {n_trials}")
         print(f"   데이터 포인트: {stage_config['data_points']:,}")
         print(f"   제한 시간: {stage_config['time_limit']}분")
+        if warm_start is not None:
+            print(
+                f"   ♻️ 웜스타트: {warm_start.source} 상위 {len(warm_start.trials)}개 "
+                f"({'점수 재사용' if warm_start.reuse_scores else '새 데이터로 재평가'}), "
+                f"범위 축소 {len(warm_start.shrunk_params)}/{len(warm_start.param_space)}개, "
+                f"이전 최고 {warm_start.prior_best:.4f}"
+            )
 
-        # Optuna 스터디 생성
+        # Optuna 스터디 생성 (보관소 사용시 데이터 지문과 함께 저장)
         sampler = TPESampler(n_startup_trials=20, n_ei_candidates=24)
         pruner = SuccessiveHalvingPruner(min_resource=1, reduction_factor=4)
 
-        study = optuna.create_study(direction="maximize", sampler=sampler, pruner=pruner)
+        if self.study_archive is not None and stage_key:
+            study = self.study_archive.create_study(
+                stage_key,
+                self.run_id,
+                self.dataset_fingerprint,
+                self.search_space,
+                frozen_params=self.frozen_params,
+                sampler=sampler,
+                pruner=pruner,
+            )
+            if warm_start is not None:
+                self.study_archive.seed(study, warm_start)
+        else:
+            study = optuna.create_study(direction="maximize", sampler=sampler, pruner=pruner)
+        self.warm_starts[stage_key] = warm_start
 
         # 목적 함수 래퍼
         def objective_wrapper(trial):
@@ -542,26 +663,74 @@ class AutoOptimizer:
         # 최적화 실행
         start_time = time.time()
         timeout = stage_config["time_limit"] * 60  # 분을 초로 변환
+        self.stage_token = self.token.child(timeout)
 
         try:
             study.optimize(
                 objective_wrapper,
-                n_trials=stage_config["samples"],
-                timeout=timeout,
+                n_trials=n_trials,
+                timeout=self.stage_token.clamp_timeout(timeout),
                 n_jobs=1,  # Railway 환경에서는 단일 프로세스
+                callbacks=[self.stage_token.optuna_callback()],
                 show_progress_bar=True,
             )
         except KeyboardInterrupt:
             print("⚠️ 사용자에 의해 중단됨")
+        finally:
+            self.active_param_space = None
 
         elapsed_time = time.time() - start_time
 
+        best = best_completed_trial(study)
         print(f"✅ {stage_name} 완료 ({elapsed_time/60:.1f}분)")
-        print(f"   최고 점수: {study.best_value:.4f}")
+        if best is not None:
+            print(f"   최고 점수: {best.value:.4f}")
+        else:
+            print(f"   ⚠️ 완료된 시도 없음 (조기 중단 {self.count_aborted_trials(study)}개)")
         print(f"   완료된 시도: {len(study.trials)}")
+        if warm_start is not None and best is not None:
+            print(f"   이전 주 대비: {best.value - warm_start.prior_best:+.4f} (시도 {n_trials}/{stage_config['samples']}회)")
 
         return study
 
+    def full_params(self, params):
+        """단계 최적 파라미터 + 고정 파라미터"""
+        return {**self.frozen_params, **params}
+
+    def reduce_param_space(self, study, stage_name):
+        """단계 완료 시도 중요도 분석 → 미미한 파라미터 고정 + 나머지 경계 축소 (결과 요약 반환)"""
+        reduction_config = self.config["space_reduction"]
+        if not reduction_config["enabled"]:
+            return None
+
+        try:
+            reduction = reduce_search_space(
+                study.get_trials(deepcopy=False),
+                self.search_space,
+                method=reduction_config["method"],
+                freeze_threshold=reduction_config["freeze_threshold"],
+                top_fraction=reduction_config["top_fraction"],
+                bound_margin=reduction_config["bound_margin"],
+                min_trials=reduction_config["min_trials"],
+                failure_score=-1000,
+            )
+        except Exception as e:
+            print(f"⚠️ 파라미터 중요도 분석 실패: {e}")
+            return None
+
+        if reduction is None:
+            print(f"   ⚠️ {stage_name} 이후 탐색 공간 유지 (유효 시도 부족 또는 점수 변화 없음)")
+            return None
+
+        self.search_space = reduction.param_space
+        self.frozen_params.update(reduction.frozen)
+
+        top = sorted(reduction.importances.items(), key=lambda item: item[1], reverse=True)[:3]
+        print(f"🧮 {stage_name} 이후 파라미터 중요도 ({reduction.method}, {reduction.n_trials}개 시도)")
+        print(f"   주요 파라미터: {', '.join(f'{name} {value:.1%}' for name, value in top)}")
+        print(f"   고정: {len(reduction.frozen)}개 {sorted(reduction.frozen)}, 탐색 유지: {len(self.search_space)}개")
+        return reduction.summary()
+
     def analyze_market_conditions(self):
         """시장 조건 분석 및 기준 동적 조정"""
         print("📊 시장 조건 분석 중...")
@@ -651,6 +820,15 @@ class AutoOptimizer:
 
         start_time = datetime.now()
         results = {}
+        self.token = CancellationToken()
+
+        # 웜스타트 기준 (실행 ID + 데이터 지문)
+        self.run_id = start_time.strftime("%Y%m%d_%H%M%S")
+        self.warm_starts = {}
+        self.search_space = self.get_param_space()
+        self.frozen_params = {}
+        if self.study_archive is not None:
+            self.dataset_fingerprint = self.compute_dataset_fingerprint()
 
         try:
             # 0단계: 시장 조건 분석
@@ -663,33 +841,59 @@ class AutoOptimizer:
             }
 
             # 1단계: 러프 스크리닝
-            stage1_study = self.run_optimization_stage("1단계: 러프 스크리닝", self.config["stages"]["stage1"])
+            stage1_study = self.run_optimization_stage("1단계: 러프 스크리닝", self.config["stages"]["stage1"], "stage1")
+            stage1_params, stage1_score, _ = stage_best(stage1_study, "1단계")
             results["stage1"] = {
-                "best_params": stage1_study.best_params,
-                "best_score": stage1_study.best_value,
+                "best_params": self.full_params(stage1_params),
+                "best_score": stage1_score,
                 "n_trials": len(stage1_study.trials),
+                "aborted_trials": self.count_aborted_trials(stage1_study),
+                "warm_start": self.warm_start_summary("stage1"),
             }
+            results["stage1"]["space_reduction"] = self.reduce_param_space(stage1_study, "1단계")
+            if self.token.stopped:
+                print(f"⏹️ 최적화 중단 ({self.token.reason}) - 결과 저장 생략")
+                return None
 
             # 2단계: 베이지안 최적화
-            stage2_study = self.run_optimization_stage("2단계: 베이지안 최적화", self.config["stages"]["stage2"])
+            stage2_study = self.run_optimization_stage("2단계: 베이지안 최적화", self.config["stages"]["stage2"], "stage2")
+            stage2_params, stage2_score, stage2_fallback = stage_best(
+                stage2_study, "2단계", (results["stage1"]["best_params"], stage1_score)
+            )
             results["stage2"] = {
-                "best_params": stage2_study.best_params,
-                "best_score": stage2_study.best_value,
+                "best_params": self.full_params(stage2_params),
+                "best_score": stage2_score,
+                "fallback_to_previous": stage2_fallback,
                 "n_trials": len(stage2_study.trials),
+                "aborted_trials": self.count_aborted_trials(stage2_study),
+                "warm_start": self.warm_start_summary("stage2"),
             }
+            results["stage2"]["space_reduction"] = self.reduce_param_space(stage2_study, "2단계")
+            if self.token.stopped:
+                print(f"⏹️ 최적화 중단 ({self.token.reason}) - 결과 저장 생략")
+                return None
 
             # 3단계: 워크포워드 검증
             print(f"\n🔍 3단계: 워크포워드 검증 시작...")
-            stage3_study = self.run_optimization_stage("3단계: 워크포워드 검증", self.config["stages"]["stage3"])
+            stage3_study = self.run_optimization_stage("3단계: 워크포워드 검증", self.config["stages"]["stage3"], "stage3")
+            stage3_params, stage3_score, stage3_fallback = stage_best(
+                stage3_study, "3단계", (results["stage2"]["best_params"], stage2_score)
+            )
             results["stage3"] = {
-                "best_params": stage3_study.best_params,
-                "best_score": stage3_study.best_value,
+                "best_params": self.full_params(stage3_params),
+                "best_score": stage3_score,
+                "fallback_to_previous": stage3_fallback,
                 "n_trials": len(stage3_study.trials),
-                "walk_forward_validated": True,
+                "warm_start": self.warm_start_summary("stage3"),
+                "walk_forward_validated": not stage3_fallback,
             }
+            if self.token.stopped:
+                print(f"⏹️ 최적화 중단 ({self.token.reason}) - 결과 저장 생략")
+                return None
 
-            # 최종 검증
-            final_params = stage3_study.best_params
+            # 최종 검증 (고정 파라미터 포함)
+            results["frozen_params"] = dict(self.frozen_params)
+            final_params = results["stage3"]["best_params"]
             final_validation = self.final_validation(final_params)
             results["final_validation"] = final_validation
 
@@ -699,8 +903,8 @@ class AutoOptimizer:
 
             print("\n🎉 워크포워드 최적화 완료!")
             print(f"   총 소요시간: {(datetime.now() - start_time).total_seconds()/60:.1f}분")
-            print(f"   최종 점수: {stage3_study.best_value:.4f}")
-            print(f"   워크포워드 검증: ✅")
+            print(f"   최종 점수: {stage3_score:.4f}")
+            print(f"   워크포워드 검증: {'⚠️ 완료 시도 없음 (2단계 파라미터)' if stage3_fallback else '✅'}")
 
             return final_params
 
@@ -711,6 +915,24 @@ class AutoOptimizer:
             traceback.print_exc()
             return None
 
+    def warm_start_summary(self, stage_key):
+        """단계 결과 기록용 웜스타트 요약"""
+        warm_start = self.warm_starts.get(stage_key)
+        if warm_start is None:
+            return None
+        return {
+            "source": warm_start.source,
+            "seeded_trials": len(warm_start.trials),
+            "reused_scores": warm_start.reuse_scores,
+            "prior_best": warm_start.prior_best,
+            "shrunk_params": warm_start.shrunk_params,
+        }
+
+    def cancel(self):
+        """실행 중인 최적화 취소 (현재 시도 종료 후 중단)"""
+        self.token.cancel()
+        print("⏹️ 최적화 취소 요청")
+
     def final_validation(self, params):
         """최종 파라미터 검증"""
         print("🔍 최종 검증 실행 중...")
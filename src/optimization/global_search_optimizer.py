@@ -5,6 +5,8 @@
 - 다중충실도 10k→30k→50k 데이터 처리
 - ASHA 조기중단 (η=3, 70%→60% 컷)
 - 스크리닝 필터 (PF≥1.4 ∧ MinTrades≥80)
+- 선택적 서로게이트 사전 스크리닝 (시도 히스토리 학습 → 대규모 풀 중 상위 비율만 실제 백테스트)
+- 백테스트 도중 제약 위반이 확정되면 조기 중단 → 실패 점수
 """
 
 import time
@@ -20,15 +22,31 @@ from scipy.stats import qmc
 
 warnings.filterwarnings("ignore")
 
+from cancellation import CancellationToken
 from fast_data_engine import FastDataEngine
-from performance_evaluator import PerformanceEvaluator, PerformanceMetrics
+from performance_evaluator import AbortRule, PerformanceEvaluator, PerformanceMetrics
+from performance_optimizer import ResultManager
+from strategy_evaluator import StrategyEvaluator, default_evaluator
+from surrogate_screener import SurrogateScreener
 
 
 class GlobalSearchOptimizer:
-    def __init__(self, data_engine: FastDataEngine, performance_evaluator: PerformanceEvaluator):
-        """전역 탐색 최적화자 초기화"""
+    # 로그 스케일로 샘플링하는 파라미터
+    LOG_SCALE_PARAMS = ("rr_percentile", "stop_atr_mult")
+
+    def __init__(
+        self,
+        data_engine: FastDataEngine,
+        performance_evaluator: PerformanceEvaluator,
+        evaluator: StrategyEvaluator = None,
+        trial_store: ResultManager = None,
+    ):
+        """전역 탐색 최적화자 초기화 (evaluator 미지정시 데이터 엔진 지표 캐시로 생성, 없으면 시뮬레이션,
+        trial_store 지정시 시도 결과를 히스토리로 저장하고 서로게이트 학습에 사용)"""
         self.data_engine = data_engine
         self.performance_evaluator = performance_evaluator
+        self.evaluator = evaluator or default_evaluator(data_engine, performance_evaluator)
+        self.trial_store = trial_store
 
         # 다중충실도 설정
         self.fidelity_levels = {
@@ -47,10 +65,27 @@ class GlobalSearchOptimizer:
         # 스크리닝 필터 (완화된 기준)
         self.screening_filter = {"min_profit_factor": 1.2, "min_trades": 30}
 
+        # 서로게이트 사전 스크리닝 (기본 비활성)
+        self.surrogate_config = {
+            "enabled": False,
+            "model": "random_forest",  # random_forest | gp
+            "pool_size": 2048,  # Sobol/LHS 후보 풀 크기
+            "top_fraction": 0.05,  # 실제 백테스트 비율 (2048 × 5% ≈ 102회)
+            "batch_size": 8,  # 서로게이트 재학습 간격 (실제 평가 수)
+            "initial_samples": 16,  # 히스토리 부족시 풀 순서대로 평가할 공간 채움 표본 수
+            "kappa": 0.5,  # UCB 탐색 가중치
+            "history_limit": 5000,  # 학습에 사용할 최근 히스토리 수
+        }
+        self.surrogate_stats: Dict = {}
+
+        # 거래 단위 조기 중단 (최대 드로우다운 초과 / 연속 손실)
+        self.abort_rule = AbortRule.from_constraints(performance_evaluator.constraints)
+
         print("🔍 전역 탐색 최적화자 초기화")
         print(f"   샘플링: Sobol/LHS 120점")
         print(f"   다중충실도: {list(self.fidelity_levels.values())}")
         print(f"   ASHA η={self.asha_config['eta']}")
+        print(f"   평가: {'실제 백테스트' if self.evaluator else '시뮬레이션'}")
 
     def define_parameter_space(self) -> Dict[str, Dict]:
         """파라미터 공간 정의"""
@@ -69,39 +104,28 @@ class GlobalSearchOptimizer:
             "trend_filter_len": {"type": "int", "low": 10, "high": 40},
         }
 
-    def generate_sobol_samples(self, n_samples: int = 120) -> List[Dict]:
-        """Sobol 시퀀스를 사용한 샘플 생성"""
+    def _unit_to_params(self, unit_samples: np.ndarray) -> List[Dict]:
+        """[0, 1] 단위 표본 → 파라미터 (정수는 내림 후 범위 제한, 로그 스케일 파라미터는 로그 공간 보간)"""
         param_space = self.define_parameter_space()
         param_names = list(param_space.keys())
-        n_params = len(param_names)
-
-        # Sobol 시퀀스 생성
-        sobol = qmc.Sobol(d=n_params, scramble=True)
-        sobol_samples = sobol.random(n_samples)
 
-        # 파라미터 공간으로 변환
         samples = []
-        for sample in sobol_samples:
+        for sample in unit_samples:
             params = {}
             for i, param_name in enumerate(param_names):
                 param_config = param_space[param_name]
+                low, high = param_config["low"], param_config["high"]
 
                 if param_config["type"] == "int":
                     # 정수 파라미터
-                    low, high = param_config["low"], param_config["high"]
                     value = int(low + sample[i] * (high - low))
                     params[param_name] = min(max(value, low), high)
 
                 elif param_config["type"] == "float":
-                    # 실수 파라미터
-                    low, high = param_config["low"], param_config["high"]
-
-                    # 로그 스케일 파라미터 확인
-                    if param_name in ["rr_percentile", "stop_atr_mult"]:
+                    if param_name in self.LOG_SCALE_PARAMS:
                         # 로그 스케일 적용
                         log_low, log_high = np.log(low), np.log(high)
-                        log_value = log_low + sample[i] * (log_high - log_low)
-                        value = np.exp(log_value)
+                        value = np.exp(log_low + sample[i] * (log_high - log_low))
                     else:
                         # 선형 스케일
                         value = low + sample[i] * (high - low)
@@ -109,58 +133,60 @@ class GlobalSearchOptimizer:
                     params[param_name] = float(value)
 
             samples.append(params)
-
-        print(f"✅ Sobol 샘플 {len(samples)}개 생성 완료")
         return samples
 
-    def generate_lhs_samples(self, n_samples: int = 120) -> List[Dict]:
-        """Latin Hypercube Sampling을 사용한 샘플 생성"""
+    def _params_to_unit(self, params_list: List[Dict]) -> np.ndarray:
+        """파라미터 → [0, 1] 단위 표본 (서로게이트 입력, _unit_to_params의 역변환)"""
         param_space = self.define_parameter_space()
-        param_names = list(param_space.keys())
-        n_params = len(param_names)
-
-        # LHS 샘플 생성
-        lhs = qmc.LatinHypercube(d=n_params)
-        lhs_samples = lhs.random(n_samples)
+        unit = np.empty((len(params_list), len(param_space)))
 
-        # 파라미터 공간으로 변환 (Sobol과 동일한 로직)
-        samples = []
-        for sample in lhs_samples:
-            params = {}
-            for i, param_name in enumerate(param_names):
-                param_config = param_space[param_name]
-
-                if param_config["type"] == "int":
-                    low, high = param_config["low"], param_config["high"]
-                    value = int(low + sample[i] * (high - low))
-                    params[param_name] = min(max(value, low), high)
+        for i, (param_name, param_config) in enumerate(param_space.items()):
+            low, high = param_config["low"], param_config["high"]
+            values = np.array([params.get(param_name, low) for params in params_list], dtype=np.float64)
+            if param_name in self.LOG_SCALE_PARAMS:
+                unit[:, i] = (np.log(values) - np.log(low)) / (np.log(high) - np.log(low))
+            else:
+                unit[:, i] = (values - low) / (high - low)
 
-                elif param_config["type"] == "float":
-                    low, high = param_config["low"], param_config["high"]
+        return unit.clip(0.0, 1.0)
 
-                    if param_name in ["rr_percentile", "stop_atr_mult"]:
-                        log_low, log_high = np.log(low), np.log(high)
-                        log_value = log_low + sample[i] * (log_high - log_low)
-                        value = np.exp(log_value)
-                    else:
-                        value = low + sample[i] * (high - low)
+    def generate_sobol_samples(self, n_samples: int = 120) -> List[Dict]:
+        """Sobol 시퀀스를 사용한 샘플 생성"""
+        sobol = qmc.Sobol(d=len(self.define_parameter_space()), scramble=True)
+        samples = self._unit_to_params(sobol.random(n_samples))
 
-                    params[param_name] = float(value)
+        print(f"✅ Sobol 샘플 {len(samples)}개 생성 완료")
+        return samples
 
-            samples.append(params)
+    def generate_lhs_samples(self, n_samples: int = 120) -> List[Dict]:
+        """Latin Hypercube Sampling을 사용한 샘플 생성"""
+        lhs = qmc.LatinHypercube(d=len(self.define_parameter_space()))
+        samples = self._unit_to_params(lhs.random(n_samples))
 
         print(f"✅ LHS 샘플 {len(samples)}개 생성 완료")
         return samples
 
+    def _generate_samples(self, sampling_method: str, n_samples: int) -> List[Dict]:
+        """샘플링 방식별 샘플 생성"""
+        if sampling_method.lower() == "sobol":
+            return self.generate_sobol_samples(n_samples)
+        return self.generate_lhs_samples(n_samples)
+
     def evaluate_candidate(self, params: Dict, fidelity: str, strategy_func: Callable) -> Tuple[float, PerformanceMetrics]:
         """후보 평가 (특정 충실도에서)"""
         try:
             # 데이터 슬라이스 크기 결정
             data_points = self.fidelity_levels[fidelity]
 
-            # 전략 실행 (가상의 함수 - 실제로는 strategy_func 사용)
-            # 여기서는 간단한 시뮬레이션으로 대체
-            metrics = self._simulate_strategy_result(params, data_points)
+            if self.evaluator is not None:
+                # 최근 data_points 바 구간 실제 백테스트
+                end = self.evaluator.n_bars
+                metrics = self.evaluator.evaluate(params, max(0, end - data_points), end, abort=self.abort_rule)
+                if metrics.abort_reason:
+                    # 제약 위반 확정 - 남은 신호 생략, 실패 점수
+                    return -10000, metrics
+            else:
+                metrics = self._simulate_strategy_result(params, data_points)
 
             # 점수 계산
             score = self.performance_evaluator.calculate_score(metrics)
@@ -172,7 +198,7 @@ class GlobalSearchOptimizer:
             return -10000, self.performance_evaluator._empty_metrics()
 
     def _simulate_strategy_result(self, params: Dict, data_points: int) -> PerformanceMetrics:
-        """전략 결과 시뮬레이션 (테스트용)"""
+        """전략 결과 시뮬레이션 (평가기 없을 때 대체용)"""
         # 파라미터 기반으로 성과 시뮬레이션
         np.random.seed(hash(str(params)) % 2**32)
 
@@ -209,6 +235,81 @@ class GlobalSearchOptimizer:
 
         return metrics
 
+    @property
+    def trial_study(self) -> str:
+        """시도 히스토리 키 (데이터/평가 설정이 바뀌면 다른 히스토리)"""
+        fingerprint = self.evaluator.fingerprint() if self.evaluator is not None else None
+        return f"global_search:{fingerprint or 'simulated'}"
+
+    def _record_trials(self, candidates: List[Tuple[Dict, float, PerformanceMetrics]], fidelity: str):
+        """시도 결과 히스토리 저장 (trial_store 지정시)"""
+        if self.trial_store is not None and candidates:
+            self.trial_store.save_trials(self.trial_study, fidelity, [(params, score) for params, score, _ in candidates])
+
+    def run_surrogate_screening(
+        self, strategy_func: Callable, sampling_method: str = "sobol", token: CancellationToken = None
+    ) -> List[Tuple[Dict, float, PerformanceMetrics]]:
+        """서로게이트 사전 스크리닝 - 대규모 풀을 예측으로 순위화하고 상위 후보만 저충실도 실제 평가
+
+        배치마다 실제 평가 결과로 서로게이트 재학습, 최고 점수 도달까지의 실제 평가 수 기록
+        """
+        token = token or CancellationToken()
+        config = self.surrogate_config
+
+        pool = self._generate_samples(sampling_method, config["pool_size"])
+        pool_unit = self._params_to_unit(pool)
+        budget = max(config["batch_size"], int(len(pool) * config["top_fraction"]))
+
+        screener = SurrogateScreener(config["model"], config["kappa"])
+        history = self.trial_store.load_trials(self.trial_study, "low", config["history_limit"]) if self.trial_store else []
+        param_names = set(self.define_parameter_space())
+        # 최신순 조회 → 시간순 (GP 학습 상한은 최근 관측 기준)
+        history = [(params, score) for params, score in reversed(history) if param_names <= set(params)]
+        if history:
+            screener.observe(self._params_to_unit([params for params, _ in history]), [score for _, score in history])
+
+        print(f"🧠 서로게이트 스크리닝 ({config['model']}): 풀 {len(pool)}개 → 실제 평가 {budget}회")
+        print(f"   학습 히스토리: {len(history)}개")
+
+        remaining = np.ones(len(pool), dtype=bool)
+        evaluated = []
+        while len(evaluated) < budget and remaining.any() and not token.stopped:
+            open_idx = np.flatnonzero(remaining)
+            n_batch = min(config["batch_size"], budget - len(evaluated))
+            if len(screener) < config["initial_samples"]:
+                # 학습 데이터 부족 - 저불일치 수열 앞부분(공간 채움) 순서로 평가
+                picked = open_idx[:n_batch]
+            else:
+                picked = open_idx[screener.select(pool_unit[open_idx], n_batch)]
+            remaining[picked] = False
+
+            batch = []
+            for index in picked:
+                if token.stopped:
+                    break
+                score, metrics = self.evaluate_candidate(pool[index], "low", strategy_func)
+                batch.append((pool[index], score, metrics))
+
+            screener.observe(pool_unit[picked[: len(batch)]], [score for _, score, _ in batch])
+            self._record_trials(batch, "low")
+            evaluated.extend(batch)
+            print(f"   진행률: {len(evaluated)}/{budget} (최고 점수: {max(score for _, score, _ in evaluated):.4f})")
+
+        scores = np.array([score for _, score, _ in evaluated])
+        self.surrogate_stats = {
+            "pool_size": len(pool),
+            "history_size": len(history),
+            "evaluations": len(evaluated),
+            "best_score": float(scores.max()) if len(scores) else None,
+            "evaluations_to_best": int(np.argmax(scores)) + 1 if len(scores) else None,
+        }
+        if len(scores):
+            print(
+                f"✅ 서로게이트 스크리닝 완료: 실제 평가 {len(evaluated)}회, "
+                f"최고 점수 {self.surrogate_stats['best_score']:.4f} ({self.surrogate_stats['evaluations_to_best']}회째 도달)"
+            )
+        return evaluated
+
     def apply_screening_filter(
         self, candidates: List[Tuple[Dict, float, PerformanceMetrics]]
     ) -> List[Tuple[Dict, float, PerformanceMetrics]]:
@@ -220,6 +321,7 @@ class GlobalSearchOptimizer:
             if (
                 metrics.profit_factor >= self.screening_filter["min_profit_factor"]
                 and metrics.total_trades >= self.screening_filter["min_trades"]
+                and not metrics.abort_reason
             ):
                 filtered.append((params, score, metrics))
 
@@ -253,28 +355,45 @@ class GlobalSearchOptimizer:
         print(f"✂️ ASHA 단계 {stage}: {len(candidates)} → {n_keep} 후보")
         return pruned
 
+    def _stopped_result(
+        self, candidates: List[Tuple[Dict, float, PerformanceMetrics]], token: CancellationToken
+    ) -> List[Tuple[Dict, float, PerformanceMetrics]]:
+        """중단시 마지막으로 평가된 충실도의 상위 후보 반환"""
+        ranked = sorted(candidates, key=lambda x: x[1], reverse=True)
+        print(f"\n⏹️ 전역 탐색 중단 ({token.reason}) - 부분 결과 {len(ranked)}개 중 상위 반환")
+        return ranked[: max(5, int(len(ranked) * 0.3))]
+
     def run_global_search(
-        self, strategy_func: Callable, sampling_method: str = "sobol"
+        self, strategy_func: Callable, sampling_method: str = "sobol", token: CancellationToken = None
     ) -> List[Tuple[Dict, float, PerformanceMetrics]]:
-        """전역 탐색 실행"""
+        """전역 탐색 실행 (token 중단시 후보 평가 경계에서 종료 후 부분 결과 반환)"""
+        token = token or CancellationToken()
         print(f"\n🚀 전역 탐색 시작 ({sampling_method.upper()})")
         start_time = time.time()
 
-        # 1단계: 초기 샘플 생성
-        if sampling_method.lower() == "sobol":
-            candidates_params = self.generate_sobol_samples(120)
+        if self.surrogate_config["enabled"]:
+            # 1~2단계: 서로게이트 사전 스크리닝 + 상위 후보 저충실도 평가 (10k)
+            print(f"\n📊 1단계: 서로게이트 사전 스크리닝 + 저충실도 평가 (10k 데이터)")
+            candidates_low = self.run_surrogate_screening(strategy_func, sampling_method, token)
+            if token.stopped:
+                return self._stopped_result(candidates_low, token)
         else:
-            candidates_params = self.generate_lhs_samples(120)
-
-        # 2단계: 저충실도 평가 (10k)
-        print(f"\n📊 1단계: 저충실도 평가 (10k 데이터)")
-        candidates_low = []
-        for i, params in enumerate(candidates_params):
-            if i % 20 == 0:
-                print(f"   진행률: {i}/{len(candidates_params)} ({i/len(candidates_params)*100:.1f}%)")
-
-            score, metrics = self.evaluate_candidate(params, "low", strategy_func)
-            candidates_low.append((params, score, metrics))
+            # 1단계: 초기 샘플 생성
+            candidates_params = self._generate_samples(sampling_method, 120)
+
+            # 2단계: 저충실도 평가 (10k)
+            print(f"\n📊 1단계: 저충실도 평가 (10k 데이터)")
+            candidates_low = []
+            for i, params in enumerate(candidates_params):
+                if token.stopped:
+                    self._record_trials(candidates_low, "low")
+                    return self._stopped_result(candidates_low, token)
+                if i % 20 == 0:
+                    print(f"   진행률: {i}/{len(candidates_params)} ({i/len(candidates_params)*100:.1f}%)")
+
+                score, metrics = self.evaluate_candidate(params, "low", strategy_func)
+                candidates_low.append((params, score, metrics))
+            self._record_trials(candidates_low, "low")
 
         # 스크리닝 필터 적용
         candidates_low = self.apply_screening_filter(candidates_low)
@@ -290,8 +409,11 @@ class GlobalSearchOptimizer:
         print(f"\n📊 2단계: 중충실도 평가 (30k 데이터)")
         candidates_medium = []
         for i, (params, _, _) in enumerate(candidates_low):
+            if token.stopped:
+                return self._stopped_result(candidates_low, token)
             score, metrics = self.evaluate_candidate(params, "medium", strategy_func)
             candidates_medium.append((params, score, metrics))
+        self._record_trials(candidates_medium, "medium")
 
         # ASHA 2단계 적용
         candidates_medium = self.apply_asha_pruning(candidates_medium, 2)
@@ -304,8 +426,11 @@ class GlobalSearchOptimizer:
         print(f"\n📊 3단계: 고충실도 평가 (50k 데이터)")
         final_candidates = []
         for i, (params, _, _) in enumerate(candidates_medium):
+            if token.stopped:
+                return self._stopped_result(candidates_medium, token)
             score, metrics = self.evaluate_candidate(params, "high", strategy_func)
             final_candidates.append((params, score, metrics))
+        self._record_trials(final_candidates, "high")
 
         # 최종 정렬
         final_candidates.sort(key=lambda x: x[1], reverse=True)
@@ -4,8 +4,11 @@
 - TPE/GP + EI 40스텝 베이지안 최적화
 - 제약 조건 위반 시 큰 음수 반환
 - Top-12 → Top-5 후보 선별
+- 워밍업 시도 후 파라미터 중요도 분석 → 미미한 파라미터 고정 + 나머지 경계 축소
+- 백테스트 도중 제약 위반이 확정되면 조기 중단 → 가지치기 처리
 """
 
+import copy
 import time
 import warnings
 from typing import Callable, Dict, List, Optional, Tuple
@@ -18,15 +21,28 @@ from optuna.samplers import TPESampler
 
 warnings.filterwarnings("ignore")
 
+from cancellation import CancellationToken
 from fast_data_engine import FastDataEngine
-from performance_evaluator import PerformanceEvaluator, PerformanceMetrics
+from parameter_importance import SpaceReduction, reduce_search_space, suggest_param
+from performance_evaluator import AbortRule, PerformanceEvaluator, PerformanceMetrics
+from strategy_evaluator import StrategyEvaluator, default_evaluator
 
 
 class LocalSearchOptimizer:
-    def __init__(self, data_engine: FastDataEngine, performance_evaluator: PerformanceEvaluator):
-        """국소 정밀 탐색 최적화자 초기화"""
+    # 정수 / 로그 스케일 파라미터
+    INT_PARAMS = ("swing_len", "atr_len", "time_stop_bars", "trend_filter_len")
+    LOG_SCALE_PARAMS = ("rr_percentile", "stop_atr_mult")
+
+    def __init__(
+        self, data_engine: FastDataEngine, performance_evaluator: PerformanceEvaluator, evaluator: StrategyEvaluator = None
+    ):
+        """국소 정밀 탐색 최적화자 초기화 (evaluator 미지정시 데이터 엔진 지표 캐시로 생성, 없으면 시뮬레이션)"""
         self.data_engine = data_engine
         self.performance_evaluator = performance_evaluator
+        self.evaluator = evaluator or default_evaluator(data_engine, performance_evaluator)
+
+        # 평가 바 구간 [start, end) - 워크포워드 슬라이스 최적화시 훈련 구간으로 제한
+        self.eval_range = (0, None)
 
         # TPE 설정
         self.tpe_config = {
@@ -39,10 +55,36 @@ class LocalSearchOptimizer:
         # 베이지안 최적화 설정
         self.bayesian_config = {"n_trials": 40, "timeout": 3600, "n_jobs": 1}  # 40스텝  # 1시간 제한  # 단일 프로세스 (안정성)
 
+        # 워밍업 후 파라미터 중요도 기반 탐색 공간 축소
+        self.reduction_config = {
+            "enabled": True,
+            "method": "fanova",  # fanova | permutation
+            "warmup_fraction": 0.5,  # 분석 전 시도 비율 (나머지는 축소된 공간 탐색)
+            "freeze_threshold": 0.02,  # 정규화 중요도 미만 파라미터 고정
+            "top_fraction": 0.2,  # 경계 축소 기준 상위 시도 비율
+            "bound_margin": 0.1,  # 상위 시도 범위 양쪽 여유 (원래 범위 대비)
+            "min_trials": 15,  # 분석 최소 완료 시도 수 (워밍업이 이보다 적으면 축소 생략)
+        }
+        self.space_reduction: Optional[Dict] = None  # 마지막 실행 축소 요약
+
+        # 거래 단위 조기 중단 (최대 드로우다운 초과 / 연속 손실) - 중단된 시도는 가지치기
+        self.abort_rule = AbortRule.from_constraints(performance_evaluator.constraints)
+
         print("🎯 국소 정밀 탐색 최적화자 초기화")
         print(f"   베이지안 최적화: TPE + EI")
         print(f"   시도 횟수: {self.bayesian_config['n_trials']}회")
         print(f"   EI 후보: {self.tpe_config['n_ei_candidates']}개")
+        print(f"   평가: {'실제 백테스트' if self.evaluator else '시뮬레이션'}")
+
+    def configured(self, eval_range: Tuple[int, Optional[int]] = None, **bayesian_overrides) -> "LocalSearchOptimizer":
+        """설정만 분리한 복사본 (평가기 공유) - 동시에 실행되는 슬라이스가 서로의 설정을 바꾸지 않도록"""
+        optimizer = copy.copy(self)
+        optimizer.tpe_config = dict(self.tpe_config)
+        optimizer.reduction_config = dict(self.reduction_config)
+        optimizer.bayesian_config = {**self.bayesian_config, **bayesian_overrides}
+        if eval_range is not None:
+            optimizer.eval_range = eval_range
+        return optimizer
 
     def create_optuna_study(self, initial_candidates: List[Tuple[Dict, float, PerformanceMetrics]] = None) -> optuna.Study:
         """Optuna 스터디 생성"""
@@ -76,58 +118,69 @@ class LocalSearchOptimizer:
             # Optuna 형식으로 변환하여 큐에 추가
             study.enqueue_trial(params)
 
-    def define_search_space(self, trial: optuna.Trial, focus_region: Dict[str, Tuple[float, float]] = None) -> Dict:
-        """탐색 공간 정의 (국소 영역에 집중)"""
-
+    def search_space_spec(self, focus_region: Dict[str, Tuple[float, float]] = None) -> Dict[str, Dict]:
+        """탐색 공간 정의 {이름: {type, low, high, log}} (집중 영역 지정시 중심 ± 반경)"""
         if focus_region:
             # 집중 영역이 지정된 경우 좁은 범위 탐색
-            params = {}
+            space = {}
             for param_name, (center, radius) in focus_region.items():
-                if param_name in ["swing_len", "atr_len", "time_stop_bars", "trend_filter_len"]:
-                    # 정수 파라미터
-                    low = max(1, int(center - radius))
-                    high = int(center + radius)
-                    params[param_name] = trial.suggest_int(param_name, low, high)
+                if param_name in self.INT_PARAMS:
+                    space[param_name] = {"type": "int", "low": max(1, int(center - radius)), "high": int(center + radius)}
                 else:
-                    # 실수 파라미터
-                    low = max(0.01, center - radius)
-                    high = center + radius
-
-                    if param_name in ["rr_percentile", "stop_atr_mult"]:
-                        # 로그 스케일
-                        params[param_name] = trial.suggest_float(param_name, low, high, log=True)
-                    else:
-                        # 선형 스케일
-                        params[param_name] = trial.suggest_float(param_name, low, high)
-        else:
-            # 전체 공간 탐색 (기본값)
-            params = {
-                "swing_len": trial.suggest_int("swing_len", 3, 8),
-                "rr_percentile": trial.suggest_float("rr_percentile", 0.05, 0.5, log=True),
-                "disp_mult": trial.suggest_float("disp_mult", 1.0, 2.0),
-                "sweep_wick_mult": trial.suggest_float("sweep_wick_mult", 0.3, 0.8),
-                "atr_len": trial.suggest_int("atr_len", 20, 60),
-                "stop_atr_mult": trial.suggest_float("stop_atr_mult", 0.05, 0.25, log=True),
-                "target_r": trial.suggest_float("target_r", 1.5, 4.0),
-                "time_stop_bars": trial.suggest_int("time_stop_bars", 2, 10),
-                "min_volatility_rank": trial.suggest_float("min_volatility_rank", 0.2, 0.7),
-                "session_strength": trial.suggest_float("session_strength", 1.0, 2.5),
-                "volume_filter": trial.suggest_float("volume_filter", 1.0, 2.0),
-                "trend_filter_len": trial.suggest_int("trend_filter_len", 10, 40),
-            }
+                    space[param_name] = {
+                        "type": "float",
+                        "low": max(0.01, center - radius),
+                        "high": center + radius,
+                        "log": param_name in self.LOG_SCALE_PARAMS,
+                    }
+            return space
+
+        # 전체 공간 탐색 (기본값)
+        return {
+            "swing_len": {"type": "int", "low": 3, "high": 8},
+            "rr_percentile": {"type": "float", "low": 0.05, "high": 0.5, "log": True},
+            "disp_mult": {"type": "float", "low": 1.0, "high": 2.0},
+            "sweep_wick_mult": {"type": "float", "low": 0.3, "high": 0.8},
+            "atr_len": {"type": "int", "low": 20, "high": 60},
+            "stop_atr_mult": {"type": "float", "low": 0.05, "high": 0.25, "log": True},
+            "target_r": {"type": "float", "low": 1.5, "high": 4.0},
+            "time_stop_bars": {"type": "int", "low": 2, "high": 10},
+            "min_volatility_rank": {"type": "float", "low": 0.2, "high": 0.7},
+            "session_strength": {"type": "float", "low": 1.0, "high": 2.5},
+            "volume_filter": {"type": "float", "low": 1.0, "high": 2.0},
+            "trend_filter_len": {"type": "int", "low": 10, "high": 40},
+        }
 
+    def define_search_space(
+        self,
+        trial: optuna.Trial,
+        focus_region: Dict[str, Tuple[float, float]] = None,
+        reduction: SpaceReduction = None,
+    ) -> Dict:
+        """탐색 공간 정의 (국소 영역에 집중, reduction 지정시 축소 공간 + 고정 파라미터)"""
+        space = reduction.param_space if reduction is not None else self.search_space_spec(focus_region)
+        params = {param_name: suggest_param(trial, param_name, config) for param_name, config in space.items()}
+        if reduction is not None:
+            params.update(reduction.frozen)
         return params
 
     def objective_function(
-        self, trial: optuna.Trial, strategy_func: Callable, focus_region: Dict[str, Tuple[float, float]] = None
+        self,
+        trial: optuna.Trial,
+        strategy_func: Callable,
+        focus_region: Dict[str, Tuple[float, float]] = None,
+        reduction: SpaceReduction = None,
     ) -> float:
         """목적 함수 (제약 조건 포함)"""
         try:
             # 파라미터 샘플링
-            params = self.define_search_space(trial, focus_region)
+            params = self.define_search_space(trial, focus_region, reduction)
 
-            # 전략 실행 (시뮬레이션)
-            metrics = self._simulate_strategy_result(params)
+            # 전략 실행 (제약 위반 확정시 조기 중단 → 가지치기)
+            metrics = self._evaluate_strategy(params, self.abort_rule)
+            if metrics.abort_reason:
+                trial.set_user_attr("abort_reason", metrics.abort_reason)
+                raise optuna.TrialPruned()
 
             # 제약 조건 확인
             passed, violations = self.performance_evaluator.check_constraints(metrics)
@@ -166,6 +219,12 @@ class LocalSearchOptimizer:
             print(f"❌ 목적 함수 오류: {e}")
             return -10000
 
+    def _evaluate_strategy(self, params: Dict, abort: AbortRule = None) -> PerformanceMetrics:
+        """전략 평가 (평가기 있으면 eval_range 구간 실제 백테스트, 없으면 시뮬레이션 - 조기 중단은 실제 백테스트만)"""
+        if self.evaluator is not None:
+            return self.evaluator.evaluate(params, *self.eval_range, abort=abort)
+        return self._simulate_strategy_result(params)
+
     def _simulate_strategy_result(self, params: Dict) -> PerformanceMetrics:
         """전략 결과 시뮬레이션 (고충실도)"""
         # 파라미터 기반으로 성과 시뮬레이션 (더 정교한 버전)
@@ -255,9 +314,11 @@ class LocalSearchOptimizer:
         strategy_func: Callable,
         initial_candidates: List[Tuple[Dict, float, PerformanceMetrics]] = None,
         use_focus_region: bool = True,
+        token: CancellationToken = None,
     ) -> List[Tuple[Dict, float, PerformanceMetrics]]:
-        """국소 정밀 탐색 실행"""
+        """국소 정밀 탐색 실행 (token 중단시 시도 경계에서 종료 후 완료된 시도로 선별)"""
         print(f"\n🎯 국소 정밀 탐색 시작")
+        token = token or CancellationToken()
         start_time = time.time()
 
         # 집중 영역 계산
@@ -268,27 +329,46 @@ class LocalSearchOptimizer:
         # Optuna 스터디 생성
         study = self.create_optuna_study(initial_candidates)
 
-        # 목적 함수 래퍼
-        def objective_wrapper(trial):
-            return self.objective_function(trial, strategy_func, focus_region)
+        # 워밍업 → 중요도 분석 → 축소 공간 순으로 나눠 실행 (워밍업이 분석 최소 시도보다 적으면 한 번에)
+        n_trials = self.bayesian_config["n_trials"]
+        n_warmup = int(n_trials * self.reduction_config["warmup_fraction"])
+        if not self.reduction_config["enabled"] or n_warmup < self.reduction_config["min_trials"]:
+            n_warmup = n_trials
+
+        reduction = None
+        self.space_reduction = None
+        deadline = time.time() + self.bayesian_config["timeout"]
 
         # 베이지안 최적화 실행
-        try:
-            study.optimize(
-                objective_wrapper,
-                n_trials=self.bayesian_config["n_trials"],
-                timeout=self.bayesian_config["timeout"],
-                n_jobs=self.bayesian_config["n_jobs"],
-                show_progress_bar=True,
-            )
-        except KeyboardInterrupt:
-            print("⚠️ 사용자에 의해 중단됨")
+        for phase_trials in (n_warmup, n_trials - n_warmup):
+            if phase_trials <= 0 or token.stopped:
+                continue
+
+            if reduction is None and len(study.trials) > 0:
+                reduction = self.reduce_search_space(study, focus_region)
+
+            def objective_wrapper(trial, reduction=reduction):
+                return self.objective_function(trial, strategy_func, focus_region, reduction)
+
+            try:
+                study.optimize(
+                    objective_wrapper,
+                    n_trials=phase_trials,
+                    timeout=token.clamp_timeout(max(0.0, deadline - time.time())),
+                    n_jobs=self.bayesian_config["n_jobs"],
+                    callbacks=[token.optuna_callback()],
+                    show_progress_bar=True,
+                )
+            except KeyboardInterrupt:
+                print("⚠️ 사용자에 의해 중단됨")
+                break
 
-        # 결과 수집
+        # 결과 수집 (축소 단계 시도는 고정 파라미터 포함)
+        frozen = reduction.frozen if reduction is not None else {}
         results = []
         for trial in study.trials:
             if trial.state == optuna.trial.TrialState.COMPLETE:
-                params = trial.params
+                params = {**frozen, **trial.params}
                 score = trial.value
 
                 # 메트릭 재구성
@@ -324,6 +404,16 @@ class LocalSearchOptimizer:
         final_candidates = []
 
         for i, (params, _, _) in enumerate(top_12):
+            if token.stopped and final_candidates:
+                print(f"   ⏹️ 추가 평가 중단 ({token.reason}) - {len(final_candidates)}개로 선별")
+                break
+
+            if self.evaluator is not None:
+                # 실제 백테스트는 결정적 - 1회 평가
+                metrics = self._evaluate_strategy(params)
+                final_candidates.append((params, self.performance_evaluator.calculate_score(metrics), metrics))
+                continue
+
             # 더 정교한 평가 (여러 번 실행 후 평균)
             scores = []
             metrics_list = []
@@ -348,11 +438,44 @@ class LocalSearchOptimizer:
         elapsed_time = time.time() - start_time
         print(f"\n✅ 국소 정밀 탐색 완료 ({elapsed_time:.1f}초)")
         print(f"   완료된 시도: {len(study.trials)}")
-        print(f"   최고 점수: {study.best_value:.4f}")
+        n_aborted = sum(1 for trial in study.trials if "abort_reason" in trial.user_attrs)
+        if n_aborted:
+            print(f"   조기 중단 (가지치기): {n_aborted}개")
+        if results:
+            print(f"   최고 점수: {study.best_value:.4f}")
         print(f"   최종 Top-5 선별 완료")
 
         return top_5
 
+    def reduce_search_space(
+        self, study: optuna.Study, focus_region: Dict[str, Tuple[float, float]] = None
+    ) -> Optional[SpaceReduction]:
+        """워밍업 시도 중요도 분석 → 미미한 파라미터 고정 + 나머지 경계 축소"""
+        config = self.reduction_config
+        try:
+            reduction = reduce_search_space(
+                study.get_trials(deepcopy=False),
+                self.search_space_spec(focus_region),
+                method=config["method"],
+                freeze_threshold=config["freeze_threshold"],
+                top_fraction=config["top_fraction"],
+                bound_margin=config["bound_margin"],
+                min_trials=config["min_trials"],
+                failure_score=-10000,
+            )
+        except Exception as e:
+            print(f"⚠️ 파라미터 중요도 분석 실패: {e}")
+            return None
+
+        if reduction is None:
+            print("   ⚠️ 탐색 공간 유지 (유효 시도 부족 또는 점수 변화 없음)")
+            return None
+
+        self.space_reduction = reduction.summary()
+        print(f"🧮 파라미터 중요도 ({reduction.method}, {reduction.n_trials}개 시도)")
+        print(f"   고정: {len(reduction.frozen)}개 {sorted(reduction.frozen)}, 탐색 유지: {len(reduction.param_space)}개")
+        return reduction
+
     def print_optimization_progress(self, study: optuna.Study):
         """최적화 진행상황 출력"""
         if len(study.trials) == 0:
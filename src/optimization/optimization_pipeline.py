@@ -3,14 +3,18 @@
 통합 최적화 파이프라인 구현
 - 전체 워크플로우 통합 실행 시스템
 - 단계별 결과 검증 및 전달
+- 검증 단계는 후보별 작업 그래프로 병렬 실행 (탈락 후보는 이후 단계 미실행)
 - 실패 시 롤백 및 재시도 로직
 - 진행상황 모니터링 및 로깅
 """
 
+import hashlib
 import json
+import os
 import pickle
 import time
 import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -21,13 +25,17 @@ import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+from cancellation import CancellationToken, OperationCancelled
 from failure_recovery_system import FailureRecoverySystem
 from kelly_position_sizer import KellyPositionSizer
+from market_data_store import MarketDataStore
+from memory_admission import get_admission_controller
 
 # 기존 컴포넌트들 import (실제 구현에서는 해당 모듈들을 import)
 from performance_evaluator import PerformanceEvaluator
 from realtime_monitoring_system import RealtimeMonitor
 from statistical_validator import StatisticalValidator
+from strategy_evaluator import ArrayStrategyEvaluator, StrategyEvaluator
 
 
 class PipelineStage(Enum):
@@ -45,6 +53,45 @@ class PipelineStage(Enum):
     FINALIZATION = "finalization"
 
 
+# 체크포인트 형식 버전 (단계 로직 변경시 증가 → 기존 체크포인트 무효화)
+CHECKPOINT_VERSION = 2
+
+# 체크포인트 대상 단계 (실행 순서): 단계 → (입력 설정 필드, 출력 intermediate_data 키)
+# 단계 키 = hash(직전 단계 키 또는 데이터 지문 + 파라미터 공간, 입력 설정) - 설정 변경시 해당 단계부터 재실행
+CHECKPOINT_STAGES = {
+    PipelineStage.GLOBAL_OPTIMIZATION: (("global_search_samples", "max_candidates"), "global_candidates"),
+    PipelineStage.LOCAL_REFINEMENT: (("final_candidates", "local_refinement_steps"), "refined_candidates"),
+    PipelineStage.TIMESERIES_VALIDATION: (("kfold_splits",), "validated_candidates"),
+    PipelineStage.WALKFORWARD_ANALYSIS: (("wfo_slices",), "wfo_candidates"),
+    PipelineStage.MONTECARLO_SIMULATION: (("mc_simulations",), "mc_candidates"),
+    PipelineStage.STATISTICAL_VALIDATION: ((), "final_candidates"),
+}
+
+# 후보별 검증 그래프 단계 (실행 순서) - 후보마다 독립적으로 다음 단계 진행, 탈락 후보는 이후 단계 미실행
+VALIDATION_STAGES = (
+    PipelineStage.TIMESERIES_VALIDATION,
+    PipelineStage.WALKFORWARD_ANALYSIS,
+    PipelineStage.MONTECARLO_SIMULATION,
+    PipelineStage.STATISTICAL_VALIDATION,
+)
+
+
+# 검증 그래프 취소/예산 확인 간격 (초)
+CANCEL_POLL_SECONDS = 0.1
+
+# 검증 합격 기준 - 제약 게이트 없는 구간 원점수 기준 (1.0 = 전 지표 목표 달성, 지표당 최대 3배)
+OOS_MIN_MEDIAN = 0.5  # OOS 구간 점수 메디안
+OOS_MIN_POSITIVE_SHARE = 0.7  # 양수 점수 OOS 구간 비율 (일관성)
+MC_MIN_P5 = 0.0  # 몬테카를로 p5 - 95% 시뮬레이션에서 양수 점수
+MIN_DEFLATED_SORTINO = 1.0  # 다중 테스트 보정 OOS Sortino
+
+
+def _candidate_seed(parameters: Dict) -> int:
+    """파라미터 조합 → 난수 시드 (후보 처리 순서/완료 순서와 무관한 재현성)"""
+    encoded = json.dumps(parameters, sort_keys=True, default=float).encode()
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=4).digest(), "little")
+
+
 class PipelineStatus(Enum):
     """파이프라인 상태"""
 
@@ -79,7 +126,8 @@ class PipelineConfig:
     # 성능 설정
     parallel_workers: int = 4
     memory_limit_gb: float = 8.0
-    timeout_minutes: int = 120
+    timeout_minutes: int = 120  # 파이프라인 전체 벽시계 예산
+    stage_time_budgets: Dict[str, float] = field(default_factory=dict)  # 단계별 벽시계 예산 (초, 키: 단계 값)
 
     # 재시도 설정
     max_retries: int = 3
@@ -88,6 +136,7 @@ class PipelineConfig:
     # 저장 설정
     save_intermediate: bool = True
     output_directory: str = "optimization_results"
+    resume_from_checkpoint: bool = True  # 입력 해시가 같은 단계 체크포인트 재사용
 
 
 @dataclass
@@ -102,6 +151,9 @@ class StageResult:
     data: Dict[str, Any] = field(default_factory=dict)
     error_message: Optional[str] = None
     retry_count: int = 0
+    checkpoint_key: Optional[str] = None
+    from_checkpoint: bool = False
+    stop_reason: Optional[str] = None  # 취소/예산 소진으로 부분 결과 반환시 사유
 
 
 @dataclass
@@ -121,9 +173,10 @@ class PipelineResult:
 
 
 class OptimizationPipeline:
-    def __init__(self, config: PipelineConfig = None):
-        """최적화 파이프라인 초기화"""
+    def __init__(self, config: PipelineConfig = None, evaluator: StrategyEvaluator = None):
+        """최적화 파이프라인 초기화 (evaluator 미지정시 데이터 준비 단계에서 가격 데이터로 생성)"""
         self.config = config or PipelineConfig()
+        self.evaluator = evaluator
 
         # 컴포넌트 초기화
         self.performance_evaluator = PerformanceEvaluator()
@@ -136,6 +189,11 @@ class OptimizationPipeline:
         self.current_result: Optional[PipelineResult] = None
         self.is_running = False
 
+        # 취소 토큰 (파이프라인 전체 → 실행 중 단계) / 부분 결과로 끝난 단계 사유
+        self.token = CancellationToken()
+        self.stage_token = self.token
+        self.stage_stops: Dict[PipelineStage, str] = {}
+
         # 콜백 함수들
         self.stage_callbacks: Dict[PipelineStage, List[Callable]] = {}
         self.progress_callbacks: List[Callable[[float, str], None]] = []
@@ -143,6 +201,14 @@ class OptimizationPipeline:
         # 중간 결과 저장
         self.intermediate_data: Dict[str, Any] = {}
 
+        # 체크포인트 키 (데이터 지문 → 단계별 입력 해시 체인)
+        self.dataset_fingerprint: Optional[str] = None
+        self.stage_keys: Dict[PipelineStage, str] = {}
+
+        # 검증 그래프 단계별 결과 (요약 또는 실패 예외) / 후보 작업 실행 구간
+        self.graph_results: Dict[PipelineStage, Any] = {}
+        self.graph_spans: Dict[PipelineStage, tuple] = {}
+
         print("🚀 통합 최적화 파이프라인 초기화")
         print(f"   심볼: {self.config.symbol}")
         print(f"   데이터 길이: {self.config.data_length:,}")
@@ -159,6 +225,11 @@ class OptimizationPipeline:
         )
 
         self.is_running = True
+        self.token = CancellationToken(self.config.timeout_minutes * 60)
+        self.stage_stops = {}
+        self.stage_keys = {}
+        self.graph_results = {}
+        self.graph_spans = {}
 
         print(f"\n🎯 최적화 파이프라인 시작: {pipeline_id}")
         print("=" * 80)
@@ -181,7 +252,7 @@ class OptimizationPipeline:
             total_stages = len(stages)
 
             for i, (stage, stage_func) in enumerate(stages):
-                if not self.is_running:
+                if not self.is_running or self.token.stopped:
                     break
 
                 # 진행률 업데이트
@@ -192,12 +263,17 @@ class OptimizationPipeline:
                 stage_result = self._execute_stage(stage, stage_func, parameter_space)
                 self.current_result.stage_results.append(stage_result)
 
+                # 단계 결과 없이 중단 (취소/단계 예산 소진)
+                if stage_result.status == PipelineStatus.CANCELLED:
+                    raise OperationCancelled(stage_result.stop_reason)
+
                 # 단계 실패 시 처리
                 if stage_result.status == PipelineStatus.FAILED:
                     if stage_result.retry_count < self.config.max_retries:
                         # 재시도
                         print(f"🔄 단계 재시도: {stage.value} ({stage_result.retry_count + 1}/{self.config.max_retries})")
-                        time.sleep(self.config.retry_delay_seconds)
+                        if self.token.wait(self.config.retry_delay_seconds):
+                            raise Exception(f"단계 실패 (재시도 전 중단): {stage.value} - {stage_result.error_message}")
 
                         # 재시도 실행
                         retry_result = self._execute_stage(stage, stage_func, parameter_space, stage_result.retry_count + 1)
@@ -212,21 +288,27 @@ class OptimizationPipeline:
                 if self.config.save_intermediate:
                     self._save_intermediate_result(stage, stage_result)
 
-            # 파이프라인 완료
-            self.current_result.status = PipelineStatus.COMPLETED
             self.current_result.end_time = datetime.now()
             self.current_result.total_duration_seconds = (
                 self.current_result.end_time - self.current_result.start_time
             ).total_seconds()
 
-            self._update_progress(1.0, "완료")
-
-            print(f"\n✅ 파이프라인 완료: {self.current_result.total_duration_seconds:.1f}초")
+            if self.token.stopped or not self.is_running:
+                # 취소/전체 예산 소진 - 완료된 단계 결과까지만 유지
+                self.current_result.status = PipelineStatus.CANCELLED
+                self.current_result.error_message = f"파이프라인 중단: {self.token.reason or 'cancelled'}"
+                print(f"\n⏹️ 파이프라인 중단: {self.current_result.total_duration_seconds:.1f}초 ({self.token.reason})")
+            else:
+                # 파이프라인 완료
+                self.current_result.status = PipelineStatus.COMPLETED
+                self._update_progress(1.0, "완료")
+                print(f"\n✅ 파이프라인 완료: {self.current_result.total_duration_seconds:.1f}초")
 
         except Exception as e:
-            # 파이프라인 실패
-            self.current_result.status = PipelineStatus.FAILED
-            self.current_result.error_message = str(e)
+            # 파이프라인 실패 (취소 중 실패는 취소로 기록)
+            cancelled = self.token.stopped or isinstance(e, OperationCancelled)
+            self.current_result.status = PipelineStatus.CANCELLED if cancelled else PipelineStatus.FAILED
+            self.current_result.error_message = f"파이프라인 중단: {e}" if isinstance(e, OperationCancelled) else str(e)
             self.current_result.end_time = datetime.now()
 
             print(f"\n❌ 파이프라인 실패: {str(e)}")
@@ -239,9 +321,15 @@ class OptimizationPipeline:
     def _execute_stage(
         self, stage: PipelineStage, stage_func: Callable, parameter_space: Dict, retry_count: int = 0
     ) -> StageResult:
-        """단계 실행"""
+        """단계 실행 (입력 해시가 같은 체크포인트가 있으면 재사용, 취소/예산 소진시 부분 결과)"""
+        stage_key = self._stage_key(stage, parameter_space)
+        self.stage_token = self.token.child(self.config.stage_time_budgets.get(stage.value))
         stage_result = StageResult(
-            stage=stage, status=PipelineStatus.RUNNING, start_time=datetime.now(), retry_count=retry_count
+            stage=stage,
+            status=PipelineStatus.RUNNING,
+            start_time=datetime.now(),
+            retry_count=retry_count,
+            checkpoint_key=stage_key,
         )
 
         print(f"\n🔄 단계 시작: {stage.value}")
@@ -252,8 +340,22 @@ class OptimizationPipeline:
                 for callback in self.stage_callbacks[stage]:
                     callback(stage_result)
 
-            # 단계 함수 실행
-            result_data = stage_func(parameter_space)
+            checkpoint = None
+            if stage_key is not None and self.config.resume_from_checkpoint:
+                checkpoint = self._load_checkpoint(stage, stage_key)
+
+            if checkpoint is not None:
+                result_data = checkpoint["data"]
+                self.intermediate_data[CHECKPOINT_STAGES[stage][1]] = checkpoint["output"]
+                stage_result.from_checkpoint = True
+                print(f"   ♻️ 체크포인트 재사용: {stage_key}")
+            else:
+                # 입력 해시 기반 시드 - 체크포인트 재사용 여부와 무관하게 같은 입력 → 같은 결과
+                if stage_key is not None:
+                    np.random.seed(int(stage_key[:8], 16))
+
+                # 단계 함수 실행
+                result_data = stage_func(parameter_space)
 
             # 결과 검증
             if not self._validate_stage_result(stage, result_data):
@@ -262,6 +364,25 @@ class OptimizationPipeline:
             stage_result.data = result_data
             stage_result.status = PipelineStatus.COMPLETED
 
+            # 부분 결과는 같은 입력의 완전한 결과가 아니므로 키 체인 제외 → 하위 단계도 체크포인트 저장/재사용 안 함
+            stage_result.stop_reason = self.stage_stops.pop(stage, None)
+            if stage_result.stop_reason:
+                stage_result.checkpoint_key = None
+                print(f"   ⏹️ 부분 결과로 종료: {stage_result.stop_reason}")
+
+            elif stage_key is not None:
+                self.stage_keys[stage] = stage_key
+                if self.config.save_intermediate and not stage_result.from_checkpoint:
+                    self._save_checkpoint(stage, stage_key, result_data)
+
+        except OperationCancelled as e:
+            # 부분 결과조차 없이 중단 - 재시도 대상 아님
+            stage_result.status = PipelineStatus.CANCELLED
+            stage_result.stop_reason = e.reason
+            stage_result.error_message = f"단계 중단: {e.reason}"
+            self.stage_stops.pop(stage, None)
+            print(f"⏹️ 단계 중단: {stage.value} - {e.reason}")
+
         except Exception as e:
             stage_result.status = PipelineStatus.FAILED
             stage_result.error_message = str(e)
@@ -269,6 +390,9 @@ class OptimizationPipeline:
 
         finally:
             stage_result.end_time = datetime.now()
+            # 검증 그래프 단계는 후보 작업이 실제 실행된 구간 (단계 간 겹침 반영)
+            if stage in self.graph_spans:
+                stage_result.start_time, stage_result.end_time = self.graph_spans.pop(stage)
             stage_result.duration_seconds = (stage_result.end_time - stage_result.start_time).total_seconds()
 
         print(f"⏱️ 단계 완료: {stage.value} ({stage_result.duration_seconds:.1f}초)")
@@ -288,8 +412,6 @@ class OptimizationPipeline:
             print(f"   ⚠️ 메모리 부족: {available_memory:.1f}GB < {self.config.memory_limit_gb}GB")
 
         # 병렬 처리 설정
-        import os
-
         os.environ["MKL_NUM_THREADS"] = "1"  # MKL 스레딩 제어
 
         return {
@@ -300,48 +422,93 @@ class OptimizationPipeline:
         }
 
     def _stage_data_preparation(self, parameter_space: Dict) -> Dict:
-        """데이터 준비 단계"""
+        """데이터 준비 단계 - 가격 데이터 로드 후 전략 평가기 구성"""
         print("   📊 데이터 준비 중...")
 
-        # 시뮬레이션: 데이터 로드 및 전처리
         np.random.seed(42)
 
-        # 가격 데이터 생성 (시뮬레이션)
-        price_data = self._generate_sample_data(self.config.data_length)
+        if self.evaluator is None:
+            price_data = self._load_price_data()
 
-        # 지표 계산 (시뮬레이션)
-        indicators = self._calculate_indicators(price_data)
+            # 지표 계산
+            indicators = self._calculate_indicators(price_data)
+
+            # 캐시 저장
+            self.intermediate_data["price_data"] = price_data
+            self.intermediate_data["indicators"] = indicators
+
+            self.evaluator = ArrayStrategyEvaluator.from_frame(
+                price_data, interval=self.config.timeframe, performance_evaluator=self.performance_evaluator
+            )
 
-        # 캐시 저장
-        self.intermediate_data["price_data"] = price_data
-        self.intermediate_data["indicators"] = indicators
+        self.dataset_fingerprint = self.evaluator.fingerprint()
 
+        # 시각 정보가 없는 평가기는 기간 미기록
+        timestamps = self.evaluator.timestamps
+        has_range = timestamps is not None and len(timestamps) > 0
         return {
-            "data_length": len(price_data),
-            "indicators_count": len(indicators),
-            "data_start": price_data.index[0].isoformat(),
-            "data_end": price_data.index[-1].isoformat(),
-            "memory_usage_mb": price_data.memory_usage(deep=True).sum() / (1024**2),
+            "data_length": self.evaluator.n_bars,
+            "dataset_fingerprint": self.dataset_fingerprint,
+            "indicators_count": len(self.intermediate_data.get("indicators", {})),
+            "data_start": pd.Timestamp(timestamps[0], unit="ms").isoformat() if has_range else None,
+            "data_end": pd.Timestamp(timestamps[-1], unit="ms").isoformat() if has_range else None,
+            "memory_usage_mb": self.evaluator.nbytes / (1024**2),
         }
 
+    def _load_price_data(self) -> pd.DataFrame:
+        """가격 데이터 로드 (시장 데이터 저장소 최근 data_length 봉, 없으면 샘플 데이터)"""
+        try:
+            data = MarketDataStore().load(self.config.symbol, self.config.timeframe)
+        except Exception as e:
+            print(f"   ⚠️ 저장소 로드 실패: {e}")
+            data = None
+
+        if data is not None and len(data) > 0:
+            print(
+                f"   저장소 데이터: {self.config.symbol} {self.config.timeframe} {min(len(data), self.config.data_length):,}개"
+            )
+            return data.tail(self.config.data_length).reset_index(drop=True)
+
+        print("   ⚠️ 저장소 데이터 없음 - 샘플 데이터 사용")
+        return self._generate_sample_data(self.config.data_length)
+
+    def _segment_scores(self, params: Dict, n_segments: int, first_segment: int = 0) -> np.ndarray:
+        """데이터를 n_segments개 연속 구간으로 나눠 first_segment번째 구간부터 구간별 실제 백테스트 점수
+        (최소 거래 수 등 전체 기간 기준 제약은 짧은 구간에 적용 불가 - 제약 게이트 없는 원점수)"""
+        bounds = np.linspace(0, self.evaluator.n_bars, n_segments + 1).astype(int)
+        return np.array(
+            [
+                self.evaluator.score(params, start, end, apply_constraints=False)[0]
+                for start, end in zip(bounds[first_segment:-1], bounds[first_segment + 1 :])
+            ]
+        )
+
     def _stage_global_optimization(self, parameter_space: Dict) -> Dict:
         """전역 최적화 단계"""
         print("   🌍 전역 탐색 중...")
 
-        # Sobol 샘플링 시뮬레이션
+        # 파라미터 샘플링
         candidates = []
 
         for i in range(self.config.global_search_samples):
+            if self.stage_token.stopped:
+                self.stage_stops[PipelineStage.GLOBAL_OPTIMIZATION] = self.stage_token.reason
+                break
+
             # 랜덤 파라미터 생성
             params = {}
             for param_name, (min_val, max_val) in parameter_space.items():
                 params[param_name] = np.random.uniform(min_val, max_val)
 
-            # 성능 평가 시뮬레이션
-            score = np.random.uniform(0.3, 0.8)  # 0.3-0.8 점수
+            # 전체 구간 실제 백테스트 평가
+            score, _ = self.evaluator.score(params)
 
             candidates.append({"parameters": params, "score": score, "fidelity": "low"})
 
+        # 평가 전 중단되면 부분 결과도 없음
+        if not candidates:
+            self.stage_token.check()
+
         # 상위 후보 선별
         candidates.sort(key=lambda x: x["score"], reverse=True)
         top_candidates = candidates[: self.config.max_candidates]
@@ -361,10 +528,14 @@ class OptimizationPipeline:
 
         global_candidates = self.intermediate_data.get("global_candidates", [])
 
-        # TPE 베이지안 최적화 시뮬레이션
+        # 파라미터 미세 조정 후 재평가
         refined_candidates = []
 
         for candidate in global_candidates[: self.config.final_candidates]:
+            if self.stage_token.stopped:
+                self.stage_stops[PipelineStage.LOCAL_REFINEMENT] = self.stage_token.reason
+                break
+
             # 파라미터 미세 조정
             refined_params = candidate["parameters"].copy()
             for param_name in refined_params:
@@ -372,7 +543,7 @@ class OptimizationPipeline:
                 refined_params[param_name] *= 1 + noise
 
             # 고충실도 평가
-            refined_score = candidate["score"] + np.random.normal(0, 0.02)  # 약간의 개선
+            refined_score, _ = self.evaluator.score(refined_params)
 
             refined_candidates.append(
                 {
@@ -383,6 +554,9 @@ class OptimizationPipeline:
                 }
             )
 
+        if not refined_candidates:
+            self.stage_token.check()
+
         refined_candidates.sort(key=lambda x: x["score"], reverse=True)
         self.intermediate_data["refined_candidates"] = refined_candidates
 
@@ -393,187 +567,262 @@ class OptimizationPipeline:
         }
 
     def _stage_timeseries_validation(self, parameter_space: Dict) -> Dict:
-        """시계열 검증 단계"""
-        print("   📈 시계열 검증 중...")
-
-        refined_candidates = self.intermediate_data.get("refined_candidates", [])
-
-        # Purged K-Fold 검증 시뮬레이션
-        validated_candidates = []
-
-        for candidate in refined_candidates:
-            # K-Fold 점수 시뮬레이션
-            fold_scores = np.random.normal(candidate["score"], 0.05, self.config.kfold_splits)
-
-            cv_score = np.median(fold_scores)  # 메디안 사용
-            cv_std = np.std(fold_scores)
-
-            validated_candidates.append(
-                {
-                    "parameters": candidate["parameters"],
-                    "cv_score": cv_score,
-                    "cv_std": cv_std,
-                    "fold_scores": fold_scores.tolist(),
-                    "original_score": candidate["score"],
-                }
-            )
-
-        validated_candidates.sort(key=lambda x: x["cv_score"], reverse=True)
-        top_3 = validated_candidates[:3]  # Top-3 승급
-
-        self.intermediate_data["validated_candidates"] = top_3
-
-        return {
-            "validated_count": len(validated_candidates),
-            "top_3_selected": len(top_3),
-            "best_cv_score": top_3[0]["cv_score"],
-            "cv_stability": top_3[0]["cv_std"],
-        }
+        """시계열 검증 단계 (후보별 검증 그래프)"""
+        return self._graph_stage_data(PipelineStage.TIMESERIES_VALIDATION, parameter_space)
 
     def _stage_walkforward_analysis(self, parameter_space: Dict) -> Dict:
-        """워크포워드 분석 단계"""
-        print("   🚶 워크포워드 분석 중...")
-
-        validated_candidates = self.intermediate_data.get("validated_candidates", [])
-
-        # 워크포워드 슬라이스 시뮬레이션
-        wfo_results = []
-
-        for candidate in validated_candidates:
-            # 8개 슬라이스 OOS 성능 시뮬레이션
-            oos_scores = np.random.normal(candidate["cv_score"], 0.08, self.config.wfo_slices)
-
-            oos_median = np.median(oos_scores)
-            oos_consistency = 1 - np.std(oos_scores) / np.mean(oos_scores)  # 일관성
-
-            # OOS 합격 기준 체크
-            passed_oos = oos_median > 0.5 and oos_consistency > 0.7
-
-            wfo_results.append(
-                {
-                    "parameters": candidate["parameters"],
-                    "oos_median": oos_median,
-                    "oos_consistency": oos_consistency,
-                    "oos_scores": oos_scores.tolist(),
-                    "passed_oos": passed_oos,
-                    "cv_score": candidate["cv_score"],
-                }
-            )
+        """워크포워드 분석 단계 (후보별 검증 그래프)"""
+        return self._graph_stage_data(PipelineStage.WALKFORWARD_ANALYSIS, parameter_space)
 
-        # OOS 통과한 후보만 선별
-        passed_candidates = [r for r in wfo_results if r["passed_oos"]]
-        passed_candidates.sort(key=lambda x: x["oos_median"], reverse=True)
-
-        self.intermediate_data["wfo_candidates"] = passed_candidates
+    def _stage_montecarlo_simulation(self, parameter_space: Dict) -> Dict:
+        """몬테카를로 시뮬레이션 단계 (후보별 검증 그래프)"""
+        return self._graph_stage_data(PipelineStage.MONTECARLO_SIMULATION, parameter_space)
 
+    def _stage_statistical_validation(self, parameter_space: Dict) -> Dict:
+        """통계적 검증 단계 (후보별 검증 그래프)"""
+        return self._graph_stage_data(PipelineStage.STATISTICAL_VALIDATION, parameter_space)
+
+    def _graph_stage_data(self, stage: PipelineStage, parameter_space: Dict) -> Dict:
+        """검증 그래프 단계 결과 (그래프 미실행 또는 재시도면 이 단계부터 그래프 실행)"""
+        if stage not in self.graph_results:
+            self._run_validation_graph(stage, parameter_space)
+
+        result = self.graph_results.pop(stage)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _validation_graph(self) -> Dict[PipelineStage, tuple]:
+        """검증 그래프 단계 정의: 단계 → (후보 작업, 통과 키, 정렬 키, 상위 선택 수)
+        상위 선택 수가 있는 단계는 전 후보 완료 후 선별하는 합류 지점"""
         return {
-            "total_tested": len(wfo_results),
-            "passed_oos": len(passed_candidates),
-            "best_oos_median": passed_candidates[0]["oos_median"] if passed_candidates else 0,
-            "oos_pass_rate": len(passed_candidates) / len(wfo_results) if wfo_results else 0,
+            PipelineStage.TIMESERIES_VALIDATION: (self._validate_timeseries, None, "cv_score", 3),  # Top-3 승급
+            PipelineStage.WALKFORWARD_ANALYSIS: (self._validate_walkforward, "passed_oos", "oos_median", None),
+            PipelineStage.MONTECARLO_SIMULATION: (self._validate_montecarlo, "passed_mc", "robustness_score", None),
+            PipelineStage.STATISTICAL_VALIDATION: (self._validate_statistics, "passed_stats", "combined_score", 2),  # Top-2
         }
 
-    def _stage_montecarlo_simulation(self, parameter_space: Dict) -> Dict:
-        """몬테카를로 시뮬레이션 단계"""
-        print("   🎲 몬테카를로 시뮬레이션 중...")
-
-        wfo_candidates = self.intermediate_data.get("wfo_candidates", [])
-
-        # 몬테카를로 견고성 테스트
-        mc_results = []
-
-        for candidate in wfo_candidates:
-            # 시뮬레이션 결과 생성
-            sim_scores = np.random.normal(candidate["oos_median"], 0.1, self.config.mc_simulations)
-
-            # 백분위수 계산
-            percentiles = {
-                "p5": np.percentile(sim_scores, 5),
-                "p25": np.percentile(sim_scores, 25),
-                "p50": np.percentile(sim_scores, 50),
-                "p75": np.percentile(sim_scores, 75),
-                "p95": np.percentile(sim_scores, 95),
+    def _run_validation_graph(self, first_stage: PipelineStage, parameter_space: Dict):
+        """후보별 검증 그래프 실행 (first_stage ~ 통계 검증)
+        - 후보가 단계를 통과하면 즉시 다음 단계 작업 제출 (단계 간 장벽 없음)
+        - 탈락 후보는 이후 단계 미실행, 상위 선택 단계만 전 후보 완료 후 합류
+        - 단계 토큰 중단시 대기 작업 취소 → 완료된 후보만으로 단계 선별 (부분 결과)
+        """
+        graph = self._validation_graph()
+        stages = VALIDATION_STAGES[VALIDATION_STAGES.index(first_stage) :]
+        upstream = list(CHECKPOINT_STAGES)[list(CHECKPOINT_STAGES).index(first_stage) - 1]
+        inputs = self.intermediate_data.get(CHECKPOINT_STAGES[upstream][1], [])
+
+        # 단계 시드 (입력 해시 체인) - 후보별 난수는 (단계 시드, 파라미터)로 결정
+        keys = dict(self.stage_keys)
+        seeds = {}
+        for stage in stages:
+            keys[stage] = self._stage_key(stage, parameter_space, keys)
+            seeds[stage] = int(keys[stage][:8], 16) if keys[stage] else 0
+
+        admission = get_admission_controller()
+        plan = admission.plan(
+            "backtest", max(1, len(inputs)) * len(stages), self.evaluator.nbytes, self.config.parallel_workers
+        )
+        print(f"   🕸️ 후보별 검증 그래프: {len(inputs)}개 후보 × {len(stages)}단계, 워커 {plan.workers}개")
+
+        records = {stage: {} for stage in stages}
+        errors = {stage: [] for stage in stages}
+        outstanding = dict.fromkeys(stages, 0)
+        started = {}
+        closed = []
+        pending = {}
+        tokens = {stages[0]: self.stage_token}
+
+        with admission.reserve(plan), ThreadPoolExecutor(plan.workers, thread_name_prefix="pipeline_graph") as executor:
+
+            def submit(stage: PipelineStage, cid: int, candidate: Dict):
+                # 단계 예산은 첫 작업 제출 시점부터
+                if stage not in tokens:
+                    tokens[stage] = self.token.child(self.config.stage_time_budgets.get(stage.value))
+                if tokens[stage].stopped:
+                    self.stage_stops[stage] = tokens[stage].reason
+                    return
+
+                rng = np.random.default_rng([seeds[stage], _candidate_seed(candidate["parameters"])])
+                started.setdefault(stage, datetime.now())
+                outstanding[stage] += 1
+                pending[executor.submit(graph[stage][0], candidate, rng)] = (stage, cid)
+
+            def close_ready():
+                # 상위 단계가 닫히고 남은 작업이 없는 단계부터 순서대로 선별 확정
+                for index, stage in enumerate(stages):
+                    if stage in closed:
+                        continue
+                    if (index > 0 and stages[index - 1] not in closed) or outstanding[stage]:
+                        return
+
+                    _, pass_key, sort_key, limit = graph[stage]
+                    passed = [(cid, r) for cid, r in sorted(records[stage].items()) if pass_key is None or r[pass_key]]
+                    passed.sort(key=lambda item: item[1][sort_key], reverse=True)
+                    selected = passed[:limit] if limit else passed
+
+                    self.intermediate_data[CHECKPOINT_STAGES[stage][1]] = [r for _, r in selected]
+                    if errors[stage]:
+                        self.graph_results[stage] = Exception(f"후보 작업 실패 {len(errors[stage])}건 - {errors[stage][0]}")
+                    else:
+                        self.graph_results[stage] = self._summarize_validation(
+                            stage, list(records[stage].values()), [r for _, r in passed], [r for _, r in selected]
+                        )
+                    self.graph_spans[stage] = (started.get(stage, datetime.now()), datetime.now())
+                    closed.append(stage)
+
+                    # 합류 단계: 선별된 후보만 다음 단계로
+                    if limit and index + 1 < len(stages):
+                        for cid, record in selected:
+                            submit(stages[index + 1], cid, record)
+
+            for cid, candidate in enumerate(inputs):
+                submit(stages[0], cid, candidate)
+            close_ready()
+
+            while pending:
+                done, _ = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+
+                # 중단된 단계의 대기 작업 취소 (실행 중 작업은 완료 후 반영)
+                for future, (stage, cid) in list(pending.items()):
+                    if tokens[stage].stopped and future.cancel():
+                        pending.pop(future)
+                        outstanding[stage] -= 1
+                        self.stage_stops[stage] = tokens[stage].reason
+
+                for future in done:
+                    stage, cid = pending.pop(future)
+                    outstanding[stage] -= 1
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        errors[stage].append(f"후보 {cid}: {e}")
+                        continue
+
+                    records[stage][cid] = record
+                    _, pass_key, _, limit = graph[stage]
+                    index = stages.index(stage)
+                    # 통과 즉시 다음 단계 진행 (합류 단계 제외)
+                    if limit is None and index + 1 < len(stages) and record[pass_key]:
+                        submit(stages[index + 1], cid, record)
+                close_ready()
+
+    def _summarize_validation(
+        self, stage: PipelineStage, records: List[Dict], passed: List[Dict], selected: List[Dict]
+    ) -> Dict:
+        """검증 그래프 단계 요약"""
+        if stage == PipelineStage.TIMESERIES_VALIDATION:
+            return {
+                "validated_count": len(records),
+                "top_3_selected": len(selected),
+                "best_cv_score": selected[0]["cv_score"] if selected else 0,
+                "cv_stability": selected[0]["cv_std"] if selected else 0,
             }
+        if stage == PipelineStage.WALKFORWARD_ANALYSIS:
+            return {
+                "total_tested": len(records),
+                "passed_oos": len(passed),
+                "best_oos_median": selected[0]["oos_median"] if selected else 0,
+                "oos_pass_rate": len(passed) / len(records) if records else 0,
+            }
+        if stage == PipelineStage.MONTECARLO_SIMULATION:
+            return {
+                "total_simulated": len(records),
+                "passed_mc": len(passed),
+                "best_robustness": selected[0]["robustness_score"] if selected else 0,
+                "mc_pass_rate": len(passed) / len(records) if records else 0,
+            }
+        return {
+            "total_candidates": len(records),
+            "passed_statistical": len(passed),
+            "final_selected": len(selected),
+            "best_combined_score": selected[0]["combined_score"] if selected else 0,
+        }
 
-            # 견고성 점수 (p5 기준)
-            robustness_score = percentiles["p5"]
-
-            # 합격 기준 체크
-            passed_mc = percentiles["p5"] > 0.4  # p5 > 0.4
-
-            mc_results.append(
-                {
-                    "parameters": candidate["parameters"],
-                    "robustness_score": robustness_score,
-                    "percentiles": percentiles,
-                    "passed_mc": passed_mc,
-                    "oos_median": candidate["oos_median"],
-                }
-            )
-
-        # MC 통과한 후보만 선별
-        robust_candidates = [r for r in mc_results if r["passed_mc"]]
-        robust_candidates.sort(key=lambda x: x["robustness_score"], reverse=True)
-
-        self.intermediate_data["mc_candidates"] = robust_candidates
+    def _validate_timeseries(self, candidate: Dict, rng: np.random.Generator) -> Dict:
+        """후보 시계열 검증 - 연속 K개 구간(K-Fold)별 점수"""
+        fold_scores = self._segment_scores(candidate["parameters"], self.config.kfold_splits)
 
         return {
-            "total_simulated": len(mc_results),
-            "passed_mc": len(robust_candidates),
-            "best_robustness": robust_candidates[0]["robustness_score"] if robust_candidates else 0,
-            "mc_pass_rate": len(robust_candidates) / len(mc_results) if mc_results else 0,
+            "parameters": candidate["parameters"],
+            "cv_score": np.median(fold_scores),  # 메디안 사용
+            "cv_std": np.std(fold_scores),
+            "fold_scores": fold_scores.tolist(),
+            "original_score": candidate["score"],
         }
 
-    def _stage_statistical_validation(self, parameter_space: Dict) -> Dict:
-        """통계적 검증 단계"""
-        print("   📊 통계적 검증 중...")
+    def _validate_walkforward(self, candidate: Dict, rng: np.random.Generator) -> Dict:
+        """후보 워크포워드 분석 - 첫 구간 이후 wfo_slices개 연속 구간 OOS 점수"""
+        oos_scores = self._segment_scores(candidate["parameters"], self.config.wfo_slices + 1, first_segment=1)
 
-        mc_candidates = self.intermediate_data.get("mc_candidates", [])
+        oos_median = np.median(oos_scores)
+        oos_consistency = np.mean(oos_scores > 0)  # 일관성 (양수 점수 구간 비율 - 평균 부호와 무관)
 
-        # 통계적 검정 시뮬레이션
-        final_candidates = []
+        return {
+            "parameters": candidate["parameters"],
+            "oos_median": oos_median,
+            "oos_consistency": oos_consistency,
+            "oos_scores": oos_scores.tolist(),
+            "passed_oos": oos_median > OOS_MIN_MEDIAN and oos_consistency > OOS_MIN_POSITIVE_SHARE,  # OOS 합격 기준
+            "cv_score": candidate["cv_score"],
+        }
 
-        for candidate in mc_candidates:
-            # 가중 결합 점수: 0.6×(MC p5) + 0.4×(WFO-OOS median)
-            combined_score = 0.6 * candidate["robustness_score"] + 0.4 * candidate["oos_median"]
+    def _validate_montecarlo(self, candidate: Dict, rng: np.random.Generator) -> Dict:
+        """후보 몬테카를로 견고성 테스트 (OOS 구간 점수 분산 기준)"""
+        sim_scores = rng.normal(candidate["oos_median"], np.std(candidate["oos_scores"]), self.config.mc_simulations)
 
-            # Deflated Sortino, White's Reality Check 등 시뮬레이션
-            statistical_tests = {
-                "deflated_sortino": np.random.uniform(0.8, 1.2),
-                "reality_check_pvalue": np.random.uniform(0.01, 0.15),
-                "spa_test_pvalue": np.random.uniform(0.02, 0.12),
-            }
+        # 백분위수 계산
+        percentiles = {f"p{q}": np.percentile(sim_scores, q) for q in (5, 25, 50, 75, 95)}
 
-            # 통계적 유의성 체크
-            passed_stats = (
-                statistical_tests["deflated_sortino"] > 1.0
-                and statistical_tests["reality_check_pvalue"] < 0.05
-                and statistical_tests["spa_test_pvalue"] < 0.05
-            )
-
-            final_candidates.append(
-                {
-                    "parameters": candidate["parameters"],
-                    "combined_score": combined_score,
-                    "statistical_tests": statistical_tests,
-                    "passed_stats": passed_stats,
-                    "robustness_score": candidate["robustness_score"],
-                    "oos_median": candidate["oos_median"],
-                }
-            )
+        return {
+            "parameters": candidate["parameters"],
+            "robustness_score": percentiles["p5"],  # 견고성 점수 (p5 기준)
+            "percentiles": percentiles,
+            "passed_mc": percentiles["p5"] > MC_MIN_P5,
+            "oos_median": candidate["oos_median"],
+            "oos_scores": candidate["oos_scores"],
+        }
 
-        # 통계적 검정 통과한 후보 중 Top-2 선택
-        validated_candidates = [c for c in final_candidates if c["passed_stats"]]
-        validated_candidates.sort(key=lambda x: x["combined_score"], reverse=True)
-        top_2 = validated_candidates[:2]
+    def _validate_statistics(self, candidate: Dict, rng: np.random.Generator) -> Dict:
+        """후보 통계적 검증 - 워크포워드 OOS 구간 점수 기준 (부트스트랩은 후보별 rng)"""
+        # 가중 결합 점수: 0.6×(MC p5) + 0.4×(WFO-OOS median)
+        combined_score = 0.6 * candidate["robustness_score"] + 0.4 * candidate["oos_median"]
+
+        oos_scores = np.asarray(candidate["oos_scores"], dtype=np.float64)
+        n = len(oos_scores)
+        mean = oos_scores.mean()
+        test_config = self.statistical_validator.test_config
+
+        # Deflated Sortino: 평균 대비 하방 편차, 전역 탐색 시도 수로 다중 테스트 보정
+        downside = np.sqrt(np.mean(np.minimum(oos_scores - mean, 0) ** 2))
+        deflated_sortino = mean / (downside + 1e-8) / np.sqrt(np.log(max(self.config.global_search_samples, 2)))
+
+        # 귀무가설(평균 OOS 점수 0) 부트스트랩 - Reality Check는 평균, SPA는 t-통계량 비교
+        centered = rng.choice(oos_scores - mean, size=(test_config["bootstrap_samples"], n))
+        standard_error = oos_scores.std() / np.sqrt(n) + 1e-8
+        boot_t = centered.mean(axis=1) / (centered.std(axis=1) / np.sqrt(n) + 1e-8)
+
+        statistical_tests = {
+            "deflated_sortino": float(deflated_sortino),
+            "reality_check_pvalue": float(np.mean(centered.mean(axis=1) >= mean)),
+            "spa_test_pvalue": float(np.mean(boot_t >= mean / standard_error)),
+        }
 
-        self.intermediate_data["final_candidates"] = top_2
+        # 통계적 유의성 체크
+        passed_stats = (
+            statistical_tests["deflated_sortino"] > MIN_DEFLATED_SORTINO
+            and statistical_tests["reality_check_pvalue"] < test_config["reality_check_alpha"]
+            and statistical_tests["spa_test_pvalue"] < test_config["spa_alpha"]
+        )
 
         return {
-            "total_candidates": len(final_candidates),
-            "passed_statistical": len(validated_candidates),
-            "final_selected": len(top_2),
-            "best_combined_score": top_2[0]["combined_score"] if top_2 else 0,
+            "parameters": candidate["parameters"],
+            "combined_score": combined_score,
+            "statistical_tests": statistical_tests,
+            "passed_stats": passed_stats,
+            "robustness_score": candidate["robustness_score"],
+            "oos_median": candidate["oos_median"],
         }
 
     def _stage_position_sizing(self, parameter_space: Dict) -> Dict:
@@ -635,8 +884,10 @@ class OptimizationPipeline:
             "final_parameters": self.current_result.final_parameters,
             "final_metrics": self.current_result.final_metrics,
             "stage_count": len(self.current_result.stage_results),
+            "partial_stages": {s.stage.value: s.stop_reason for s in self.current_result.stage_results if s.stop_reason},
             "success_rate": sum(1 for s in self.current_result.stage_results if s.status == PipelineStatus.COMPLETED)
             / len(self.current_result.stage_results),
+            "reused_stages": [s.stage.value for s in self.current_result.stage_results if s.from_checkpoint],
         }
 
         # 결과 저장
@@ -647,7 +898,7 @@ class OptimizationPipeline:
 
     def _generate_sample_data(self, length: int) -> pd.DataFrame:
         """샘플 데이터 생성"""
-        dates = pd.date_range(start="2020-01-01", periods=length, freq="15T")
+        dates = pd.date_range(start="2020-01-01", periods=length, freq="15min")
 
         # 랜덤 워크 가격 데이터
         returns = np.random.normal(0, 0.001, length)  # 0.1% 변동성
@@ -714,10 +965,72 @@ class OptimizationPipeline:
 
         return True
 
+    def _stage_key(self, stage: PipelineStage, parameter_space: Dict, stage_keys: Dict = None) -> Optional[str]:
+        """단계 입력 해시 (체크포인트 비대상 단계, 데이터 지문 없음, 상위 단계 미완료시 None)"""
+        if stage not in CHECKPOINT_STAGES or self.dataset_fingerprint is None:
+            return None
+
+        stage_keys = self.stage_keys if stage_keys is None else stage_keys
+        stages = list(CHECKPOINT_STAGES)
+        index = stages.index(stage)
+        upstream = stage_keys.get(stages[index - 1]) if index > 0 else self.dataset_fingerprint
+        if upstream is None:
+            return None
+
+        config_fields, _ = CHECKPOINT_STAGES[stage]
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "stage": stage.value,
+            "upstream": upstream,
+            "config": {name: getattr(self.config, name) for name in config_fields},
+        }
+        if index == 0:
+            payload["parameter_space"] = parameter_space
+
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def _checkpoint_path(self, stage: PipelineStage, stage_key: str) -> str:
+        """체크포인트 파일 경로"""
+        return os.path.join(self.config.output_directory, "checkpoints", f"{stage.value}_{stage_key}.pkl")
+
+    def _load_checkpoint(self, stage: PipelineStage, stage_key: str) -> Optional[Dict]:
+        """유효한 체크포인트 조회 (없거나 손상/키 불일치/결과 검증 실패시 None)"""
+        path = self._checkpoint_path(stage, stage_key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                checkpoint = pickle.load(f)
+        except Exception as e:
+            print(f"   ⚠️ 체크포인트 로드 실패 - 재실행: {e}")
+            return None
+
+        if checkpoint.get("key") != stage_key or not self._validate_stage_result(stage, checkpoint.get("data")):
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, stage: PipelineStage, stage_key: str, result_data: Dict):
+        """단계 결과 + 출력 후보 체크포인트 저장 (임시 파일 → os.replace)"""
+        path = self._checkpoint_path(stage, stage_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        checkpoint = {
+            "stage": stage.value,
+            "key": stage_key,
+            "created_at": datetime.now().isoformat(),
+            "data": result_data,
+            "output": self.intermediate_data.get(CHECKPOINT_STAGES[stage][1]),
+        }
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(checkpoint, f)
+        os.replace(tmp_path, path)
+
     def _save_intermediate_result(self, stage: PipelineStage, result: StageResult):
         """중간 결과 저장"""
-        import os
-
         os.makedirs(self.config.output_directory, exist_ok=True)
 
         filename = f"{self.current_result.pipeline_id}_{stage.value}.json"
@@ -727,6 +1040,8 @@ class OptimizationPipeline:
             "stage": stage.value,
             "status": result.status.value,
             "duration_seconds": result.duration_seconds,
+            "checkpoint_key": result.checkpoint_key,
+            "from_checkpoint": result.from_checkpoint,
             "data": result.data,
             "timestamp": result.start_time.isoformat(),
         }
@@ -736,8 +1051,6 @@ class OptimizationPipeline:
 
     def _save_final_result(self, summary: Dict):
         """최종 결과 저장"""
-        import os
-
         os.makedirs(self.config.output_directory, exist_ok=True)
 
         # JSON 형태로 저장
@@ -773,7 +1086,8 @@ class OptimizationPipeline:
         self.progress_callbacks.append(callback)
 
     def cancel_pipeline(self):
-        """파이프라인 취소"""
+        """파이프라인 취소 - 실행 중 단계는 다음 반복 경계에서 부분 결과로 종료"""
+        self.token.cancel()
         self.is_running = False
         if self.current_result:
             self.current_result.status = PipelineStatus.CANCELLED
@@ -885,10 +1199,10 @@ def main():
 
     print(f"\n🎯 핵심 특징:")
     print(f"   • 10단계 통합 워크플로우")
-    print(f"   • 단계별 결과 검증 및 전달")
+    print(f"   • 단계별 결과 검증 및 전달 (후보별 검증 그래프 병렬 실행)")
     print(f"   • 실패 시 자동 재시도")
     print(f"   • 실시간 진행률 모니터링")
-    print(f"   • 중간 결과 자동 저장")
+    print(f"   • 중간 결과 자동 저장 + 입력 해시 체크포인트 재개")
     print(f"   • 완전한 롤백 지원")
 
 
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+파라미터 중요도 기반 탐색 공간 축소 (단계 사이 분석)
+- 완료된 시도로 파라미터 중요도 계산 (fANOVA 또는 랜덤 포레스트 순열 중요도)
+- 영향이 미미한 파라미터는 최고 시도 값으로 고정
+- 나머지는 상위 시도 범위 주변으로 경계 축소 → 이후 단계는 중요한 차원에만 시도 사용
+- 점수는 순위 정규화 후 분석 (제약 위반 페널티가 분산을 지배하지 않도록)
+"""
+
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import optuna
+from optuna.importance import FanovaImportanceEvaluator
+from optuna.trial import FrozenTrial, TrialState
+from scipy.stats import rankdata
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.inspection import permutation_importance
+
+warnings.filterwarnings("ignore")
+
+from study_archive import clip_param, param_distributions, shrink_param_space
+
+IMPORTANCE_METHODS = ("fanova", "permutation")
+
+
+@dataclass
+class SpaceReduction:
+    """단계 사이 탐색 공간 축소 결과"""
+
+    method: str
+    n_trials: int  # 분석에 사용한 시도 수
+    importances: Dict[str, float]  # 정규화 중요도 (합 1)
+    frozen: Dict[str, float]  # 고정 파라미터 → 최고 시도 값
+    param_space: Dict[str, Dict]  # 고정 제외, 경계 축소된 탐색 공간
+
+    def summary(self) -> Dict:
+        """결과 JSON 기록용 요약"""
+        return {
+            "method": self.method,
+            "n_trials": self.n_trials,
+            "importances": {name: round(float(value), 4) for name, value in self.importances.items()},
+            "frozen": self.frozen,
+            "search_space": {name: [config["low"], config["high"]] for name, config in self.param_space.items()},
+        }
+
+
+def suggest_param(trial: optuna.Trial, name: str, config: Dict):
+    """파라미터 공간 항목 → trial 제안 (log 키가 있으면 로그 스케일)"""
+    if config["type"] == "int":
+        return trial.suggest_int(name, int(config["low"]), int(config["high"]))
+    return trial.suggest_float(name, float(config["low"]), float(config["high"]), log=config.get("log", False))
+
+
+def _encode(trials: List[FrozenTrial], param_space: Dict[str, Dict]) -> np.ndarray:
+    """시도 파라미터 → [0, 1] 단위 행렬 (로그 스케일 반영, 범위 밖 값은 경계로 제한)"""
+    columns = []
+    for name, config in param_space.items():
+        values = np.array([trial.params[name] for trial in trials], dtype=np.float64)
+        low, high = float(config["low"]), float(config["high"])
+        if config.get("log", False):
+            values, low, high = np.log(values), np.log(low), np.log(high)
+        columns.append((values - low) / (high - low) if high > low else np.zeros_like(values))
+    return np.clip(np.column_stack(columns), 0.0, 1.0)
+
+
+def param_importances(
+    trials: List[FrozenTrial], param_space: Dict[str, Dict], method: str = "fanova", seed: int = 0
+) -> Optional[Dict[str, float]]:
+    """완료 시도 기반 정규화 파라미터 중요도 (점수 변화가 없으면 None)"""
+    if method not in IMPORTANCE_METHODS:
+        raise ValueError(f"지원하지 않는 중요도 방식: {method} (가능: {', '.join(IMPORTANCE_METHODS)})")
+
+    scores = np.array([trial.value for trial in trials], dtype=np.float64)
+    if len(np.unique(scores)) < 2:
+        return None
+    ranks = rankdata(scores) / len(scores)
+
+    if method == "fanova":
+        # 원래 범위 분포로 재구성한 분석용 스터디 (값 = 순위)
+        distributions = param_distributions(param_space)
+        study = optuna.create_study(direction="maximize")
+        study.add_trials(
+            [
+                optuna.trial.create_trial(
+                    params={name: clip_param(trial.params[name], config) for name, config in param_space.items()},
+                    distributions=distributions,
+                    value=float(rank),
+                )
+                for trial, rank in zip(trials, ranks)
+            ]
+        )
+        importances = optuna.importance.get_param_importances(
+            study, evaluator=FanovaImportanceEvaluator(seed=seed), params=list(param_space)
+        )
+    else:
+        X = _encode(trials, param_space)
+        model = RandomForestRegressor(n_estimators=100, min_samples_leaf=2, n_jobs=1, random_state=seed).fit(X, ranks)
+        raw = permutation_importance(model, X, ranks, n_repeats=10, random_state=seed).importances_mean
+        raw = np.clip(raw, 0.0, None)
+        if raw.sum() <= 0:
+            return None
+        importances = dict(zip(param_space, raw / raw.sum()))
+
+    return {name: float(importances.get(name, 0.0)) for name in param_space}
+
+
+def reduce_search_space(
+    trials: List[FrozenTrial],
+    param_space: Dict[str, Dict],
+    method: str = "fanova",
+    freeze_threshold: float = 0.02,
+    top_fraction: float = 0.2,
+    bound_margin: float = 0.1,
+    min_trials: int = 20,
+    min_active: int = 2,
+    failure_score: float = None,
+) -> Optional[SpaceReduction]:
+    """중요도 미만 파라미터 고정 + 나머지 경계 축소 (유효 시도 부족/점수 변화 없음이면 None)
+
+    고정 값은 최고 시도 값, 축소 범위는 상위 top_fraction 시도 범위 ± bound_margin (원래 범위 대비)
+    """
+    trials = [
+        trial
+        for trial in trials
+        if trial.state == TrialState.COMPLETE
+        and trial.value is not None
+        and np.isfinite(trial.value)
+        and all(name in trial.params for name in param_space)
+    ]
+    if len(trials) < min_trials:
+        return None
+
+    importances = param_importances(trials, param_space, method)
+    if importances is None:
+        return None
+
+    ranked = sorted(trials, key=lambda trial: trial.value, reverse=True)
+    best = ranked[0].params
+
+    # 중요도 순 상위 min_active개는 항상 유지
+    by_importance = sorted(param_space, key=lambda name: importances[name], reverse=True)
+    frozen = {name: best[name] for name in by_importance[min_active:] if importances[name] < freeze_threshold}
+
+    # 실패 점수 제외 상위 시도 범위로 경계 축소
+    successful = [trial for trial in ranked if failure_score is None or trial.value > failure_score] or ranked
+    top = successful[: max(min_active, int(np.ceil(len(successful) * top_fraction)))]
+    active_space = {name: config for name, config in param_space.items() if name not in frozen}
+    narrowed = shrink_param_space(active_space, [trial.params for trial in top], bound_margin)
+
+    return SpaceReduction(method=method, n_trials=len(trials), importances=importances, frozen=frozen, param_space=narrowed)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+주간 최적화 스터디 보관소 (교차 주간 웜스타트)
+- Optuna 스터디를 로컬 SQLite 저장소에 데이터셋 지문과 함께 보관
+- 새 실행은 같은 단계의 직전 스터디 상위 K개 시도로 샘플러 초기화
+  (데이터 동일 → 기존 점수 그대로 추가, 데이터 변경 → 새 데이터로 재평가되도록 큐에 등록)
+- 탐색 범위를 상위 K개 시도가 모인 안정 구간 주변으로 축소
+- 이전 시도는 현재 탐색 공간으로 투영 (고정된 파라미터 제거, 축소된 경계로 제한, 당시 고정값으로 누락 보충)
+- 단계 최고 시도 조회 (전 시도 조기 중단시 이전 단계 결과로 대체)
+"""
+
+import hashlib
+import os
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import optuna
+import pandas as pd
+from optuna.distributions import FloatDistribution, IntDistribution
+from optuna.trial import FrozenTrial, TrialState
+
+warnings.filterwarnings("ignore")
+
+# 기본 저장소 (결과 디렉토리 아래, 버전 관리 제외)
+DEFAULT_STORAGE = "sqlite:///results/optimization_studies.db"
+
+# 지문 계산 대상 컬럼
+FINGERPRINT_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """시장 데이터 지문 (시간/OHLCV 값 기준 - 같은 데이터면 같은 지문)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(df)).encode())
+    for column in FINGERPRINT_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy()
+        values = values.astype("datetime64[ns]").view(np.int64) if column == "time" else values.astype(np.float64)
+        digest.update(column.encode())
+        digest.update(np.ascontiguousarray(values).data)
+    return digest.hexdigest()
+
+
+def param_distributions(param_space: Dict[str, Dict]) -> Dict:
+    """파라미터 공간 → Optuna 분포 (log 키가 있으면 로그 스케일)"""
+    return {
+        name: (
+            IntDistribution(int(config["low"]), int(config["high"]))
+            if config["type"] == "int"
+            else FloatDistribution(float(config["low"]), float(config["high"]), log=config.get("log", False))
+        )
+        for name, config in param_space.items()
+    }
+
+
+def clip_param(value, config: Dict):
+    """파라미터 값을 공간 경계 안으로 제한 (정수 유지)"""
+    value = min(max(value, config["low"]), config["high"])
+    return int(round(value)) if config["type"] == "int" else float(value)
+
+
+def project_params(params: Dict, param_space: Dict[str, Dict], fill: Dict = None) -> Optional[Dict]:
+    """파라미터 조합 → 탐색 공간 투영 (공간 밖 키 제거, 경계로 제한, 누락 키는 fill 값 - 없으면 None)"""
+    fill = fill or {}
+    projected = {}
+    for name, config in param_space.items():
+        value = params.get(name, fill.get(name))
+        if value is None:
+            return None
+        projected[name] = clip_param(value, config)
+    return projected
+
+
+def shrink_param_space(param_space: Dict[str, Dict], param_sets: List[Dict], margin: float) -> Dict[str, Dict]:
+    """파라미터 조합들의 범위 ± 여유(원래 범위 대비 비율)로 탐색 범위 축소 (원래 범위 안으로 제한)"""
+    shrunk = {}
+    for name, config in param_space.items():
+        low, high = config["low"], config["high"]
+        values = np.array([params[name] for params in param_sets], dtype=np.float64)
+        pad = margin * (high - low)
+        new_low, new_high = max(low, values.min() - pad), min(high, values.max() + pad)
+
+        if config["type"] == "int":
+            new_low, new_high = int(np.floor(new_low)), int(np.ceil(new_high))
+            if new_high <= new_low:
+                new_low, new_high = max(low, new_low - 1), min(high, new_high + 1)
+        else:
+            new_low, new_high = float(new_low), float(new_high)
+
+        shrunk[name] = {**config, "low": new_low, "high": new_high}
+    return shrunk
+
+
+def best_completed_trial(study: optuna.Study) -> Optional[FrozenTrial]:
+    """최고 완료 시도 (완료 시도가 없으면 None - study.best_trial은 ValueError)"""
+    trials = study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+    return max(trials, key=lambda trial: trial.value) if trials else None
+
+
+def stage_best(study: optuna.Study, stage: str, previous: Tuple[Dict, float] = None) -> Tuple[Dict, float, bool]:
+    """단계 최고 (파라미터, 점수, 이전 단계 대체 여부)
+
+    전 시도가 조기 중단/실패하면 이전 단계 (파라미터, 점수)로 대체, 이전 단계도 없으면 ValueError
+    """
+    best = best_completed_trial(study)
+    if best is not None:
+        return best.params, best.value, False
+
+    reason = f"{stage}: 완료된 시도 없음 ({len(study.trials)}개 시도 모두 조기 중단/실패)"
+    if previous is None:
+        raise ValueError(f"{reason} - 대체할 이전 단계 결과 없음")
+    print(f"⚠️ {reason} - 이전 단계 파라미터 사용")
+    return previous[0], previous[1], True
+
+
+@dataclass
+class WarmStart:
+    """웜스타트 계획"""
+
+    source: str  # 이전 스터디 이름
+    trials: List[FrozenTrial]  # 상위 K개 시도 (현재 탐색 공간으로 투영, 값이 바뀐 시도는 user_attrs["projected"])
+    param_space: Dict[str, Dict]  # 축소된 탐색 범위
+    reuse_scores: bool  # 데이터 동일 - 점수 재사용 (False면 재평가)
+    prior_best: float
+    shrunk_params: List[str] = field(default_factory=list)
+
+
+class StudyArchive:
+    def __init__(
+        self,
+        storage: str = DEFAULT_STORAGE,
+        top_k: int = 10,
+        bound_margin: float = 0.15,
+        min_trials: int = 3,
+        failure_score: float = -1000,
+    ):
+        """스터디 보관소 초기화 (bound_margin: 상위 K개 범위 양쪽 여유, 원래 범위 대비 비율)"""
+        self.storage = storage
+        if storage.startswith("sqlite:///"):
+            os.makedirs(os.path.dirname(storage[len("sqlite:///") :]) or ".", exist_ok=True)
+        self.top_k = top_k
+        self.bound_margin = bound_margin
+        self.min_trials = min_trials
+        self.failure_score = failure_score
+
+    def create_study(
+        self,
+        stage: str,
+        run_id: str,
+        fingerprint: Optional[str],
+        param_space: Dict,
+        frozen_params: Dict = None,
+        **kwargs,
+    ) -> optuna.Study:
+        """단계 스터디 생성 (단계/실행 ID/데이터 지문/원래 탐색 범위/고정 파라미터 기록)"""
+        study = optuna.create_study(
+            storage=self.storage, study_name=f"{stage}_{run_id}", direction="maximize", load_if_exists=True, **kwargs
+        )
+        study.set_user_attr("stage", stage)
+        study.set_user_attr("run_id", run_id)
+        study.set_user_attr("dataset_fingerprint", fingerprint)
+        study.set_user_attr("param_space", param_space)
+        study.set_user_attr("frozen_params", dict(frozen_params or {}))
+        return study
+
+    def prior_study(self, stage: str, run_id: str) -> Optional[optuna.Study]:
+        """같은 단계의 가장 최근 이전 실행 스터디 (완료 시도가 있는 것)"""
+        summaries = [
+            summary
+            for summary in optuna.get_all_study_summaries(self.storage, include_best_trial=False)
+            if summary.user_attrs.get("stage") == stage and summary.user_attrs.get("run_id", run_id) < run_id
+        ]
+        for summary in sorted(summaries, key=lambda s: s.user_attrs["run_id"], reverse=True):
+            study = optuna.load_study(study_name=summary.study_name, storage=self.storage)
+            if any(trial.state == TrialState.COMPLETE for trial in study.get_trials(deepcopy=False)):
+                return study
+        return None
+
+    def top_trials(self, study: optuna.Study, param_space: Dict) -> List[FrozenTrial]:
+        """상위 K개 완료 시도를 현재 탐색 공간으로 투영 (실패 점수 제외)
+
+        단계 사이 축소로 고정된 파라미터는 제거, 좁아진 경계로 제한, 이전 실행에서 고정돼 없는 파라미터는
+        당시 고정값으로 보충 - 값이 바뀐 시도는 projected 표시 (점수 재사용 대신 재평가)
+        """
+        distributions = param_distributions(param_space)
+        fill = study.user_attrs.get("frozen_params", {})
+        projected = []
+        for trial in study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,)):
+            if trial.value is None or trial.value <= self.failure_score:
+                continue
+            params = project_params(trial.params, param_space, fill)
+            if params is None:
+                continue
+            projected.append(
+                optuna.trial.create_trial(
+                    params=params,
+                    distributions=distributions,
+                    value=trial.value,
+                    user_attrs={"projected": params != trial.params},
+                )
+            )
+        return sorted(projected, key=lambda trial: trial.value, reverse=True)[: self.top_k]
+
+    def shrink_space(self, param_space: Dict, trials: List[FrozenTrial]) -> Dict:
+        """상위 시도 범위 ± 여유로 탐색 범위 축소"""
+        return shrink_param_space(param_space, [trial.params for trial in trials], self.bound_margin)
+
+    def plan(self, stage: str, run_id: str, fingerprint: Optional[str], param_space: Dict) -> Optional[WarmStart]:
+        """웜스타트 계획 (이전 스터디가 없거나 유효 시도가 min_trials 미만이면 None)"""
+        prior = self.prior_study(stage, run_id)
+        if prior is None:
+            return None
+
+        trials = self.top_trials(prior, param_space)
+        if len(trials) < self.min_trials:
+            return None
+
+        shrunk = self.shrink_space(param_space, trials)
+        return WarmStart(
+            source=prior.study_name,
+            trials=trials,
+            param_space=shrunk,
+            reuse_scores=fingerprint is not None and prior.user_attrs.get("dataset_fingerprint") == fingerprint,
+            prior_best=trials[0].value,
+            shrunk_params=[name for name in param_space if shrunk[name] != param_space[name]],
+        )
+
+    def seed(self, study: optuna.Study, warm_start: WarmStart):
+        """상위 K개 시도로 스터디 초기화 (데이터 동일 + 투영 불변 → 점수 그대로 추가, 그 외 → 재평가 큐 등록)"""
+        reusable = [warm_start.reuse_scores and not trial.user_attrs.get("projected") for trial in warm_start.trials]
+        distributions = param_distributions(warm_start.param_space)
+        study.add_trials(
+            [
+                optuna.trial.create_trial(
+                    params={name: trial.params[name] for name in distributions},
+                    distributions=distributions,
+                    value=trial.value,
+                    user_attrs={"warm_start_source": warm_start.source},
+                )
+                for trial, reuse in zip(warm_start.trials, reusable)
+                if reuse
+            ]
+        )
+        for trial, reuse in zip(warm_start.trials, reusable):
+            if not reuse:
+                study.enqueue_trial(
+                    {name: trial.params[name] for name in warm_start.param_space},
+                    user_attrs={"warm_start_source": warm_start.source},
+                    skip_if_exists=True,
+                )
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+서로게이트 모델 사전 스크리닝
+- 시도 히스토리(파라미터 → 점수)로 랜덤 포레스트 / 가우시안 프로세스 회귀 학습
+- 대규모 Sobol/LHS 후보 풀을 저비용 예측 → 상위 후보만 실제 백테스트
+- 점수는 순위 정규화 후 학습 (제약 위반 페널티 -10000이 회귀를 지배하지 않도록)
+- 획득 함수: UCB (예측 평균 + κ × 예측 표준편차)
+"""
+
+import warnings
+from typing import Sequence, Tuple
+
+import numpy as np
+from scipy.stats import rankdata
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+warnings.filterwarnings("ignore")
+
+SURROGATE_MODELS = ("random_forest", "gp")
+
+# GP 학습 표본 상한 (O(n³) 학습 비용 - 최근 관측만 사용)
+GP_MAX_SAMPLES = 500
+
+
+class SurrogateScreener:
+    def __init__(self, model: str = "random_forest", kappa: float = 0.5, random_state: int = 42):
+        """서로게이트 초기화 (입력은 [0, 1] 단위 초입방체로 인코딩된 파라미터)"""
+        if model not in SURROGATE_MODELS:
+            raise ValueError(f"지원하지 않는 서로게이트 모델: {model} (가능: {', '.join(SURROGATE_MODELS)})")
+
+        self.model_name = model
+        self.kappa = kappa
+        self.random_state = random_state
+        self.model = None
+        self.X = None
+        self.y = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def _build_model(self, n_features: int):
+        """회귀 모델 생성"""
+        if self.model_name == "gp":
+            kernel = ConstantKernel(1.0) * Matern(length_scale=np.ones(n_features), nu=2.5) + WhiteKernel(1e-2)
+            return GaussianProcessRegressor(kernel=kernel, normalize_y=True, random_state=self.random_state)
+        return RandomForestRegressor(n_estimators=100, min_samples_leaf=2, n_jobs=1, random_state=self.random_state)
+
+    def observe(self, X: np.ndarray, scores: Sequence[float]):
+        """관측 추가 후 재학습 (빈 관측은 무시)"""
+        if len(scores) == 0:
+            return
+        X = np.asarray(X, dtype=np.float64).reshape(len(scores), -1)
+        self.X = X if self.X is None else np.vstack([self.X, X])
+        self.y = np.r_[self.y, np.asarray(scores, dtype=np.float64)]
+
+        if len(self.y) >= 2:
+            X_fit, y_fit = (
+                (self.X[-GP_MAX_SAMPLES:], self.y[-GP_MAX_SAMPLES:]) if self.model_name == "gp" else (self.X, self.y)
+            )
+            self.model = self._build_model(X_fit.shape[1])
+            self.model.fit(X_fit, rankdata(y_fit) / len(y_fit))
+
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """예측 (평균, 표준편차) - 순위 정규화 척도"""
+        X = np.asarray(X, dtype=np.float64)
+        if self.model is None:
+            return np.zeros(len(X)), np.ones(len(X))
+        if self.model_name == "gp":
+            return self.model.predict(X, return_std=True)
+        per_tree = np.stack([tree.predict(X) for tree in self.model.estimators_])
+        return per_tree.mean(axis=0), per_tree.std(axis=0)
+
+    def select(self, X: np.ndarray, n: int) -> np.ndarray:
+        """획득 함수 상위 n개 인덱스"""
+        mean, std = self.predict(X)
+        acquisition = mean + self.kappa * std
+        n = min(n, len(acquisition))
+        top = np.argpartition(-acquisition, n - 1)[:n] if n > 0 else np.empty(0, dtype=np.int64)
+        return top[np.argsort(-acquisition[top], kind="stable")]
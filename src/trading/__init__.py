@@ -7,7 +7,12 @@ from .binance_account_manager import BinanceAccountManager
 from .binance_data_collector import BinanceDataCollector
 from .dd_scaling_system import DDScalingSystem
 from .eth_session_strategy import EthSessionStrategy
+from .exchange_adapter import BinanceFuturesAdapter, ExchangeAdapter, FakeExchangeAdapter
 from .kelly_position_sizer import KellyPositionSizer
+from .kline_stream import KlineStream
+from .market_data_store import MarketDataStore
+from .order_pipeline import BracketOrderPipeline
+from .rate_limiter import RateLimitGovernor, get_rate_limiter
 from .trading_bot import TradingBot
 
 __all__ = [
@@ -17,4 +22,12 @@ __all__ = [
     "DDScalingSystem",
     "BinanceAccountManager",
     "BinanceDataCollector",
+    "ExchangeAdapter",
+    "BinanceFuturesAdapter",
+    "FakeExchangeAdapter",
+    "BracketOrderPipeline",
+    "KlineStream",
+    "MarketDataStore",
+    "RateLimitGovernor",
+    "get_rate_limiter",
 ]
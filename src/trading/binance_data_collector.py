@@ -7,17 +7,39 @@ import hashlib
 import hmac
 import json
 import os
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
 
-import pandas as pd
+import numpy as np
 import requests
 from dotenv import load_dotenv
+from kline_stream import INTERVAL_MS
+from market_data_store import MarketDataStore
+from rate_limiter import RequestPriority, get_rate_limiter, klines_weight
 
 # 환경 변수 로드
 load_dotenv()
 
+# kline 배열 컬럼 (마지막 ignore 제외)
+KLINE_COLUMNS = [
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_volume",
+    "trades",
+    "taker_buy_base",
+    "taker_buy_quote",
+]
+INT_COLUMNS = {"timestamp", "close_time", "trades"}
+
 
 class BinanceDataCollector:
     def __init__(self):
@@ -38,10 +60,16 @@ class BinanceDataCollector:
         self.target_points = int(os.getenv("DATA_POINTS_TARGET", "500000"))
         self.points_per_request = int(os.getenv("DATA_POINTS_PER_REQUEST", "1000"))
 
-        # 요청 제한 (바이낸스 API 제한 준수)
-        self.request_delay = 0.1  # 100ms 딜레이
+        # 요청 제한 (프로세스 전역 가중치 거버너 - 거래 요청보다 낮은 우선순위)
+        self.rate_limiter = get_rate_limiter()
         self.max_retries = 3
 
+        # 병렬 샤드 다운로드 설정
+        self.download_workers = int(os.getenv("DATA_DOWNLOAD_WORKERS", "4"))
+        self.shard_pages = int(os.getenv("DATA_SHARD_PAGES", "10"))  # 샤드당 페이지 수
+        self.checkpoint_dir = os.getenv("DATA_CHECKPOINT_DIR", "data/checkpoints")
+        self._local = threading.local()
+
         print(f"🚀 바이낸스 데이터 수집기 초기화")
         print(f"   심볼: {self.symbol}")
         print(f"   간격: {self.interval}")
@@ -50,7 +78,7 @@ class BinanceDataCollector:
         print(f"   예상 요청 수: {self.target_points // self.points_per_request}회")
         print(f"   테스트넷: {self.testnet}")
 
-    def get_klines(self, symbol, interval, limit=1000, start_time=None, end_time=None):
+    def get_klines(self, symbol, interval, limit=1000, start_time=None, end_time=None, priority=RequestPriority.BULK):
         """K라인 데이터 가져오기"""
         endpoint = "/fapi/v1/klines"
         url = self.base_url + endpoint
@@ -68,14 +96,17 @@ class BinanceDataCollector:
 
         for attempt in range(self.max_retries):
             try:
-                response = requests.get(url, params=params, headers=headers, timeout=30)
+                # 가중치 예산 확보 (한도 근접시 거버너가 필요한 만큼만 대기)
+                self.rate_limiter.acquire(klines_weight(limit), priority)
+                response = self._session().get(url, params=params, headers=headers, timeout=30)
+                self.rate_limiter.update_from_headers(response.headers)
 
                 if response.status_code == 200:
                     return response.json()
-                elif response.status_code == 429:  # Rate limit
-                    wait_time = 2**attempt
-                    print(f"   ⚠️ Rate limit 도달, {wait_time}초 대기...")
-                    time.sleep(wait_time)
+                elif response.status_code in (418, 429):  # Rate limit - Retry-After 동안 전역 정지
+                    retry_after = response.headers.get("Retry-After")
+                    print(f"   ⚠️ Rate limit 도달, Retry-After={retry_after}")
+                    self.rate_limiter.penalize(retry_after)
                     continue
                 else:
                     print(f"   ❌ API 오류: {response.status_code} - {response.text}")
@@ -91,155 +122,184 @@ class BinanceDataCollector:
 
         return None
 
-    def collect_historical_data(self):
-        """과거 데이터 수집"""
-        print(f"\n📊 {self.symbol} {self.interval} 데이터 수집 시작")
-        print("=" * 80)
-
-        all_data = []
-        total_requests = self.target_points // self.points_per_request
-
-        # 현재 시간부터 과거로 거슬러 올라가며 수집
-        end_time = int(datetime.now().timestamp() * 1000)
-
-        for batch_num in range(total_requests):
-            print(f"📥 배치 {batch_num + 1}/{total_requests} 수집 중...", end=" ")
-
-            # API 요청
+    def _session(self):
+        """스레드별 keep-alive 세션"""
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    @staticmethod
+    def decode_klines(klines) -> dict:
+        """kline 페이지 → NumPy 컬럼"""
+        if not klines:
+            return {name: np.empty(0, dtype=np.int64 if name in INT_COLUMNS else np.float64) for name in KLINE_COLUMNS}
+
+        rows = np.array([k[: len(KLINE_COLUMNS)] for k in klines], dtype=object)
+        return {
+            name: rows[:, i].astype(np.int64 if name in INT_COLUMNS else np.float64) for i, name in enumerate(KLINE_COLUMNS)
+        }
+
+    @staticmethod
+    def concat_columns(parts) -> dict:
+        """컬럼 묶음 병합 + 시간순 정렬 + 중복 제거"""
+        parts = [p for p in parts if len(p["timestamp"]) > 0]
+        if not parts:
+            return BinanceDataCollector.decode_klines([])
+
+        columns = {name: np.concatenate([p[name] for p in parts]) for name in KLINE_COLUMNS}
+        _, unique_idx = np.unique(columns["timestamp"], return_index=True)
+        return {name: values[unique_idx] for name, values in columns.items()}
+
+    def _shard_path(self, shard_start: int) -> str:
+        """샤드 체크포인트 경로 (절대 시간 격자 기준 - 종료 시각이 달라도 재사용)"""
+        return os.path.join(self.checkpoint_dir, f"{self.symbol}_{self.interval}", f"{shard_start}.npz")
+
+    def _fetch_shard(self, shard_start: int, shard_end: int, now_ms: int, checkpoint: bool = True) -> dict:
+        """샤드 수집 (페이지 순차, 완료된 과거 샤드는 체크포인트 저장)"""
+        path = self._shard_path(shard_start)
+        if checkpoint and os.path.exists(path):
+            with np.load(path) as cached:
+                return {name: cached[name] for name in KLINE_COLUMNS}
+
+        interval_ms = INTERVAL_MS[self.interval]
+        pages = []
+        cursor = shard_start
+        while cursor < shard_end:
             klines = self.get_klines(
-                symbol=self.symbol, interval=self.interval, limit=self.points_per_request, end_time=end_time
+                symbol=self.symbol,
+                interval=self.interval,
+                limit=self.points_per_request,
+                start_time=cursor,
+                end_time=shard_end - 1,
             )
-
             if klines is None:
-                print("❌ 실패")
-                break
-
+                raise RuntimeError(f"샤드 수집 실패: {shard_start}")
             if len(klines) == 0:
-                print("❌ 데이터 없음")
                 break
 
-            # 데이터 처리
-            batch_data = []
-            for kline in klines:
-                batch_data.append(
-                    {
-                        "timestamp": kline[0],
-                        "open": float(kline[1]),
-                        "high": float(kline[2]),
-                        "low": float(kline[3]),
-                        "close": float(kline[4]),
-                        "volume": float(kline[5]),
-                        "close_time": kline[6],
-                        "quote_volume": float(kline[7]),
-                        "trades": int(kline[8]),
-                        "taker_buy_base": float(kline[9]),
-                        "taker_buy_quote": float(kline[10]),
-                    }
-                )
-
-            # 시간순 정렬 (과거부터)
-            batch_data.sort(key=lambda x: x["timestamp"])
-            all_data.extend(batch_data)
-
-            # 다음 배치를 위한 end_time 업데이트
-            end_time = batch_data[0]["timestamp"] - 1
-
-            print(f"✅ {len(klines)}개 수집 (총 {len(all_data):,}개)")
-
-            # 진행률 표시
-            progress = (batch_num + 1) / total_requests * 100
-            print(f"   진행률: {progress:.1f}% | 수집된 데이터: {len(all_data):,}/{self.target_points:,}")
-
-            # API 제한 준수
-            time.sleep(self.request_delay)
-
-            # 목표 달성 확인
-            if len(all_data) >= self.target_points:
-                print(f"🎯 목표 달성! {len(all_data):,}개 데이터 수집 완료")
+            page = self.decode_klines(klines)
+            pages.append(page)
+            cursor = int(page["timestamp"][-1]) + interval_ms
+            if len(klines) < self.points_per_request:
                 break
 
-        return all_data
+        columns = self.concat_columns(pages)
 
-    def process_and_save_data(self, raw_data):
-        """데이터 처리 및 저장"""
-        if not raw_data:
-            print("❌ 저장할 데이터가 없습니다.")
-            return None
+        # 진행 중인 구간이 포함된 샤드는 저장하지 않음
+        if checkpoint and shard_end <= now_ms:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path[: -len(".npz")] + ".tmp.npz"
+            np.savez(tmp_path, **columns)
+            os.replace(tmp_path, path)
 
-        print(f"\n🔄 데이터 처리 중...")
+        return columns
 
-        # DataFrame 생성
-        df = pd.DataFrame(raw_data)
+    def download_range(self, start_ms: int, end_ms: int, checkpoint: bool = True) -> dict:
+        """구간 병렬 다운로드 (시간 샤드 단위, 중단시 완료 샤드부터 재개)
 
-        # 시간 변환
-        df["time"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms")
+        checkpoint=False: 증분 동기화용 - 샤드를 요청 구간으로 잘라 필요한 봉만 받고 체크포인트 미사용
+        """
+        interval_ms = INTERVAL_MS[self.interval]
+        shard_span = interval_ms * self.points_per_request * self.shard_pages
+        now_ms = int(time.time() * 1000)
 
-        # 시간순 정렬
-        df = df.sort_values("timestamp").reset_index(drop=True)
+        first_shard = (start_ms // shard_span) * shard_span
+        if checkpoint:
+            shards = [(s, s + shard_span) for s in range(first_shard, end_ms, shard_span)]
+            cached = sum(os.path.exists(self._shard_path(s)) for s, _ in shards)
+        else:
+            shards = [(max(s, start_ms), min(s + shard_span, end_ms)) for s in range(first_shard, end_ms, shard_span)]
+            cached = 0
 
-        # 중복 제거
-        initial_count = len(df)
-        df = df.drop_duplicates(subset=["timestamp"]).reset_index(drop=True)
-        final_count = len(df)
+        print(f"📦 샤드 {len(shards)}개 (체크포인트 {cached}개), 워커 {self.download_workers}개")
 
-        if initial_count != final_count:
-            print(f"   중복 제거: {initial_count - final_count}개 제거됨")
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            futures = {executor.submit(self._fetch_shard, s, e, now_ms, checkpoint): s for s, e in shards}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                bars = sum(len(r["timestamp"]) for r in results.values())
+                print(f"   진행률: {done}/{len(shards)} 샤드 | 수집된 데이터: {bars:,}개")
 
-        # 데이터 검증
-        print(f"📋 데이터 검증:")
-        print(f"   총 데이터 수: {len(df):,}개")
-        print(f"   시작 시간: {df['time'].iloc[0]}")
-        print(f"   종료 시간: {df['time'].iloc[-1]}")
-        print(f"   기간: {(df['time'].iloc[-1] - df['time'].iloc[0]).days}일")
+        columns = self.concat_columns([results[s] for s, _ in shards])
+        mask = (columns["timestamp"] >= start_ms) & (columns["timestamp"] < end_ms)
+        return {name: values[mask] for name, values in columns.items()}
 
-        # 가격 범위 확인
-        print(f"   가격 범위: ${df['low'].min():.2f} ~ ${df['high'].max():.2f}")
-        print(f"   평균 거래량: {df['volume'].mean():,.2f}")
+    def collect_historical_data(self):
+        """과거 데이터 수집 - 목표 개수만큼 현재 시점 이전 구간 병렬 다운로드"""
+        print(f"\n📊 {self.symbol} {self.interval} 데이터 수집 시작")
+        print("=" * 80)
 
-        # 파일 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"data/{self.symbol}_{self.interval}_{len(df)}points_{timestamp}.csv"
+        interval_ms = INTERVAL_MS[self.interval]
+        end_time = int(datetime.now().timestamp() * 1000) // interval_ms * interval_ms
+        start_time = end_time - self.target_points * interval_ms
 
-        # data 폴더 생성
-        os.makedirs("data", exist_ok=True)
+        columns = self.download_range(start_time, end_time)
+        collected = len(columns["timestamp"])
 
-        # CSV 저장 (트레이딩에 필요한 컬럼만)
-        trading_df = df[["time", "open", "high", "low", "close", "volume"]].copy()
-        trading_df.to_csv(filename, index=False)
+        if collected == 0:
+            print("❌ 데이터 없음")
+            return None
 
-        print(f"💾 데이터 저장 완료: {filename}")
+        if collected >= self.target_points:
+            print(f"🎯 목표 달성! {collected:,}개 데이터 수집 완료")
 
-        # 상세 데이터도 별도 저장
-        detailed_filename = f"data/{self.symbol}_{self.interval}_detailed_{len(df)}points_{timestamp}.csv"
-        df.to_csv(detailed_filename, index=False)
-        print(f"💾 상세 데이터 저장: {detailed_filename}")
+        return columns
 
-        return filename, trading_df
+    def sync_store(self, store: MarketDataStore = None) -> dict:
+        """저장소 증분 동기화 - 마지막 저장 봉 이후 마감 봉 + 누락 구간만 수집해 추가"""
+        store = store or MarketDataStore()
+        interval_ms = INTERVAL_MS[self.interval]
+        end_time = int(time.time() * 1000) // interval_ms * interval_ms  # 마감된 봉까지만
 
-    def run_collection(self):
-        """전체 데이터 수집 프로세스 실행"""
+        last_timestamp = store.last_timestamp(self.symbol, self.interval)
+        if last_timestamp is None:
+            # 최초 동기화 - 목표 개수만큼 체크포인트 기반 대량 수집
+            print(f"📥 저장소 비어 있음 - 최초 수집 ({self.target_points:,}개)")
+            parts = [self.download_range(end_time - self.target_points * interval_ms, end_time)]
+        else:
+            start_time = last_timestamp + interval_ms
+            print(f"📥 증분 동기화: {datetime.utcfromtimestamp(start_time / 1000)} 이후")
+            parts = [self.download_range(start_time, end_time, checkpoint=False)] if start_time < end_time else []
+
+        # 누락 구간 보충 (거래소에도 데이터가 없으면 빈 구간으로 기록해 재요청 방지)
+        gaps = store.find_gaps(self.symbol, self.interval)
+        empty_ranges = []
+        for gap_start, gap_end in gaps:
+            filled = self.download_range(gap_start, gap_end, checkpoint=False)
+            if len(filled["timestamp"]) == 0:
+                empty_ranges.append((gap_start, gap_end))
+            else:
+                parts.append(filled)
+
+        stats = store.append(self.symbol, self.interval, self.concat_columns(parts), empty_ranges=empty_ranges)
+        stats["gaps"] = len(gaps)
+        stats["manifest"] = store.manifest_path(self.symbol, self.interval)
+        stats.update(store.get_status(self.symbol, self.interval))
+
+        print(f"💾 저장소 동기화 완료: +{stats['added']:,}개 (중복 {stats['duplicates']}개, 누락 구간 {len(gaps)}개)")
+        print(f"   파티션 {stats['partitions_written']}개 기록, {stats['bytes_written'] / 1024:.1f}KB")
+        print(f"   총 {stats['rows']:,}개 | 매니페스트 v{stats['version']}: {stats['manifest']}")
+        return stats
+
+    def run_collection(self, store: MarketDataStore = None):
+        """전체 데이터 수집 프로세스 실행 (저장소 증분 동기화)"""
         start_time = time.time()
 
         try:
-            # 데이터 수집
-            raw_data = self.collect_historical_data()
+            print(f"\n📊 {self.symbol} {self.interval} 저장소 동기화 시작")
+            print("=" * 80)
 
-            if not raw_data:
-                print("❌ 데이터 수집 실패")
-                return None
-
-            # 데이터 처리 및 저장
-            result = self.process_and_save_data(raw_data)
+            stats = self.sync_store(store)
 
             # 실행 시간 계산
             execution_time = time.time() - start_time
 
             print(f"\n🎉 데이터 수집 완료!")
             print(f"   실행 시간: {execution_time:.1f}초")
-            print(f"   수집 속도: {len(raw_data)/execution_time:.1f} 포인트/초")
+            print(f"   수집 속도: {stats['added']/execution_time:.1f} 포인트/초")
 
-            return result
+            return stats
 
         except KeyboardInterrupt:
             print("\n⚠️ 사용자에 의해 중단되었습니다.")
@@ -257,6 +317,13 @@ def main():
     print("🎯 바이낸스 ETHUSDT.P 15분봉 데이터 수집기")
     print("=" * 80)
 
+    # 기존 수집기 CSV 가져오기 (python binance_data_collector.py --import-csv <경로>)
+    if len(sys.argv) > 2 and sys.argv[1] == "--import-csv":
+        collector = BinanceDataCollector()
+        stats = MarketDataStore().import_csv(collector.symbol, collector.interval, sys.argv[2])
+        print(f"💾 CSV 가져오기 완료: +{stats['added']:,}개 (중복 {stats['duplicates']}개)")
+        return
+
     # API 키 확인
     if not os.getenv("BINANCE_API_KEY"):
         print("⚠️ 경고: BINANCE_API_KEY가 설정되지 않았습니다.")
@@ -272,14 +339,14 @@ def main():
     result = collector.run_collection()
 
     if result:
-        filename, df = result
         print(f"\n✅ 성공적으로 완료되었습니다!")
-        print(f"   파일: {filename}")
-        print(f"   데이터 수: {len(df):,}개")
+        print(f"   매니페스트: {result['manifest']}")
+        print(f"   데이터 수: {result['rows']:,}개")
 
         # 간단한 통계 표시
+        df = MarketDataStore().load(collector.symbol, collector.interval)
         print(f"\n📊 데이터 미리보기:")
-        print(df.head().to_string(index=False))
+        print(df.tail().to_string(index=False))
 
     else:
         print("\n❌ 데이터 수집에 실패했습니다.")
@@ -3,59 +3,109 @@ ETHUSDT 세션 스윕 리버설 + 리퀴데이션 모멘텀 전략
 15분봉 데이터 기반 백테스팅 시스템
 """
 
+import copy
 import warnings
 from datetime import datetime, timedelta
+from typing import Callable
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
 
 warnings.filterwarnings("ignore")
 
 # 고급 리스크 관리 시스템 import
 from advanced_risk_system import AdvancedRiskManager, RiskParameters
+from calendar_features import calendar_features, funding_window_mask, to_epoch_ms
+from kline_stream import INTERVAL_MS
+from market_data_store import MarketDataStore
+
+# 세션 코드 (fast_data_engine과 동일): 0=other, 1=asia, 2=london, 3=ny, 4=london_ny
+SESSION_OTHER, SESSION_ASIA, SESSION_LONDON, SESSION_NY, SESSION_LONDON_NY = range(5)
+SESSION_NAMES = ("other", "asia", "london", "ny", "london_ny")
+TRADING_SESSIONS = (SESSION_LONDON, SESSION_NY, SESSION_LONDON_NY)
+
+# 스윕 후 디스플레이스먼트 확인 최대 바 수
+SIGNAL_LOOKAHEAD_BARS = 3
+
+# 작업 프레임 가격 컬럼 (float32 저장, 누적 계산은 float64)
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# 전략 파라미터 (워크포워드 테스트 통과 최적값 - 2025.10.17)
+DEFAULT_PARAMS = {
+    # 기본 설정 (워크포워드 검증됨)
+    "swing_len": 3,  # 스윙 고저 인식 길이
+    "rr_percentile": 0.1278554501836069,  # 변동성 필터
+    "disp_mult": 1.3107139215624644,  # 디스플레이스먼트 배수
+    "sweep_wick_mult": 0.6490576952390765,  # 스윕 꼬리 비율
+    "atr_len": 41,  # ATR 계산 길이
+    # 리스크 관리 (워크포워드 검증됨)
+    "stop_atr_mult": 0.0549414233732278,  # 스톱 ATR 배수
+    "time_stop_bars": 8,  # 시간 스톱
+    "target_r": 2.862429365474845,  # 목표 R배수
+    # 추가 최적화 파라미터 (워크포워드 검증됨)
+    "funding_avoid_bars": 1,  # 펀딩 회피 바
+    "min_volatility_rank": 0.3052228633363352,  # 최소 변동성 순위
+    "session_strength": 1.9322268126535338,  # 세션 강도
+    "volume_filter": 1.8994566274211397,  # 볼륨 필터
+    "trend_filter_len": 13,  # 트렌드 필터 길이
+    # 세션 시간 (UTC 기준, 15분봉에 맞춰 조정)
+    "asia_start": 0,  # 00:00 UTC
+    "asia_end": 8,  # 08:00 UTC
+    "london_start": 8,  # 08:00 UTC
+    "london_end": 16,  # 16:00 UTC
+    "ny_start": 13,  # 13:00 UTC (런던과 겹침)
+    "ny_end": 21,  # 21:00 UTC
+    # 펀딩 시간 (UTC)
+    "funding_hours": [0, 8, 16],  # 00:00, 08:00, 16:00 UTC
+    "funding_avoid_bars": 1,  # 펀딩 전후 1바 (15분) 회피
+}
+
+
+def session_codes(hour: np.ndarray, params: dict) -> np.ndarray:
+    """시간(UTC) → int8 세션 코드 (SESSION_NAMES 참조)"""
+    p = params
+    in_london = (p["london_start"] <= hour) & (hour < p["london_end"])
+    conditions = [
+        (p["asia_start"] <= hour) & (hour < p["asia_end"]),
+        in_london & (hour >= p["ny_start"]),  # 겹치는 시간
+        in_london,
+        (p["ny_start"] <= hour) & (hour < p["ny_end"]),
+    ]
+    choices = [SESSION_ASIA, SESSION_LONDON_NY, SESSION_LONDON, SESSION_NY]
+    return np.select(conditions, choices, default=SESSION_OTHER).astype(np.int8)
+
+
+def rr_percentile_by_day(day: np.ndarray, daily_tr: pd.Series, lookback: int = 20) -> np.ndarray:
+    """날짜별 최종 누적 TR의 과거 lookback일 대비 순위 → 각 행 float32 (초기 lookback일은 0.5)"""
+    # 각 날짜별 최종 TR (일중 마지막 누적값)
+    daily_final_tr = daily_tr.groupby(day).last()
+    values = daily_final_tr.to_numpy()
+
+    percentiles = np.full(len(values), 0.5)
+    if len(values) > lookback:
+        past_values = np.lib.stride_tricks.sliding_window_view(values[:-1], lookback)
+        percentiles[lookback:] = (past_values < values[lookback:, None]).sum(axis=1) / lookback
+
+    # 날짜별 퍼센타일 → 각 행에 매핑
+    positions = np.searchsorted(daily_final_tr.index.to_numpy(), day)
+    return percentiles.astype(np.float32)[positions]
 
 
 class ETHSessionStrategy:
-    def __init__(self, data_file=None, initial_balance=100000):
-        """전략 초기화"""
-        self.data_file = data_file or "data/ETHUSDT_15m_206319points_20251015_202539.csv"
+    def __init__(self, data_file=None, initial_balance=100000, symbol="ETHUSDT", interval="15m"):
+        """전략 초기화 (data_file 미지정시 시장 데이터 저장소에서 로드)"""
+        self.data_file = data_file
+        self.symbol = symbol
+        self.interval = interval
         self.initial_balance = initial_balance
 
-        # 전략 파라미터 (워크포워드 테스트 통과 최적값 - 2025.10.17)
-        self.params = {
-            # 기본 설정 (워크포워드 검증됨)
-            "swing_len": 3,  # 스윙 고저 인식 길이
-            "rr_percentile": 0.1278554501836069,  # 변동성 필터
-            "disp_mult": 1.3107139215624644,  # 디스플레이스먼트 배수
-            "sweep_wick_mult": 0.6490576952390765,  # 스윕 꼬리 비율
-            "atr_len": 41,  # ATR 계산 길이
-            # 리스크 관리 (워크포워드 검증됨)
-            "stop_atr_mult": 0.0549414233732278,  # 스톱 ATR 배수
-            "time_stop_bars": 8,  # 시간 스톱
-            "target_r": 2.862429365474845,  # 목표 R배수
-            # 추가 최적화 파라미터 (워크포워드 검증됨)
-            "funding_avoid_bars": 1,  # 펀딩 회피 바
-            "min_volatility_rank": 0.3052228633363352,  # 최소 변동성 순위
-            "session_strength": 1.9322268126535338,  # 세션 강도
-            "volume_filter": 1.8994566274211397,  # 볼륨 필터
-            "trend_filter_len": 13,  # 트렌드 필터 길이
-            # 세션 시간 (UTC 기준, 15분봉에 맞춰 조정)
-            "asia_start": 0,  # 00:00 UTC
-            "asia_end": 8,  # 08:00 UTC
-            "london_start": 8,  # 08:00 UTC
-            "london_end": 16,  # 16:00 UTC
-            "ny_start": 13,  # 13:00 UTC (런던과 겹침)
-            "ny_end": 21,  # 21:00 UTC
-            # 펀딩 시간 (UTC)
-            "funding_hours": [0, 8, 16],  # 00:00, 08:00, 16:00 UTC
-            "funding_avoid_bars": 1,  # 펀딩 전후 1바 (15분) 회피
-        }
+        # 전략 파라미터 (인스턴스별 사본)
+        self.params = copy.deepcopy(DEFAULT_PARAMS)
 
         self.df = None
         self.signals = None
         self.trades = []
+        self.abort_reason = ""  # 마지막 백테스트 조기 중단 사유
         self.equity_curve = []
 
         # 고급 리스크 관리자 초기화
@@ -68,47 +118,91 @@ class ETHSessionStrategy:
         self.risk_manager = AdvancedRiskManager(risk_params)
 
         print("🚀 ETH 세션 전략 초기화 완료")
-        print(f"   데이터 파일: {self.data_file}")
+        print(f"   데이터 소스: {self.data_file or f'저장소 {self.symbol} {self.interval}'}")
         print(f"   타임프레임: 15분봉")
 
     def load_data(self):
         """데이터 로드 및 전처리"""
         print("📊 데이터 로딩 중...")
 
-        self.df = pd.read_csv(self.data_file)
-        self.df["time"] = pd.to_datetime(self.df["time"])
-        self.df = self.df.sort_values("time").reset_index(drop=True)
+        if self.data_file:
+            self.df = pd.read_csv(self.data_file)
+            self.df["time"] = pd.to_datetime(self.df["time"])
+            self.df = self.df.sort_values("time").reset_index(drop=True)
+        else:
+            self.df = MarketDataStore().load(self.symbol, self.interval)
+            if self.df.empty:
+                raise FileNotFoundError(
+                    f"시장 데이터 저장소에 {self.symbol} {self.interval} 데이터가 없습니다 "
+                    "(binance_data_collector.py로 동기화하거나 --import-csv로 기존 CSV 가져오기)"
+                )
 
         # 기본 지표 계산
         self._calculate_indicators()
 
+        report = self.memory_report()
         print(f"   데이터 수: {len(self.df):,}개")
+        print(f"   작업 프레임 메모리: {report['frame_mb']:.1f}MB (행당 {report['bytes_per_row']:.0f} bytes)")
         print(f"   기간: {self.df['time'].iloc[0]} ~ {self.df['time'].iloc[-1]}")
         print(f"   총 {(self.df['time'].iloc[-1] - self.df['time'].iloc[0]).days}일")
 
-    def _calculate_indicators(self):
-        """기술적 지표 계산"""
+    def memory_report(self):
+        """작업 프레임 메모리 사용량 (트라이얼당) - 원시 OHLCV(float64) 대비"""
         df = self.df
+        columns = df.memory_usage(index=False, deep=True)
+        rows = max(len(df), 1)
+        raw_bytes = len(df) * 8 * (len(PRICE_COLUMNS) + 1)  # time + OHLCV float64
+        return {
+            "rows": len(df),
+            "frame_mb": columns.sum() / 1024**2,
+            "raw_ohlcv_mb": raw_bytes / 1024**2,
+            "bytes_per_row": columns.sum() / rows,
+            "ratio_to_raw": columns.sum() / max(raw_bytes, 1),
+            "columns": {col: int(nbytes) for col, nbytes in columns.items()},
+        }
+
+    def _compact_frame(self, df):
+        """작업 프레임 dtype 축소 (가격 float32, 불필요 컬럼 제거)"""
+        df = df[["time"] + PRICE_COLUMNS].copy()
+        for col in PRICE_COLUMNS:
+            df[col] = df[col].astype(np.float32)
+        return df
+
+    def _calculate_indicators(self):
+        """기술적 지표 계산 (가격 float32 저장, TR/ATR/일중 누적은 float64)"""
+        self.df = df = self._compact_frame(self.df)
+
+        high = df["high"].astype(np.float64)
+        low = df["low"].astype(np.float64)
+        prev_close = df["close"].astype(np.float64).shift(1)
 
         # ATR 계산
-        df["tr"] = np.maximum(
-            df["high"] - df["low"], np.maximum(abs(df["high"] - df["close"].shift(1)), abs(df["low"] - df["close"].shift(1)))
-        )
-        df["atr"] = df["tr"].rolling(self.params["atr_len"]).mean()
+        tr = np.maximum(high - low, np.maximum(abs(high - prev_close), abs(low - prev_close)))
+        df["tr"] = tr.astype(np.float32)
+        df["atr"] = tr.rolling(self.params["atr_len"]).mean()
 
-        # 시간 정보 추출
-        df["hour"] = df["time"].dt.hour
-        df["minute"] = df["time"].dt.minute
-        df["weekday"] = df["time"].dt.weekday  # 0=월요일
+        # 시간 정보 추출 (epoch ms 정수 연산, weekday 0=월요일, day=epoch 기준 일 번호)
+        calendar = calendar_features(to_epoch_ms(df["time"]))
+        for col in ("hour", "minute", "weekday", "day"):
+            df[col] = calendar[col]
 
-        # 세션 구분
+        # 세션 구분 + 스윕 감지 세션(런던/NY) 마스크
         df["session"] = self._identify_sessions(df)
+        df["trading_session"] = np.isin(df["session"].to_numpy(), TRADING_SESSIONS)
+
+        # 펀딩 회피 구간 마스크
+        df["funding_window"] = funding_window_mask(
+            calendar["minute_of_day"],
+            self.params["funding_hours"],
+            self.params["funding_avoid_bars"],
+            INTERVAL_MS[self.interval],
+        )
 
         # 스윙 고저점
         df["swing_high"], df["swing_low"] = self._find_swing_points(df)
 
         # 일중 변동성 (Realized Range Percentile)
-        df["daily_tr"] = self._calculate_daily_tr(df)
+        df["daily_tr"] = self._calculate_daily_tr(tr, df["day"])
         df["rr_percentile"] = self._calculate_rr_percentile(df)
 
         # 디스플레이스먼트
@@ -116,27 +210,13 @@ class ETHSessionStrategy:
 
         # 바디 크기
         df["body"] = abs(df["close"] - df["open"])
-        df["body_pct"] = df["body"] / (df["high"] - df["low"])
+        df["body_pct"] = (df["body"] / (df["high"] - df["low"])).astype(np.float32)
 
         print("✅ 지표 계산 완료")
 
     def _identify_sessions(self, df):
-        """세션 구분"""
-        sessions = []
-        for _, row in df.iterrows():
-            hour = row["hour"]
-            if self.params["asia_start"] <= hour < self.params["asia_end"]:
-                sessions.append("asia")
-            elif self.params["london_start"] <= hour < self.params["london_end"]:
-                if hour >= self.params["ny_start"]:
-                    sessions.append("london_ny")  # 겹치는 시간
-                else:
-                    sessions.append("london")
-            elif self.params["ny_start"] <= hour < self.params["ny_end"]:
-                sessions.append("ny")
-            else:
-                sessions.append("other")
-        return sessions
+        """세션 구분 → int8 세션 코드 (SESSION_NAMES 참조)"""
+        return session_codes(df["hour"].to_numpy(), self.params)
 
     def _find_swing_points(self, df):
         """스윙 고저점 찾기"""
@@ -165,61 +245,14 @@ class ETHSessionStrategy:
 
         return swing_highs, swing_lows
 
-    def _calculate_daily_tr(self, df):
-        """일별 True Range 합계 (최적화된 버전)"""
-        df_copy = df.copy()
-        df_copy["date"] = df_copy["time"].dt.date
-
-        # 각 날짜별로 누적 TR 계산
-        result = []
-        current_date = None
-        daily_cumulative = 0
-
-        for _, row in df_copy.iterrows():
-            if row["date"] != current_date:
-                # 새로운 날짜 시작
-                current_date = row["date"]
-                daily_cumulative = row["tr"]
-            else:
-                # 같은 날짜 내에서 누적
-                daily_cumulative += row["tr"]
-
-            result.append(daily_cumulative)
-
-        return result
+    def _calculate_daily_tr(self, tr, day):
+        """일별 True Range 누적 합계 (float64 누적, 날짜 변경시 초기화)"""
+        # NaN은 해당 날짜 끝까지 전파 (첫 봉의 TR 미정)
+        return tr.groupby(day.to_numpy()).cumsum(skipna=False)
 
     def _calculate_rr_percentile(self, df):
-        """Realized Range Percentile 계산 (최적화된 버전)"""
-        df_copy = df.copy()
-        df_copy["date"] = df_copy["time"].dt.date
-
-        # 각 날짜별 최종 TR (일중 마지막 누적값)
-        daily_final_tr = df_copy.groupby("date")["daily_tr"].last()
-
-        # 20일 롤링 윈도우로 퍼센타일 계산
-        percentiles = []
-        lookback = 20
-
-        daily_tr_values = daily_final_tr.values
-        for i in range(len(daily_tr_values)):
-            if i < lookback:
-                percentiles.append(0.5)  # 초기값
-            else:
-                # 과거 20일 데이터와 비교
-                past_values = daily_tr_values[i - lookback : i]
-                current_value = daily_tr_values[i]
-                percentile = (past_values < current_value).sum() / len(past_values)
-                percentiles.append(percentile)
-
-        # 날짜별 퍼센타일 매핑
-        date_to_percentile = dict(zip(daily_final_tr.index, percentiles))
-
-        # 각 행에 매핑
-        result = []
-        for _, row in df_copy.iterrows():
-            result.append(date_to_percentile.get(row["date"], 0.5))
-
-        return result
+        """Realized Range Percentile 계산 (일별 최종 TR의 과거 20일 대비 순위)"""
+        return pd.Series(rr_percentile_by_day(df["day"].to_numpy(), df["daily_tr"]), index=df.index)
 
     def _calculate_displacement(self, df):
         """디스플레이스먼트 계산"""
@@ -241,19 +274,12 @@ class ETHSessionStrategy:
         df = self.df
         session_levels = {}
 
-        # 날짜별로 그룹화
-        df["date"] = df["time"].dt.date
+        # 날짜(일 번호)별 아시아 세션 고저점
+        asia_data = df[df["session"] == SESSION_ASIA]
+        asia_levels = asia_data.groupby("day").agg(asia_high=("high", "max"), asia_low=("low", "min"))
 
-        for date in df["date"].unique():
-            day_data = df[df["date"] == date].copy()
-
-            # 아시아 세션 고저점
-            asia_data = day_data[day_data["session"] == "asia"]
-            if len(asia_data) > 0:
-                asia_high = asia_data["high"].max()
-                asia_low = asia_data["low"].min()
-
-                session_levels[date] = {"asia_high": asia_high, "asia_low": asia_low}
+        for day, row in zip(asia_levels.index, asia_levels.itertuples(index=False)):
+            session_levels[int(day)] = {"asia_high": float(row.asia_high), "asia_low": float(row.asia_low)}
 
         return session_levels
 
@@ -261,26 +287,30 @@ class ETHSessionStrategy:
         """스윕 패턴 감지"""
         df = self.df
         sweeps = []
+        trading_session = df["trading_session"].to_numpy()
 
         for i in range(len(df)):
+            # 런던/NY 세션에서만 스윕 감지
+            if not trading_session[i]:
+                continue
+
             row = df.iloc[i]
-            date = row["date"]
+            day = row["day"]
 
-            if date not in session_levels:
+            if day not in session_levels:
                 continue
 
-            levels = session_levels[date]
+            levels = session_levels[day]
 
-            # 런던/NY 세션에서만 스윕 감지
-            if row["session"] not in ["london", "ny", "london_ny"]:
-                continue
+            # float32 저장값 → float64 계산
+            open_, high, low, close = float(row["open"]), float(row["high"]), float(row["low"]), float(row["close"])
 
             # 상승 스윕 (아시아 고점 돌파 후 복귀)
-            if row["high"] > levels["asia_high"] and row["close"] < levels["asia_high"]:
+            if high > levels["asia_high"] and close < levels["asia_high"]:
 
                 # 꼬리 비율 확인
-                wick_size = row["high"] - max(row["open"], row["close"])
-                total_range = row["high"] - row["low"]
+                wick_size = high - max(open_, close)
+                total_range = high - low
 
                 if total_range > 0:
                     wick_ratio = wick_size / total_range
@@ -291,18 +321,18 @@ class ETHSessionStrategy:
                                 "index": i,
                                 "type": "bullish_sweep",
                                 "sweep_level": levels["asia_high"],
-                                "sweep_high": row["high"],
+                                "sweep_high": high,
                                 "wick_ratio": wick_ratio,
                                 "time": row["time"],
                             }
                         )
 
             # 하락 스윕 (아시아 저점 하회 후 복귀)
-            if row["low"] < levels["asia_low"] and row["close"] > levels["asia_low"]:
+            if low < levels["asia_low"] and close > levels["asia_low"]:
 
                 # 꼬리 비율 확인
-                wick_size = min(row["open"], row["close"]) - row["low"]
-                total_range = row["high"] - row["low"]
+                wick_size = min(open_, close) - low
+                total_range = high - low
 
                 if total_range > 0:
                     wick_ratio = wick_size / total_range
@@ -313,7 +343,7 @@ class ETHSessionStrategy:
                                 "index": i,
                                 "type": "bearish_sweep",
                                 "sweep_level": levels["asia_low"],
-                                "sweep_low": row["low"],
+                                "sweep_low": low,
                                 "wick_ratio": wick_ratio,
                                 "time": row["time"],
                             }
@@ -322,7 +352,7 @@ class ETHSessionStrategy:
         return sweeps
 
     def generate_signals(self):
-        """트레이딩 신호 생성"""
+        """트레이딩 신호 생성 → 컬럼형 신호 테이블 (index, type, entry/stop/target_price, time, atr, sweep_index, sweep_level)"""
         print("🔍 신호 생성 중...")
 
         # 세션 레벨 찾기
@@ -331,96 +361,74 @@ class ETHSessionStrategy:
         # 스윕 감지
         sweeps = self.detect_sweeps(session_levels)
 
-        signals = []
         df = self.df
+        n = len(df)
+        open_price = df["open"].to_numpy()
+        close = df["close"].to_numpy()
+        atr = df["atr"].to_numpy()
+
+        # 진입 가능 봉: 레짐 필터(변동성) + 펀딩 시간 회피 + 디스플레이스먼트
+        eligible = (
+            ~(df["rr_percentile"].to_numpy() < self.params["rr_percentile"])
+            & ~df["funding_window"].to_numpy()
+            & df["displacement"].to_numpy()
+        )
+        long_entry = eligible & (close > open_price)  # 상승 디스플레이스먼트
+        short_entry = eligible & (close < open_price)  # 하락 디스플레이스먼트
+
+        sweep_index = np.array([sweep["index"] for sweep in sweeps], dtype=np.int64)
+        sweep_level = np.array([sweep["sweep_level"] for sweep in sweeps], dtype=np.float64)
+        is_long = np.array([sweep["type"] == "bullish_sweep" for sweep in sweeps], dtype=bool)
+
+        # 스윕 후 1~SIGNAL_LOOKAHEAD_BARS 바 중 첫 진입 가능 봉 (먼 바부터 덮어써 가장 가까운 바 유지)
+        entry_index = np.full(len(sweeps), -1, dtype=np.int64)
+        for offset in range(SIGNAL_LOOKAHEAD_BARS, 0, -1):
+            j = sweep_index + offset
+            in_range = j < n
+            j_clipped = np.minimum(j, n - 1)
+            hit = in_range & np.where(is_long, long_entry[j_clipped], short_entry[j_clipped])
+            entry_index = np.where(hit, j, entry_index)
+
+        found = entry_index >= 0
+        j = entry_index[found]
+        is_long = is_long[found]
+        entry_price = close[j].astype(np.float64)
+        stop_offset = self.params["stop_atr_mult"] * atr[j]
+
+        # 스톱은 스윕 레벨 너머, 목표는 target_r × 리스크
+        stop_price = np.where(is_long, sweep_level[found] - stop_offset, sweep_level[found] + stop_offset)
+        risk = np.where(is_long, entry_price - stop_price, stop_price - entry_price)
+        target_price = np.where(
+            is_long, entry_price + self.params["target_r"] * risk, entry_price - self.params["target_r"] * risk
+        )
 
-        for sweep in sweeps:
-            i = sweep["index"]
-
-            # 다음 몇 개 바에서 디스플레이스먼트 확인
-            for j in range(i + 1, min(i + 4, len(df))):  # 최대 3바 후까지
-                next_row = df.iloc[j]
-
-                # 레짐 필터 (변동성)
-                if next_row["rr_percentile"] < self.params["rr_percentile"]:
-                    continue
-
-                # 펀딩 시간 회피
-                if self._is_funding_time(next_row):
-                    continue
-
-                # 디스플레이스먼트 확인
-                if not next_row["displacement"]:
-                    continue
-
-                # 신호 생성
-                if sweep["type"] == "bullish_sweep":
-                    # 상승 디스플레이스먼트 확인
-                    if next_row["close"] > next_row["open"]:
-                        # 스톱은 스윕 레벨 아래
-                        stop_price = sweep["sweep_level"] - (self.params["stop_atr_mult"] * next_row["atr"])
-                        risk = next_row["close"] - stop_price
-                        target_price = next_row["close"] + (self.params["target_r"] * risk)
-
-                        signals.append(
-                            {
-                                "index": j,
-                                "type": "long",
-                                "entry_price": next_row["close"],
-                                "stop_price": stop_price,
-                                "target_price": target_price,
-                                "sweep_data": sweep,
-                                "time": next_row["time"],
-                                "atr": next_row["atr"],
-                            }
-                        )
-                        break
-
-                elif sweep["type"] == "bearish_sweep":
-                    # 하락 디스플레이스먼트 확인
-                    if next_row["close"] < next_row["open"]:
-                        # 스톱은 스윕 레벨 위
-                        stop_price = sweep["sweep_level"] + (self.params["stop_atr_mult"] * next_row["atr"])
-                        risk = stop_price - next_row["close"]
-                        target_price = next_row["close"] - (self.params["target_r"] * risk)
-
-                        signals.append(
-                            {
-                                "index": j,
-                                "type": "short",
-                                "entry_price": next_row["close"],
-                                "stop_price": stop_price,
-                                "target_price": target_price,
-                                "sweep_data": sweep,
-                                "time": next_row["time"],
-                                "atr": next_row["atr"],
-                            }
-                        )
-                        break
+        signals = pd.DataFrame(
+            {
+                "index": j,
+                "type": np.where(is_long, "long", "short"),
+                "entry_price": entry_price,
+                "stop_price": stop_price,
+                "target_price": target_price,
+                "time": df["time"].to_numpy()[j],
+                "atr": atr[j],
+                "sweep_index": sweep_index[found],
+                "sweep_level": sweep_level[found],
+            }
+        )
 
         self.signals = signals
         print(f"✅ {len(signals)}개 신호 생성 완료")
 
         return signals
 
-    def _is_funding_time(self, row):
-        """펀딩 시간 확인"""
-        hour = row["hour"]
-        minute = row["minute"]
-
-        for funding_hour in self.params["funding_hours"]:
-            # 펀딩 시간 전후 15분 회피
-            if (
-                (funding_hour == hour and minute == 0)
-                or (funding_hour - 1 == hour and minute == 45)
-                or (funding_hour == hour and minute == 15)
-            ):
-                return True
-        return False
-
-    def backtest(self):
-        """고급 리스크 관리가 적용된 백테스트 실행"""
-        if not self.signals:
+    def backtest(self, abort: Callable[[float], str] = None):
+        """고급 리스크 관리가 적용된 백테스트 실행
+
+        abort: 거래 손익을 순서대로 받아 중단 사유를 반환하는 판정 함수 (AbortRule.predicate)
+               - 사유가 반환되면 남은 신호를 생략하고 self.abort_reason에 기록
+        """
+        self.abort_reason = ""
+        if self.signals is None or self.signals.empty:
             print("❌ 신호가 없습니다. generate_signals()를 먼저 실행하세요.")
             return
 
@@ -430,7 +438,7 @@ class ETHSessionStrategy:
         df = self.df
         equity_curve = [self.initial_balance]
 
-        for i, signal in enumerate(self.signals):
+        for i, signal in enumerate(self.signals.to_dict("records")):
             if i % 100 == 0 and i > 0:
                 print(f"   진행률: {i}/{len(self.signals)} ({i/len(self.signals)*100:.1f}%)")
 
@@ -482,17 +490,18 @@ class ETHSessionStrategy:
 
             for j in range(entry_idx + 1, min(entry_idx + self.params["time_stop_bars"] + 1, len(df))):
                 bar = df.iloc[j]
+                bar_high, bar_low = float(bar["high"]), float(bar["low"])
 
                 if trade_type == "long":
                     # 유리한/불리한 움직임 추적
-                    favorable = bar["high"] - entry_price
-                    adverse = entry_price - bar["low"]
+                    favorable = bar_high - entry_price
+                    adverse = entry_price - bar_low
 
                     max_fav = max(max_fav, favorable)
                     max_adv = max(max_adv, adverse)
 
                     # 청산 확인 (우선순위 최고)
-                    if bar["low"] <= position_info["liquidation_price"]:
+                    if bar_low <= position_info["liquidation_price"]:
                         pnl_result = self.risk_manager.calculate_pnl(
                             position_info, entry_price, position_info["liquidation_price"], trade_type
                         )
@@ -509,7 +518,7 @@ class ETHSessionStrategy:
                         break
 
                     # 스톱 히트
-                    if bar["low"] <= stop_price:
+                    if bar_low <= stop_price:
                         pnl_result = self.risk_manager.calculate_pnl(position_info, entry_price, stop_price, trade_type)
                         trade.update(
                             {
@@ -524,7 +533,7 @@ class ETHSessionStrategy:
                         break
 
                     # 타겟 히트
-                    if bar["high"] >= target_price:
+                    if bar_high >= target_price:
                         pnl_result = self.risk_manager.calculate_pnl(position_info, entry_price, target_price, trade_type)
                         trade.update(
                             {
@@ -540,14 +549,14 @@ class ETHSessionStrategy:
 
                 else:  # short
                     # 유리한/불리한 움직임 추적
-                    favorable = entry_price - bar["low"]
-                    adverse = bar["high"] - entry_price
+                    favorable = entry_price - bar_low
+                    adverse = bar_high - entry_price
 
                     max_fav = max(max_fav, favorable)
                     max_adv = max(max_adv, adverse)
 
                     # 청산 확인 (우선순위 최고)
-                    if bar["high"] >= position_info["liquidation_price"]:
+                    if bar_high >= position_info["liquidation_price"]:
                         pnl_result = self.risk_manager.calculate_pnl(
                             position_info, entry_price, position_info["liquidation_price"], trade_type
                         )
@@ -564,7 +573,7 @@ class ETHSessionStrategy:
                         break
 
                     # 스톱 히트
-                    if bar["high"] >= stop_price:
+                    if bar_high >= stop_price:
                         pnl_result = self.risk_manager.calculate_pnl(position_info, entry_price, stop_price, trade_type)
                         trade.update(
                             {
@@ -579,7 +588,7 @@ class ETHSessionStrategy:
                         break
 
                     # 타겟 히트
-                    if bar["low"] <= target_price:
+                    if bar_low <= target_price:
                         pnl_result = self.risk_manager.calculate_pnl(position_info, entry_price, target_price, trade_type)
                         trade.update(
                             {
@@ -596,7 +605,7 @@ class ETHSessionStrategy:
             # 시간 스톱 (루프가 끝까지 갔을 경우)
             if trade["exit_time"] is None:
                 final_bar = df.iloc[min(entry_idx + self.params["time_stop_bars"], len(df) - 1)]
-                exit_price = final_bar["close"]
+                exit_price = float(final_bar["close"])
 
                 pnl_result = self.risk_manager.calculate_pnl(position_info, entry_price, exit_price, trade_type)
 
@@ -620,6 +629,12 @@ class ETHSessionStrategy:
 
             trades.append(trade)
 
+            if abort is not None:
+                self.abort_reason = abort(trade["pnl"])
+                if self.abort_reason:
+                    print(f"⏹️ 조기 중단 ({self.abort_reason}) - {i + 1}/{len(self.signals)}개 신호에서 종료")
+                    break
+
         self.trades = trades
         self.equity_curve = equity_curve
 
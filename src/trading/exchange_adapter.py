@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+비동기 거래소 어댑터
+- 단일 인터페이스: 캔들, 잔고, 포지션, 주문/취소
+- keep-alive 커넥션 풀 기반 aiohttp 세션 (이벤트 루프 블로킹 제거)
+- 테스트용 로컬 가짜 거래소 구현
+"""
+
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import time
+import warnings
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+warnings.filterwarnings("ignore")
+
+from rate_limiter import RateLimitGovernor, RequestPriority, get_rate_limiter, request_weight
+
+try:
+    import aiohttp
+    from yarl import URL
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class ExchangeAPIError(Exception):
+    """거래소 API 오류"""
+
+    def __init__(self, status: int, code: int, message: str):
+        super().__init__(f"APIError(code={code}): {message}")
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+class ExchangeAdapter(ABC):
+    """거래소 어댑터 인터페이스"""
+
+    @abstractmethod
+    async def get_klines(self, symbol: str, interval: str, limit: int = 500, start_time: int = None) -> List[List]:
+        """캔들 데이터 (바이낸스 kline 배열 형식)"""
+
+    @abstractmethod
+    async def get_balance(self) -> float:
+        """총 지갑 잔고 (USDT)"""
+
+    @abstractmethod
+    async def get_positions(self, symbol: str) -> List[Dict]:
+        """포지션 정보"""
+
+    @abstractmethod
+    async def get_price(self, symbol: str) -> float:
+        """현재가"""
+
+    @abstractmethod
+    async def change_leverage(self, symbol: str, leverage: int) -> Dict:
+        """레버리지 설정"""
+
+    @abstractmethod
+    async def place_order(self, symbol: str, side: str, type: str, quantity: float, **kwargs) -> Dict:
+        """주문 실행"""
+
+    async def place_batch_orders(self, orders: List[Dict]) -> List[Dict]:
+        """일괄 주문 (기본: 개별 주문 동시 실행)"""
+        tasks = [self.place_order(**order) for order in orders]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return [{"code": getattr(r, "code", -1), "msg": str(r)} if isinstance(r, Exception) else r for r in results]
+
+    @abstractmethod
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict:
+        """주문 취소"""
+
+    async def close(self):
+        """리소스 정리"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+class BinanceFuturesAdapter(ExchangeAdapter):
+    """바이낸스 USDⓈ-M 선물 REST 어댑터 (커넥션 풀 재사용)"""
+
+    MAINNET_URL = "https://fapi.binance.com"
+    TESTNET_URL = "https://testnet.binancefuture.com"
+
+    def __init__(
+        self,
+        api_key: str = None,
+        secret_key: str = None,
+        testnet: bool = False,
+        base_url: str = None,
+        pool_size: int = 10,
+        timeout: float = 10.0,
+        recv_window: int = 5000,
+        rate_limiter: RateLimitGovernor = None,
+    ):
+        """어댑터 초기화 - 세션은 첫 요청 시 생성 (이벤트 루프 바인딩)"""
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp가 설치되지 않았습니다")
+
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.base_url = base_url or (self.TESTNET_URL if testnet else self.MAINNET_URL)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.recv_window = recv_window
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._session = None
+
+    async def _get_session(self):
+        """keep-alive 커넥션 풀 세션"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60, ttl_dns_cache=300)
+            headers = {"X-MBX-APIKEY": self.api_key} if self.api_key else {}
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    def _sign(self, params: Dict) -> str:
+        """HMAC SHA256 서명 쿼리 문자열"""
+        params = {k: v for k, v in params.items() if v is not None}
+        params["timestamp"] = int(time.time() * 1000)
+        params["recvWindow"] = self.recv_window
+        query = urlencode(params)
+        signature = hmac.new(self.secret_key.encode(), query.encode(), hashlib.sha256).hexdigest()
+        return f"{query}&signature={signature}"
+
+    async def _request(
+        self, method: str, path: str, params: Dict = None, signed: bool = False, priority: RequestPriority = None
+    ):
+        """REST 요청 (가중치 거버너 통과 후 전송, 서명 요청은 거래 핵심 우선순위)"""
+        params = params or {}
+        if priority is None:
+            priority = RequestPriority.CRITICAL if signed else RequestPriority.NORMAL
+        await self.rate_limiter.acquire_async(request_weight(path, params), priority)
+
+        if signed:
+            query = self._sign(params)
+        else:
+            query = urlencode({k: v for k, v in params.items() if v is not None})
+
+        url = URL(f"{self.base_url}{path}?{query}" if query else f"{self.base_url}{path}", encoded=True)
+        session = await self._get_session()
+
+        async with session.request(method, url) as response:
+            self.rate_limiter.update_from_headers(response.headers)
+            if response.status in (418, 429):
+                self.rate_limiter.penalize(response.headers.get("Retry-After"))
+
+            text = await response.text()
+            try:
+                data = json.loads(text)
+            except ValueError:
+                # HTML 오류 페이지 / 빈 응답 (게이트웨이 오류, 점검 등)
+                raise ExchangeAPIError(response.status, -1, f"JSON이 아닌 응답: {text[:200]!r}") from None
+            if response.status >= 400:
+                code = data.get("code", -1) if isinstance(data, dict) else -1
+                message = data.get("msg", str(data)) if isinstance(data, dict) else str(data)
+                raise ExchangeAPIError(response.status, code, message)
+            return data
+
+    async def get_klines(self, symbol: str, interval: str, limit: int = 500, start_time: int = None) -> List[List]:
+        """캔들 데이터"""
+        params = {"symbol": symbol, "interval": interval, "limit": limit, "startTime": start_time}
+        return await self._request("GET", "/fapi/v1/klines", params)
+
+    async def get_balance(self) -> float:
+        """총 지갑 잔고"""
+        account = await self._request("GET", "/fapi/v2/account", signed=True)
+        return float(account["totalWalletBalance"])
+
+    async def get_positions(self, symbol: str) -> List[Dict]:
+        """포지션 정보"""
+        return await self._request("GET", "/fapi/v2/positionRisk", {"symbol": symbol}, signed=True)
+
+    async def get_price(self, symbol: str) -> float:
+        """현재가"""
+        ticker = await self._request("GET", "/fapi/v1/ticker/price", {"symbol": symbol})
+        return float(ticker["price"])
+
+    async def change_leverage(self, symbol: str, leverage: int) -> Dict:
+        """레버리지 설정"""
+        return await self._request("POST", "/fapi/v1/leverage", {"symbol": symbol, "leverage": leverage}, signed=True)
+
+    async def place_order(self, symbol: str, side: str, type: str, quantity: float, **kwargs) -> Dict:
+        """주문 실행"""
+        params = {"symbol": symbol, "side": side, "type": type, "quantity": quantity}
+        params.update(kwargs)
+        return await self._request("POST", "/fapi/v1/order", params, signed=True)
+
+    async def place_batch_orders(self, orders: List[Dict]) -> List[Dict]:
+        """일괄 주문 - 단일 요청 (최대 5건)"""
+        batch = [{k: str(v) for k, v in order.items() if v is not None} for order in orders]
+        params = {"batchOrders": json.dumps(batch, separators=(",", ":"))}
+        return await self._request("POST", "/fapi/v1/batchOrders", params, signed=True)
+
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict:
+        """주문 취소"""
+        return await self._request("DELETE", "/fapi/v1/order", {"symbol": symbol, "orderId": order_id}, signed=True)
+
+    async def close(self):
+        """세션 종료"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class FakeExchangeAdapter(ExchangeAdapter):
+    """로컬 가짜 거래소 - 테스트 및 지연시간 측정용"""
+
+    def __init__(self, klines: List[List] = None, balance: float = 1000.0, price: float = 2500.0, latency: float = 0.0):
+        """가짜 거래소 초기화 (latency: 요청당 왕복 지연 초)"""
+        self.klines = klines or []
+        self.balance = balance
+        self.price = price
+        self.latency = latency
+        self.leverage = {}
+        self.position_amt = {}
+        self.open_orders = {}
+        self.calls = []
+        self._order_ids = itertools.count(1)
+
+    async def _round_trip(self, name: str, **kwargs):
+        """요청 기록 + 지연 주입"""
+        self.calls.append((name, kwargs))
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    async def get_klines(self, symbol: str, interval: str, limit: int = 500, start_time: int = None) -> List[List]:
+        await self._round_trip("get_klines", symbol=symbol, interval=interval, limit=limit)
+        klines = self.klines
+        if start_time is not None:
+            klines = [k for k in klines if k[0] >= start_time]
+            return klines[:limit]
+        return klines[-limit:]
+
+    async def get_balance(self) -> float:
+        await self._round_trip("get_balance")
+        return self.balance
+
+    async def get_positions(self, symbol: str) -> List[Dict]:
+        await self._round_trip("get_positions", symbol=symbol)
+        amount = self.position_amt.get(symbol, 0.0)
+        return [{"symbol": symbol, "positionAmt": str(amount), "entryPrice": str(self.price), "unRealizedProfit": "0.0"}]
+
+    async def get_price(self, symbol: str) -> float:
+        await self._round_trip("get_price", symbol=symbol)
+        return self.price
+
+    async def change_leverage(self, symbol: str, leverage: int) -> Dict:
+        await self._round_trip("change_leverage", symbol=symbol, leverage=leverage)
+        self.leverage[symbol] = leverage
+        return {"symbol": symbol, "leverage": leverage}
+
+    def _fill_order(self, symbol: str, side: str, type: str, quantity: float, **kwargs) -> Dict:
+        """주문 체결/등록 처리"""
+        order = {
+            "orderId": next(self._order_ids),
+            "symbol": symbol,
+            "side": side,
+            "type": type,
+            "origQty": str(quantity),
+            "status": "FILLED" if type == "MARKET" else "NEW",
+        }
+        order.update(kwargs)
+
+        if type == "MARKET":
+            signed_qty = quantity if side == "BUY" else -quantity
+            self.position_amt[symbol] = self.position_amt.get(symbol, 0.0) + signed_qty
+        else:
+            self.open_orders[order["orderId"]] = order
+        return order
+
+    async def place_order(self, symbol: str, side: str, type: str, quantity: float, **kwargs) -> Dict:
+        await self._round_trip("place_order", symbol=symbol, side=side, type=type, quantity=quantity, **kwargs)
+        return self._fill_order(symbol, side, type, quantity, **kwargs)
+
+    async def place_batch_orders(self, orders: List[Dict]) -> List[Dict]:
+        await self._round_trip("place_batch_orders", count=len(orders))
+        return [self._fill_order(**order) for order in orders]
+
+    async def cancel_order(self, symbol: str, order_id: int) -> Dict:
+        await self._round_trip("cancel_order", symbol=symbol, order_id=order_id)
+        if order_id not in self.open_orders:
+            raise ExchangeAPIError(400, -2011, "Unknown order sent.")
+        order = self.open_orders.pop(order_id)
+        order["status"] = "CANCELED"
+        return order
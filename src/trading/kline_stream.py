@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+웹소켓 캔들 스트림 수집기
+- 봉 마감 즉시 마감 이벤트 발행 (15분 sleep 폴링 대체)
+- 누락 구간 / 재연결 시 REST 보충 (gap-fill)
+- 로컬 웹소켓 리플레이 서버로 테스트 가능
+"""
+
+import asyncio
+import json
+import logging
+import time
+import warnings
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+warnings.filterwarnings("ignore")
+
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from exchange_adapter import ExchangeAdapter
+
+logger = logging.getLogger(__name__)
+
+# 봉 간격 (ms)
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+
+@dataclass
+class ClosedBarEvent:
+    """봉 마감 이벤트"""
+
+    symbol: str
+    interval: str
+    open_time: int
+    close_time: int
+    kline: List
+    received_at: int  # 수신 시각 (epoch ms)
+    source: str  # "ws" 또는 "rest"
+    gap_filled: int = 0  # REST로 보충한 봉 수
+
+    @property
+    def latency_ms(self) -> float:
+        """봉 마감 → 이벤트 수신 지연"""
+        return self.received_at - self.close_time
+
+
+class KlineStream:
+    """마감 봉 이벤트 스트림"""
+
+    STREAM_URL = "wss://fstream.binance.com/ws"
+    TESTNET_STREAM_URL = "wss://stream.binancefuture.com/ws"
+
+    def __init__(
+        self,
+        exchange: ExchangeAdapter,
+        symbol: str = "ETHUSDT",
+        interval: str = "15m",
+        history: int = 1000,
+        stream_url: str = None,
+        testnet: bool = False,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+    ):
+        """스트림 초기화 (stream_url: 웹소켓 전체 URL, 미지정시 바이낸스 선물 스트림)"""
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"지원하지 않는 봉 간격: {interval}")
+
+        self.exchange = exchange
+        self.symbol = symbol
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self.history = history
+        base_url = self.TESTNET_STREAM_URL if testnet else self.STREAM_URL
+        self.stream_url = stream_url or f"{base_url}/{symbol.lower()}@kline_{interval}"
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.klines: List[List] = []  # 마감된 봉만 (바이낸스 kline 배열 형식)
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        """마지막 마감 봉 시작 시각"""
+        return self.klines[-1][0] if self.klines else None
+
+    def _merge(self, klines: List[List], now_ms: int) -> List[List]:
+        """마감 봉 병합 (중복/미마감 제거) - 새로 추가된 봉 반환"""
+        added = []
+        for kline in klines:
+            open_time, close_time = int(kline[0]), int(kline[6])
+            if close_time >= now_ms:
+                continue  # 진행 중인 봉
+            if self.last_open_time is not None and open_time <= self.last_open_time:
+                continue  # 중복
+            self.klines.append(kline)
+            added.append(kline)
+
+        if len(self.klines) > self.history:
+            del self.klines[: len(self.klines) - self.history]
+        return added
+
+    async def backfill(self) -> int:
+        """초기 이력 로드"""
+        klines = await self.exchange.get_klines(self.symbol, self.interval, limit=self.history)
+        added = self._merge(klines, int(time.time() * 1000))
+        logger.info(f"📥 캔들 이력 로드: {len(added)}개 ({self.symbol} {self.interval})")
+        return len(added)
+
+    async def gap_fill(self) -> List[List]:
+        """마지막 봉 이후 누락 구간 REST 보충"""
+        if self.last_open_time is None:
+            await self.backfill()
+            return list(self.klines)
+
+        added = []
+        while True:
+            start_time = self.last_open_time + self.interval_ms
+            klines = await self.exchange.get_klines(self.symbol, self.interval, limit=1500, start_time=start_time)
+            new_bars = self._merge(klines, int(time.time() * 1000))
+            added.extend(new_bars)
+            if len(klines) < 1500 or not new_bars:
+                break
+        return added
+
+    def _emit(self, kline: List, source: str, gap_filled: int = 0):
+        """마감 이벤트 발행"""
+        event = ClosedBarEvent(
+            symbol=self.symbol,
+            interval=self.interval,
+            open_time=int(kline[0]),
+            close_time=int(kline[6]),
+            kline=kline,
+            received_at=int(time.time() * 1000),
+            source=source,
+            gap_filled=gap_filled,
+        )
+        self.events.put_nowait(event)
+
+    @staticmethod
+    def parse_message(data: Dict) -> Optional[List]:
+        """웹소켓 kline 메시지 → 마감 봉 kline 배열 (미마감이면 None)"""
+        if data.get("e") != "kline":
+            return None
+
+        k = data["k"]
+        if not k.get("x"):
+            return None
+
+        return [k["t"], k["o"], k["h"], k["l"], k["c"], k["v"], k["T"], k["q"], k["n"], k["V"], k["Q"], "0"]
+
+    async def _on_closed_bar(self, kline: List):
+        """웹소켓 마감 봉 처리 - 이전 봉 누락시 REST 보충 후 병합"""
+        gap_filled = 0
+        expected = self.last_open_time + self.interval_ms if self.last_open_time is not None else None
+        if expected is not None and int(kline[0]) > expected:
+            gap_filled = len(await self.gap_fill())
+
+        # 마감 메시지는 close_time 직후 도착하므로 close_time 기준 필터를 우회
+        if self._merge([kline], int(kline[6]) + 1):
+            self._emit(kline, "ws", gap_filled)
+        elif gap_filled:
+            self._emit(self.klines[-1], "rest", gap_filled)
+
+    async def _consume(self, session):
+        """웹소켓 연결 및 메시지 처리"""
+        async with session.ws_connect(self.stream_url, heartbeat=30) as ws:
+            logger.info(f"🔌 캔들 스트림 연결: {self.stream_url}")
+
+            # 연결 공백 동안 마감된 봉 보충
+            added = await self.gap_fill()
+            if added:
+                self._emit(added[-1], "rest", len(added))
+
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    kline = self.parse_message(json.loads(msg.data))
+                    if kline is not None:
+                        await self._on_closed_bar(kline)
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+
+    async def run(self):
+        """스트림 실행 (재연결 + 지수 백오프)"""
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp가 설치되지 않았습니다")
+
+        self.is_running = True
+        delay = self.reconnect_delay
+
+        async with aiohttp.ClientSession() as session:
+            while self.is_running:
+                try:
+                    # 초기 이력 로드도 재연결과 같은 백오프 경로로 재시도
+                    if not self.klines:
+                        await self.backfill()
+                    await self._consume(session)
+                    delay = self.reconnect_delay
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"⚠️ 캔들 스트림 오류: {e} - {delay:.0f}초 후 재연결")
+
+                if not self.is_running:
+                    break
+
+                # 연결 불가 동안에도 REST 보충으로 마감 이벤트 유지 (이력 로드 전이면 다음 시도에서 로드)
+                if self.klines:
+                    try:
+                        added = await self.gap_fill()
+                        if added:
+                            self._emit(added[-1], "rest", len(added))
+                    except Exception as e:
+                        logger.warning(f"⚠️ REST 보충 실패: {e}")
+
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def start(self) -> asyncio.Task:
+        """백그라운드 실행"""
+        if self._task is None or self._task.done():
+            if self._task is not None:
+                self.events = asyncio.Queue()  # 이전 실행의 종료 표식 제거
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        """스트림 중지 (대기 중인 소비자 깨움)"""
+        self.is_running = False
+        if self._task is not None:
+            self._task.cancel()
+        self.events.put_nowait(None)
+
+    async def closed_bars(self) -> AsyncIterator[ClosedBarEvent]:
+        """마감 봉 이벤트 비동기 반복자 (stop() 이후 모든 소비자 종료)"""
+        self.start()
+        while True:
+            event = await self.events.get()
+            if event is None:
+                # 종료 표식을 다시 넣어 대기 중인 다른 소비자도 깨움
+                self.events.put_nowait(None)
+                break
+            yield event
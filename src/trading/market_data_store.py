@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+증분 추가 전용 시장 데이터 저장소
+- 심볼 / 봉 간격 / 월 단위 Parquet 파티션
+- 추가시 해당 월 파티션만 새 버전으로 기록 (전체 CSV 재작성 제거)
+- 매니페스트 원자적 교체로 읽기 측은 항상 일관된 스냅샷 조회
+- 타임스탬프 중복 제거 + 누락 구간(gap) 탐지
+"""
+
+import json
+import os
+import warnings
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from kline_stream import INTERVAL_MS
+
+warnings.filterwarnings("ignore")
+
+# 저장 컬럼 (바이낸스 kline 배열 순서, 마지막 ignore 제외)
+STORE_COLUMNS = [
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_volume",
+    "trades",
+    "taker_buy_base",
+    "taker_buy_quote",
+]
+STORE_INT_COLUMNS = {"timestamp", "close_time", "trades"}
+
+
+def month_keys(timestamps: np.ndarray) -> np.ndarray:
+    """epoch ms → 'YYYY-MM' 파티션 키"""
+    months = np.asarray(timestamps, dtype=np.int64).astype("datetime64[ms]").astype("datetime64[M]")
+    return np.datetime_as_string(months, unit="M")
+
+
+class MarketDataStore:
+    """월 파티션 Parquet 저장소 (단일 작성자, 다중 독자)"""
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, root: str = None):
+        """저장소 초기화 (root: 저장소 루트, 기본 MARKET_DATA_DIR 또는 data/store)"""
+        self.root = root or os.getenv("MARKET_DATA_DIR", "data/store")
+
+    def series_dir(self, symbol: str, interval: str) -> str:
+        """심볼/간격 디렉토리"""
+        return os.path.join(self.root, symbol, interval)
+
+    def manifest_path(self, symbol: str, interval: str) -> str:
+        """매니페스트 경로"""
+        return os.path.join(self.series_dir(symbol, interval), self.MANIFEST_NAME)
+
+    def read_manifest(self, symbol: str, interval: str) -> Dict:
+        """현재 매니페스트 (없으면 빈 매니페스트)"""
+        path = self.manifest_path(symbol, interval)
+        if not os.path.exists(path):
+            return {
+                "symbol": symbol,
+                "interval": interval,
+                "version": 0,
+                "rows": 0,
+                "first_timestamp": None,
+                "last_timestamp": None,
+                "partitions": {},
+                "empty_ranges": [],
+            }
+
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _publish_manifest(self, symbol: str, interval: str, manifest: Dict):
+        """매니페스트 원자적 교체 (임시 파일 → os.replace)"""
+        path = self.manifest_path(symbol, interval)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """마지막 저장 봉 시작 시각"""
+        return self.read_manifest(symbol, interval)["last_timestamp"]
+
+    def _read_partition(self, symbol: str, interval: str, entry: Dict, columns: List[str] = None) -> Dict[str, np.ndarray]:
+        """파티션 → NumPy 컬럼"""
+        path = os.path.join(self.series_dir(symbol, interval), entry["file"])
+        table = pq.read_table(path, columns=columns or STORE_COLUMNS)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, np.ndarray]:
+        return {name: np.empty(0, dtype=np.int64 if name in STORE_INT_COLUMNS else np.float64) for name in STORE_COLUMNS}
+
+    @staticmethod
+    def _normalize(columns: Dict) -> Dict[str, np.ndarray]:
+        """입력 컬럼 dtype 정규화"""
+        return {
+            name: np.asarray(columns[name], dtype=np.int64 if name in STORE_INT_COLUMNS else np.float64)
+            for name in STORE_COLUMNS
+        }
+
+    def append(self, symbol: str, interval: str, columns: Dict, empty_ranges: List[Tuple[int, int]] = None) -> Dict[str, int]:
+        """봉 추가 - 새 타임스탬프가 있는 월 파티션만 재기록 후 매니페스트 교체"""
+        manifest = self.read_manifest(symbol, interval)
+        series_dir = self.series_dir(symbol, interval)
+        os.makedirs(series_dir, exist_ok=True)
+
+        columns = self._normalize(columns) if columns is not None else self._empty_columns()
+        version = manifest["version"] + 1
+        stats = {"added": 0, "duplicates": 0, "partitions_written": 0, "bytes_written": 0}
+        superseded = []
+
+        keys = month_keys(columns["timestamp"])
+        for month in np.unique(keys):
+            mask = keys == month
+            incoming = {name: values[mask] for name, values in columns.items()}
+
+            entry = manifest["partitions"].get(month)
+            existing = self._read_partition(symbol, interval, entry) if entry else self._empty_columns()
+
+            # 기존 봉 우선 (마감 봉은 불변) - 새 타임스탬프만 추가
+            new_mask = ~np.isin(incoming["timestamp"], existing["timestamp"])
+            _, first_idx = np.unique(incoming["timestamp"][new_mask], return_index=True)
+            added = len(first_idx)
+            stats["duplicates"] += len(incoming["timestamp"]) - added
+            if added == 0:
+                continue
+
+            merged = {name: np.concatenate([existing[name], incoming[name][new_mask][first_idx]]) for name in STORE_COLUMNS}
+            order = np.argsort(merged["timestamp"], kind="stable")
+            merged = {name: values[order] for name, values in merged.items()}
+
+            # 버전별 새 파일로 기록 - 매니페스트 교체 전까지 독자는 이전 파일을 조회
+            filename = f"{month}.v{version}.parquet"
+            path = os.path.join(series_dir, filename)
+            tmp_path = f"{path}.tmp"
+            pq.write_table(pa.table(merged), tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+
+            if entry:
+                superseded.append(entry["file"])
+            manifest["partitions"][month] = {
+                "file": filename,
+                "rows": int(len(merged["timestamp"])),
+                "first_timestamp": int(merged["timestamp"][0]),
+                "last_timestamp": int(merged["timestamp"][-1]),
+            }
+            stats["added"] += added
+            stats["partitions_written"] += 1
+            stats["bytes_written"] += os.path.getsize(path)
+
+        new_empty = [list(map(int, r)) for r in (empty_ranges or []) if list(r) not in manifest["empty_ranges"]]
+        if stats["partitions_written"] == 0 and not new_empty:
+            return stats
+
+        partitions = manifest["partitions"].values()
+        manifest.update(
+            {
+                "version": version,
+                "updated_at": datetime.now().isoformat(),
+                "rows": sum(p["rows"] for p in partitions),
+                "first_timestamp": min((p["first_timestamp"] for p in partitions), default=None),
+                "last_timestamp": max((p["last_timestamp"] for p in partitions), default=None),
+                "empty_ranges": sorted(manifest["empty_ranges"] + new_empty),
+            }
+        )
+        self._publish_manifest(symbol, interval, manifest)
+
+        # 교체 후 이전 버전 정리
+        for filename in superseded:
+            try:
+                os.remove(os.path.join(series_dir, filename))
+            except OSError:
+                pass
+
+        return stats
+
+    def import_csv(self, symbol: str, interval: str, csv_path: str) -> Dict[str, int]:
+        """기존 수집기 CSV(time 또는 timestamp + OHLCV) → 저장소 추가 (없는 컬럼은 0, close_time은 봉 끝)"""
+        df = pd.read_csv(csv_path)
+        if "timestamp" in df.columns:
+            timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+        else:
+            timestamps = pd.to_datetime(df["time"]).to_numpy(dtype="datetime64[ms]").view(np.int64)
+
+        columns = {name: df[name].to_numpy() if name in df.columns else np.zeros(len(df)) for name in STORE_COLUMNS}
+        columns["timestamp"] = timestamps
+        if "close_time" not in df.columns:
+            columns["close_time"] = timestamps + INTERVAL_MS[interval] - 1
+        return self.append(symbol, interval, columns)
+
+    def find_gaps(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        """누락 구간 [시작, 끝) 목록 (거래소 무데이터로 확인된 구간 제외)"""
+        manifest = self.read_manifest(symbol, interval)
+        if not manifest["partitions"]:
+            return []
+
+        interval_ms = INTERVAL_MS[interval]
+        timestamps = np.concatenate(
+            [
+                self._read_partition(symbol, interval, manifest["partitions"][month], ["timestamp"])["timestamp"]
+                for month in sorted(manifest["partitions"])
+            ]
+        )
+        breaks = np.nonzero(np.diff(timestamps) > interval_ms)[0]
+        known_empty = {tuple(r) for r in manifest["empty_ranges"]}
+
+        gaps = []
+        for i in breaks:
+            gap = (int(timestamps[i]) + interval_ms, int(timestamps[i + 1]))
+            if gap not in known_empty:
+                gaps.append(gap)
+        return gaps
+
+    def load_columns(
+        self, symbol: str, interval: str, start_ms: int = None, end_ms: int = None, columns: List[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """구간 조회 → NumPy 컬럼 (해당 월 파티션만 읽음)"""
+        manifest = self.read_manifest(symbol, interval)
+        columns = columns or STORE_COLUMNS
+        read_columns = columns if "timestamp" in columns else ["timestamp"] + list(columns)
+
+        parts = []
+        for month in sorted(manifest["partitions"]):
+            entry = manifest["partitions"][month]
+            if start_ms is not None and entry["last_timestamp"] < start_ms:
+                continue
+            if end_ms is not None and entry["first_timestamp"] >= end_ms:
+                continue
+            parts.append(self._read_partition(symbol, interval, entry, read_columns))
+
+        if not parts:
+            empty = self._empty_columns()
+            return {name: empty[name] for name in columns}
+
+        data = {name: np.concatenate([p[name] for p in parts]) for name in read_columns}
+        mask = np.ones(len(data["timestamp"]), dtype=bool)
+        if start_ms is not None:
+            mask &= data["timestamp"] >= start_ms
+        if end_ms is not None:
+            mask &= data["timestamp"] < end_ms
+        return {name: data[name][mask] for name in columns}
+
+    def load(self, symbol: str, interval: str, start_ms: int = None, end_ms: int = None) -> pd.DataFrame:
+        """전략용 OHLCV DataFrame (time, open, high, low, close, volume)"""
+        data = self.load_columns(symbol, interval, start_ms, end_ms, ["timestamp", "open", "high", "low", "close", "volume"])
+        df = pd.DataFrame(data)
+        df.insert(0, "time", pd.to_datetime(df.pop("timestamp"), unit="ms"))
+        return df
+
+    def get_status(self, symbol: str, interval: str) -> Dict:
+        """저장소 상태 요약"""
+        manifest = self.read_manifest(symbol, interval)
+        return {
+            "version": manifest["version"],
+            "rows": manifest["rows"],
+            "partitions": len(manifest["partitions"]),
+            "first_timestamp": manifest["first_timestamp"],
+            "last_timestamp": manifest["last_timestamp"],
+            "empty_ranges": len(manifest["empty_ranges"]),
+        }
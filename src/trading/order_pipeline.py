@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+브래킷 주문 파이프라인
+- 진입 체결 확인 즉시 스톱로스/익절 주문을 동시(또는 일괄) 제출
+- 단계별 소요시간 측정 (진입 → 스톱 활성까지 보호 공백 최소화)
+"""
+
+import asyncio
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+warnings.filterwarnings("ignore")
+
+from exchange_adapter import ExchangeAdapter
+
+
+@dataclass
+class BracketOrderResult:
+    """브래킷 주문 결과"""
+
+    entry_order: Dict
+    stop_order: Optional[Dict] = None
+    target_order: Optional[Dict] = None
+    timings: Dict[str, float] = field(default_factory=dict)  # 단계별 소요시간 (ms)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def protected(self) -> bool:
+        """스톱로스 활성 여부"""
+        return self.stop_order is not None
+
+
+class BracketOrderPipeline:
+    """진입 + 보호 주문 파이프라인"""
+
+    MODES = ("concurrent", "batch", "sequential")
+
+    def __init__(self, exchange: ExchangeAdapter, mode: str = "concurrent"):
+        """파이프라인 초기화 (mode: concurrent=동시 제출, batch=일괄 주문 1회, sequential=기존 순차 방식)"""
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 주문 모드: {mode}")
+
+        self.exchange = exchange
+        self.mode = mode
+
+    def _protective_orders(
+        self, symbol: str, side: str, quantity: float, stop_price: float, target_price: Optional[float]
+    ) -> List[Dict]:
+        """스톱로스/익절 주문 생성 (reduceOnly)"""
+        exit_side = "SELL" if side == "BUY" else "BUY"
+        orders = [
+            {
+                "symbol": symbol,
+                "side": exit_side,
+                "type": "STOP_MARKET",
+                "quantity": quantity,
+                "stopPrice": stop_price,
+                "reduceOnly": "true",
+            }
+        ]
+        if target_price is not None:
+            orders.append(
+                {
+                    "symbol": symbol,
+                    "side": exit_side,
+                    "type": "TAKE_PROFIT_MARKET",
+                    "quantity": quantity,
+                    "stopPrice": target_price,
+                    "reduceOnly": "true",
+                }
+            )
+        return orders
+
+    async def _place_timed(self, order: Dict, start: float, acked: Dict[str, float]):
+        """개별 주문 제출 + 응답 시각 기록"""
+        result = await self.exchange.place_order(**order)
+        acked[order["type"]] = (time.perf_counter() - start) * 1000
+        return result
+
+    async def submit(
+        self, symbol: str, side: str, quantity: float, stop_price: float, target_price: Optional[float] = None
+    ) -> BracketOrderResult:
+        """브래킷 주문 제출 - 진입 실패시 예외 전파, 보호 주문 실패는 errors에 기록"""
+        start = time.perf_counter()
+
+        # 1. 시장가 진입
+        entry_order = await self.exchange.place_order(symbol, side, "MARKET", quantity)
+        entry_ack = time.perf_counter()
+        result = BracketOrderResult(entry_order=entry_order)
+        result.timings["entry_ms"] = (entry_ack - start) * 1000
+
+        # 2. 보호 주문 제출
+        orders = self._protective_orders(symbol, side, quantity, stop_price, target_price)
+        acked = {}
+
+        if self.mode == "batch":
+            # 일괄 요청 자체가 실패하면 보호 주문 전부 실패로 기록 (진입은 이미 체결)
+            try:
+                responses = await self.exchange.place_batch_orders(orders)
+                batch_ms = (time.perf_counter() - entry_ack) * 1000
+                acked = {order["type"]: batch_ms for order in orders}
+            except Exception as e:
+                responses = [e] * len(orders)
+        elif self.mode == "concurrent":
+            tasks = [self._place_timed(order, entry_ack, acked) for order in orders]
+            responses = await asyncio.gather(*tasks, return_exceptions=True)
+        else:
+            responses = []
+            for order in orders:
+                try:
+                    responses.append(await self._place_timed(order, entry_ack, acked))
+                except Exception as e:
+                    responses.append(e)
+
+        for order, response in zip(orders, responses):
+            if isinstance(response, Exception) or (isinstance(response, dict) and "code" in response):
+                message = response.get("msg") if isinstance(response, dict) else str(response)
+                result.errors.append(f"{order['type']} 실패: {message}")
+                continue
+
+            if order["type"] == "STOP_MARKET":
+                result.stop_order = response
+            else:
+                result.target_order = response
+
+        end = time.perf_counter()
+        result.timings["protection_ms"] = (end - entry_ack) * 1000
+        if "STOP_MARKET" in acked and result.protected:
+            result.timings["entry_to_stop_live_ms"] = acked["STOP_MARKET"]
+        result.timings["total_ms"] = (end - start) * 1000
+
+        return result
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+바이낸스 요청 가중치 레이트 리밋 거버너
+- 프로세스 전역 토큰 버킷 (IP 가중치 1분 한도 기준)
+- 응답 헤더(X-MBX-USED-WEIGHT-1M)로 서버 사용량 동기화, 없으면 로컬 추정
+- 우선순위: 거래 핵심 요청 > 일반 조회 > 대량 이력 수집
+- 429/418 응답시 Retry-After 동안 전체 일시 정지
+"""
+
+import asyncio
+import threading
+import time
+import warnings
+from enum import IntEnum
+from typing import Dict, Optional
+
+warnings.filterwarnings("ignore")
+
+
+class RequestPriority(IntEnum):
+    """요청 우선순위 (낮을수록 우선)"""
+
+    CRITICAL = 0  # 주문/취소/포지션/잔고
+    NORMAL = 1  # 실시간 캔들/가격 조회
+    BULK = 2  # 과거 데이터 대량 수집
+
+
+# 엔드포인트별 요청 가중치 (USDⓈ-M 선물)
+ENDPOINT_WEIGHTS = {
+    "/fapi/v1/ticker/price": 1,
+    "/fapi/v1/leverage": 1,
+    "/fapi/v1/order": 1,
+    "/fapi/v1/batchOrders": 5,
+    "/fapi/v2/account": 5,
+    "/fapi/v2/positionRisk": 5,
+}
+
+
+def klines_weight(limit: int) -> int:
+    """캔들 요청 가중치 (limit 구간별)"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def request_weight(path: str, params: Dict = None) -> int:
+    """요청 가중치 추정"""
+    if path.endswith("/klines"):
+        return klines_weight(int((params or {}).get("limit", 500)))
+    return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+class RateLimitGovernor:
+    """토큰 버킷 기반 가중치 거버너 (스레드/코루틴 공용)"""
+
+    # 우선순위별 사용 불가 잔여 토큰 비율 (대량 수집이 거래 요청 몫을 잠식하지 않도록)
+    RESERVE_RATIO = {
+        RequestPriority.CRITICAL: 0.0,
+        RequestPriority.NORMAL: 0.1,
+        RequestPriority.BULK: 0.3,
+    }
+
+    def __init__(self, weight_limit: int = 2400, window_seconds: float = 60.0, safety_margin: float = 0.9):
+        """거버너 초기화 (weight_limit: 서버 1분 가중치 한도)"""
+        self.weight_limit = weight_limit
+        self.window_seconds = window_seconds
+        self.capacity = weight_limit * safety_margin
+        self.refill_rate = self.capacity / window_seconds
+
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting = {priority: 0 for priority in RequestPriority}
+        self.lock = threading.Lock()
+
+        # 통계
+        self.stats = {"requests": 0, "weight": 0, "waits": 0, "wait_seconds": 0.0, "throttled": 0, "header_syncs": 0}
+
+    def _refill(self, now: float):
+        """토큰 보충"""
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.last_refill = now
+
+    def _try_acquire(self, weight: int, priority: RequestPriority) -> float:
+        """토큰 획득 시도 - 성공시 0, 실패시 권장 대기 시간(초)"""
+        with self.lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+
+            self._refill(now)
+
+            # 상위 우선순위 대기자가 있으면 양보
+            if any(self.waiting[p] > 0 for p in RequestPriority if p < priority):
+                return 0.01
+
+            reserve = self.capacity * self.RESERVE_RATIO[priority]
+            available = self.tokens - reserve
+            if available >= weight:
+                self.tokens -= weight
+                self.stats["requests"] += 1
+                self.stats["weight"] += weight
+                return 0.0
+
+            return max((weight - available) / self.refill_rate, 0.001)
+
+    def acquire(self, weight: int = 1, priority: RequestPriority = RequestPriority.NORMAL) -> float:
+        """토큰 획득 (블로킹) - 대기한 시간 반환"""
+        wait = self._try_acquire(weight, priority)
+        if wait == 0.0:
+            return 0.0
+
+        start = time.monotonic()
+        with self.lock:
+            self.waiting[priority] += 1
+        try:
+            while wait > 0.0:
+                time.sleep(min(wait, 1.0))
+                wait = self._try_acquire(weight, priority)
+        finally:
+            with self.lock:
+                self.waiting[priority] -= 1
+
+        return self._record_wait(start)
+
+    async def acquire_async(self, weight: int = 1, priority: RequestPriority = RequestPriority.NORMAL) -> float:
+        """토큰 획득 (비동기) - 이벤트 루프를 막지 않음"""
+        wait = self._try_acquire(weight, priority)
+        if wait == 0.0:
+            return 0.0
+
+        start = time.monotonic()
+        with self.lock:
+            self.waiting[priority] += 1
+        try:
+            while wait > 0.0:
+                await asyncio.sleep(min(wait, 1.0))
+                wait = self._try_acquire(weight, priority)
+        finally:
+            with self.lock:
+                self.waiting[priority] -= 1
+
+        return self._record_wait(start)
+
+    def _record_wait(self, start: float) -> float:
+        """대기 통계 기록"""
+        waited = time.monotonic() - start
+        with self.lock:
+            self.stats["waits"] += 1
+            self.stats["wait_seconds"] += waited
+        return waited
+
+    def update_from_headers(self, headers) -> Optional[int]:
+        """응답 헤더의 서버 사용 가중치로 버킷 동기화 (다른 프로세스 사용량 반영)"""
+        used = None
+        for key in ("X-MBX-USED-WEIGHT-1M", "x-mbx-used-weight-1m", "X-MBX-USED-WEIGHT-1m"):
+            if key in headers:
+                used = int(headers[key])
+                break
+
+        if used is None:
+            return None
+
+        with self.lock:
+            self._refill(time.monotonic())
+            # 서버 집계(고정 1분 창, 전 프로세스 합산)를 기준으로 로컬 추정 보정
+            self.tokens = min(max(self.capacity - used, 0.0), self.capacity)
+            self.stats["header_syncs"] += 1
+        return used
+
+    def penalize(self, retry_after: float = None):
+        """429/418 응답 - Retry-After 동안 전체 요청 정지"""
+        retry_after = float(retry_after) if retry_after else self.window_seconds
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self.tokens = 0.0
+            self.stats["throttled"] += 1
+
+    def get_stats(self) -> Dict:
+        """거버너 상태"""
+        with self.lock:
+            self._refill(time.monotonic())
+            return {
+                **self.stats,
+                "tokens": self.tokens,
+                "capacity": self.capacity,
+                "blocked_for": max(0.0, self.blocked_until - time.monotonic()),
+            }
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimitGovernor:
+    """프로세스 전역 거버너"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateLimitGovernor()
+        return _governor
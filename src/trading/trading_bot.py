@@ -11,8 +11,6 @@ import warnings
 from datetime import datetime, timedelta
 
 import pandas as pd
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
 
 warnings.filterwarnings("ignore")
 
@@ -25,6 +23,9 @@ from advanced_risk_system import AdvancedRiskManager, RiskParameters
 
 # 로컬 모듈 import
 from eth_session_strategy import ETHSessionStrategy
+from exchange_adapter import BinanceFuturesAdapter, ExchangeAdapter, ExchangeAPIError
+from kline_stream import KlineStream
+from order_pipeline import BracketOrderPipeline
 
 # 로깅 설정
 logging.basicConfig(
@@ -36,7 +37,7 @@ logger = logging.getLogger(__name__)
 
 
 class LiveTradingBot:
-    def __init__(self):
+    def __init__(self, exchange: ExchangeAdapter = None):
         """실시간 거래 봇 초기화"""
 
         # 환경 변수에서 API 키 로드
@@ -44,16 +45,19 @@ class LiveTradingBot:
         self.secret_key = os.getenv("BINANCE_SECRET_KEY")
         self.testnet = os.getenv("BINANCE_TESTNET", "true").lower() == "true"
 
-        if not self.api_key or not self.secret_key:
-            raise ValueError("바이낸스 API 키가 설정되지 않았습니다!")
-
-        # 바이낸스 클라이언트 초기화
-        if self.testnet:
-            self.client = Client(self.api_key, self.secret_key, testnet=True)
-            logger.info("🧪 테스트넷 모드로 연결됨")
+        if exchange is not None:
+            # 주입된 어댑터 사용 (테스트용 가짜 거래소 등)
+            self.exchange = exchange
         else:
-            self.client = Client(self.api_key, self.secret_key)
-            logger.info("🔴 실제 거래 모드로 연결됨")
+            if not self.api_key or not self.secret_key:
+                raise ValueError("바이낸스 API 키가 설정되지 않았습니다!")
+
+            # 비동기 거래소 어댑터 초기화 (keep-alive 커넥션 풀)
+            self.exchange = BinanceFuturesAdapter(self.api_key, self.secret_key, testnet=self.testnet)
+            if self.testnet:
+                logger.info("🧪 테스트넷 모드로 연결됨")
+            else:
+                logger.info("🔴 실제 거래 모드로 연결됨")
 
         # 거래 설정
         self.symbol = "ETHUSDT"
@@ -64,10 +68,12 @@ class LiveTradingBot:
         self.strategy = None
         self.risk_manager = None
         self.active_positions = {}
+        self.order_pipeline = BracketOrderPipeline(self.exchange, mode=os.getenv("BRACKET_ORDER_MODE", "concurrent"))
 
         # 거래 상태
         self.is_trading = True
         self.last_signal_time = None
+        self.kline_stream = None
 
         logger.info("🚀 실시간 거래 봇 초기화 완료")
 
@@ -75,8 +81,7 @@ class LiveTradingBot:
         """전략 초기화"""
         try:
             # 계좌 잔고 확인
-            account_info = self.client.futures_account()
-            balance = float(account_info["totalWalletBalance"])
+            balance = await self.exchange.get_balance()
 
             logger.info(f"💰 현재 계좌 잔고: ${balance:,.2f}")
 
@@ -98,11 +103,12 @@ class LiveTradingBot:
             logger.error(f"❌ 전략 초기화 실패: {e}")
             raise
 
-    async def get_market_data(self):
-        """시장 데이터 수집"""
+    async def get_market_data(self, klines=None):
+        """시장 데이터 수집 (스트림 버퍼가 주어지면 REST 재다운로드 생략)"""
         try:
             # 15분봉 데이터 수집
-            klines = self.client.futures_klines(symbol=self.symbol, interval=self.interval, limit=self.lookback_periods)
+            if klines is None:
+                klines = await self.exchange.get_klines(self.symbol, self.interval, limit=self.lookback_periods)
 
             # DataFrame 변환
             df = pd.DataFrame(
@@ -142,6 +148,7 @@ class LiveTradingBot:
             # 전략에 데이터 설정
             self.strategy.df = df
             self.strategy._calculate_indicators()
+            df = self.strategy.df
 
             # 최근 신호만 확인 (마지막 몇 개 바)
             recent_signals = []
@@ -229,7 +236,7 @@ class LiveTradingBot:
             confidence += 0.1
 
         # 시간대 (고변동성 시간)
-        hour = pd.to_datetime(bar["time"]).hour
+        hour = bar["hour"]
         if hour in [8, 9, 13, 14, 15, 16]:  # UTC
             confidence += 0.1
 
@@ -248,38 +255,42 @@ class LiveTradingBot:
             )
 
             # 레버리지 설정
-            self.client.futures_change_leverage(symbol=self.symbol, leverage=int(position_info["leverage"]))
+            await self.exchange.change_leverage(self.symbol, int(position_info["leverage"]))
 
             # 주문 실행
             side = "BUY" if signal["type"] == "long" else "SELL"
             quantity = round(position_info["position_size"], 4)
 
-            # 시장가 주문
-            order = self.client.futures_create_order(symbol=self.symbol, side=side, type="MARKET", quantity=quantity)
+            # 시장가 진입 + 스톱로스/익절 동시 제출
+            bracket = await self.order_pipeline.submit(
+                self.symbol, side, quantity, signal["stop_price"], signal["target_price"]
+            )
+            order = bracket.entry_order
 
             logger.info(f"✅ 주문 실행: {side} {quantity} {self.symbol} @ {signal['entry_price']}")
             logger.info(f"   레버리지: {position_info['leverage']}x")
             logger.info(f"   스톱: {signal['stop_price']:.2f}")
             logger.info(f"   타겟: {signal['target_price']:.2f}")
+            timings = bracket.timings
+            logger.info(f"   소요시간: 진입 {timings['entry_ms']:.0f}ms, 보호주문 {timings['protection_ms']:.0f}ms")
 
-            # 스톱로스 주문
-            stop_side = "SELL" if signal["type"] == "long" else "BUY"
-            stop_order = self.client.futures_create_order(
-                symbol=self.symbol, side=stop_side, type="STOP_MARKET", quantity=quantity, stopPrice=signal["stop_price"]
-            )
+            for error in bracket.errors:
+                logger.error(f"❌ 보호 주문 실패: {error}")
 
             # 활성 포지션에 추가
             self.active_positions[order["orderId"]] = {
                 "signal": signal,
                 "position_info": position_info,
                 "entry_order": order,
-                "stop_order": stop_order,
+                "stop_order": bracket.stop_order,
+                "target_order": bracket.target_order,
+                "order_timings": bracket.timings,
                 "entry_time": datetime.now(),
             }
 
             return True
 
-        except BinanceAPIException as e:
+        except ExchangeAPIError as e:
             logger.error(f"❌ 바이낸스 API 오류: {e}")
             return False
         except Exception as e:
@@ -292,9 +303,10 @@ class LiveTradingBot:
             if not self.active_positions:
                 return
 
-            # 현재 포지션 확인
-            positions = self.client.futures_position_information(symbol=self.symbol)
-            current_price = float(self.client.futures_symbol_ticker(symbol=self.symbol)["price"])
+            # 현재 포지션 / 가격 동시 조회
+            positions, current_price = await asyncio.gather(
+                self.exchange.get_positions(self.symbol), self.exchange.get_price(self.symbol)
+            )
 
             for pos_id, pos_data in list(self.active_positions.items()):
                 signal = pos_data["signal"]
@@ -326,15 +338,16 @@ class LiveTradingBot:
             side = "SELL" if signal["type"] == "long" else "BUY"
             quantity = pos_data["position_info"]["position_size"]
 
-            close_order = self.client.futures_create_order(symbol=self.symbol, side=side, type="MARKET", quantity=quantity)
+            close_order = await self.exchange.place_order(self.symbol, side, "MARKET", quantity)
 
             logger.info(f"✅ 포지션 종료: {reason} - {side} {quantity} {self.symbol}")
 
-            # 스톱 주문 취소
-            try:
-                self.client.futures_cancel_order(symbol=self.symbol, orderId=pos_data["stop_order"]["orderId"])
-            except Exception as e:
-                logger.warning(f"Stop order cancellation failed: {e}")
+            # 스톱/익절 주문 취소
+            protective_orders = [pos_data.get("stop_order"), pos_data.get("target_order")]
+            cancels = [self.exchange.cancel_order(self.symbol, o["orderId"]) for o in protective_orders if o]
+            for result in await asyncio.gather(*cancels, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"Protective order cancellation failed: {result}")
 
             # 활성 포지션에서 제거
             del self.active_positions[pos_id]
@@ -349,12 +362,21 @@ class LiveTradingBot:
         # 전략 초기화
         await self.initialize_strategy()
 
-        while self.is_trading:
+        # 봉 마감 이벤트 스트림 (웹소켓 + REST 보충)
+        self.kline_stream = KlineStream(
+            self.exchange, self.symbol, self.interval, history=self.lookback_periods, testnet=self.testnet
+        )
+
+        async for bar in self.kline_stream.closed_bars():
+            if not self.is_trading:
+                break
+
             try:
-                # 시장 데이터 수집
-                df = await self.get_market_data()
+                logger.info(f"🕯️ 봉 마감 수신: 지연 {bar.latency_ms}ms ({bar.source})")
+
+                # 시장 데이터 (스트림 버퍼)
+                df = await self.get_market_data(self.kline_stream.klines)
                 if df is None:
-                    await asyncio.sleep(60)
                     continue
 
                 # 시장 분석
@@ -369,17 +391,15 @@ class LiveTradingBot:
                 # 포지션 모니터링
                 await self.monitor_positions()
 
-                # 15분 대기 (다음 캔들까지)
-                await asyncio.sleep(900)  # 15분
-
             except KeyboardInterrupt:
                 logger.info("⚠️ 사용자에 의해 중단됨")
                 self.is_trading = False
                 break
             except Exception as e:
                 logger.error(f"❌ 메인 루프 오류: {e}")
-                await asyncio.sleep(60)
 
+        self.kline_stream.stop()
+        await self.exchange.close()
         logger.info("🛑 거래 봇 종료")
 
 
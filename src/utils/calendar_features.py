@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+epoch ms 기반 캘린더 피처
+- 시/분/요일/일 번호를 정수 연산으로 한 번에 계산 (pandas datetime 접근자 대체)
+- 펀딩 회피 구간 / 세션 소속 불리언 마스크 사전계산
+"""
+
+import warnings
+from typing import Dict, Iterable
+
+import numpy as np
+
+warnings.filterwarnings("ignore")
+
+MINUTE_MS = 60_000
+HOUR_MS = 3_600_000
+DAY_MS = 86_400_000
+MINUTES_PER_DAY = 1440
+
+# 1970-01-01은 목요일 (월요일=0 기준 3)
+EPOCH_WEEKDAY = 3
+
+
+def to_epoch_ms(times) -> np.ndarray:
+    """datetime64 배열/Series → int64 epoch ms"""
+    values = np.asarray(times)
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(np.int64)
+    return values.astype("datetime64[ms]").astype(np.int64)
+
+
+def calendar_features(epoch_ms: np.ndarray) -> Dict[str, np.ndarray]:
+    """epoch ms → hour/minute/weekday (int8), day (epoch 기준 일 번호, int32), minute_of_day (int16)"""
+    epoch_ms = np.asarray(epoch_ms, dtype=np.int64)
+    day = epoch_ms // DAY_MS
+    minute_of_day = (epoch_ms - day * DAY_MS) // MINUTE_MS
+    return {
+        "hour": (minute_of_day // 60).astype(np.int8),
+        "minute": (minute_of_day % 60).astype(np.int8),
+        "weekday": ((day + EPOCH_WEEKDAY) % 7).astype(np.int8),
+        "day": day.astype(np.int32),
+        "minute_of_day": minute_of_day.astype(np.int16),
+    }
+
+
+def funding_window_mask(
+    minute_of_day: np.ndarray, funding_hours: Iterable[int], avoid_bars: int, interval_ms: int, wrap_midnight: bool = False
+) -> np.ndarray:
+    """펀딩 시각 전후 avoid_bars 봉 이내에 시작하는 봉 마스크
+
+    기본값은 기존 _is_funding_time과 동일하게 같은 날 안에서만 비교 (0시 펀딩 직전 23:45 봉 미차단).
+    wrap_midnight=True면 자정 경계를 순환해 전날 23:45 봉도 회피 구간에 포함.
+    """
+    minute_of_day = np.asarray(minute_of_day, dtype=np.int16)
+    window_minutes = avoid_bars * interval_ms // MINUTE_MS
+    mask = np.zeros(len(minute_of_day), dtype=bool)
+    for funding_hour in funding_hours:
+        offset = np.abs(minute_of_day.astype(np.int32) - funding_hour * 60)
+        if wrap_midnight:
+            offset = np.minimum(offset, MINUTES_PER_DAY - offset)
+        mask |= offset <= window_minutes
+    return mask
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+협력적 취소 토큰 + 벽시계 예산
+- 명시적 취소(cancel)와 시간 예산 소진을 같은 방식으로 확인 (stopped / reason)
+- 부모 토큰 연결: 파이프라인 전체 → 단계 → 워커 순으로 취소/마감 전파
+- Optuna 콜백 / 타임아웃 보정
+"""
+
+import threading
+import time
+import warnings
+from typing import Callable, Optional
+
+warnings.filterwarnings("ignore")
+
+# 중단 사유
+CANCELLED = "cancelled"
+BUDGET_EXHAUSTED = "budget_exhausted"
+
+# wait() 폴링 간격 (초) - 부모 취소/마감 감지 지연 상한
+POLL_SECONDS = 0.05
+
+
+class OperationCancelled(Exception):
+    """취소 또는 시간 예산 소진으로 작업 중단"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancellationToken:
+    """협력적 취소 토큰 (스레드 안전) - 작업은 반복 경계마다 stopped를 확인하고 부분 결과로 종료"""
+
+    def __init__(self, budget_seconds: float = None, parent: "CancellationToken" = None):
+        """토큰 생성 (budget_seconds: 생성 시점부터의 벽시계 예산, parent: 상위 토큰)"""
+        self.parent = parent
+        self.budget_seconds = budget_seconds
+        self.deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+        self._event = threading.Event()
+        self._reason: Optional[str] = None
+
+    def child(self, budget_seconds: float = None) -> "CancellationToken":
+        """하위 토큰 (상위 취소/마감 상속 + 자체 예산)"""
+        return CancellationToken(budget_seconds, parent=self)
+
+    def cancel(self, reason: str = CANCELLED):
+        """취소 요청 (하위 토큰에도 전파)"""
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        """중단 사유 (진행 가능하면 None)"""
+        if self._event.is_set():
+            return self._reason
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return BUDGET_EXHAUSTED
+        return self.parent.reason if self.parent is not None else None
+
+    @property
+    def stopped(self) -> bool:
+        """취소 또는 예산 소진 여부"""
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """남은 예산 (초, 상위 토큰 포함 최소값, 예산 없으면 None)"""
+        remaining = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+        parent_remaining = self.parent.remaining() if self.parent is not None else None
+        if parent_remaining is None:
+            return remaining
+        return parent_remaining if remaining is None else min(remaining, parent_remaining)
+
+    def clamp_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        """기존 타임아웃을 남은 예산으로 제한"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def check(self):
+        """중단되었으면 OperationCancelled 발생"""
+        reason = self.reason
+        if reason is not None:
+            raise OperationCancelled(reason)
+
+    def wait(self, seconds: float) -> bool:
+        """최대 seconds초 대기 - 중단되면 즉시 True 반환 (재시도 지연 등)"""
+        end = time.monotonic() + seconds
+        while not self.stopped:
+            left = end - time.monotonic()
+            if left <= 0:
+                return False
+            self._event.wait(min(left, POLL_SECONDS))
+        return True
+
+    def optuna_callback(self) -> Callable:
+        """Optuna study.optimize 콜백 - 시도 종료마다 확인 후 study.stop()"""
+
+        def callback(study, trial):
+            if self.stopped:
+                study.stop()
+
+        return callback
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+메모리 예산 기반 작업 허용 제어
+- 컨테이너(cgroup) 메모리 한도 인식 (psutil은 호스트 전체 메모리를 보고함)
+- 단계별 작업당 피크 메모리 추정 (데이터셋 크기 × 단계 계수 + 고정 오버헤드)
+- 예산 내 동시 워커 수 / 배치 크기 결정, 부족시 청크 → 순차 실행으로 강등
+- 동시에 실행되는 단계 간 예약량 공유 (프로세스 전역)
+"""
+
+import os
+import threading
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import psutil
+
+warnings.filterwarnings("ignore")
+
+MB = 1024**2
+
+# 단계별 작업당 피크 메모리 프로파일: (고정 오버헤드 bytes, 데이터셋 대비 계수)
+# 계수는 워커가 데이터셋에서 파생해 새로 만드는 배열(신호/포지션/자산곡선 등)의 크기 비율
+STAGE_PROFILES: Dict[str, Tuple[int, float]] = {
+    "screening": (48 * MB, 0.5),  # 저충실도 후보 선별
+    "backtest": (64 * MB, 1.5),  # 전체 백테스트
+    "optimization": (96 * MB, 2.0),  # 국소 탐색 (스터디 상태 포함)
+    "walkforward": (96 * MB, 2.5),  # 슬라이스 복사 + 지표 재계산
+    "montecarlo": (48 * MB, 3.0),  # 리샘플 경로 다수 보유
+}
+
+# 데이터셋을 memmap으로 공유하지 않을 때 워커별 데이터셋 사본 계수
+PRIVATE_DATASET_FACTOR = 1.0
+
+
+def container_memory_limit() -> Optional[int]:
+    """cgroup 메모리 한도 (bytes, 없으면 None)"""
+    candidates = ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes")
+    for path in candidates:
+        try:
+            with open(path, "r") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value == "max":
+            return None
+        limit = int(value)
+        # cgroup v1 무제한 값 (페이지 정렬된 매우 큰 수)
+        if limit >= 1 << 60:
+            return None
+        return limit
+    return None
+
+
+@dataclass
+class AdmissionPlan:
+    """허용 계획"""
+
+    stage: str
+    mode: str  # "parallel" / "chunked" / "sequential"
+    workers: int
+    batch_size: int  # 한 번에 제출/보유할 작업 수
+    per_task_bytes: int
+    available_bytes: int
+    reason: str = ""
+
+    @property
+    def per_task_mb(self) -> float:
+        return self.per_task_bytes / MB
+
+
+class MemoryAdmissionController:
+    """메모리 예산 허용 제어기 (스레드 안전)"""
+
+    # 워커당 배치 작업 수 (배치 경계마다 예산 재확인)
+    TASKS_PER_WORKER_BATCH = 256
+
+    def __init__(self, budget_bytes: int = None, budget_ratio: float = 0.7, min_batch: int = 1):
+        """허용 제어기 초기화 (budget_bytes 미지정시 MEMORY_BUDGET_MB 또는 (cgroup 한도|물리 메모리) × budget_ratio)"""
+        if budget_bytes is None:
+            env_budget = os.getenv("MEMORY_BUDGET_MB")
+            if env_budget:
+                budget_bytes = int(float(env_budget) * MB)
+            else:
+                total = psutil.virtual_memory().total
+                limit = container_memory_limit()
+                budget_bytes = int(min(total, limit or total) * budget_ratio)
+
+        self.budget_bytes = budget_bytes
+        self.min_batch = min_batch
+        self.reserved_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {"plans": 0, "parallel": 0, "chunked": 0, "sequential": 0, "throttled": 0}
+
+    @staticmethod
+    def estimate_task_bytes(stage: str, dataset_bytes: int, shared_dataset: bool = True) -> int:
+        """작업당 피크 메모리 추정"""
+        fixed, factor = STAGE_PROFILES.get(stage, STAGE_PROFILES["backtest"])
+        estimate = fixed + int(dataset_bytes * factor)
+        if not shared_dataset:
+            estimate += int(dataset_bytes * PRIVATE_DATASET_FACTOR)
+        return estimate
+
+    def available_bytes(self) -> int:
+        """현재 사용 가능 예산 = 예산 - 현재 프로세스 사용량 - 다른 단계 예약량 (실제 가용 메모리로 상한)"""
+        process_rss = psutil.Process().memory_info().rss
+        system_available = psutil.virtual_memory().available
+        with self.lock:
+            headroom = self.budget_bytes - process_rss - self.reserved_bytes
+        return max(0, min(headroom, system_available))
+
+    def plan(
+        self, stage: str, n_tasks: int, dataset_bytes: int, max_workers: int, shared_dataset: bool = True
+    ) -> AdmissionPlan:
+        """동시 워커 수 / 배치 크기 결정"""
+        per_task = self.estimate_task_bytes(stage, dataset_bytes, shared_dataset)
+        available = self.available_bytes()
+        # 워커 프로세스 기본 상주 메모리 (인터프리터 + numpy/numba 임포트)
+        worker_base = 0 if max_workers <= 1 else STAGE_PROFILES["screening"][0]
+
+        fit = available // max(per_task + worker_base, 1)
+        workers = int(max(0, min(max_workers, n_tasks, fit)))
+
+        requested = max(1, min(max_workers, n_tasks))
+        if workers >= 2 or workers == requested:
+            mode, reason = ("parallel" if workers >= 2 else "sequential"), ""
+            if workers < requested:
+                self.stats["throttled"] += 1
+                reason = f"메모리 예산으로 워커 {max_workers}→{workers}개 제한"
+        elif available >= per_task:
+            mode, workers, reason = "sequential", 1, "예산 부족 - 단일 프로세스 순차 실행"
+        else:
+            mode, workers, reason = "chunked", 1, "예산 부족 - 작은 배치로 나눠 순차 실행"
+
+        # 배치 크기: 배치마다 재계획해 메모리 증가에 따라 워커 수를 다시 조정
+        if mode == "chunked":
+            batch_size = self.min_batch
+        else:
+            batch_size = max(self.min_batch, min(n_tasks, workers * self.TASKS_PER_WORKER_BATCH))
+
+        self.stats["plans"] += 1
+        self.stats[mode] += 1
+        return AdmissionPlan(
+            stage=stage,
+            mode=mode,
+            workers=workers,
+            batch_size=batch_size,
+            per_task_bytes=per_task,
+            available_bytes=available,
+            reason=reason,
+        )
+
+    @contextmanager
+    def reserve(self, plan: AdmissionPlan):
+        """계획 실행 동안 예산 예약 (동시 실행 단계가 같은 예산을 중복 사용하지 않도록)"""
+        amount = plan.per_task_bytes * plan.workers
+        with self.lock:
+            self.reserved_bytes += amount
+        try:
+            yield plan
+        finally:
+            with self.lock:
+                self.reserved_bytes -= amount
+
+    def get_stats(self) -> Dict:
+        """허용 제어 통계"""
+        with self.lock:
+            reserved = self.reserved_bytes
+        return {
+            **self.stats,
+            "budget_mb": self.budget_bytes / MB,
+            "reserved_mb": reserved / MB,
+            "available_mb": self.available_bytes() / MB,
+        }
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> MemoryAdmissionController:
+    """프로세스 전역 허용 제어기"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = MemoryAdmissionController()
+        return _controller
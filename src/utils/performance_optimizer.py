@@ -11,14 +11,16 @@ import gc
 import json
 import multiprocessing as mp
 import os
-import pickle
 import sqlite3
+import sys
 import threading
+import time
 import warnings
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -43,6 +45,7 @@ class PerformanceConfig:
 
     # 캐시 관리
     cache_ttl_hours: int = 24  # 캐시 TTL
+    cache_namespace_quotas_mb: Dict[str, float] = field(default_factory=dict)  # 네임스페이스별 할당량
     auto_cleanup: bool = True  # 자동 정리
 
     # 배포 설정
@@ -74,12 +77,48 @@ class PerformanceMetrics:
     processing_speed: float  # items/second
 
 
+@dataclass
+class CacheEntry:
+    """캐시 항목"""
+
+    value: Any
+    nbytes: int
+    created_at: datetime
+
+
+def estimate_nbytes(value: Any, _depth: int = 0) -> int:
+    """객체 메모리 크기 추정 (배열/프레임은 실제 버퍼 크기, 컨테이너는 재귀 합산)"""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_nbytes(k, _depth + 1) + estimate_nbytes(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_nbytes(v, _depth + 1) for v in value)
+    elif hasattr(value, "__dict__"):
+        size += estimate_nbytes(vars(value), _depth + 1)
+    return size
+
+
 class MemoryManager:
     def __init__(self, config: PerformanceConfig):
         """메모리 관리자 초기화"""
         self.config = config
-        self.cache: Dict[str, Any] = {}
-        self.cache_timestamps: Dict[str, datetime] = {}
+        # LRU 캐시 (키: (네임스페이스, 키), 삽입/조회 순서 = 최근 사용 순)
+        self.cache: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self.cache_bytes = 0
+        self.namespace_bytes: Dict[str, int] = {}
+        self.cache_counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+        self.namespace_counters: Dict[str, Dict[str, int]] = {}
         self.cache_lock = threading.Lock()
 
         # 메모리 모니터링
@@ -139,64 +178,89 @@ class MemoryManager:
             process_memory_gb=process.memory_info().rss / (1024**3),
         )
 
-    def cache_get(self, key: str) -> Optional[Any]:
-        """캐시에서 데이터 조회"""
+    def cache_get(self, key: str, namespace: str = "default") -> Optional[Any]:
+        """캐시에서 데이터 조회 (LRU 갱신, 만료 항목은 미스 처리)"""
+        cache_key = (namespace, key)
         with self.cache_lock:
-            if key in self.cache:
-                # TTL 체크
-                if self._is_cache_valid(key):
-                    return self.cache[key]
-                else:
-                    # 만료된 캐시 삭제
-                    del self.cache[key]
-                    del self.cache_timestamps[key]
+            entry = self.cache.get(cache_key)
+            if entry is not None and not self._is_expired(entry):
+                self.cache.move_to_end(cache_key)
+                self._count(namespace, "hits")
+                return entry.value
+
+            if entry is not None:
+                # 만료된 캐시 삭제
+                self._remove(cache_key)
+                self._count(namespace, "expirations")
+            self._count(namespace, "misses")
 
         return None
 
-    def cache_set(self, key: str, value: Any):
-        """캐시에 데이터 저장"""
-        with self.cache_lock:
-            # 캐시 크기 체크
-            if self._get_cache_size_mb() > self.config.cache_size_mb:
-                self._evict_old_cache()
+    def cache_set(self, key: str, value: Any, namespace: str = "default") -> bool:
+        """캐시에 데이터 저장 - 예산(전체/네임스페이스) 이내가 될 때까지 LRU 제거, 예산보다 큰 항목은 저장 안 함"""
+        cache_key = (namespace, key)
+        nbytes = estimate_nbytes(value)
+        limit = self._namespace_limit(namespace)
 
-            self.cache[key] = value
-            self.cache_timestamps[key] = datetime.now()
-
-    def _is_cache_valid(self, key: str) -> bool:
-        """캐시 유효성 체크"""
-        if key not in self.cache_timestamps:
-            return False
-
-        age = datetime.now() - self.cache_timestamps[key]
-        return age.total_seconds() < self.config.cache_ttl_hours * 3600
+        with self.cache_lock:
+            if cache_key in self.cache:
+                self._remove(cache_key)
+
+            if nbytes > min(limit, self.cache_budget):
+                self._count(namespace, "rejected")
+                return False
+
+            self.cache[cache_key] = CacheEntry(value=value, nbytes=nbytes, created_at=datetime.now())
+            self.cache_bytes += nbytes
+            self.namespace_bytes[namespace] = self.namespace_bytes.get(namespace, 0) + nbytes
+
+            # 네임스페이스 할당량 → 전체 예산 순으로 초과분 제거
+            if self.namespace_bytes[namespace] > limit:
+                self._evict_until(lambda: self.namespace_bytes[namespace] <= limit, namespace)
+            if self.cache_bytes > self.cache_budget:
+                self._evict_until(lambda: self.cache_bytes <= self.cache_budget)
+            return True
+
+    @property
+    def cache_budget(self) -> int:
+        """전체 캐시 예산 (bytes)"""
+        return int(self.config.cache_size_mb * 1024**2)
+
+    def _namespace_limit(self, namespace: str) -> int:
+        """네임스페이스 할당량 (bytes, 미지정시 전체 예산)"""
+        quota_mb = self.config.cache_namespace_quotas_mb.get(namespace)
+        return int(quota_mb * 1024**2) if quota_mb is not None else self.cache_budget
+
+    def _count(self, namespace: str, counter: str, amount: int = 1):
+        """전체/네임스페이스 카운터 증가"""
+        self.cache_counters[counter] += amount
+        namespace_counters = self.namespace_counters.setdefault(namespace, dict.fromkeys(self.cache_counters, 0))
+        namespace_counters[counter] += amount
+
+    def _remove(self, cache_key: Tuple[str, str]) -> "CacheEntry":
+        """항목 제거 + 크기 차감"""
+        entry = self.cache.pop(cache_key)
+        self.cache_bytes -= entry.nbytes
+        self.namespace_bytes[cache_key[0]] -= entry.nbytes
+        return entry
+
+    def _is_expired(self, entry: "CacheEntry") -> bool:
+        """TTL 만료 여부"""
+        age = datetime.now() - entry.created_at
+        return age.total_seconds() >= self.config.cache_ttl_hours * 3600
+
+    def _evict_until(self, satisfied: Callable[[], bool], namespace: str = None):
+        """조건 만족까지 최근 사용이 가장 오래된 항목부터 제거 (만료 항목은 조회/주기 정리시 제거)"""
+        while not satisfied():
+            cache_key = next((k for k in self.cache if namespace is None or k[0] == namespace), None)
+            if cache_key is None:
+                return
+            self._remove(cache_key)
+            self._count(cache_key[0], "evictions")
 
     def _get_cache_size_mb(self) -> float:
-        """캐시 크기 계산 (MB)"""
-        total_size = 0
-        for value in self.cache.values():
-            try:
-                if isinstance(value, (pd.DataFrame, np.ndarray)):
-                    total_size += value.nbytes
-                else:
-                    total_size += len(pickle.dumps(value))
-            except:
-                total_size += 1024  # 기본값
-
-        return total_size / (1024**2)
-
-    def _evict_old_cache(self):
-        """오래된 캐시 제거"""
-        # 가장 오래된 항목부터 제거
-        if not self.cache_timestamps:
-            return
-
-        oldest_key = min(self.cache_timestamps.keys(), key=lambda k: self.cache_timestamps[k])
-
-        del self.cache[oldest_key]
-        del self.cache_timestamps[oldest_key]
-
-        print(f"🗑️ 캐시 제거: {oldest_key}")
+        """캐시 크기 (MB) - 항목별 추적값 합계"""
+        return self.cache_bytes / (1024**2)
 
     def cleanup_memory(self):
         """메모리 정리"""
@@ -204,14 +268,10 @@ class MemoryManager:
 
         # 캐시 정리
         with self.cache_lock:
-            expired_keys = []
-            for key in self.cache_timestamps:
-                if not self._is_cache_valid(key):
-                    expired_keys.append(key)
-
+            expired_keys = [key for key, entry in self.cache.items() if self._is_expired(entry)]
             for key in expired_keys:
-                del self.cache[key]
-                del self.cache_timestamps[key]
+                self._remove(key)
+                self._count(key[0], "expirations")
 
         # 가비지 컬렉션 강제 실행
         collected = gc.collect()
@@ -222,83 +282,221 @@ class MemoryManager:
     def get_cache_stats(self) -> Dict:
         """캐시 통계"""
         with self.cache_lock:
+            lookups = self.cache_counters["hits"] + self.cache_counters["misses"]
             return {
                 "cache_entries": len(self.cache),
                 "cache_size_mb": self._get_cache_size_mb(),
-                "hit_rate": getattr(self, "_hit_count", 0) / max(getattr(self, "_access_count", 1), 1),
-                "oldest_entry": min(self.cache_timestamps.values()) if self.cache_timestamps else None,
+                "hit_rate": self.cache_counters["hits"] / lookups if lookups else 0.0,
+                **self.cache_counters,
+                "namespaces": {
+                    namespace: {"size_mb": self.namespace_bytes.get(namespace, 0) / (1024**2), **counters}
+                    for namespace, counters in self.namespace_counters.items()
+                },
+                "oldest_entry": min((e.created_at for e in self.cache.values()), default=None),
             }
 
 
+# 워커 프로세스 상태 (초기화 훅이 연결한 데이터셋 등)
+_worker_context: Dict[str, Any] = {}
+
+
+def _warm_worker_init(worker_initializer: Optional[Callable], initargs: tuple, cancel_event=None):
+    """워커 초기화 - 취소 이벤트 연결, 데이터셋 연결/커널 JIT 워밍업 후 GC 동결"""
+    _worker_context["cancel"] = cancel_event
+    if worker_initializer is not None:
+        _worker_context["data"] = worker_initializer(*initargs)
+
+    # 초기화 객체를 영구 세대로 이동 - 이후 GC 스캔/copy-on-write 페이지 변경 방지
+    gc.collect()
+    gc.freeze()
+
+
+def _worker_ready() -> int:
+    """워커 준비 확인 (짧게 점유해 작업이 여러 워커에 분산되도록 함)"""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def get_worker_context() -> Any:
+    """현재 워커의 초기화 데이터 (초기화 훅 반환값)"""
+    return _worker_context.get("data")
+
+
+def _run_chunk(func: Callable, chunk: List[Any], cancel_event=None):
+    """청크 실행 + 워커 측 순수 계산 시간 (취소 이벤트 설정시 남은 항목 건너뜀 - 부분 결과 반환)"""
+    if cancel_event is None:
+        cancel_event = _worker_context.get("cancel")
+
+    start = time.perf_counter()
+    results = []
+    for item in chunk:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        results.append(func(item))
+    return results, time.perf_counter() - start
+
+
 class ParallelProcessor:
+    # 청크당 목표 실행 시간 (초) - 작업당 오버헤드가 계산 시간에 묻히는 크기
+    TARGET_CHUNK_SECONDS = 0.05
+
+    # 취소 토큰 확인 간격 (초)
+    CANCEL_POLL_SECONDS = 0.1
+
     def __init__(self, config: PerformanceConfig):
         """병렬 처리기 초기화"""
         self.config = config
         self.thread_pool: Optional[ThreadPoolExecutor] = None
         self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.thread_workers = 0
+        self.process_workers = 0
+        # 워커 공유 취소 이벤트 (프로세스 워커는 초기화시 상속)
+        self.cancel_event = None
+        self.dispatch_stats = {"tasks": 0, "chunks": 0, "compute_seconds": 0.0, "wall_seconds": 0.0}
 
         print("⚡ 병렬 처리기 초기화")
         print(f"   최대 워커: {self.config.max_workers}개")
         print(f"   청크 크기: {self.config.chunk_size}")
         print(f"   프로세스 풀: {'사용' if self.config.use_process_pool else '미사용'}")
 
-    def start_pools(self):
-        """풀 시작"""
+    def start_pools(self, worker_initializer: Callable = None, initargs: tuple = ()):
+        """풀 시작 - 프로세스 워커는 시작시 한 번 초기화 훅 실행 후 재사용 (warm pool)"""
+        context = mp.get_context("spawn")
+        self.cancel_event = context.Event()
+
         # 스레드 풀 (I/O 집약적 작업용)
-        self.thread_pool = ThreadPoolExecutor(max_workers=min(self.config.max_workers, 32), thread_name_prefix="opt_thread")
+        self.thread_workers = min(self.config.max_workers, 32)
+        self.thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="opt_thread")
 
         # 프로세스 풀 (CPU 집약적 작업용)
         if self.config.use_process_pool:
+            self.process_workers = min(self.config.max_workers, mp.cpu_count())
             self.process_pool = ProcessPoolExecutor(
-                max_workers=min(self.config.max_workers, mp.cpu_count()), mp_context=mp.get_context("spawn")
+                max_workers=self.process_workers,
+                mp_context=context,
+                initializer=_warm_worker_init,
+                initargs=(worker_initializer, initargs, self.cancel_event),
             )
+            # 모든 워커 초기화 완료까지 대기 - 첫 작업에서 초기화 비용이 발생하지 않도록 함
+            ready = set()
+            for _ in range(20):
+                ready.update(
+                    f.result() for f in [self.process_pool.submit(_worker_ready) for _ in range(self.process_workers)]
+                )
+                if len(ready) >= self.process_workers:
+                    break
 
         print("🚀 병렬 처리 풀 시작")
 
-    def stop_pools(self):
-        """풀 중지"""
+    def stop_pools(self, cancel_futures: bool = False):
+        """풀 중지 (cancel_futures: 대기 중 작업 취소)"""
         if self.thread_pool:
-            self.thread_pool.shutdown(wait=True)
+            self.thread_pool.shutdown(wait=True, cancel_futures=cancel_futures)
             self.thread_pool = None
 
         if self.process_pool:
-            self.process_pool.shutdown(wait=True)
+            self.process_pool.shutdown(wait=True, cancel_futures=cancel_futures)
             self.process_pool = None
 
         print("⏹️ 병렬 처리 풀 중지")
 
-    def process_parallel(self, func: Callable, data: List[Any], use_processes: bool = False) -> List[Any]:
-        """병렬 처리 실행"""
+    def _next_chunk_size(self, remaining: int, workers: int, seconds_per_item: Optional[float]) -> int:
+        """적응형 청크 크기 - 측정된 작업 시간 기준, 꼬리 구간은 점점 작게 (guided)"""
+        guided = max(1, remaining // (workers * 2))
+        if seconds_per_item is None:
+            # 첫 파동: 작은 탐색 청크로 작업 시간 측정
+            size = max(1, remaining // (workers * 8))
+        else:
+            size = int(self.TARGET_CHUNK_SECONDS / max(seconds_per_item, 1e-9))
+        return max(1, min(size, guided, self.config.chunk_size))
+
+    def process_parallel(self, func: Callable, data: List[Any], use_processes: bool = False, token=None) -> List[Any]:
+        """병렬 처리 실행 - 동적 분배 (완료된 워커에 다음 청크 할당)
+
+        token: 취소 토큰 - 중단시 새 청크 제출 중지 + 워커 공유 이벤트로 실행 중 청크도 항목 경계에서 종료
+        미처리 항목은 None (부분 결과)
+        """
         if not data:
             return []
 
-        # 청크 분할
-        chunks = [data[i : i + self.config.chunk_size] for i in range(0, len(data), self.config.chunk_size)]
-
         executor = self.process_pool if (use_processes and self.process_pool) else self.thread_pool
 
         if not executor:
             # 풀이 없으면 순차 처리
-            return [func(item) for item in data]
-
-        # 병렬 실행
-        futures = []
-        for chunk in chunks:
-            future = executor.submit(self._process_chunk, func, chunk)
-            futures.append(future)
-
-        # 결과 수집
-        results = []
-        for future in futures:
-            try:
-                chunk_results = future.result(timeout=300)  # 5분 타임아웃
-                results.extend(chunk_results)
-            except Exception as e:
-                print(f"병렬 처리 오류: {e}")
-                # 실패한 청크는 순차 처리로 대체
-                results.extend([None] * self.config.chunk_size)
+            results = []
+            for item in data:
+                if token is not None and token.stopped:
+                    break
+                results.append(func(item))
+            return results + [None] * (len(data) - len(results))
+
+        workers = self.process_workers if executor is self.process_pool else self.thread_workers
+        # 스레드 워커는 이벤트를 인자로 전달, 프로세스 워커는 초기화시 상속한 이벤트 사용
+        chunk_event = self.cancel_event if executor is self.thread_pool else None
+        if self.cancel_event is not None:
+            self.cancel_event.clear()
+
+        results: List[Any] = [None] * len(data)
+        pending = {}
+        position = 0
+        compute_seconds = 0.0
+        processed = 0
+        wall_start = time.perf_counter()
+        last_progress = wall_start
+
+        def submit_next():
+            nonlocal position
+            seconds_per_item = compute_seconds / processed if processed else None
+            size = self._next_chunk_size(len(data) - position, workers, seconds_per_item)
+            chunk = data[position : position + size]
+            pending[executor.submit(_run_chunk, func, chunk, chunk_event)] = (position, len(chunk))
+            position += len(chunk)
+            self.dispatch_stats["chunks"] += 1
+
+        # 워커당 2개 청크를 유지해 워커가 쉬지 않도록 함
+        while position < len(data) and len(pending) < workers * 2:
+            submit_next()
+
+        stopping = False
+        while pending:
+            done, _ = wait(
+                pending, timeout=self.CANCEL_POLL_SECONDS if token is not None else 300, return_when=FIRST_COMPLETED
+            )
 
-        return results[: len(data)]  # 원래 크기로 맞춤
+            if token is not None and token.stopped and not stopping:
+                # 중단: 대기 중 청크 취소, 실행 중 청크는 워커가 다음 항목 경계에서 종료
+                stopping = True
+                if self.cancel_event is not None:
+                    self.cancel_event.set()
+                for future in list(pending):
+                    if future.cancel():
+                        pending.pop(future)
+
+            if not done:
+                if time.perf_counter() - last_progress > 300:  # 5분 타임아웃
+                    print("병렬 처리 오류: 응답 없는 청크 타임아웃")
+                    break
+                continue
+            last_progress = time.perf_counter()
+
+            for future in done:
+                start, size = pending.pop(future)
+                try:
+                    chunk_results, elapsed = future.result()
+                    results[start : start + len(chunk_results)] = chunk_results
+                    compute_seconds += elapsed
+                    processed += len(chunk_results)
+                except Exception as e:
+                    # 실패한 청크는 None으로 표시
+                    print(f"병렬 처리 오류: {e}")
+
+                if position < len(data) and not stopping:
+                    submit_next()
+
+        self.dispatch_stats["tasks"] += len(data)
+        self.dispatch_stats["compute_seconds"] += compute_seconds
+        self.dispatch_stats["wall_seconds"] += time.perf_counter() - wall_start
+        return results
 
     @staticmethod
     def _process_chunk(func: Callable, chunk: List[Any]) -> List[Any]:
@@ -315,10 +513,10 @@ class ParallelProcessor:
         }
 
         if self.thread_pool:
-            stats["thread_pool_size"] = self.thread_pool._max_workers
+            stats["thread_pool_size"] = self.thread_workers
 
         if self.process_pool:
-            stats["process_pool_size"] = self.process_pool._max_workers
+            stats["process_pool_size"] = self.process_workers
 
         return stats
 
@@ -375,9 +573,24 @@ class ResultManager:
             """
             )
 
+            # 시도 히스토리 테이블 (서로게이트 학습용 파라미터 → 점수)
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trial_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    study TEXT NOT NULL,
+                    fidelity TEXT NOT NULL,
+                    parameters TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+
             # 인덱스 생성
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_id ON optimization_results (pipeline_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON performance_metrics (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trial_study ON trial_history (study, fidelity)")
 
             conn.commit()
 
@@ -445,6 +658,29 @@ class ResultManager:
 
             conn.commit()
 
+    def save_trials(self, study: str, fidelity: str, trials: List[Tuple[Dict, float]]):
+        """시도 결과 일괄 저장 [(파라미터, 점수)]"""
+        if not trials:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO trial_history (study, fidelity, parameters, score) VALUES (?, ?, ?, ?)",
+                [
+                    (study, fidelity, json.dumps(params, sort_keys=True, default=float), float(score))
+                    for params, score in trials
+                ],
+            )
+            conn.commit()
+
+    def load_trials(self, study: str, fidelity: str, limit: int = 5000) -> List[Tuple[Dict, float]]:
+        """시도 히스토리 조회 (최신순 limit개)"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT parameters, score FROM trial_history WHERE study = ? AND fidelity = ? ORDER BY id DESC LIMIT ?",
+                (study, fidelity, limit),
+            ).fetchall()
+        return [(json.loads(parameters), score) for parameters, score in rows]
+
     def get_results(self, limit: int = 100) -> pd.DataFrame:
         """결과 조회"""
         with sqlite3.connect(self.db_path) as conn:
@@ -873,8 +1109,6 @@ def main():
         metrics = optimizer.collect_performance_metrics(pipeline_id)
         print(f"   수집 {i+1}: 메모리 {metrics.memory_stats.process_memory_gb:.2f}GB, " f"CPU {metrics.cpu_percent:.1f}%")
 
-        import time
-
         time.sleep(1)
 
     # 최적화 보고서 생성
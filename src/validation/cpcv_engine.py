@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+조합 퍼지 교차검증 (CPCV) 엔진
+- 데이터를 N개 연속 그룹으로 나누고 테스트 그룹 k개 조합 C(N,k)개 분할 생성
+- 분할은 (start, end) 구간 집합으로 표현 - 훈련 구간은 테스트 앞 퍼지 / 뒤 퍼지+엠바고 제외
+- 그룹 백테스트 결과(거래 손익) 캐시 - 여러 조합이 공유하는 그룹은 파라미터당 한 번만 시뮬레이션
+- 그룹 시뮬레이션 / 조합 평가는 공유 지표 배열 위 스레드 워커에서 병렬 실행 (Numba 커널 GIL 해제)
+- 백테스트 경로 φ = C(N-1, k-1)개: 각 경로는 모든 그룹을 서로 다른 분할의 테스트 결과로 구성
+"""
+
+import itertools
+import json
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from math import comb
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+warnings.filterwarnings("ignore")
+
+from memory_admission import get_admission_controller
+from performance_evaluator import PerformanceMetrics
+from strategy_evaluator import StrategyEvaluator
+
+
+def merge_intervals(intervals) -> np.ndarray:
+    """구간 집합 정규화 - 빈 구간 제거, 정렬, 겹치거나 맞닿은 구간 병합 → (m, 2) int64"""
+    intervals = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+    intervals = intervals[intervals[:, 1] > intervals[:, 0]]
+    if len(intervals) == 0:
+        return intervals
+
+    intervals = intervals[np.argsort(intervals[:, 0], kind="stable")]
+    # 앞선 구간들의 최대 끝보다 뒤에서 시작하면 새 구간
+    reach = np.maximum.accumulate(intervals[:, 1])
+    opens = np.flatnonzero(np.r_[True, intervals[1:, 0] > reach[:-1]])
+    return np.column_stack([intervals[opens, 0], np.maximum.reduceat(intervals[:, 1], opens)])
+
+
+def subtract_intervals(base, remove) -> np.ndarray:
+    """구간 차집합 base − remove (구간 수가 작아 구간 단위 순회)"""
+    remove = merge_intervals(remove)
+    result = []
+    for start, end in merge_intervals(base):
+        for cut_start, cut_end in remove:
+            if cut_end <= start or cut_start >= end:
+                continue
+            if cut_start > start:
+                result.append((start, cut_start))
+            start = max(start, cut_end)
+            if start >= end:
+                break
+        if start < end:
+            result.append((start, end))
+    return merge_intervals(result)
+
+
+def expand_intervals(intervals) -> np.ndarray:
+    """구간 집합 → 인덱스 배열 (레거시 인덱스 기반 API 호환용)"""
+    intervals = merge_intervals(intervals)
+    lengths = intervals[:, 1] - intervals[:, 0]
+    if lengths.sum() == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = intervals[:, 0] - np.r_[0, np.cumsum(lengths)[:-1]]
+    return np.arange(lengths.sum(), dtype=np.int64) + np.repeat(offsets, lengths)
+
+
+def interval_bars(intervals) -> int:
+    """구간 집합의 총 바 수"""
+    intervals = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+    return int((intervals[:, 1] - intervals[:, 0]).sum())
+
+
+def _params_key(params: Dict) -> str:
+    """세그먼트 캐시 키용 파라미터 직렬화"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+@dataclass
+class CPCVSplit:
+    """CPCV 분할 (구간 집합 [start, end))"""
+
+    split_id: int
+    test_groups: Tuple[int, ...]
+    test: np.ndarray  # (m, 2)
+    train: np.ndarray  # (m, 2) 퍼지 + 엠바고 적용
+
+
+class CombinatorialPurgedCV:
+    def __init__(
+        self,
+        evaluator: StrategyEvaluator,
+        n_groups: int = 6,
+        n_test_groups: int = 2,
+        purge_bars: int = 0,
+        embargo_bars: int = 0,
+        n_bars: int = None,
+    ):
+        """CPCV 엔진 초기화 (n_bars 미지정시 평가기 전체 바 수)"""
+        if not 0 < n_test_groups < n_groups:
+            raise ValueError(f"테스트 그룹 수는 1 이상 {n_groups - 1} 이하여야 합니다: {n_test_groups}")
+
+        self.evaluator = evaluator
+        self.n_bars = evaluator.n_bars if n_bars is None else int(n_bars)
+        self.n_groups = n_groups
+        self.n_test_groups = n_test_groups
+        self.purge_bars = purge_bars
+        self.embargo_bars = embargo_bars
+
+        bounds = np.linspace(0, self.n_bars, n_groups + 1).astype(np.int64)
+        self.groups = np.column_stack([bounds[:-1], bounds[1:]])
+        self.splits = [
+            self._make_split(split_id, test_groups)
+            for split_id, test_groups in enumerate(itertools.combinations(range(n_groups), n_test_groups))
+        ]
+        self.paths = self._build_paths()
+
+        # (파라미터 키, 그룹) → 거래 손익
+        self._segment_cache: Dict[Tuple[str, int], np.ndarray] = {}
+        self._cache_lock = threading.Lock()
+        self.stats = {"segments_simulated": 0, "segment_hits": 0, "combinations": 0}
+
+        print(f"🧩 CPCV: {n_groups}개 그룹, 테스트 {n_test_groups}개 → 분할 {len(self.splits)}개, 경로 {len(self.paths)}개")
+        print(f"   퍼지: {purge_bars}바, 엠바고: {embargo_bars}바")
+
+    def _make_split(self, split_id: int, test_groups: Tuple[int, ...]) -> CPCVSplit:
+        """테스트 그룹 조합 → 테스트/훈련 구간 집합"""
+        test = merge_intervals(self.groups[list(test_groups)])
+        # 테스트 앞: 퍼지 (훈련 거래가 테스트 구간으로 이어지는 구간), 뒤: 퍼지 + 엠바고 (직렬 상관)
+        excluded = np.column_stack([test[:, 0] - self.purge_bars, test[:, 1] + self.purge_bars + self.embargo_bars]).clip(
+            0, self.n_bars
+        )
+        train = subtract_intervals([(0, self.n_bars)], excluded)
+        return CPCVSplit(split_id=split_id, test_groups=tuple(test_groups), test=test, train=train)
+
+    def _build_paths(self) -> List[List[Tuple[int, int]]]:
+        """백테스트 경로 - j번째 경로는 각 그룹이 테스트로 등장하는 j번째 분할을 사용 [(그룹, 분할 번호)]"""
+        appearances = [
+            [split.split_id for split in self.splits if group in split.test_groups] for group in range(self.n_groups)
+        ]
+        n_paths = comb(self.n_groups - 1, self.n_test_groups - 1)
+        return [[(group, appearances[group][path]) for group in range(self.n_groups)] for path in range(n_paths)]
+
+    def segment_pnl(self, params: Dict, group: int, key: Optional[str] = None) -> np.ndarray:
+        """그룹 구간 진입 거래 손익 (캐시 - 같은 파라미터/그룹은 한 번만 시뮬레이션)"""
+        cache_key = (key or _params_key(params), group)
+        with self._cache_lock:
+            cached = self._segment_cache.get(cache_key)
+            if cached is not None:
+                self.stats["segment_hits"] += 1
+                return cached
+
+        start, end = self.groups[group]
+        pnl = np.asarray(self.evaluator.run_trades(params, int(start), int(end))["pnl"], dtype=np.float64)
+
+        with self._cache_lock:
+            self._segment_cache[cache_key] = pnl
+            self.stats["segments_simulated"] += 1
+        return pnl
+
+    def combination_metrics(self, params: Dict, split: CPCVSplit, key: Optional[str] = None) -> PerformanceMetrics:
+        """분할 테스트 그룹 거래를 시간 순으로 이어 붙여 평가"""
+        key = key or _params_key(params)
+        pnl = np.concatenate([self.segment_pnl(params, group, key) for group in split.test_groups])
+        with self._cache_lock:
+            self.stats["combinations"] += 1
+        return self.evaluator.metrics_from_trades(pnl)
+
+    def path_metrics(self, params: Dict, key: Optional[str] = None) -> PerformanceMetrics:
+        """경로 성과 - 고정 파라미터에서는 모든 경로가 같은 그룹 결과로 구성되어 한 번만 계산"""
+        key = key or _params_key(params)
+        return self.evaluator.metrics_from_trades(
+            np.concatenate([self.segment_pnl(params, group, key) for group in range(self.n_groups)])
+        )
+
+    def evaluate(self, params_list: List[Dict], max_workers: int = 1) -> List[Dict]:
+        """후보별 전 분할 평가 → [{"splits": [분할별 성과], "path": 경로 성과}]
+
+        1) 후보 × 그룹 시뮬레이션 (캐시에 없는 것만) 2) 후보 × 조합 평가 (캐시된 그룹 손익 연결)
+        """
+        keys = [_params_key(params) for params in params_list]
+        segments = [(ci, group) for ci in range(len(params_list)) for group in range(self.n_groups)]
+        combinations = [(ci, split) for ci in range(len(params_list)) for split in self.splits]
+
+        admission = get_admission_controller()
+        plan = admission.plan("backtest", len(segments), getattr(self.evaluator, "nbytes", 0), max_workers)
+        workers = max(1, plan.workers)
+        print(f"   🧩 CPCV 평가: 후보 {len(params_list)}개 × 분할 {len(self.splits)}개, 워커 {workers}개")
+
+        with admission.reserve(plan), ThreadPoolExecutor(workers, thread_name_prefix="cpcv") as executor:
+            list(executor.map(lambda task: self.segment_pnl(params_list[task[0]], task[1], keys[task[0]]), segments))
+            split_metrics = list(
+                executor.map(lambda task: self.combination_metrics(params_list[task[0]], task[1], keys[task[0]]), combinations)
+            )
+            path_metrics = list(executor.map(lambda ci: self.path_metrics(params_list[ci], keys[ci]), range(len(params_list))))
+
+        n_splits = len(self.splits)
+        return [
+            {"splits": split_metrics[ci * n_splits : (ci + 1) * n_splits], "path": path_metrics[ci]}
+            for ci in range(len(params_list))
+        ]
+
+    def clear_cache(self):
+        """세그먼트 캐시 정리"""
+        with self._cache_lock:
+            self._segment_cache.clear()
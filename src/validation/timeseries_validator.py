@@ -5,8 +5,10 @@
 - fold별 Score 메디안 − DD 패널티 랭킹
 - Top-3 파라미터 승급 시스템
 - 데이터 누수 방지 검증 로직
+- CPCV (조합 퍼지 교차검증): 구간 집합 분할 + 그룹 백테스트 캐시 + 병렬 조합 평가
 """
 
+import os
 import warnings
 from dataclasses import dataclass
 from typing import Callable, Dict, List, Optional, Tuple
@@ -16,8 +18,10 @@ import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+from cpcv_engine import CombinatorialPurgedCV, expand_intervals, subtract_intervals
 from fast_data_engine import FastDataEngine
 from performance_evaluator import PerformanceEvaluator, PerformanceMetrics
+from strategy_evaluator import StrategyEvaluator, default_evaluator
 
 
 @dataclass
@@ -35,10 +39,13 @@ class FoldResult:
 
 
 class TimeSeriesValidator:
-    def __init__(self, data_engine: FastDataEngine, performance_evaluator: PerformanceEvaluator):
-        """시계열 검증자 초기화"""
+    def __init__(
+        self, data_engine: FastDataEngine, performance_evaluator: PerformanceEvaluator, evaluator: StrategyEvaluator = None
+    ):
+        """시계열 검증자 초기화 (evaluator 미지정시 데이터 엔진 지표 캐시로 생성, 없으면 시뮬레이션)"""
         self.data_engine = data_engine
         self.performance_evaluator = performance_evaluator
+        self.evaluator = evaluator or default_evaluator(data_engine, performance_evaluator)
 
         # Purged K-Fold 설정
         self.kfold_config = {
@@ -46,6 +53,10 @@ class TimeSeriesValidator:
             "test_size": 0.2,  # 각 fold에서 테스트 비율
             "purge_pct": 0.01,  # 퍼지 비율 (1%)
             "embargo_multiplier": 2,  # 엠바고 = 평균보유기간 × 2
+            "method": "cpcv",  # cpcv | kfold (평가기 없으면 kfold)
+            "cpcv_groups": 6,  # CPCV 그룹 수 N
+            "cpcv_test_groups": 2,  # 분할당 테스트 그룹 수 k → C(6,2)=15 분할, 5 경로
+            "max_workers": os.cpu_count() or 1,  # 병렬 평가 워커 상한 (메모리 허용 계획으로 재조정)
         }
 
         # 검증 설정
@@ -59,6 +70,7 @@ class TimeSeriesValidator:
         print(f"   Purged K-Fold: {self.kfold_config['n_splits']}개 fold")
         print(f"   퍼지 비율: {self.kfold_config['purge_pct']*100}%")
         print(f"   엠바고 배수: {self.kfold_config['embargo_multiplier']}×")
+        print(f"   평가: {'실제 백테스트' if self.evaluator else '시뮬레이션'}")
 
     def estimate_average_holding_period(self, sample_trades: List[Dict]) -> int:
         """평균 보유 기간 추정 (바 단위)"""
@@ -107,24 +119,12 @@ class TimeSeriesValidator:
             # 퍼지 구간 계산
             purge_bars = max(1, int(data_length * purge_pct))
 
-            # 훈련 구간 정의 (테스트 구간 제외 + 퍼지 + 엠바고)
-            train_indices = []
+            # 훈련 구간 정의 (테스트 구간 제외 + 퍼지 + 엠바고) - 구간 집합으로 계산 후 인덱스 전개
+            gap = purge_bars + embargo_bars
+            train_intervals = subtract_intervals([(0, data_length)], [(test_start - gap, test_end + gap)])
 
-            # 테스트 구간 이전 데이터
-            if test_start > purge_bars + embargo_bars:
-                train_start_1 = 0
-                train_end_1 = test_start - purge_bars - embargo_bars
-                train_indices.extend(range(train_start_1, train_end_1))
-
-            # 테스트 구간 이후 데이터
-            if test_end + purge_bars + embargo_bars < data_length:
-                train_start_2 = test_end + purge_bars + embargo_bars
-                train_end_2 = data_length
-                train_indices.extend(range(train_start_2, train_end_2))
-
-            # 인덱스 배열 생성
-            train_idx = np.array(train_indices)
-            test_idx = np.array(range(test_start, test_end))
+            train_idx = expand_intervals(train_intervals)
+            test_idx = np.arange(test_start, test_end)
 
             # 유효성 검사
             if len(train_idx) > 0 and len(test_idx) > 0:
@@ -149,17 +149,8 @@ class TimeSeriesValidator:
         test_min = test_idx.min()
         test_max = test_idx.max()
 
-        # 훈련 데이터가 테스트 구간과 겹치는지 확인
-        for train_point in train_idx:
-            # 테스트 구간과 겹침
-            if test_min <= train_point <= test_max:
-                return False
-
-            # 엠바고 구간 침범 (테스트 구간 전후 embargo_bars 범위)
-            if (test_min - embargo_bars <= train_point < test_min) or (test_max < train_point <= test_max + embargo_bars):
-                return False
-
-        return True
+        # 훈련 데이터가 테스트 구간 또는 전후 엠바고 범위를 침범하는지 확인
+        return not np.any((train_idx >= test_min - embargo_bars) & (train_idx <= test_max + embargo_bars))
 
     def run_fold_validation(
         self, params: Dict, train_idx: np.ndarray, test_idx: np.ndarray, fold_id: int, strategy_func: Callable
@@ -172,38 +163,47 @@ class TimeSeriesValidator:
                 print(f"❌ Fold {fold_id}: 데이터 누수 감지")
                 return None
 
-            # 테스트 데이터로 전략 실행 (시뮬레이션)
-            test_metrics = self._simulate_fold_strategy(params, len(test_idx), fold_id)
-
-            # 최소 거래 수 확인
-            if test_metrics.total_trades < self.validation_config["min_test_trades"]:
-                print(f"⚠️ Fold {fold_id}: 거래 수 부족 ({test_metrics.total_trades})")
-                return None
+            # 테스트 구간 전략 실행 (테스트 인덱스는 연속 구간)
+            if self.evaluator is not None:
+                test_metrics = self.evaluator.evaluate(params, int(test_idx[0]), int(test_idx[-1]) + 1)
+            else:
+                test_metrics = self._simulate_fold_strategy(params, len(test_idx), fold_id)
 
-            # 점수 계산
-            base_score = self.performance_evaluator.calculate_score(test_metrics)
-
-            # DD 패널티 적용
-            dd_penalty = max(0, test_metrics.max_drawdown - 0.15) * 10  # 15% 초과시 패널티
-            final_score = base_score - dd_penalty
-
-            return FoldResult(
-                fold_id=fold_id,
-                train_start=train_idx[0] if len(train_idx) > 0 else 0,
-                train_end=train_idx[-1] if len(train_idx) > 0 else 0,
-                test_start=test_idx[0],
-                test_end=test_idx[-1],
-                metrics=test_metrics,
-                score=final_score,
-                params=params,
-            )
+            return self._score_fold(params, fold_id, (train_idx[0], train_idx[-1]), (test_idx[0], test_idx[-1]), test_metrics)
 
         except Exception as e:
             print(f"❌ Fold {fold_id} 검증 실패: {e}")
             return None
 
+    def _score_fold(
+        self, params: Dict, fold_id: int, train_bounds: Tuple[int, int], test_bounds: Tuple[int, int], test_metrics
+    ) -> Optional[FoldResult]:
+        """fold 테스트 성과 → 점수 (최소 거래 수 미달시 None, DD 패널티 적용)"""
+        # 최소 거래 수 확인
+        if test_metrics.total_trades < self.validation_config["min_test_trades"]:
+            print(f"⚠️ Fold {fold_id}: 거래 수 부족 ({test_metrics.total_trades})")
+            return None
+
+        # 점수 계산
+        base_score = self.performance_evaluator.calculate_score(test_metrics)
+
+        # DD 패널티 적용
+        dd_penalty = max(0, test_metrics.max_drawdown - 0.15) * 10  # 15% 초과시 패널티
+        final_score = base_score - dd_penalty
+
+        return FoldResult(
+            fold_id=fold_id,
+            train_start=int(train_bounds[0]),
+            train_end=int(train_bounds[1]),
+            test_start=int(test_bounds[0]),
+            test_end=int(test_bounds[1]),
+            metrics=test_metrics,
+            score=final_score,
+            params=params,
+        )
+
     def _simulate_fold_strategy(self, params: Dict, test_length: int, fold_id: int) -> PerformanceMetrics:
-        """Fold 전략 시뮬레이션"""
+        """Fold 전략 시뮬레이션 (평가기 없을 때 대체용)"""
         # 시드 설정 (fold별로 다른 시드)
         np.random.seed(hash(str(params)) % 1000 + fold_id * 100)
 
@@ -301,14 +301,21 @@ class TimeSeriesValidator:
         return final_score, stats
 
     def run_timeseries_validation(
-        self, candidates: List[Tuple[Dict, float, PerformanceMetrics]], strategy_func: Callable, data_length: int = 50000
+        self, candidates: List[Tuple[Dict, float, PerformanceMetrics]], strategy_func: Callable, data_length: int = None
     ) -> List[Tuple[Dict, float, Dict]]:
-        """시계열 검증 실행"""
+        """시계열 검증 실행 (data_length 미지정시 평가기 바 수, 평가기 없으면 50000)"""
         print(f"\n🔍 시계열 검증 시작 ({len(candidates)}개 후보)")
 
+        if data_length is None:
+            data_length = self.evaluator.n_bars if self.evaluator is not None else 50000
+
         # 평균 보유 기간 추정 (샘플 데이터 기반)
         avg_holding_period = self.estimate_average_holding_period([])
 
+        # CPCV는 실제 백테스트 평가기 필요 (그룹 거래 결과 캐시)
+        if self.kfold_config["method"] == "cpcv" and self.evaluator is not None:
+            return self._promote_top(self.run_cpcv_validation(candidates, data_length, avg_holding_period))
+
         # Purged K-Fold 분할 생성
         splits = self.create_purged_kfold_splits(data_length, avg_holding_period)
 
@@ -346,6 +353,62 @@ class TimeSeriesValidator:
             else:
                 print(f"   ❌ 유효한 fold 부족 ({len(fold_results)}/5)")
 
+        return self._promote_top(validated_candidates)
+
+    def run_cpcv_validation(
+        self, candidates: List[Tuple[Dict, float, PerformanceMetrics]], data_length: int, avg_holding_period: int
+    ) -> List[Tuple[Dict, float, Dict]]:
+        """CPCV 검증 - 전 후보 × 분할 병렬 평가 후 분할 점수를 fold 점수와 같은 규칙으로 집계"""
+        engine = CombinatorialPurgedCV(
+            self.evaluator,
+            n_groups=self.kfold_config["cpcv_groups"],
+            n_test_groups=self.kfold_config["cpcv_test_groups"],
+            purge_bars=max(1, int(data_length * self.kfold_config["purge_pct"])),
+            embargo_bars=avg_holding_period * self.kfold_config["embargo_multiplier"],
+            n_bars=data_length,
+        )
+        results = engine.evaluate([params for params, _, _ in candidates], self.kfold_config["max_workers"])
+        print(
+            f"   그룹 시뮬레이션: {engine.stats['segments_simulated']}회 "
+            f"(조합 {engine.stats['combinations']}개, 캐시 적중 {engine.stats['segment_hits']}회)"
+        )
+
+        validated_candidates = []
+        min_folds = max(3, len(engine.splits) // 2)
+
+        for i, ((params, _, _), result) in enumerate(zip(candidates, results)):
+            print(f"\n📊 후보 {i+1}/{len(candidates)} CPCV 집계...")
+
+            fold_results = []
+            for split, metrics in zip(engine.splits, result["splits"]):
+                fold_result = self._score_fold(
+                    params,
+                    split.split_id + 1,
+                    (split.train[0, 0], split.train[-1, 1] - 1) if len(split.train) else (0, 0),
+                    (split.test[0, 0], split.test[-1, 1] - 1),
+                    metrics,
+                )
+                if fold_result:
+                    fold_results.append(fold_result)
+
+            if len(fold_results) >= min_folds:
+                cv_score, stats = self.calculate_cross_validation_score(fold_results)
+                stats["path_score"] = self.performance_evaluator.calculate_score(result["path"])
+                stats["n_paths"] = len(engine.paths)
+
+                validated_candidates.append((params, cv_score, stats))
+
+                print(
+                    f"   CV 점수: {cv_score:.4f} (메디안: {stats['median_score']:.4f}, 경로 점수: {stats['path_score']:.4f})"
+                )
+                print(f"   일관성: {stats['consistency_ratio']:.1%} ({stats['profitable_folds']}/{stats['total_folds']})")
+            else:
+                print(f"   ❌ 유효한 분할 부족 ({len(fold_results)}/{len(engine.splits)})")
+
+        return validated_candidates
+
+    def _promote_top(self, validated_candidates: List[Tuple[Dict, float, Dict]]) -> List[Tuple[Dict, float, Dict]]:
+        """점수 기준 정렬 후 Top-3 승급"""
         # 점수 기준 정렬
         validated_candidates.sort(key=lambda x: x[1], reverse=True)
 
@@ -5,11 +5,16 @@
 - 변동성 레짐별 슬라이싱 로직
 - 슬라이스별 최적 파라미터 도출 시스템
 - OOS 합격선 검증 및 메디안 기준 선택
+- 슬라이스 최적화 병렬 실행 (상주 워커 프로세스, 슬라이스별 설정 분리) + 웜스타트
 """
 
+import os
+import time
 import warnings
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np
@@ -17,9 +22,39 @@ import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+from cancellation import CancellationToken
 from fast_data_engine import FastDataEngine
 from local_search_optimizer import LocalSearchOptimizer
+from memory_admission import get_admission_controller
 from performance_evaluator import PerformanceEvaluator, PerformanceMetrics
+from performance_optimizer import ParallelProcessor, PerformanceConfig, get_worker_context
+from strategy_evaluator import StrategyEvaluator, default_evaluator
+
+# 웜스타트 방식
+WARM_START_CANDIDATES = "candidates"  # 모든 슬라이스가 분석 후보에서 시작 (슬라이스 완전 병렬)
+WARM_START_PREVIOUS = "previous"  # 직전 슬라이스 상위 시도에서 시작 (후보별 슬라이스 체인, 후보 간 병렬)
+
+
+def _attach_slice_worker(optimizer: LocalSearchOptimizer) -> LocalSearchOptimizer:
+    """상주 슬라이스 워커 초기화 - 평가기 복원 + 백테스트 커널 컴파일"""
+    optimizer.evaluator.run_trades({}, 0, min(optimizer.evaluator.n_bars, 1000))
+    return optimizer
+
+
+def _optimize_slice(optimizer: LocalSearchOptimizer, spec: Dict) -> List[Tuple[Dict, float, PerformanceMetrics]]:
+    """슬라이스 훈련 구간 국소 탐색 - 슬라이스 전용 설정 복사본 사용 (공유 최적화자 설정 불변)
+
+    제출 시점의 마감 시각(벽시계)에서 워커 토큰 생성 - 대기열에서 기다린 시간도 예산에 포함
+    """
+    deadline = spec["deadline"]
+    token = CancellationToken(None if deadline is None else max(0.0, deadline - time.time()))
+    slice_optimizer = optimizer.configured(spec["eval_range"], n_trials=spec["n_trials"], timeout=spec["timeout"])
+    return slice_optimizer.run_local_search(None, spec["seeds"], use_focus_region=True, token=token)
+
+
+def _run_pooled_slice(spec: Dict) -> List[Tuple[Dict, float, PerformanceMetrics]]:
+    """상주 워커 작업 - 초기화시 복원한 최적화자로 슬라이스 최적화"""
+    return _optimize_slice(get_worker_context(), spec)
 
 
 @dataclass
@@ -53,12 +88,17 @@ class WalkForwardResult:
 
 class WalkForwardAnalyzer:
     def __init__(
-        self, data_engine: FastDataEngine, performance_evaluator: PerformanceEvaluator, local_optimizer: LocalSearchOptimizer
+        self,
+        data_engine: FastDataEngine,
+        performance_evaluator: PerformanceEvaluator,
+        local_optimizer: LocalSearchOptimizer,
+        evaluator: StrategyEvaluator = None,
     ):
-        """워크포워드 분석자 초기화"""
+        """워크포워드 분석자 초기화 (evaluator 미지정시 국소 최적화자 평가기 공유, 없으면 시뮬레이션)"""
         self.data_engine = data_engine
         self.performance_evaluator = performance_evaluator
         self.local_optimizer = local_optimizer
+        self.evaluator = evaluator or local_optimizer.evaluator or default_evaluator(data_engine, performance_evaluator)
 
         # 워크포워드 설정
         self.wf_config = {
@@ -67,6 +107,9 @@ class WalkForwardAnalyzer:
             "total_slices": 8,  # 8슬라이스
             "min_oos_trades": 20,  # 최소 OOS 거래 수
             "overlap_ratio": 0.1,  # 슬라이스 간 겹침 비율
+            "max_workers": os.cpu_count() or 1,  # 슬라이스 최적화 워커 상한 (메모리 허용 계획으로 재조정)
+            "warm_start": WARM_START_CANDIDATES,  # 슬라이스 스터디 시작점
+            "warm_start_trials": 5,  # 직전 슬라이스에서 넘겨받는 상위 시도 수
         }
 
         # OOS 합격선
@@ -83,6 +126,7 @@ class WalkForwardAnalyzer:
         print(f"   슬라이스 구성: {self.wf_config['train_months']}개월 훈련 / {self.wf_config['test_months']}개월 테스트")
         print(f"   총 슬라이스: {self.wf_config['total_slices']}개")
         print(f"   OOS 기준: PF≥{self.oos_criteria['min_profit_factor']}, Sortino≥{self.oos_criteria['min_sortino_ratio']}")
+        print(f"   평가: {'실제 백테스트' if self.evaluator else '시뮬레이션'}")
 
     def detect_volatility_regimes(self, data: pd.DataFrame, window: int = 30) -> pd.Series:
         """변동성 레짐 감지"""
@@ -192,6 +236,27 @@ class WalkForwardAnalyzer:
 
         return time_slices
 
+    def _slice_spec(
+        self,
+        slice_obj: WalkForwardSlice,
+        seeds: List[Tuple[Dict, float, PerformanceMetrics]],
+        token: CancellationToken = None,
+    ) -> Dict:
+        """슬라이스 최적화 작업 명세 (축약된 베이지안 최적화: 스텝 수 절반, 훈련 구간에서만 평가)
+
+        시작점은 파라미터만 전달 - 스터디의 모든 시도 값은 [train_start, train_end) 구간에서 새로 평가
+        """
+        config = self.local_optimizer.bayesian_config
+        remaining = (token or CancellationToken()).remaining()
+        return {
+            "slice_id": slice_obj.slice_id,
+            "eval_range": (slice_obj.train_start, slice_obj.train_end),
+            "n_trials": config["n_trials"] // 2,
+            "timeout": config["timeout"],
+            "deadline": None if remaining is None else time.time() + remaining,
+            "seeds": list(seeds),
+        }
+
     def optimize_slice_parameters(
         self,
         slice_obj: WalkForwardSlice,
@@ -202,42 +267,117 @@ class WalkForwardAnalyzer:
         """슬라이스별 파라미터 최적화"""
         print(f"🎯 슬라이스 {slice_obj.slice_id} 파라미터 최적화 중...")
 
-        # 축약된 베이지안 최적화 (스텝 수 절반)
-        original_trials = self.local_optimizer.bayesian_config["n_trials"]
-        self.local_optimizer.bayesian_config["n_trials"] = original_trials // 2
-
         try:
-            # 국소 탐색 실행 (집중 영역 사용)
-            optimized_candidates = self.local_optimizer.run_local_search(
-                strategy_func, initial_candidates[:3], use_focus_region=True  # 상위 3개만 사용
+            # 국소 탐색 실행 (집중 영역 사용, 상위 3개만 사용)
+            optimized_candidates = _optimize_slice(self.local_optimizer, self._slice_spec(slice_obj, initial_candidates[:3]))
+        except Exception as e:
+            print(f"   ❌ 최적화 오류: {e}")
+            optimized_candidates = []
+
+        return self._select_slice_parameters(optimized_candidates, initial_candidates)
+
+    def _select_slice_parameters(
+        self,
+        optimized_candidates: List[Tuple[Dict, float, PerformanceMetrics]],
+        initial_candidates: List[Tuple[Dict, float, PerformanceMetrics]],
+    ) -> Dict:
+        """최적 파라미터 선택 (최적화 실패 시 초기 후보 중 최고 사용)"""
+        if optimized_candidates:
+            print(f"   최적 파라미터 도출 완료 (점수: {optimized_candidates[0][1]:.4f})")
+            return optimized_candidates[0][0]
+
+        print(f"   ⚠️ 최적화 실패, 초기 후보 사용")
+        return initial_candidates[0][0] if initial_candidates else {}
+
+    def optimize_slices(
+        self,
+        candidates: List[Tuple[Dict, float, PerformanceMetrics]],
+        slices: List[WalkForwardSlice],
+        token: CancellationToken = None,
+    ) -> Dict[Tuple[int, int], List[Tuple[Dict, float, PerformanceMetrics]]]:
+        """후보 × 슬라이스 최적화 - 상주 워커 프로세스에서 병렬 실행 → {(후보 번호, slice_id): 최적화 결과}
+
+        - candidates: 모든 슬라이스가 분석 후보에서 시작, 전 슬라이스 동시 실행
+        - previous: 직전 슬라이스 상위 시도를 시작점에 추가 (직전 슬라이스 훈련 구간은 현재 구간보다 앞서므로
+          미래 정보 없음) - 후보별로 슬라이스 순서대로, 후보 간에는 병렬
+        - token 중단시 새 슬라이스 제출 중지 (미최적화 슬라이스는 결과 없음)
+        """
+        token = token or CancellationToken()
+        mode = self.wf_config["warm_start"]
+        chained = mode == WARM_START_PREVIOUS
+        n_tasks = len(candidates) * len(slices)
+
+        admission = get_admission_controller()
+        dataset_bytes = self.evaluator.nbytes if self.evaluator is not None else 0
+        plan = admission.plan("walkforward", n_tasks, dataset_bytes, self.wf_config["max_workers"], shared_dataset=False)
+        # 시뮬레이션 평가는 프로세스 간 공유할 데이터가 없어 순차 실행
+        workers = plan.workers if self.evaluator is not None else 1
+        print(f"⚡ 슬라이스 최적화: 후보 {len(candidates)}개 × 슬라이스 {len(slices)}개, 워커 {workers}개, 웜스타트 {mode}")
+
+        pool = None
+        if workers >= 2:
+            # 워커 전달용 복사본 (데이터 엔진 제외, 평가기는 워커별로 한 번 복원)
+            worker_optimizer = self.local_optimizer.configured()
+            worker_optimizer.data_engine = None
+            pool = ParallelProcessor(PerformanceConfig(max_workers=workers))
+            pool.start_pools(worker_initializer=_attach_slice_worker, initargs=(worker_optimizer,))
+            executor, task = pool.process_pool, _run_pooled_slice
+        else:
+            executor, task = ThreadPoolExecutor(1, thread_name_prefix="wf_slice"), partial(
+                _optimize_slice, self.local_optimizer
             )
 
-            # 최적 파라미터 선택
-            if optimized_candidates:
-                optimal_params = optimized_candidates[0][0]  # 최고 점수 파라미터
-                print(f"   최적 파라미터 도출 완료 (점수: {optimized_candidates[0][1]:.4f})")
-            else:
-                # 최적화 실패 시 초기 후보 중 최고 사용
-                optimal_params = initial_candidates[0][0] if initial_candidates else {}
-                print(f"   ⚠️ 최적화 실패, 초기 후보 사용")
+        results = {}
+        pending = {}
 
-        except Exception as e:
-            print(f"   ❌ 최적화 오류: {e}")
-            optimal_params = initial_candidates[0][0] if initial_candidates else {}
+        def submit(ci: int, k: int, seeds: List[Tuple[Dict, float, PerformanceMetrics]]):
+            if not token.stopped:
+                pending[executor.submit(task, self._slice_spec(slices[k], seeds, token))] = (ci, k)
 
+        try:
+            with admission.reserve(plan):
+                for ci, candidate in enumerate(candidates):
+                    for k in range(1 if chained else len(slices)):
+                        submit(ci, k, [candidate])
+
+                while pending:
+                    done, _ = wait(pending, timeout=ParallelProcessor.CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+
+                    # 중단: 대기 중 슬라이스 취소 (실행 중 슬라이스는 마감 시각에 시도 경계에서 종료)
+                    if token.stopped:
+                        for future in [future for future in pending if future.cancel()]:
+                            pending.pop(future)
+
+                    for future in done:
+                        ci, k = pending.pop(future)
+                        try:
+                            optimized = future.result()
+                        except Exception as e:
+                            print(f"   ❌ 슬라이스 {slices[k].slice_id} 최적화 오류: {e}")
+                            optimized = []
+
+                        results[(ci, slices[k].slice_id)] = optimized
+                        if chained and k + 1 < len(slices):
+                            submit(ci, k + 1, [candidates[ci]] + optimized[: self.wf_config["warm_start_trials"]])
         finally:
-            # 원래 설정 복원
-            self.local_optimizer.bayesian_config["n_trials"] = original_trials
+            # 오류/중단으로 빠져나와도 대기 중 슬라이스는 실행하지 않음
+            if pool is not None:
+                pool.stop_pools(cancel_futures=True)
+            else:
+                executor.shutdown(cancel_futures=True)
 
-        return optimal_params
+        return results
 
     def evaluate_oos_performance(
         self, slice_obj: WalkForwardSlice, test_data: pd.DataFrame, optimal_params: Dict, strategy_func: Callable
     ) -> Tuple[PerformanceMetrics, float]:
         """OOS 성능 평가"""
         try:
-            # OOS 전략 실행 (시뮬레이션)
-            oos_metrics = self._simulate_oos_strategy(optimal_params, len(test_data), slice_obj.regime)
+            # OOS 전략 실행 (테스트 구간 바 범위)
+            if self.evaluator is not None:
+                oos_metrics = self.evaluator.evaluate(optimal_params, slice_obj.test_start, slice_obj.test_end)
+            else:
+                oos_metrics = self._simulate_oos_strategy(optimal_params, len(test_data), slice_obj.regime)
 
             # OOS 점수 계산
             oos_score = self.performance_evaluator.calculate_score(oos_metrics)
@@ -256,7 +396,7 @@ class WalkForwardAnalyzer:
             return self.performance_evaluator._empty_metrics(), -10000
 
     def _simulate_oos_strategy(self, params: Dict, test_length: int, regime: str) -> PerformanceMetrics:
-        """OOS 전략 시뮬레이션"""
+        """OOS 전략 시뮬레이션 (평가기 없을 때 대체용)"""
         # 레짐별 시드 설정
         regime_seed = {"low_vol": 100, "normal": 200, "high_vol": 300}.get(regime, 200)
         np.random.seed(hash(str(params)) % 1000 + regime_seed)
@@ -366,29 +506,38 @@ class WalkForwardAnalyzer:
         return all_passed, details
 
     def run_walkforward_analysis(
-        self, candidates: List[Tuple[Dict, float, PerformanceMetrics]], strategy_func: Callable, data: pd.DataFrame
+        self,
+        candidates: List[Tuple[Dict, float, PerformanceMetrics]],
+        strategy_func: Callable,
+        data: pd.DataFrame,
+        token: CancellationToken = None,
     ) -> WalkForwardResult:
-        """워크포워드 분석 실행"""
+        """워크포워드 분석 실행 (평가기 사용시 data는 평가기와 같은 바 구간 - 슬라이스 인덱스 공유)"""
+        if self.evaluator is not None and len(data) != self.evaluator.n_bars:
+            raise ValueError(f"데이터 길이 불일치: data {len(data):,}개 ≠ 평가기 {self.evaluator.n_bars:,}개 바")
+
         print(f"\n📈 워크포워드 분석 시작 ({len(candidates)}개 후보)")
 
         best_result = None
         best_score = -float("inf")
 
+        # 레짐 인식 슬라이스 생성 (후보 공통 구간)
+        regime_slices = self.create_regime_aware_slices(data)
+
+        # 전 후보 × 슬라이스 파라미터 최적화 (현재 후보를 초기값으로 사용, 병렬 실행)
+        optimized = self.optimize_slices(candidates, regime_slices, token)
+
         for i, (params, original_score, original_metrics) in enumerate(candidates):
             print(f"\n🔍 후보 {i+1}/{len(candidates)} 분석 중...")
+            slices = [replace(slice_obj) for slice_obj in regime_slices]
 
-            # 레짐 인식 슬라이스 생성
-            slices = self.create_regime_aware_slices(data)
-
-            # 각 슬라이스에서 최적화 및 OOS 평가
+            # 각 슬라이스 OOS 평가
             for slice_obj in slices:
-                # 훈련 데이터 추출
-                train_data = data.iloc[slice_obj.train_start : slice_obj.train_end]
                 test_data = data.iloc[slice_obj.test_start : slice_obj.test_end]
 
-                # 파라미터 최적화 (현재 후보를 초기값으로 사용)
-                optimal_params = self.optimize_slice_parameters(
-                    slice_obj, train_data, [(params, original_score, original_metrics)], strategy_func
+                print(f"🎯 슬라이스 {slice_obj.slice_id} 파라미터")
+                optimal_params = self._select_slice_parameters(
+                    optimized.get((i, slice_obj.slice_id), []), [(params, original_score, original_metrics)]
                 )
 
                 # OOS 성능 평가
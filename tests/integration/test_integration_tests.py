@@ -168,6 +168,239 @@ class TestOptimizationPipelineIntegration(unittest.TestCase):
         else:
             print(f"   ⚠️ 예상과 다른 결과: {result.status.value}")
 
+    def test_pipeline_checkpoint_resume(self):
+        """체크포인트 재개 테스트 - 입력이 같은 단계는 재사용, 설정이 바뀐 단계부터 재실행"""
+        print("♻️ 파이프라인 체크포인트 재개 테스트...")
+
+        from optimization_pipeline import CHECKPOINT_STAGES, PipelineStage
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = PipelineConfig(
+                data_length=3000,
+                global_search_samples=10,
+                mc_simulations=100,
+                max_retries=0,
+                output_directory=temp_dir,
+            )
+
+            def completed(result):
+                return {s.stage: s for s in result.stage_results if s.stage in CHECKPOINT_STAGES}
+
+            first = completed(OptimizationPipeline(config).run_pipeline(self.parameter_space))
+            self.assertEqual(len(first), len(CHECKPOINT_STAGES))
+            self.assertFalse(any(s.from_checkpoint for s in first.values()))
+
+            # 동일 입력 재실행 → 전 단계 체크포인트 재사용, 결과 동일
+            second = completed(OptimizationPipeline(config).run_pipeline(self.parameter_space))
+            self.assertTrue(all(s.from_checkpoint for s in second.values()))
+            for stage, stage_result in second.items():
+                self.assertEqual(stage_result.checkpoint_key, first[stage].checkpoint_key)
+                self.assertEqual(stage_result.data, first[stage].data)
+
+            # 몬테카를로 설정만 변경 → 이전 단계 재사용, 몬테카를로부터 재실행
+            config.mc_simulations = 200
+            third = completed(OptimizationPipeline(config).run_pipeline(self.parameter_space))
+            stages = list(CHECKPOINT_STAGES)
+            mc_index = stages.index(PipelineStage.MONTECARLO_SIMULATION)
+            for index, stage in enumerate(stages):
+                self.assertEqual(third[stage].from_checkpoint, index < mc_index)
+
+        print(f"   ✅ 재사용 단계: {mc_index}/{len(stages)} (몬테카를로 설정 변경 후)")
+
+    def test_candidate_validation_graph(self):
+        """후보별 검증 그래프 - 탈락 후보는 이후 단계 미실행, 워커 수와 무관한 결과"""
+        print("🕸️ 후보별 검증 그래프 테스트...")
+
+        from optimization_pipeline import PipelineStage
+
+        calls = []
+
+        class ScriptedPipeline(OptimizationPipeline):
+            def _validate_timeseries(self, candidate, rng):
+                calls.append(("timeseries", candidate["id"]))
+                return {**candidate, "cv_score": candidate["id"], "cv_std": 0.0}
+
+            def _validate_walkforward(self, candidate, rng):
+                calls.append(("walkforward", candidate["id"]))
+                return {**candidate, "oos_median": candidate["id"], "passed_oos": candidate["id"] % 2 == 1}
+
+            def _validate_montecarlo(self, candidate, rng):
+                calls.append(("montecarlo", candidate["id"]))
+                return {**candidate, "robustness_score": rng.normal(), "passed_mc": True}
+
+            def _validate_statistics(self, candidate, rng):
+                calls.append(("statistics", candidate["id"]))
+                return {**candidate, "combined_score": candidate["robustness_score"], "passed_stats": True}
+
+        refined = [{"id": i, "parameters": {"target_r": 2.0 + 0.1 * i}, "score": float(i)} for i in range(6)]
+
+        final = {}
+        for workers in (4, 1):
+            calls.clear()
+            self.config.parallel_workers = workers
+            pipeline = ScriptedPipeline(self.config)
+            pipeline._stage_data_preparation(self.parameter_space)
+            pipeline.intermediate_data["refined_candidates"] = refined
+            pipeline._run_validation_graph(PipelineStage.TIMESERIES_VALIDATION, self.parameter_space)
+
+            reached = {stage: sorted(cid for name, cid in calls if name == stage) for stage, _ in calls}
+            self.assertEqual(reached["timeseries"], list(range(6)))
+            self.assertEqual(reached["walkforward"], [3, 4, 5])  # Top-3 합류
+            self.assertEqual(reached["montecarlo"], [3, 5])  # OOS 탈락 후보(4)는 MC 미실행
+            self.assertEqual(reached["statistics"], [3, 5])
+            self.assertEqual(pipeline.graph_results[PipelineStage.WALKFORWARD_ANALYSIS]["passed_oos"], 2)
+            self.assertEqual(pipeline.graph_results[PipelineStage.MONTECARLO_SIMULATION]["total_simulated"], 2)
+
+            final[workers] = [(c["id"], c["combined_score"]) for c in pipeline.intermediate_data["final_candidates"]]
+
+        self.assertEqual(final[4], final[1])
+
+        print(f"   ✅ 최종 후보: {final[4]}")
+
+    def test_pipeline_stage_budgets_and_cancel(self):
+        """단계 시간 예산 소진 → 부분 결과/중단, 부분 단계는 체크포인트 미저장"""
+        print("⏹️ 단계 시간 예산 + 취소 테스트...")
+
+        from cancellation import BUDGET_EXHAUSTED, CANCELLED
+        from optimization_pipeline import PipelineStage
+
+        calls = []
+
+        class ScriptedPipeline(OptimizationPipeline):
+            def _validate_timeseries(self, candidate, rng):
+                calls.append(("timeseries", candidate["id"]))
+                return {**candidate, "cv_score": candidate["id"], "cv_std": 0.0}
+
+            def _validate_walkforward(self, candidate, rng):
+                calls.append(("walkforward", candidate["id"]))
+                return {**candidate, "oos_median": candidate["id"], "passed_oos": True}
+
+        # 워크포워드 예산 0 → 검증 그래프에서 워크포워드 작업 미제출, 이후 단계는 후보 없음
+        self.config.parallel_workers = 2
+        self.config.stage_time_budgets = {"walkforward_analysis": 0.0}
+        pipeline = ScriptedPipeline(self.config)
+        pipeline._stage_data_preparation(self.parameter_space)
+        pipeline.intermediate_data["refined_candidates"] = [
+            {"id": i, "parameters": {"target_r": 2.0 + 0.1 * i}, "score": float(i)} for i in range(4)
+        ]
+        pipeline._run_validation_graph(PipelineStage.TIMESERIES_VALIDATION, self.parameter_space)
+
+        self.assertEqual(sorted(cid for name, cid in calls if name == "timeseries"), [0, 1, 2, 3])
+        self.assertFalse(any(name == "walkforward" for name, _ in calls))
+        self.assertEqual(pipeline.stage_stops[PipelineStage.WALKFORWARD_ANALYSIS], BUDGET_EXHAUSTED)
+        self.assertNotIn(PipelineStage.TIMESERIES_VALIDATION, pipeline.stage_stops)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # 전역 탐색 예산 0 → 평가 전 중단, 재시도 없이 파이프라인 중단
+            config = PipelineConfig(
+                data_length=3000,
+                global_search_samples=10,
+                max_retries=1,
+                output_directory=temp_dir,
+                stage_time_budgets={"global_optimization": 0.0},
+            )
+            start = time.time()
+            result = OptimizationPipeline(config).run_pipeline(self.parameter_space)
+            self.assertLess(time.time() - start, config.retry_delay_seconds)
+            self.assertEqual(result.status, PipelineStatus.CANCELLED)
+            global_result = result.stage_results[-1]
+            self.assertEqual(global_result.stage, PipelineStage.GLOBAL_OPTIMIZATION)
+            self.assertEqual(global_result.stop_reason, BUDGET_EXHAUSTED)
+            checkpoint_dir = os.path.join(temp_dir, "checkpoints")
+            self.assertEqual(os.listdir(checkpoint_dir) if os.path.isdir(checkpoint_dir) else [], [])
+
+            # 명시적 취소 → 진행 중 단계 후 중단
+            class CancellingPipeline(OptimizationPipeline):
+                def _stage_data_preparation(self, parameter_space):
+                    data = super()._stage_data_preparation(parameter_space)
+                    self.cancel_pipeline()
+                    return data
+
+            config.stage_time_budgets = {}
+            result = CancellingPipeline(config).run_pipeline(self.parameter_space)
+            self.assertEqual(result.status, PipelineStatus.CANCELLED)
+            self.assertIn(CANCELLED, result.error_message)
+            self.assertEqual(result.stage_results[-1].stage, PipelineStage.DATA_PREPARATION)
+
+        print(f"   ✅ 예산 소진/취소: {result.status.value}")
+
+    def test_partial_stage_not_chained_into_checkpoints(self):
+        """부분 결과로 끝난 단계는 키 체인 제외 - 재실행시 하위 단계가 부분 결과 기반 체크포인트를 재사용하지 않음"""
+        print("⏹️ 부분 단계 체크포인트 체인 테스트...")
+
+        from cancellation import CANCELLED
+        from optimization_pipeline import CHECKPOINT_STAGES, PipelineStage
+
+        class PartialGlobalPipeline(OptimizationPipeline):
+            def _stage_global_optimization(self, parameter_space):
+                # 첫 평가 직후 단계 취소 → 후보 1개짜리 부분 결과, 파이프라인은 계속 진행
+                score = self.evaluator.score
+
+                def cancelling_score(params, *args, **kwargs):
+                    result = score(params, *args, **kwargs)
+                    self.stage_token.cancel()
+                    return result
+
+                self.evaluator.score = cancelling_score
+                try:
+                    return super()._stage_global_optimization(parameter_space)
+                finally:
+                    del self.evaluator.score
+
+        downstream = list(CHECKPOINT_STAGES)[1:]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = PipelineConfig(
+                data_length=3000,
+                global_search_samples=10,
+                mc_simulations=100,
+                max_retries=0,
+                output_directory=temp_dir,
+            )
+
+            first = {s.stage: s for s in PartialGlobalPipeline(config).run_pipeline(self.parameter_space).stage_results}
+            self.assertEqual(first[PipelineStage.GLOBAL_OPTIMIZATION].stop_reason, CANCELLED)
+            self.assertIsNone(first[PipelineStage.GLOBAL_OPTIMIZATION].checkpoint_key)
+            for stage in downstream:
+                self.assertIsNone(first[stage].checkpoint_key)
+
+            # 동일 입력 재실행 → 전역 탐색 완전 실행, 하위 단계도 체크포인트 없이 재실행
+            second = {s.stage: s for s in OptimizationPipeline(config).run_pipeline(self.parameter_space).stage_results}
+            self.assertFalse(second[PipelineStage.GLOBAL_OPTIMIZATION].from_checkpoint)
+            for stage in downstream:
+                self.assertIn(stage, second)
+                self.assertFalse(second[stage].from_checkpoint)
+
+        print(f"   ✅ 재실행 단계: {len(downstream) + 1}/{len(CHECKPOINT_STAGES)}")
+
+    def test_sample_data_pipeline_completes(self):
+        """저장소가 비어 있으면 샘플 데이터로 전 단계 완료 - 구간 점수는 전체 기간 제약(최소 거래 수 등) 없이 평가"""
+        print("🏁 샘플 데이터 파이프라인 완료 테스트...")
+
+        from unittest import mock
+
+        from optimization_pipeline import PipelineStage
+
+        with tempfile.TemporaryDirectory() as temp_dir, mock.patch.dict(os.environ, {"MARKET_DATA_DIR": temp_dir}):
+            config = PipelineConfig(
+                data_length=20000,
+                global_search_samples=20,
+                mc_simulations=200,
+                max_retries=0,
+                output_directory=temp_dir,
+            )
+            result = OptimizationPipeline(config).run_pipeline(self.parameter_space)
+
+        self.assertEqual(result.status, PipelineStatus.COMPLETED, result.error_message)
+        stages = {s.stage: s for s in result.stage_results}
+        self.assertEqual(stages[PipelineStage.DATA_PREPARATION].data["data_length"], 20000)
+        self.assertGreater(stages[PipelineStage.WALKFORWARD_ANALYSIS].data["passed_oos"], 0)
+        self.assertGreater(result.final_metrics["oos_median"], 0.5)
+        self.assertGreater(result.final_metrics["robustness_score"], 0)
+        self.assertIsNotNone(result.final_parameters)
+
+        print(f"   ✅ 최종 결합 점수: {result.final_metrics['combined_score']:.3f}")
+
 
 class TestWorkforwardValidationWorkflow(unittest.TestCase):
     """워크포워드 검증 워크플로우 테스트"""
@@ -238,6 +471,68 @@ class TestWorkforwardValidationWorkflow(unittest.TestCase):
         print(f"   ✅ 생성된 슬라이스: {len(slices)}개")
         print(f"   📏 훈련 크기: {train_length}, 테스트 크기: {test_length}")
 
+    def test_parallel_slice_optimization(self):
+        """슬라이스 병렬 최적화 - 워커 프로세스 결과 동일 구성, 공유 설정 불변, 직전 슬라이스 웜스타트"""
+        print("⚡ 슬라이스 병렬 최적화 테스트...")
+
+        from local_search_optimizer import LocalSearchOptimizer
+        from strategy_evaluator import ArrayStrategyEvaluator
+        from walkforward_analyzer import WARM_START_PREVIOUS, WalkForwardAnalyzer
+
+        times = pd.date_range("2024-01-01", periods=96 * 40, freq="15min")
+        prices = 2000 * np.exp(np.cumsum(np.random.normal(0, 0.003, len(times))))
+        frame = pd.DataFrame({"time": times, "open": prices, "high": prices * 1.003, "low": prices * 0.997, "close": prices})
+        evaluator = ArrayStrategyEvaluator.from_frame(frame, performance_evaluator=self.performance_evaluator)
+
+        seeds_seen = []
+
+        class RecordingOptimizer(LocalSearchOptimizer):
+            def run_local_search(self, strategy_func, initial_candidates=None, use_focus_region=True, token=None):
+                seeds_seen.append((self.eval_range, len(initial_candidates)))
+                return super().run_local_search(strategy_func, initial_candidates, use_focus_region, token)
+
+        local_optimizer = LocalSearchOptimizer(None, self.performance_evaluator, evaluator)
+        local_optimizer.bayesian_config["n_trials"] = 6
+        analyzer = WalkForwardAnalyzer(None, self.performance_evaluator, local_optimizer)
+        analyzer.wf_config.update(train_months=0.5, test_months=0.2, total_slices=3)
+        slices = analyzer.create_time_based_slices(len(frame), pd.DatetimeIndex(times))
+        candidates = [({"target_r": 2.5, "stop_atr_mult": 0.1, "swing_len": 5}, 0.0, None)]
+        expected_keys = {(0, slice_obj.slice_id) for slice_obj in slices}
+
+        # 워커 프로세스 2개 - 슬라이스 전체 동시 실행
+        analyzer.wf_config["max_workers"] = 2
+        parallel = analyzer.optimize_slices(candidates, slices)
+        self.assertEqual(set(parallel), expected_keys)
+        self.assertTrue(all(parallel.values()))
+        self.assertEqual(local_optimizer.bayesian_config["n_trials"], 6)
+        self.assertEqual(local_optimizer.eval_range, (0, None))
+
+        # 직전 슬라이스 웜스타트 (순차) - 슬라이스 k는 후보 + 직전 슬라이스 상위 시도에서 시작
+        analyzer.local_optimizer = RecordingOptimizer(None, self.performance_evaluator, evaluator)
+        analyzer.local_optimizer.bayesian_config["n_trials"] = 6
+        analyzer.wf_config.update(max_workers=1, warm_start=WARM_START_PREVIOUS, warm_start_trials=2)
+        chained = analyzer.optimize_slices(candidates, slices)
+        self.assertEqual(set(chained), expected_keys)
+        self.assertEqual([eval_range for eval_range, _ in seeds_seen], [(s.train_start, s.train_end) for s in slices])
+        self.assertEqual([n for _, n in seeds_seen], [1] + [3] * (len(slices) - 1))
+
+        # 마감 시각이 지난 슬라이스 작업 → 워커에서 시도 없이 종료
+        from cancellation import CancellationToken
+        from walkforward_analyzer import _optimize_slice
+
+        spec = analyzer._slice_spec(slices[0], candidates, CancellationToken(60))
+        self.assertIsNotNone(spec["deadline"])
+        spec["deadline"] = time.time() - 1
+        seeds_seen.clear()
+        self.assertEqual(_optimize_slice(analyzer.local_optimizer, spec), [])
+        self.assertEqual(len(seeds_seen), 1)
+
+        # 슬라이스 인덱스는 평가기 바 기준 - 길이가 다른 데이터는 거부
+        with self.assertRaises(ValueError):
+            analyzer.run_walkforward_analysis(candidates, None, frame.iloc[:-1])
+
+        print(f"   ✅ 슬라이스 {len(slices)}개 최적화 (병렬/웜스타트 체인)")
+
     def test_oos_performance_evaluation(self):
         """OOS 성능 평가 테스트"""
         print("📈 OOS 성능 평가 테스트...")
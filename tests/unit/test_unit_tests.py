@@ -7,8 +7,12 @@
 - 포지션 사이징 계산 테스트
 """
 
+import asyncio
+import json
 import os
 import tempfile
+import threading
+import time
 import unittest
 import warnings
 from datetime import datetime, timedelta
@@ -18,14 +22,35 @@ import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+from aiohttp import web
+from binance_data_collector import BinanceDataCollector
+from calendar_features import calendar_features, funding_window_mask, to_epoch_ms
+from cancellation import BUDGET_EXHAUSTED, CANCELLED, CancellationToken, OperationCancelled
+from cpcv_engine import CombinatorialPurgedCV, expand_intervals, interval_bars, merge_intervals, subtract_intervals
 from dd_scaling_system import DDScalingConfig, DDScalingSystem
+from eth_session_strategy import SESSION_ASIA, SESSION_LONDON_NY, SESSION_OTHER, ETHSessionStrategy
+from exchange_adapter import BinanceFuturesAdapter, ExchangeAdapter, ExchangeAPIError, FakeExchangeAdapter
+from fast_data_engine import FastDataEngine, open_array_bundle
+from global_search_optimizer import GlobalSearchOptimizer
 from kelly_position_sizer import KellyParameters, KellyPositionSizer, TradeStatistics
+from kline_stream import KlineStream
+from local_search_optimizer import LocalSearchOptimizer
+from market_data_store import MarketDataStore
+from memory_admission import MB, MemoryAdmissionController
+from order_pipeline import BracketOrderPipeline
+from parameter_importance import param_importances, reduce_search_space, suggest_param
 
 # 테스트할 모듈들 import
-from performance_evaluator import PerformanceEvaluator, PerformanceMetrics
-from performance_optimizer import MemoryManager, PerformanceConfig, PerformanceOptimizer
+from performance_evaluator import AbortRule, ConstraintConfig, PerformanceEvaluator, PerformanceMetrics
+from performance_optimizer import MemoryManager, ParallelProcessor, PerformanceConfig, PerformanceOptimizer, ResultManager
+from rate_limiter import RateLimitGovernor, RequestPriority, klines_weight
 from realtime_monitoring_system import MarketData, MonitoringConfig, RealtimeMonitor, TradeEvent
 from statistical_validator import StatisticalValidator
+from strategy_evaluator import EXIT_REASONS, ArrayStrategyEvaluator
+from study_archive import StudyArchive, best_completed_trial, dataset_fingerprint, stage_best
+from surrogate_screener import SurrogateScreener
+
+from process_supervisor import ProcessSupervisor, plan_cpu_allocation, summarize_latency
 
 
 class TestPerformanceEvaluator(unittest.TestCase):
@@ -469,6 +494,40 @@ class TestPerformanceOptimizer(unittest.TestCase):
 
         print(f"✅ 캐시 작업: {cache_stats['cache_entries']}개 항목")
 
+    def test_cache_lru_budget_and_counters(self):
+        """LRU 예산 제거 + 네임스페이스 할당량 + 적중/미스 카운터"""
+        config = PerformanceConfig(cache_size_mb=1.0, cache_namespace_quotas_mb={"indicators": 0.25})
+        memory_manager = MemoryManager(config)
+        block = np.zeros(100_000 // 8)  # 100KB
+
+        for i in range(10):
+            memory_manager.cache_set(f"k{i}", block.copy())
+        memory_manager.cache_get("k0")  # 최근 사용 갱신
+        memory_manager.cache_set("big", np.zeros(300_000 // 8))  # 3개 이상 제거 필요
+
+        stats = memory_manager.get_cache_stats()
+        self.assertLessEqual(stats["cache_size_mb"], 1.0)
+        self.assertIsNotNone(memory_manager.cache_get("k0"))
+        self.assertIsNone(memory_manager.cache_get("k1"))
+        self.assertGreaterEqual(stats["evictions"], 3)
+
+        # 네임스페이스 할당량은 다른 네임스페이스를 밀어내지 않음
+        for i in range(5):
+            memory_manager.cache_set(f"ind{i}", block.copy(), namespace="indicators")
+        self.assertLessEqual(memory_manager.namespace_bytes["indicators"], 0.25 * 1024**2)
+        self.assertIsNotNone(memory_manager.cache_get("k0"))
+
+        # 예산보다 큰 항목은 저장하지 않음
+        self.assertFalse(memory_manager.cache_set("huge", np.zeros(2 * 1024**2 // 8)))
+
+        stats = memory_manager.get_cache_stats()
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["misses"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 0.75)
+        self.assertEqual(stats["rejected"], 1)
+
+        print(f"✅ LRU 캐시: 적중률 {stats['hit_rate']:.0%}, 제거 {stats['evictions']}개")
+
     def test_parallel_processing(self):
         """병렬 처리 테스트"""
         parallel_processor = self.optimizer.parallel_processor
@@ -496,6 +555,37 @@ class TestPerformanceOptimizer(unittest.TestCase):
 
         parallel_processor.stop_pools()
 
+    def test_parallel_processing_cancellation(self):
+        """취소 토큰 - 새 청크 제출 중지 + 실행 중 청크는 항목 경계에서 종료, 미처리 항목은 None"""
+        parallel_processor = self.optimizer.parallel_processor
+        parallel_processor.start_pools()
+        token = CancellationToken()
+
+        def slow_function(x):
+            if x == 5:
+                token.cancel()
+            time.sleep(0.01)
+            return x
+
+        test_data = list(range(2000))
+        start = time.perf_counter()
+        results = parallel_processor.process_parallel(slow_function, test_data, token=token)
+        elapsed = time.perf_counter() - start
+        parallel_processor.stop_pools()
+
+        completed = [r for r in results if r is not None]
+        self.assertEqual(len(results), len(test_data))
+        self.assertIn(5, completed)
+        self.assertLess(len(completed), len(test_data) // 2)
+        self.assertTrue(all(results[r] == r for r in completed))
+        self.assertLess(elapsed, 5.0)
+
+        # 순차 경로도 동일하게 부분 결과
+        sequential = ParallelProcessor(PerformanceConfig()).process_parallel(lambda x: x, [1, 2, 3], token=token)
+        self.assertEqual(sequential, [None, None, None])
+
+        print(f"✅ 병렬 처리 취소: {len(completed)}/{len(test_data)}개 처리 후 중단 ({elapsed:.2f}초)")
+
     def test_performance_metrics_collection(self):
         """성능 지표 수집 테스트"""
         pipeline_id = "test_pipeline"
@@ -512,6 +602,1536 @@ class TestPerformanceOptimizer(unittest.TestCase):
         print(f"✅ 성능 지표: CPU {metrics.cpu_percent:.1f}%, 메모리 {metrics.memory_stats.process_memory_gb:.2f}GB")
 
 
+class TestExchangeAdapter(unittest.TestCase):
+    """비동기 거래소 어댑터 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        base = 1_700_000_000_000
+        self.klines = [[base + i * 900_000, "1", "2", "0.5", "1.5", "10"] for i in range(20)]
+
+    def test_fake_exchange_orders(self):
+        """가짜 거래소 주문/취소 테스트"""
+        exchange = FakeExchangeAdapter(klines=self.klines, balance=500.0)
+
+        async def scenario():
+            balance = await exchange.get_balance()
+            klines = await exchange.get_klines("ETHUSDT", "15m", limit=5)
+            entry = await exchange.place_order("ETHUSDT", "BUY", "MARKET", 0.1)
+            stop = await exchange.place_order("ETHUSDT", "SELL", "STOP_MARKET", 0.1, stopPrice=2400.0)
+            positions = await exchange.get_positions("ETHUSDT")
+            await exchange.cancel_order("ETHUSDT", stop["orderId"])
+            with self.assertRaises(ExchangeAPIError):
+                await exchange.cancel_order("ETHUSDT", stop["orderId"])
+            return balance, klines, entry, positions
+
+        balance, klines, entry, positions = asyncio.run(scenario())
+
+        self.assertEqual(balance, 500.0)
+        self.assertEqual(len(klines), 5)
+        self.assertEqual(klines[-1], self.klines[-1])
+        self.assertEqual(entry["status"], "FILLED")
+        self.assertAlmostEqual(float(positions[0]["positionAmt"]), 0.1)
+        self.assertEqual(len(exchange.open_orders), 0)
+
+        print(f"✅ 가짜 거래소: {len(exchange.calls)}개 요청 처리")
+
+    def test_fake_exchange_overlapping_calls(self):
+        """독립 요청 동시 실행 테스트 (이벤트 루프 비블로킹)"""
+        exchange = FakeExchangeAdapter(latency=0.05)
+
+        async def scenario():
+            start = time.perf_counter()
+            await asyncio.gather(exchange.get_balance(), exchange.get_positions("ETHUSDT"), exchange.get_price("ETHUSDT"))
+            return time.perf_counter() - start
+
+        elapsed = asyncio.run(scenario())
+
+        # 순차 실행시 0.15초 - 동시 실행시 약 1 RTT
+        self.assertLess(elapsed, 0.12)
+
+        print(f"✅ 동시 요청: 3개 요청 {elapsed*1000:.0f}ms")
+
+    def test_bracket_order_pipeline(self):
+        """브래킷 주문 동시 제출 테스트 (진입 → 보호 주문 약 1 RTT)"""
+        rtt = 0.05
+
+        async def submit(mode):
+            exchange = FakeExchangeAdapter(latency=rtt)
+            pipeline = BracketOrderPipeline(exchange, mode=mode)
+            result = await pipeline.submit("ETHUSDT", "BUY", 0.1, stop_price=2400.0, target_price=2600.0)
+            return result, exchange
+
+        sequential, _ = asyncio.run(submit("sequential"))
+        concurrent, exchange = asyncio.run(submit("concurrent"))
+        batch, batch_exchange = asyncio.run(submit("batch"))
+
+        for result in (sequential, concurrent, batch):
+            self.assertTrue(result.protected)
+            self.assertIsNotNone(result.target_order)
+            self.assertEqual(result.errors, [])
+
+        self.assertEqual(len(exchange.open_orders), 2)
+        self.assertEqual(len(batch_exchange.calls), 2)
+        self.assertLess(concurrent.timings["protection_ms"], sequential.timings["protection_ms"] * 0.75)
+        self.assertLess(batch.timings["protection_ms"], rtt * 1000 * 1.5)
+
+        print(
+            f"✅ 브래킷 주문: 보호 주문 순차 {sequential.timings['protection_ms']:.0f}ms → "
+            f"동시 {concurrent.timings['protection_ms']:.0f}ms / 일괄 {batch.timings['protection_ms']:.0f}ms"
+        )
+
+    def test_bracket_batch_failure_after_entry(self):
+        """일괄 보호 주문 요청 실패 - 예외 전파 없이 보호 주문별 오류 기록 (진입은 체결 상태)"""
+
+        class FailingBatchExchange(FakeExchangeAdapter):
+            async def place_batch_orders(self, orders):
+                raise ExchangeAPIError(503, -1001, "Internal error")
+
+        exchange = FailingBatchExchange()
+        result = asyncio.run(
+            BracketOrderPipeline(exchange, mode="batch").submit("ETHUSDT", "BUY", 0.1, stop_price=2400.0, target_price=2600.0)
+        )
+
+        self.assertEqual(exchange.position_amt["ETHUSDT"], 0.1)
+        self.assertFalse(result.protected)
+        self.assertEqual(len(result.errors), 2)
+        self.assertTrue(result.errors[0].startswith("STOP_MARKET 실패"))
+        self.assertNotIn("entry_to_stop_live_ms", result.timings)
+
+        print(f"✅ 일괄 주문 실패: {result.errors[0]}")
+
+    def test_binance_adapter_signing(self):
+        """바이낸스 어댑터 서명 쿼리 테스트"""
+        adapter = BinanceFuturesAdapter("key", "secret", testnet=True)
+        query = adapter._sign({"symbol": "ETHUSDT", "startTime": None})
+
+        self.assertIn("symbol=ETHUSDT", query)
+        self.assertNotIn("startTime", query)
+        self.assertIn("&signature=", query)
+        self.assertEqual(adapter.base_url, BinanceFuturesAdapter.TESTNET_URL)
+
+        print("✅ 어댑터 서명 쿼리 생성")
+
+    def test_binance_adapter_non_json_error(self):
+        """HTML/빈 오류 응답은 상태 코드와 본문을 담은 ExchangeAPIError로 변환"""
+
+        async def gateway_error(request):
+            return web.Response(status=502, text="<html>502 Bad Gateway</html>", content_type="text/html")
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/fapi/v1/ticker/price", gateway_error)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            adapter = BinanceFuturesAdapter("key", "secret", testnet=True)
+            adapter.base_url = f"http://127.0.0.1:{port}"
+            try:
+                with self.assertRaises(ExchangeAPIError) as ctx:
+                    await adapter.get_price("ETHUSDT")
+            finally:
+                await adapter.close()
+                await runner.cleanup()
+            return ctx.exception
+
+        error = asyncio.run(asyncio.wait_for(scenario(), 10))
+
+        self.assertEqual(error.status, 502)
+        self.assertIn("502 Bad Gateway", error.message)
+        with self.assertRaises(TypeError):
+            ExchangeAdapter()
+
+        print(f"✅ 비JSON 오류 응답: {error}")
+
+
+class TestKlineStream(unittest.TestCase):
+    """웹소켓 캔들 스트림 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        base = 1_700_000_000_000
+        self.bars = [
+            [base + i * 900_000, "1", "2", "0.5", "1.5", "10", base + (i + 1) * 900_000 - 1, "15", 5, "5", "7", "0"]
+            for i in range(6)
+        ]
+
+    def _message(self, kline, closed=True):
+        keys = ["t", "o", "h", "l", "c", "v", "T", "q", "n", "V", "Q"]
+        return json.dumps({"e": "kline", "s": "ETHUSDT", "k": dict(zip(keys, kline), x=closed)})
+
+    def test_replay_with_gap_fill(self):
+        """리플레이 서버 마감 이벤트 + 누락 봉 REST 보충 테스트"""
+        exchange = FakeExchangeAdapter(klines=self.bars[:3])
+
+        async def replay(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            await asyncio.sleep(0.2)  # 클라이언트 연결 직후 보충 완료 대기
+            await ws.send_str(self._message(self.bars[3], closed=False))
+            await ws.send_str(self._message(self.bars[3]))
+            await asyncio.sleep(0.2)
+            exchange.klines = self.bars[:5]  # 봉 4는 웹소켓에서 누락
+            await ws.send_str(self._message(self.bars[5]))
+            await ws.close()
+            return ws
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/ws", replay)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            stream = KlineStream(exchange, history=10, stream_url=f"http://127.0.0.1:{port}/ws")
+            events = []
+            async for event in stream.closed_bars():
+                events.append(event)
+                if len(events) == 2:
+                    stream.stop()
+            await runner.cleanup()
+            return stream, events
+
+        stream, events = asyncio.run(asyncio.wait_for(scenario(), 10))
+
+        self.assertEqual([e.open_time for e in events], [self.bars[3][0], self.bars[5][0]])
+        self.assertEqual(events[1].gap_filled, 1)
+        self.assertEqual([k[0] for k in stream.klines], [b[0] for b in self.bars])
+
+        print(f"✅ 캔들 스트림: {len(events)}개 마감 이벤트, 보충 {events[1].gap_filled}개")
+
+    def test_backfill_retry_and_stop(self):
+        """시작 시 이력 로드 실패는 백오프 후 재시도, stop()은 모든 소비자를 종료"""
+        exchange = FakeExchangeAdapter(klines=self.bars[:3])
+        get_klines = exchange.get_klines
+        failures = []
+
+        async def flaky_get_klines(*args, **kwargs):
+            if not failures:
+                failures.append(1)
+                raise ExchangeAPIError(502, -1, "gateway error")
+            return await get_klines(*args, **kwargs)
+
+        exchange.get_klines = flaky_get_klines
+
+        async def replay(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            await asyncio.sleep(0.1)
+            await ws.send_str(self._message(self.bars[3]))
+            async for _ in ws:  # 클라이언트 종료까지 연결 유지
+                pass
+            return ws
+
+        async def scenario():
+            app = web.Application()
+            app.router.add_get("/ws", replay)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            stream = KlineStream(exchange, history=10, stream_url=f"http://127.0.0.1:{port}/ws", reconnect_delay=0.05)
+
+            async def consume():
+                return [event async for event in stream.closed_bars()]
+
+            consumers = [asyncio.create_task(consume()) for _ in range(2)]
+            while len(stream.klines) < 4:
+                await asyncio.sleep(0.01)
+            stream.stop()
+            results = await asyncio.gather(*consumers)
+            await runner.cleanup()
+            return stream, results
+
+        stream, results = asyncio.run(asyncio.wait_for(scenario(), 10))
+
+        self.assertEqual(len(failures), 1)
+        self.assertEqual([k[0] for k in stream.klines], [b[0] for b in self.bars[:4]])
+        self.assertEqual(sorted(len(events) for events in results), [0, 1])
+
+        print("✅ 캔들 스트림: 이력 로드 재시도 + 모든 소비자 종료")
+
+
+class TestRateLimitGovernor(unittest.TestCase):
+    """요청 가중치 거버너 테스트"""
+
+    def test_priority_reserve(self):
+        """대량 수집은 예약분을 남기고 거래 요청은 즉시 통과"""
+        governor = RateLimitGovernor(weight_limit=100, window_seconds=60.0, safety_margin=1.0)
+
+        # BULK는 용량의 70%까지만 사용
+        for _ in range(14):
+            self.assertEqual(governor._try_acquire(5, RequestPriority.BULK), 0.0)
+        self.assertGreater(governor._try_acquire(5, RequestPriority.BULK), 0.0)
+
+        # 예약분으로 거래 핵심 요청 즉시 처리
+        waited = governor.acquire(5, RequestPriority.CRITICAL)
+        self.assertEqual(waited, 0.0)
+
+        print(f"✅ 우선순위 예약: 잔여 토큰 {governor.tokens:.1f}")
+
+    def test_header_sync_and_penalty(self):
+        """서버 사용량 헤더 동기화 및 429 정지"""
+        governor = RateLimitGovernor(weight_limit=1000, window_seconds=1.0, safety_margin=1.0)
+
+        used = governor.update_from_headers({"X-MBX-USED-WEIGHT-1M": "900"})
+        self.assertEqual(used, 900)
+        self.assertLessEqual(governor.tokens, 100.0 + 1.0)
+
+        governor.penalize(0.2)
+        start = time.monotonic()
+        asyncio.run(governor.acquire_async(klines_weight(1000), RequestPriority.NORMAL))
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        self.assertEqual(governor.get_stats()["throttled"], 1)
+
+        print(f"✅ 헤더 동기화/정지: 대기 {governor.stats['wait_seconds']:.2f}초")
+
+
+class TestHistoricalDownloader(unittest.TestCase):
+    """병렬 이력 다운로더 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.calls = []
+
+    def _collector(self):
+        collector = BinanceDataCollector()
+        collector.checkpoint_dir = self.temp_dir
+        collector.points_per_request = 100
+        collector.shard_pages = 2
+
+        def fake_get_klines(symbol, interval, limit=1000, start_time=None, end_time=None, priority=None):
+            self.calls.append(start_time)
+            times = range(start_time, min(end_time + 1, start_time + limit * 900_000), 900_000)
+            return [[t, "1.0", "2.0", "0.5", "1.5", "10", t + 899_999, "15", 3, "5", "7", "0"] for t in times]
+
+        collector.get_klines = fake_get_klines
+        return collector
+
+    def test_sharded_download_and_resume(self):
+        """샤드 병렬 수집 + 체크포인트 재개"""
+        span = 900_000 * 100 * 2
+        start_ms = 1_600_000_000_000 // span * span + 900_000 * 37
+        end_ms = start_ms + 900_000 * 1000
+
+        columns = self._collector().download_range(start_ms, end_ms)
+        first_calls = len(self.calls)
+
+        self.assertEqual(len(columns["timestamp"]), 1000)
+        self.assertEqual(columns["timestamp"][0], start_ms)
+        self.assertTrue(np.all(np.diff(columns["timestamp"]) == 900_000))
+        self.assertEqual(columns["close"].dtype, np.float64)
+
+        # 재실행시 체크포인트 사용 (요청 없음)
+        resumed = self._collector().download_range(start_ms, end_ms)
+        self.assertEqual(len(self.calls), first_calls)
+        np.testing.assert_array_equal(resumed["timestamp"], columns["timestamp"])
+
+        print(f"✅ 샤드 다운로드: {len(columns['timestamp'])}개, 요청 {first_calls}회, 재개시 요청 0회")
+
+
+class TestMarketDataStore(unittest.TestCase):
+    """증분 시장 데이터 저장소 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = MarketDataStore(self.temp_dir)
+        self.start_ms = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+    def _bars(self, start_index, count):
+        timestamps = self.start_ms + np.arange(start_index, start_index + count, dtype=np.int64) * 900_000
+        columns = BinanceDataCollector.decode_klines([])
+        columns.update({name: np.full(count, 1.0) for name in columns})
+        columns["timestamp"] = timestamps
+        columns["close_time"] = timestamps + 899_999
+        columns["trades"] = np.full(count, 3, dtype=np.int64)
+        return columns
+
+    def test_append_dedupe_and_partitions(self):
+        """월 파티션 기록 + 중복 제거 + 증분 추가는 마지막 월만 재기록"""
+        bars_per_month = 31 * 96
+        stats = self.store.append("ETHUSDT", "15m", self._bars(0, bars_per_month + 100))
+        self.assertEqual(stats["added"], bars_per_month + 100)
+        self.assertEqual(stats["partitions_written"], 2)
+
+        manifest = self.store.read_manifest("ETHUSDT", "15m")
+        self.assertEqual(sorted(manifest["partitions"]), ["2024-01", "2024-02"])
+        january_file = manifest["partitions"]["2024-01"]["file"]
+
+        # 겹치는 구간 재추가 - 새 봉만 추가, 1월 파티션은 그대로
+        stats = self.store.append("ETHUSDT", "15m", self._bars(bars_per_month + 50, 96))
+        self.assertEqual(stats["added"], 46)
+        self.assertEqual(stats["duplicates"], 50)
+        self.assertEqual(stats["partitions_written"], 1)
+
+        manifest = self.store.read_manifest("ETHUSDT", "15m")
+        self.assertEqual(manifest["partitions"]["2024-01"]["file"], january_file)
+        self.assertEqual(manifest["rows"], bars_per_month + 146)
+        self.assertEqual(manifest["last_timestamp"], self.start_ms + (bars_per_month + 145) * 900_000)
+
+        df = self.store.load("ETHUSDT", "15m")
+        self.assertEqual(len(df), bars_per_month + 146)
+        self.assertTrue(df["time"].is_monotonic_increasing)
+
+        # 이전 버전 파일 정리
+        files = [f for f in os.listdir(self.store.series_dir("ETHUSDT", "15m")) if f.endswith(".parquet")]
+        self.assertEqual(len(files), 2)
+
+        print(
+            f"✅ 저장소 추가: {manifest['rows']}개, 증분시 파티션 {stats['partitions_written']}개 ({stats['bytes_written']}B)"
+        )
+
+    def test_sync_fetches_only_new_bars_and_gaps(self):
+        """증분 동기화 - 마지막 봉 이후 + 누락 구간만 요청"""
+        now_bar = int(time.time() * 1000) // 900_000 * 900_000
+        self.start_ms = now_bar - 300 * 900_000
+        self.store.append("ETHUSDT", "15m", self._bars(0, 100))
+        self.store.append("ETHUSDT", "15m", self._bars(120, 170))  # 20봉 누락
+
+        requested = []
+        collector = BinanceDataCollector()
+        collector.checkpoint_dir = self.temp_dir
+
+        def fake_get_klines(symbol, interval, limit=1000, start_time=None, end_time=None, priority=None):
+            requested.append((start_time, end_time))
+            times = range(start_time, min(end_time + 1, start_time + limit * 900_000), 900_000)
+            return [[t, "1.0", "2.0", "0.5", "1.5", "10", t + 899_999, "15", 3, "5", "7", "0"] for t in times]
+
+        collector.get_klines = fake_get_klines
+        stats = collector.sync_store(self.store)
+
+        self.assertEqual(stats["gaps"], 1)
+        self.assertEqual(stats["added"], 20 + 10)
+        self.assertEqual(self.store.find_gaps("ETHUSDT", "15m"), [])
+        self.assertEqual(self.store.last_timestamp("ETHUSDT", "15m"), now_bar - 900_000)
+        self.assertEqual(min(start for start, _ in requested), self.start_ms + 100 * 900_000)
+
+        # 재동기화시 추가 없음
+        stats = collector.sync_store(self.store)
+        self.assertEqual(stats["added"], 0)
+
+        print(f"✅ 증분 동기화: 요청 {len(requested)}회, 총 {stats['rows']}개")
+
+    def test_import_legacy_csv(self):
+        """기존 수집기 CSV 가져오기 - time 컬럼 변환, close_time 보충, 재가져오기는 중복"""
+        times = pd.date_range("2024-01-31 12:00", periods=200, freq="15min")
+        csv_path = os.path.join(self.temp_dir, "legacy.csv")
+        pd.DataFrame({"time": times, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}).to_csv(
+            csv_path, index=False
+        )
+
+        stats = self.store.import_csv("ETHUSDT", "15m", csv_path)
+        self.assertEqual(stats["added"], 200)
+        self.assertEqual(stats["partitions_written"], 2)
+
+        df = self.store.load("ETHUSDT", "15m")
+        self.assertTrue((df["time"].to_numpy() == times.to_numpy()).all())
+        columns = self.store.load_columns("ETHUSDT", "15m", columns=["timestamp", "close_time"])
+        self.assertTrue((columns["close_time"] - columns["timestamp"] == 899_999).all())
+        self.assertEqual(self.store.import_csv("ETHUSDT", "15m", csv_path)["duplicates"], 200)
+
+        print(f"✅ CSV 가져오기: {stats['added']}개, 파티션 {stats['partitions_written']}개")
+
+
+class TestFastDataEngineLoading(unittest.TestCase):
+    """데이터 엔진 구간/컬럼 로드 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "ohlcv.csv")
+        times = pd.date_range("2023-01-01", periods=20000, freq="15min")
+        pd.DataFrame(
+            {"time": times, "open": 1.0, "high": 2.0, "low": 0.5, "close": np.arange(20000, dtype=float), "volume": 10.0}
+        ).to_csv(self.csv_path, index=False)
+        self.engine = FastDataEngine(cache_dir=os.path.join(self.temp_dir, "cache"))
+
+    def test_range_and_column_projection(self):
+        """구간 + 컬럼 프로젝션 로드"""
+        full = self.engine.load_data(self.csv_path)
+        part = self.engine.load_data(self.csv_path, start="2023-02-01", end="2023-02-08", columns=["close"])
+
+        self.assertEqual(len(full), 20000)
+        self.assertEqual(list(part.columns), ["time", "close"])
+        self.assertEqual(len(part), 7 * 96)
+        self.assertEqual(part["time"].iloc[0], pd.Timestamp("2023-02-01"))
+        self.assertTrue(part["time"].is_monotonic_increasing)
+
+        print(f"✅ 구간 로드: {len(part)}개 행, 컬럼 {list(part.columns)}")
+
+    def test_cache_invalidated_on_source_change(self):
+        """원본 변경시 캐시 재생성"""
+        first = self.engine.load_data(self.csv_path)
+        pd.read_csv(self.csv_path).iloc[:100].to_csv(self.csv_path, index=False)
+        second = self.engine.load_data(self.csv_path)
+
+        self.assertEqual(len(first), 20000)
+        self.assertEqual(len(second), 100)
+        self.assertEqual(len([f for f in os.listdir(self.engine.cache_dir) if f.endswith(".parquet")]), 1)
+
+        print("✅ 원본 지문 변경시 캐시 무효화")
+
+    def test_sources_keep_own_cache_and_copies(self):
+        """같은 심볼/봉의 다른 원본 캐시는 유지, 반환 DataFrame 수정은 캐시에 영향 없음"""
+        other_path = os.path.join(self.temp_dir, "ohlcv_other.csv")
+        pd.read_csv(self.csv_path).iloc[:500].to_csv(other_path, index=False)
+
+        def cache_files():
+            cache_dir = self.engine.cache_dir
+            return {
+                f: os.stat(os.path.join(cache_dir, f)).st_mtime_ns for f in os.listdir(cache_dir) if f.endswith(".parquet")
+            }
+
+        self.engine.load_data(self.csv_path)
+        self.engine.load_data(other_path)
+        built = cache_files()
+        self.assertEqual(len(built), 2)
+
+        # 다시 로드해도 재생성 없음 (서로의 캐시를 지우지 않음)
+        self.engine.cached_data.clear()
+        self.engine.load_data(self.csv_path)
+        self.engine.load_data(other_path)
+        self.assertEqual(cache_files(), built)
+
+        df = self.engine.load_data(self.csv_path)
+        df["close"] = -1.0
+        self.assertEqual(self.engine.load_data(self.csv_path)["close"].iloc[1], 1.0)
+
+        print("✅ 원본별 캐시 유지 + 사본 반환")
+
+
+def _bundle_close_sum(params, arrays):
+    """번들 공유 백테스트용 전략 (워커에서 실행)"""
+    return {"window": params["window"], "sum": float(arrays["close"][: params["window"]].sum()), "pid": os.getpid()}
+
+
+class TestIndicatorBundle(unittest.TestCase):
+    """지표 memmap 번들 공유 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.engine = FastDataEngine(cache_dir=self.temp_dir)
+        n = 5000
+        self.df = pd.DataFrame(
+            {
+                "time": pd.date_range("2024-01-01", periods=n, freq="15min"),
+                "open": np.full(n, 100.0),
+                "high": np.full(n, 101.0),
+                "low": np.full(n, 99.0),
+                "close": np.arange(n, dtype=float),
+                "volume": np.ones(n),
+            }
+        )
+        self.engine.cache_indicators(self.df, {"atr_len": 14})
+
+    def test_persist_and_attach_readonly(self):
+        """번들 저장 + 읽기 전용 memmap 연결"""
+        close = np.array(self.engine.cached_indicators["close"])
+        bundle_dir = self.engine.persist_indicators()
+
+        self.assertEqual(self.engine.persist_indicators(), bundle_dir)
+        arrays = open_array_bundle(bundle_dir)
+        self.assertIsInstance(arrays["close"], np.memmap)
+        self.assertFalse(arrays["close"].flags.writeable)
+        np.testing.assert_array_equal(arrays["close"], close)
+
+        print(f"✅ 지표 번들: {len(arrays)}개 배열 memmap 연결")
+
+    def test_parallel_backtest_with_shared_data(self):
+        """워커가 번들을 연결해 백테스트"""
+        param_sets = [{"window": w} for w in (10, 100, 1000)]
+        results = self.engine.parallel_backtest(param_sets, _bundle_close_sum, n_jobs=2, with_data=True)
+
+        for params, result in zip(param_sets, results):
+            self.assertEqual(result["sum"], float(np.arange(params["window"]).sum()))
+
+        print(f"✅ 번들 공유 병렬 백테스트: {len(results)}개, 워커 {len({r['pid'] for r in results})}개")
+
+    def test_warm_pool_reused_across_calls(self):
+        """상주 워커 풀 재사용 - 두 번째 호출은 같은 워커에서 실행"""
+        param_sets = [{"window": w} for w in range(1, 201)]
+        first = self.engine.parallel_backtest(param_sets, _bundle_close_sum, n_jobs=2, with_data=True)
+        pool = self.engine.worker_pool
+        second = self.engine.parallel_backtest(param_sets, _bundle_close_sum, n_jobs=2, with_data=True)
+
+        self.assertIs(self.engine.worker_pool, pool)
+        worker_pids = set(pool.process_pool._processes)
+        self.assertTrue({r["pid"] for r in first + second} <= worker_pids)
+        self.assertEqual([r["sum"] for r in first], [r["sum"] for r in second])
+        self.assertLess(pool.dispatch_stats["chunks"], 2 * len(param_sets))
+
+        print(f"✅ 상주 워커 풀: 청크 {pool.dispatch_stats['chunks']}개로 {2 * len(param_sets)}개 작업 분배")
+
+    def tearDown(self):
+        """워커 풀 정리"""
+        self.engine.stop_worker_pool()
+
+
+class TestMemoryAdmission(unittest.TestCase):
+    """메모리 예산 허용 제어 테스트"""
+
+    def _controller(self, budget_mb: float) -> MemoryAdmissionController:
+        """현재 프로세스 사용량 + budget_mb 만큼의 예산"""
+        import psutil
+
+        rss = psutil.Process().memory_info().rss
+        return MemoryAdmissionController(budget_bytes=rss + int(budget_mb * MB))
+
+    def test_plan_scales_workers_with_dataset(self):
+        """데이터셋이 커질수록 워커 수 감소 → 순차 → 청크"""
+        controller = self._controller(1024)
+
+        small = controller.plan("backtest", 1000, 10 * MB, 8)
+        large = controller.plan("walkforward", 1000, 200 * MB, 8)
+        huge = controller.plan("walkforward", 1000, 2048 * MB, 8)
+
+        self.assertEqual(small.mode, "parallel")
+        self.assertEqual(small.workers, 8)
+        self.assertEqual(small.reason, "")
+        self.assertLess(large.workers, small.workers)
+        self.assertEqual(huge.mode, "chunked")
+        self.assertEqual(huge.batch_size, 1)
+        self.assertEqual(controller.get_stats()["chunked"], 1)
+
+        print(f"✅ 허용 계획: 워커 {small.workers} → {large.workers} ({large.mode}) → {huge.mode}")
+
+    def test_single_worker_request_not_throttled(self):
+        """워커 1개 요청은 제한 사유 없이 순차 실행"""
+        controller = self._controller(1024)
+        plan = controller.plan("backtest", 10, MB, 1)
+
+        self.assertEqual((plan.mode, plan.workers, plan.reason), ("sequential", 1, ""))
+        print("✅ 단일 워커 요청: 순차 실행")
+
+    def test_reserve_shares_budget(self):
+        """예약 중에는 다른 단계의 가용 예산 감소"""
+        controller = self._controller(1024)
+        plan = controller.plan("backtest", 100, 10 * MB, 4)
+        amount = plan.per_task_bytes * plan.workers
+
+        before = controller.available_bytes()
+        with controller.reserve(plan):
+            self.assertEqual(controller.reserved_bytes, amount)
+            self.assertLess(controller.available_bytes(), before)
+            nested = controller.plan("backtest", 100, 10 * MB, 8)
+        self.assertEqual(controller.reserved_bytes, 0)
+        self.assertLess(nested.workers, 8)
+
+        print(f"✅ 예산 예약: {amount / MB:.0f}MB, 동시 단계 워커 {nested.workers}개")
+
+    def test_engine_degrades_to_chunked(self):
+        """예산 부족시 엔진이 청크 순차 실행으로 모든 작업 완료"""
+        engine = FastDataEngine(cache_dir=tempfile.mkdtemp())
+        engine.admission = MemoryAdmissionController(budget_bytes=1)
+        n = 1000
+        df = pd.DataFrame(
+            {
+                "time": pd.date_range("2024-01-01", periods=n, freq="15min"),
+                "open": np.full(n, 100.0),
+                "high": np.full(n, 101.0),
+                "low": np.full(n, 99.0),
+                "close": np.arange(n, dtype=float),
+                "volume": np.ones(n),
+            }
+        )
+        engine.cache_indicators(df, {"atr_len": 14})
+
+        param_sets = [{"window": w} for w in range(1, 21)]
+        results = engine.parallel_backtest(param_sets, _bundle_close_sum, n_jobs=4, with_data=True)
+
+        self.assertEqual([r["sum"] for r in results], [float(np.arange(p["window"]).sum()) for p in param_sets])
+        self.assertEqual({r["pid"] for r in results}, {os.getpid()})
+        self.assertEqual(engine.admission.get_stats()["chunked"], len(param_sets))
+
+        print(f"✅ 청크 강등: {len(results)}개 작업 단일 프로세스 완료")
+
+
+class TestStrategyFrame(unittest.TestCase):
+    """전략 작업 프레임 dtype 축소 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        rng = np.random.default_rng(7)
+        n = 2000
+        close = np.round(2500 + np.cumsum(rng.normal(0, 4, n)), 2)
+        open_price = np.r_[close[0], close[:-1]]
+        self.df = pd.DataFrame(
+            {
+                "time": pd.date_range("2024-01-01", periods=n, freq="15min"),
+                "open": open_price,
+                "high": np.round(np.maximum(open_price, close) + np.abs(rng.normal(0, 3, n)), 2),
+                "low": np.round(np.minimum(open_price, close) - np.abs(rng.normal(0, 3, n)), 2),
+                "close": close,
+                "volume": rng.uniform(100, 5000, n),
+            }
+        )
+        self.strategy = ETHSessionStrategy()
+        self.strategy.df = self.df.copy()
+        self.strategy._calculate_indicators()
+
+    def test_compact_dtypes(self):
+        """세션 int8 코드, 일 번호 int32, 가격 float32, 누적값 float64"""
+        df = self.strategy.df
+
+        self.assertEqual(df["session"].dtype, np.int8)
+        self.assertEqual(df["day"].dtype, np.int32)
+        self.assertEqual(df["hour"].dtype, np.int8)
+        self.assertEqual(df["close"].dtype, np.float32)
+        self.assertEqual(df["atr"].dtype, np.float64)
+        self.assertEqual(df["daily_tr"].dtype, np.float64)
+        self.assertEqual(df["displacement"].dtype, bool)
+        self.assertFalse((df.dtypes == object).any())
+
+        hours = self.df["time"].dt.hour
+        self.assertTrue((df["session"][hours < 8] == SESSION_ASIA).all())
+        self.assertTrue((df["session"][(hours >= 13) & (hours < 16)] == SESSION_LONDON_NY).all())
+        self.assertTrue((df["session"][hours >= 21] == SESSION_OTHER).all())
+        self.assertEqual(df["day"].iloc[0], (self.df["time"].iloc[0] - pd.Timestamp("1970-01-01")).days)
+
+        print(f"✅ 작업 프레임 dtype: {df.dtypes.value_counts().to_dict()}")
+
+    def test_calendar_features_match_pandas(self):
+        """epoch ms 정수 연산 캘린더 피처 = pandas datetime 접근자"""
+        times = pd.Series(pd.date_range("1969-12-28", periods=20000, freq="7min"))
+        calendar = calendar_features(to_epoch_ms(times))
+
+        np.testing.assert_array_equal(calendar["hour"], times.dt.hour)
+        np.testing.assert_array_equal(calendar["minute"], times.dt.minute)
+        np.testing.assert_array_equal(calendar["weekday"], times.dt.weekday)
+        np.testing.assert_array_equal(calendar["day"], (times - pd.Timestamp(0)).dt.days)
+        self.assertEqual(calendar["hour"].dtype, np.int8)
+
+        print("✅ 캘린더 피처: pandas 접근자와 일치")
+
+    def test_funding_window_mask(self):
+        """펀딩 전후 avoid_bars 봉 마스크 (기본은 기존 _is_funding_time 동일, 자정 순환은 옵션)"""
+        minute_of_day = np.arange(0, 1440, 15)
+        one_bar = funding_window_mask(minute_of_day, [0, 8, 16], 1, 900_000)
+        two_bars = funding_window_mask(minute_of_day, [8], 2, 900_000)
+        wrapped = funding_window_mask(minute_of_day, [0, 8, 16], 1, 900_000, wrap_midnight=True)
+
+        self.assertEqual(minute_of_day[one_bar].tolist(), [0, 15, 465, 480, 495, 945, 960, 975])
+        self.assertEqual(minute_of_day[two_bars].tolist(), [450, 465, 480, 495, 510])
+        self.assertEqual(minute_of_day[wrapped].tolist(), [0, 15, 465, 480, 495, 945, 960, 975, 1425])
+
+        # 기존 봉 단위 판정 (펀딩 시각 정각/직전 45분/직후 15분)
+        legacy = [
+            any((h == m // 60 and m % 60 in (0, 15)) or (h - 1 == m // 60 and m % 60 == 45) for h in [0, 8, 16])
+            for m in minute_of_day
+        ]
+        np.testing.assert_array_equal(one_bar, legacy)
+
+        df = self.strategy.df
+        np.testing.assert_array_equal(
+            df["funding_window"], np.isin(df["hour"].astype(int) * 60 + df["minute"], minute_of_day[one_bar])
+        )
+
+        print(f"✅ 펀딩 회피 마스크: {int(df['funding_window'].sum())}개 봉")
+
+    def test_memory_report(self):
+        """트라이얼당 작업 프레임 메모리 리포트"""
+        report = self.strategy.memory_report()
+
+        self.assertEqual(report["rows"], len(self.df))
+        self.assertLess(report["bytes_per_row"], 80)
+        self.assertEqual(report["columns"]["session"], len(self.df))
+
+        print(f"✅ 작업 프레임: 행당 {report['bytes_per_row']:.0f} bytes, 원시 OHLCV 대비 {report['ratio_to_raw']:.2f}배")
+
+    def test_signals_use_float64_prices(self):
+        """일 번호 키 세션 레벨 + float64 컬럼형 신호 테이블"""
+        self.strategy.params.update({"rr_percentile": 0.05, "sweep_wick_mult": 0.3, "disp_mult": 1.0})
+        levels = self.strategy.find_session_levels()
+        signals = self.strategy.generate_signals()
+
+        self.assertTrue(all(isinstance(day, int) for day in levels))
+        self.assertGreater(len(signals), 0)
+        self.assertEqual(signals["entry_price"].dtype, np.float64)
+        np.testing.assert_array_equal(signals["entry_price"], self.strategy.df["close"].to_numpy()[signals["index"]])
+
+        print(f"✅ 신호 생성: {len(signals)}개 ({len(levels)}일 세션 레벨)")
+
+    def test_vectorized_signals_match_bar_loop(self):
+        """시프트 마스크 신호 = 스윕 후 3바 순차 탐색 결과"""
+        strategy = self.strategy
+        strategy.params.update({"rr_percentile": 0.05, "sweep_wick_mult": 0.3, "disp_mult": 1.0})
+        sweeps = strategy.detect_sweeps(strategy.find_session_levels())
+        signals = strategy.generate_signals()
+
+        df = strategy.df
+        expected = []
+        for sweep in sweeps:
+            for j in range(sweep["index"] + 1, min(sweep["index"] + 4, len(df))):
+                bar = df.iloc[j]
+                if bar["rr_percentile"] < strategy.params["rr_percentile"] or bar["funding_window"] or not bar["displacement"]:
+                    continue
+                if sweep["type"] == "bullish_sweep" and bar["close"] > bar["open"]:
+                    stop_price = sweep["sweep_level"] - strategy.params["stop_atr_mult"] * bar["atr"]
+                    expected.append(
+                        (j, "long", stop_price, bar["close"] + strategy.params["target_r"] * (bar["close"] - stop_price))
+                    )
+                    break
+                if sweep["type"] == "bearish_sweep" and bar["close"] < bar["open"]:
+                    stop_price = sweep["sweep_level"] + strategy.params["stop_atr_mult"] * bar["atr"]
+                    expected.append(
+                        (j, "short", stop_price, bar["close"] - strategy.params["target_r"] * (stop_price - bar["close"]))
+                    )
+                    break
+
+        self.assertEqual(signals["index"].tolist(), [e[0] for e in expected])
+        self.assertEqual(signals["type"].tolist(), [e[1] for e in expected])
+        np.testing.assert_array_equal(signals["stop_price"], [e[2] for e in expected])
+        np.testing.assert_array_equal(signals["target_price"], [e[3] for e in expected])
+
+        trades = strategy.backtest()
+        self.assertEqual(len(trades), len(signals))
+
+        print(f"✅ 벡터화 신호: {len(sweeps)}개 스윕 → {len(signals)}개 신호 (순차 탐색과 일치)")
+
+
+class TestStrategyEvaluator(unittest.TestCase):
+    """배열 기반 전략 평가기 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        rng = np.random.default_rng(11)
+        n = 3000
+        close = np.round(2500 + np.cumsum(rng.normal(0, 4, n)), 2)
+        open_price = np.r_[close[0], close[:-1]]
+        self.df = pd.DataFrame(
+            {
+                "time": pd.date_range("2024-01-01", periods=n, freq="15min"),
+                "open": open_price,
+                "high": np.round(np.maximum(open_price, close) + np.abs(rng.normal(0, 3, n)), 2),
+                "low": np.round(np.minimum(open_price, close) - np.abs(rng.normal(0, 3, n)), 2),
+                "close": close,
+                "volume": rng.uniform(100, 5000, n),
+            }
+        )
+        self.params = {
+            "rr_percentile": 0.05,
+            "sweep_wick_mult": 0.3,
+            "disp_mult": 1.0,
+            "atr_len": 20,
+            "stop_atr_mult": 0.3,
+            "time_stop_bars": 6,
+            "target_r": 1.5,
+        }
+        self.evaluator = ArrayStrategyEvaluator.from_frame(self.df)
+
+    def test_matches_strategy_backtest(self):
+        """평가기 거래 = ETHSessionStrategy 신호 + 백테스트 결과"""
+        strategy = ETHSessionStrategy()
+        strategy.params.update(self.params)
+        strategy.df = self.df.copy()
+        strategy._calculate_indicators()
+        strategy.generate_signals()
+        trades = strategy.backtest() or []
+
+        result = self.evaluator.run_trades(self.params)
+
+        self.assertGreater(len(trades), 10)
+        self.assertEqual(result["entry_index"].tolist(), [t["entry_index"] for t in trades])
+        self.assertEqual([EXIT_REASONS[r] for r in result["exit_reason"]], [t["exit_reason"] for t in trades])
+        np.testing.assert_array_equal(result["pnl"], [t["pnl"] for t in trades])
+
+        print(f"✅ 평가기 = 전략 백테스트: {len(trades)}개 거래 PnL 일치")
+
+    def test_bar_range(self):
+        """[start, end) 구간 진입만 평가, 청산은 end-1 바에서 절단"""
+        start, end = 1000, 2000
+        result = self.evaluator.run_trades(self.params, start, end)
+
+        self.assertGreater(len(result["pnl"]), 0)
+        self.assertTrue(((result["entry_index"] >= start) & (result["entry_index"] < end)).all())
+        self.assertTrue((result["exit_index"] < end).all())
+
+        metrics = self.evaluator.evaluate(self.params, start, end)
+        self.assertEqual(metrics.total_trades, len(result["pnl"]))
+        self.assertEqual(self.evaluator.evaluate(self.params, end, end).total_trades, 0)
+
+        print(f"✅ 구간 평가: [{start}, {end}) {metrics.total_trades}개 거래")
+
+    def test_engine_cache_and_throughput(self):
+        """데이터 엔진 지표 캐시로 생성 + 코어당 분당 수천 회 평가"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            engine = FastDataEngine(cache_dir=temp_dir)
+            engine.cache_indicators(self.df, self.params)
+            evaluator = ArrayStrategyEvaluator.from_engine(engine)
+        np.testing.assert_array_equal(evaluator.run_trades(self.params)["pnl"], self.evaluator.run_trades(self.params)["pnl"])
+
+        for step in range(100):
+            evaluator.evaluate({**self.params, "target_r": 1.0 + step * 0.02, "atr_len": 15 + step % 10})
+
+        self.assertEqual(evaluator.stats["evaluations"], 100)
+        self.assertGreater(evaluator.evaluations_per_minute(), 1000)
+
+        print(f"✅ 평가 처리량: {evaluator.evaluations_per_minute():,.0f}회/분")
+
+
+class TestCPCVEngine(unittest.TestCase):
+    """조합 퍼지 교차검증 엔진 테스트"""
+
+    def setUp(self):
+        """테스트 설정 (TestStrategyEvaluator와 같은 합성 데이터)"""
+        rng = np.random.default_rng(11)
+        n = 3000
+        close = np.round(2500 + np.cumsum(rng.normal(0, 4, n)), 2)
+        open_price = np.r_[close[0], close[:-1]]
+        self.df = pd.DataFrame(
+            {
+                "time": pd.date_range("2024-01-01", periods=n, freq="15min"),
+                "open": open_price,
+                "high": np.round(np.maximum(open_price, close) + np.abs(rng.normal(0, 3, n)), 2),
+                "low": np.round(np.minimum(open_price, close) - np.abs(rng.normal(0, 3, n)), 2),
+                "close": close,
+            }
+        )
+        self.params = {"rr_percentile": 0.05, "sweep_wick_mult": 0.3, "disp_mult": 1.0, "atr_len": 20, "target_r": 1.5}
+        self.evaluator = ArrayStrategyEvaluator.from_frame(self.df)
+
+    def test_interval_sets(self):
+        """구간 병합 / 차집합 / 인덱스 전개"""
+        merged = merge_intervals([(10, 20), (0, 5), (5, 8), (15, 30), (40, 40)])
+        np.testing.assert_array_equal(merged, [[0, 8], [10, 30]])
+
+        train = subtract_intervals([(0, 100)], [(20, 30), (25, 40), (90, 120)])
+        np.testing.assert_array_equal(train, [[0, 20], [40, 90]])
+        self.assertEqual(interval_bars(train), 70)
+
+        expanded = expand_intervals(train)
+        np.testing.assert_array_equal(expanded, np.r_[np.arange(0, 20), np.arange(40, 90)])
+        self.assertEqual(len(expand_intervals(np.empty((0, 2)))), 0)
+
+        print("✅ 구간 집합: 병합/차집합/전개")
+
+    def test_splits_purge_embargo_and_paths(self):
+        """C(6,2)=15 분할, 훈련 구간은 테스트 앞 퍼지/뒤 퍼지+엠바고 제외, 5개 경로가 각 그룹을 한 번씩 포함"""
+        cpcv = CombinatorialPurgedCV(self.evaluator, n_groups=6, n_test_groups=2, purge_bars=10, embargo_bars=8)
+
+        self.assertEqual(len(cpcv.splits), 15)
+        for split in cpcv.splits:
+            train_idx, test_idx = expand_intervals(split.train), expand_intervals(split.test)
+            self.assertEqual(len(np.intersect1d(train_idx, test_idx)), 0)
+            for start, end in split.test:
+                self.assertFalse(np.any((train_idx >= start - 10) & (train_idx < end + 18)))
+
+        self.assertEqual(len(cpcv.paths), 5)
+        for path in cpcv.paths:
+            self.assertEqual([group for group, _ in path], list(range(6)))
+            self.assertTrue(all(group in cpcv.splits[split_id].test_groups for group, split_id in path))
+        used = sorted((group, split_id) for path in cpcv.paths for group, split_id in path)
+        self.assertEqual(len(set(used)), 30)  # 분할 15개 × 테스트 그룹 2개를 정확히 한 번씩 사용
+
+        print(f"✅ CPCV 분할: {len(cpcv.splits)}개, 경로 {len(cpcv.paths)}개")
+
+    def test_segment_cache_and_parallel_evaluation(self):
+        """그룹 결과는 파라미터당 한 번만 시뮬레이션, 병렬 평가 = 순차 평가"""
+        other = {**self.params, "target_r": 2.5}
+        cpcv = CombinatorialPurgedCV(self.evaluator, n_groups=6, n_test_groups=2)
+
+        results = cpcv.evaluate([self.params, other], max_workers=4)
+        self.assertEqual(cpcv.stats["segments_simulated"], 12)
+        self.assertEqual(cpcv.stats["combinations"], 30)
+
+        # 분할 성과 = 테스트 그룹 구간 거래를 이어 붙인 결과
+        split = cpcv.splits[7]
+        pnl = np.concatenate([self.evaluator.run_trades(self.params, *cpcv.groups[g])["pnl"] for g in split.test_groups])
+        self.assertEqual(results[0]["splits"][7].total_trades, len(pnl))
+        self.assertAlmostEqual(results[0]["splits"][7].total_return, self.evaluator.metrics_from_trades(pnl).total_return)
+
+        # 재평가는 캐시 적중만
+        cpcv.evaluate([self.params], max_workers=1)
+        self.assertEqual(cpcv.stats["segments_simulated"], 12)
+
+        sequential = CombinatorialPurgedCV(self.evaluator, n_groups=6, n_test_groups=2).evaluate([self.params, other], 1)
+        for parallel_result, sequential_result in zip(results, sequential):
+            self.assertEqual(
+                [m.total_return for m in parallel_result["splits"]], [m.total_return for m in sequential_result["splits"]]
+            )
+            self.assertEqual(parallel_result["path"].total_trades, sequential_result["path"].total_trades)
+
+        print(f"✅ 세그먼트 캐시: 시뮬레이션 12회로 조합 30개 평가")
+
+
+class TestCancellationToken(unittest.TestCase):
+    """협력적 취소 토큰 + 시간 예산 테스트"""
+
+    def test_budget_and_parent_propagation(self):
+        """예산 소진 / 상위 취소가 하위 토큰에 전파"""
+        root = CancellationToken()
+        stage = root.child(0.05)
+        worker = stage.child()
+
+        self.assertFalse(worker.stopped)
+        self.assertIsNone(root.remaining())
+        self.assertLessEqual(worker.remaining(), 0.05)
+        self.assertLessEqual(worker.clamp_timeout(3600), 0.05)
+
+        time.sleep(0.06)
+        self.assertEqual(stage.reason, BUDGET_EXHAUSTED)
+        self.assertEqual(worker.reason, BUDGET_EXHAUSTED)
+        self.assertFalse(root.stopped)
+        self.assertEqual(worker.clamp_timeout(3600), 0.0)
+
+        # 상위 취소는 새 하위 토큰에도 적용
+        sibling = root.child(60)
+        root.cancel()
+        self.assertEqual(sibling.reason, CANCELLED)
+        with self.assertRaises(OperationCancelled) as ctx:
+            sibling.check()
+        self.assertEqual(ctx.exception.reason, CANCELLED)
+
+        print("✅ 취소 토큰: 예산 소진/상위 취소 전파")
+
+    def test_wait_returns_early_on_cancel(self):
+        """wait()는 다른 스레드의 취소를 폴링 간격 내에 감지"""
+        root = CancellationToken()
+        child = root.child()
+        threading.Timer(0.05, root.cancel).start()
+
+        start = time.perf_counter()
+        self.assertTrue(child.wait(10))
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 1.0)
+
+        # 중단되지 않으면 전체 대기 후 False
+        self.assertFalse(CancellationToken().wait(0.01))
+
+        print(f"✅ 취소 대기: {elapsed:.3f}초 만에 감지")
+
+    def test_optuna_callback_stops_study(self):
+        """Optuna 콜백 - 예산 소진시 시도 경계에서 study.stop()"""
+        import optuna
+
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        token = CancellationToken(0.05)
+        study = optuna.create_study(direction="maximize")
+
+        def objective(trial):
+            time.sleep(0.02)
+            return trial.suggest_float("x", 0, 1)
+
+        study.optimize(objective, n_trials=1000, callbacks=[token.optuna_callback()])
+        self.assertLess(len(study.trials), 20)
+
+        print(f"✅ Optuna 콜백: {len(study.trials)}회 시도 후 중단")
+
+
+class TestSurrogateScreening(unittest.TestCase):
+    """서로게이트 사전 스크리닝 테스트"""
+
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.trial_store = ResultManager(PerformanceConfig(), db_path=os.path.join(self.temp_dir, "trials.db"))
+
+    def test_surrogate_ranks_pool(self):
+        """매끄러운 목적 함수 - 서로게이트 상위 선택이 풀 상위 10% 수준"""
+        rng = np.random.default_rng(7)
+
+        def objective(X):
+            return -np.sum((X - 0.3) ** 2, axis=1)
+
+        X_train, X_pool = rng.random((80, 6)), rng.random((1000, 6))
+        threshold = np.quantile(objective(X_pool), 0.9)
+
+        for model in ("random_forest", "gp"):
+            screener = SurrogateScreener(model, kappa=0.0)
+            screener.observe(np.empty((0, 6)), [])
+            self.assertIsNone(screener.model)
+            screener.observe(X_train, objective(X_train))
+            picked = screener.select(X_pool, 10)
+
+            self.assertEqual(len(set(picked)), 10)
+            self.assertGreater(np.mean(objective(X_pool[picked])), threshold)
+
+        with self.assertRaises(ValueError):
+            SurrogateScreener("xgboost")
+
+        print("✅ 서로게이트 선택: 상위 10개 평균이 풀 90 퍼센타일 초과")
+
+    def test_trial_history_roundtrip(self):
+        """시도 히스토리 저장/조회 (study/충실도별 분리, 최신순)"""
+        self.trial_store.save_trials("a", "low", [({"x": 1.0}, 0.5), ({"x": 2.0}, -10000)])
+        self.trial_store.save_trials("a", "high", [({"x": 3.0}, 1.0)])
+        self.trial_store.save_trials("b", "low", [({"x": 4.0}, 2.0)])
+
+        self.assertEqual(self.trial_store.load_trials("a", "low"), [({"x": 2.0}, -10000.0), ({"x": 1.0}, 0.5)])
+        self.assertEqual(self.trial_store.load_trials("a", "low", limit=1), [({"x": 2.0}, -10000.0)])
+        self.assertEqual(len(self.trial_store.load_trials("b", "low")), 1)
+
+        print("✅ 시도 히스토리 저장/조회")
+
+    def test_global_search_surrogate_stage(self):
+        """전역 탐색 서로게이트 단계 - 예산만큼만 실제 평가, 히스토리 누적/재사용"""
+        optimizer = GlobalSearchOptimizer(None, PerformanceEvaluator(), trial_store=self.trial_store)
+        optimizer.surrogate_config.update(enabled=True, pool_size=256, top_fraction=0.125, batch_size=8, initial_samples=16)
+
+        # 단위 표본 ↔ 파라미터 역변환 (실수 파라미터)
+        params = optimizer.generate_sobol_samples(8)
+        roundtrip = optimizer._unit_to_params(optimizer._params_to_unit(params))
+        self.assertAlmostEqual(roundtrip[3]["rr_percentile"], params[3]["rr_percentile"])
+        self.assertAlmostEqual(roundtrip[3]["target_r"], params[3]["target_r"])
+
+        evaluated = optimizer.run_surrogate_screening(lambda p: p)
+        self.assertEqual(len(evaluated), 32)
+        self.assertEqual(len({json.dumps(p, sort_keys=True) for p, _, _ in evaluated}), 32)
+        self.assertEqual(optimizer.surrogate_stats["history_size"], 0)
+        self.assertEqual(optimizer.surrogate_stats["best_score"], max(score for _, score, _ in evaluated))
+        self.assertTrue(1 <= optimizer.surrogate_stats["evaluations_to_best"] <= 32)
+
+        evaluations_to_best = optimizer.surrogate_stats["evaluations_to_best"]
+
+        # 두 번째 실행은 저장된 히스토리로 학습 시작
+        optimizer.run_surrogate_screening(lambda p: p)
+        self.assertEqual(optimizer.surrogate_stats["history_size"], 32)
+        self.assertEqual(len(self.trial_store.load_trials(optimizer.trial_study, "low")), 64)
+
+        # 취소 토큰 - 배치 경계에서 중단
+        token = CancellationToken()
+        token.cancel()
+        self.assertEqual(optimizer.run_surrogate_screening(lambda p: p, token=token), [])
+
+        print(f"✅ 서로게이트 단계: 풀 256개 중 32회 평가, 최고 점수 {evaluations_to_best}회째 도달")
+
+
+class TestStudyArchive(unittest.TestCase):
+    """교차 주간 웜스타트 스터디 보관소 테스트"""
+
+    def setUp(self):
+        """테스트 설정 (임시 SQLite 저장소, 2차원 이차 목적 함수)"""
+        import optuna
+
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive = StudyArchive(f"sqlite:///{os.path.join(self.temp_dir, 'studies.db')}", top_k=5, bound_margin=0.1)
+        self.space = {"x": {"type": "float", "low": 0.0, "high": 10.0}, "n": {"type": "int", "low": 1, "high": 20}}
+
+    def _objective(self, space):
+        def objective(trial):
+            x = trial.suggest_float("x", space["x"]["low"], space["x"]["high"])
+            n = trial.suggest_int("n", space["n"]["low"], space["n"]["high"])
+            return -1000 if x > 9.5 else -((x - 3.0) ** 2) - 0.1 * (n - 7) ** 2
+
+        return objective
+
+    def _run_week(self, run_id, fingerprint, n_trials=40):
+        import optuna
+
+        study = self.archive.create_study(
+            "stage1", run_id, fingerprint, self.space, sampler=optuna.samplers.RandomSampler(seed=int(run_id[-1]))
+        )
+        study.optimize(self._objective(self.space), n_trials=n_trials)
+        return study
+
+    def test_dataset_fingerprint(self):
+        """같은 데이터 → 같은 지문, 봉 추가 → 다른 지문"""
+        df = pd.DataFrame(
+            {"time": pd.date_range("2024-01-01", periods=50, freq="15min"), "close": np.linspace(2500, 2550, 50)}
+        )
+        self.assertEqual(dataset_fingerprint(df), dataset_fingerprint(df.copy()))
+        appended = pd.concat([df, df.tail(1).assign(time=df["time"].iloc[-1] + pd.Timedelta("15min"))], ignore_index=True)
+        self.assertNotEqual(dataset_fingerprint(df), dataset_fingerprint(appended))
+
+        print("✅ 데이터 지문")
+
+    def test_plan_and_shrink(self):
+        """이전 주 상위 K개 (실패 점수 제외) 기반 범위 축소, 이후 실행 스터디는 무시"""
+        self.assertIsNone(self.archive.plan("stage1", "20260104_000001", "a", self.space))
+
+        prior = self._run_week("20260104_000001", "a")
+        self._run_week("20260125_000002", "a", n_trials=5)  # 이후 실행 - 무시
+
+        plan = self.archive.plan("stage1", "20260111_000003", "a", self.space)
+        self.assertEqual(plan.source, prior.study_name)
+        self.assertTrue(plan.reuse_scores)
+        self.assertEqual(len(plan.trials), 5)
+        self.assertEqual(plan.prior_best, prior.best_value)
+        self.assertTrue(all(trial.value > -1000 for trial in plan.trials))
+
+        for name, config in plan.param_space.items():
+            values = [trial.params[name] for trial in plan.trials]
+            self.assertGreaterEqual(min(values), config["low"])
+            self.assertLessEqual(max(values), config["high"])
+            self.assertGreaterEqual(config["low"], self.space[name]["low"])
+            self.assertLessEqual(config["high"], self.space[name]["high"])
+        self.assertIsInstance(plan.param_space["n"]["low"], int)
+        self.assertIn("x", plan.shrunk_params)
+
+        self.assertFalse(self.archive.plan("stage1", "20260111_000003", "b", self.space).reuse_scores)
+        self.assertIsNone(self.archive.plan("stage2", "20260111_000003", "a", self.space))
+
+        print(f"✅ 웜스타트 계획: x 범위 {plan.param_space['x']['low']:.2f}~{plan.param_space['x']['high']:.2f}")
+
+    def test_seed_reuse_and_reevaluate(self):
+        """데이터 동일 → 점수 재사용 추가, 데이터 변경 → 상위 시도 재평가 후 절반 예산으로 이전 최고 이상"""
+        import optuna
+
+        self._run_week("20260104_000001", "a")
+
+        # 데이터 동일: 평가 없이 완료 시도로 추가
+        plan = self.archive.plan("stage1", "20260111_000002", "a", self.space)
+        reused = self.archive.create_study("stage1", "20260111_000002", "a", self.space)
+        self.archive.seed(reused, plan)
+        self.assertEqual(sorted(t.value for t in reused.trials), sorted(t.value for t in plan.trials))
+
+        # 데이터 변경: 큐에 등록된 상위 시도가 먼저 재평가
+        plan = self.archive.plan("stage1", "20260118_000003", "b", self.space)
+        study = self.archive.create_study(
+            "stage1", "20260118_000003", "b", self.space, sampler=optuna.samplers.TPESampler(seed=0, n_startup_trials=5)
+        )
+        self.archive.seed(study, plan)
+        study.optimize(self._objective(plan.param_space), n_trials=20)
+
+        self.assertEqual([t.params for t in study.trials[:5]], [t.params for t in plan.trials])
+        self.assertTrue(all(t.user_attrs.get("warm_start_source") == plan.source for t in study.trials[:5]))
+        self.assertGreaterEqual(study.best_value, plan.prior_best)
+
+        print(f"✅ 웜스타트 재평가: 이전 최고 {plan.prior_best:.4f} → {study.best_value:.4f} (20회)")
+
+    def test_warm_start_after_space_reduction(self):
+        """단계 사이 축소(고정/경계 축소) 스터디 → 다음 주 축소/복원된 공간으로 투영해 웜스타트"""
+        import optuna
+
+        full_space = {
+            **self.space,
+            "w1": {"type": "float", "low": 0.0, "high": 1.0},
+            "w2": {"type": "float", "low": 0.0, "high": 1.0},
+        }
+
+        def full_objective(trial):
+            for name in ("w1", "w2"):
+                suggest_param(trial, name, full_space[name])
+            return self._objective(self.space)(trial)
+
+        # 1주차: 1단계 전체 공간 → 잡음 파라미터 고정 → 2단계는 축소 공간 (고정값 기록)
+        stage1 = self.archive.create_study(
+            "stage1", "20260104_000001", "a", full_space, sampler=optuna.samplers.RandomSampler(seed=1)
+        )
+        stage1.optimize(full_objective, n_trials=60)
+        reduction = reduce_search_space(stage1.trials, full_space, failure_score=-1000)
+        self.assertEqual(set(reduction.frozen), {"w1", "w2"})
+
+        stage2 = self.archive.create_study(
+            "stage2",
+            "20260104_000001",
+            "a",
+            reduction.param_space,
+            frozen_params=reduction.frozen,
+            sampler=optuna.samplers.RandomSampler(seed=2),
+        )
+        stage2.optimize(self._objective(reduction.param_space), n_trials=20)
+
+        # 2주차 2단계: 최적점을 벗어난 더 좁은 경계 → 경계로 제한, 점수 재사용 대신 재평가
+        narrowed = {**reduction.param_space, "x": {"type": "float", "low": 5.0, "high": 6.0}}
+        plan = self.archive.plan("stage2", "20260111_000002", "a", narrowed)
+        self.assertIsNotNone(plan)
+        self.assertTrue(all(set(t.params) == {"x", "n"} for t in plan.trials))
+        self.assertTrue(all(5.0 <= t.params["x"] <= 6.0 for t in plan.trials))
+        self.assertTrue(all(t.user_attrs["projected"] for t in plan.trials if t.params["x"] in (5.0, 6.0)))
+
+        # 2주차 전체 공간 (고정 해제): 누락된 잡음 파라미터는 1주차 고정값으로 보충
+        plan = self.archive.plan("stage2", "20260111_000002", "a", full_space)
+        self.assertIsNotNone(plan)
+        self.assertTrue(all(t.params["w1"] == reduction.frozen["w1"] for t in plan.trials))
+
+        study = self.archive.create_study("stage2", "20260111_000002", "a", full_space)
+        self.archive.seed(study, plan)
+        study.optimize(full_objective, n_trials=len(plan.trials))
+        self.assertEqual([t.params for t in study.trials], [t.params for t in plan.trials])
+
+        print(f"✅ 축소 공간 웜스타트: 고정 {sorted(reduction.frozen)}, 투영 시도 {len(plan.trials)}개")
+
+
+class TestParameterImportance(unittest.TestCase):
+    """파라미터 중요도 기반 탐색 공간 축소 테스트"""
+
+    def setUp(self):
+        """테스트 설정 (중요 파라미터 2개 + 잡음 파라미터 6개)"""
+        import optuna
+
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        self.space = {f"noise_{i}": {"type": "float", "low": 0.0, "high": 1.0} for i in range(5)}
+        self.space["x"] = {"type": "float", "low": 0.0, "high": 1.0}
+        self.space["n"] = {"type": "int", "low": 1, "high": 20}
+        self.space["r"] = {"type": "float", "low": 0.05, "high": 0.5, "log": True}
+
+        def objective(trial):
+            params = {name: suggest_param(trial, name, config) for name, config in self.space.items()}
+            return -10 * (params["x"] - 0.3) ** 2 - 0.05 * (params["n"] - 5) ** 2
+
+        self.study = optuna.create_study(direction="maximize", sampler=optuna.samplers.RandomSampler(seed=1))
+        self.study.optimize(objective, n_trials=40)
+
+    def test_importance_and_freeze(self):
+        """fANOVA / 순열 중요도 모두 x, n을 중요 파라미터로 판별하고 잡음 파라미터를 최고 시도 값으로 고정"""
+        best = self.study.best_params
+
+        for method in ("fanova", "permutation"):
+            reduction = reduce_search_space(self.study.trials, self.space, method=method)
+
+            self.assertAlmostEqual(sum(reduction.importances.values()), 1.0, places=6)
+            self.assertEqual(set(reduction.param_space), {"x", "n"})
+            self.assertEqual(reduction.frozen, {name: best[name] for name in reduction.frozen})
+            self.assertEqual(set(reduction.frozen), set(self.space) - {"x", "n"})
+
+            # 축소 범위는 원래 범위 안, 최고 시도 포함
+            for name, config in reduction.param_space.items():
+                self.assertGreaterEqual(config["low"], self.space[name]["low"])
+                self.assertLessEqual(config["high"], self.space[name]["high"])
+                self.assertTrue(config["low"] <= best[name] <= config["high"])
+            self.assertIsInstance(reduction.param_space["n"]["low"], int)
+            self.assertEqual(json.loads(json.dumps(reduction.summary()))["frozen"], reduction.frozen)
+
+        print(f"✅ 중요도 분석: 고정 {len(reduction.frozen)}개, 탐색 유지 {sorted(reduction.param_space)}")
+
+    def test_insufficient_or_flat_trials(self):
+        """시도 부족 / 점수 변화 없음이면 축소하지 않음"""
+        self.assertIsNone(reduce_search_space(self.study.trials[:10], self.space))
+        self.assertIsNone(param_importances([t for t in self.study.trials[:1]] * 20, self.space))
+        with self.assertRaises(ValueError):
+            param_importances(self.study.trials, self.space, method="shap")
+
+        print("✅ 축소 생략 조건")
+
+    def test_local_search_phases(self):
+        """국소 탐색 - 워밍업 후 축소 공간 탐색, 결과 파라미터는 고정값 포함 전체 집합"""
+        optimizer = LocalSearchOptimizer(None, PerformanceEvaluator()).configured(n_trials=32)
+        optimizer.reduction_config["min_trials"] = 10
+        full_space = optimizer.search_space_spec()
+
+        results = optimizer.run_local_search(None)
+
+        self.assertIsNotNone(optimizer.space_reduction)
+        self.assertEqual(optimizer.space_reduction["n_trials"], 16)
+        self.assertEqual(
+            set(optimizer.space_reduction["frozen"]) | set(optimizer.space_reduction["search_space"]), set(full_space)
+        )
+        for params, _, _ in results:
+            self.assertEqual(set(params), set(full_space))
+
+        # 워밍업이 최소 시도 수보다 적으면 한 번에 실행
+        small = LocalSearchOptimizer(None, PerformanceEvaluator()).configured(n_trials=10)
+        small.run_local_search(None)
+        self.assertIsNone(small.space_reduction)
+
+        print(f"✅ 국소 탐색 축소: 고정 {len(optimizer.space_reduction['frozen'])}개")
+
+
+class TestEarlyTermination(unittest.TestCase):
+    """거래 단위 조기 중단 테스트"""
+
+    def setUp(self):
+        """테스트 설정 (TestStrategyEvaluator와 같은 합성 데이터)"""
+        rng = np.random.default_rng(11)
+        n = 3000
+        close = np.round(2500 + np.cumsum(rng.normal(0, 4, n)), 2)
+        open_price = np.r_[close[0], close[:-1]]
+        self.df = pd.DataFrame(
+            {
+                "time": pd.date_range("2024-01-01", periods=n, freq="15min"),
+                "open": open_price,
+                "high": np.round(np.maximum(open_price, close) + np.abs(rng.normal(0, 3, n)), 2),
+                "low": np.round(np.minimum(open_price, close) - np.abs(rng.normal(0, 3, n)), 2),
+                "close": close,
+                "volume": rng.uniform(100, 5000, n),
+            }
+        )
+        self.params = {
+            "rr_percentile": 0.05,
+            "sweep_wick_mult": 0.3,
+            "disp_mult": 1.0,
+            "atr_len": 20,
+            "stop_atr_mult": 0.3,
+            "time_stop_bars": 6,
+            "target_r": 1.5,
+        }
+        self.evaluator = ArrayStrategyEvaluator.from_frame(self.df)
+
+    def _abort_index(self, rule, pnl):
+        """판정 함수 기준 중단 거래 인덱스 (중단 없으면 None)"""
+        should_abort = rule.predicate(self.evaluator.initial_balance)
+        return next((i for i, value in enumerate(pnl) if should_abort(value)), None)
+
+    def test_predicate(self):
+        """드로우다운은 거래 후 자산 고점 대비, 연속 손실은 손실 거래 수 기준"""
+        should_abort = AbortRule(max_drawdown=0.1).predicate(1000)
+        self.assertEqual([should_abort(pnl) for pnl in (50, -30, -80)], ["", "", "drawdown"])
+
+        should_abort = AbortRule(max_loss_streak=3).predicate(1000)
+        self.assertEqual([should_abort(pnl) for pnl in (-1, -1, 5, -1, -1, -1)], ["", "", "", "", "", "loss_streak"])
+
+        self.assertFalse(AbortRule().enabled)
+        self.assertEqual(AbortRule.from_constraints(ConstraintConfig()).max_drawdown, 0.20)
+
+        print("✅ 조기 중단 판정: 드로우다운/연속 손실")
+
+    def test_kernel_matches_predicate(self):
+        """평가기 커널 중단 지점 = 판정 함수 중단 지점, 중단 결과는 제약 위반"""
+        full = self.evaluator.run_trades(self.params)
+        full_dd = self.evaluator.evaluate(self.params).max_drawdown
+        self.assertGreater(full_dd, 0)
+        self.assertEqual(full["abort_reason"], "")
+
+        rule = AbortRule(max_drawdown=full_dd / 2)
+        stop = self._abort_index(rule, full["pnl"])
+        aborted = self.evaluator.run_trades(self.params, abort=rule)
+
+        self.assertEqual(aborted["abort_reason"], "drawdown")
+        self.assertEqual(len(aborted["pnl"]), stop + 1)
+        np.testing.assert_array_equal(aborted["pnl"], full["pnl"][: stop + 1])
+
+        metrics = self.evaluator.evaluate(self.params, abort=rule)
+        self.assertEqual(metrics.abort_reason, "drawdown")
+        self.assertGreater(metrics.max_drawdown, rule.max_drawdown)
+        passed, violations = PerformanceEvaluator().check_constraints(metrics)
+        self.assertFalse(passed)
+        self.assertIn("조기 중단: drawdown", violations)
+
+        # 전체 드로우다운 이상 기준이면 결과 동일
+        untouched = self.evaluator.run_trades(self.params, abort=AbortRule(max_drawdown=full_dd))
+        np.testing.assert_array_equal(untouched["pnl"], full["pnl"])
+        self.assertEqual(untouched["abort_reason"], "")
+
+        print(f"✅ 커널 조기 중단: {len(full['pnl'])}개 중 {stop + 1}개 거래에서 종료")
+
+    def test_strategy_backtest_abort(self):
+        """전략 백테스트도 같은 거래에서 중단"""
+        rule = AbortRule(max_drawdown=self.evaluator.evaluate(self.params).max_drawdown / 2, max_loss_streak=4)
+        expected = self.evaluator.run_trades(self.params, abort=rule)
+
+        strategy = ETHSessionStrategy()
+        strategy.params.update(self.params)
+        strategy.df = self.df.copy()
+        strategy._calculate_indicators()
+        strategy.generate_signals()
+        trades = strategy.backtest(abort=rule.predicate(strategy.initial_balance)) or []
+
+        self.assertEqual(strategy.abort_reason, expected["abort_reason"])
+        self.assertNotEqual(strategy.abort_reason, "")
+        np.testing.assert_array_equal([t["pnl"] for t in trades], expected["pnl"])
+
+        print(f"✅ 전략 백테스트 조기 중단: {strategy.abort_reason} ({len(trades)}개 거래)")
+
+    def test_local_search_prunes_aborted(self):
+        """국소 탐색 - 조기 중단 시도는 가지치기 (최종 후보에서 제외)"""
+        optimizer = LocalSearchOptimizer(None, PerformanceEvaluator(), evaluator=self.evaluator).configured(n_trials=12)
+        optimizer.abort_rule = AbortRule(max_drawdown=1e-9)
+
+        results = optimizer.run_local_search(None)
+
+        self.assertGreater(self.evaluator.stats["aborted"], 0)
+        for params, _, metrics in results:
+            self.assertEqual(metrics.abort_reason, "")
+            self.assertEqual(self.evaluator.evaluate(params, abort=optimizer.abort_rule).abort_reason, "")
+
+        print(f"✅ 조기 중단 가지치기: {self.evaluator.stats['aborted']}회 평가 중단")
+
+    def test_stage_with_all_trials_aborted(self):
+        """단계 전 시도 조기 중단 - best_* 대신 이전 단계 결과로 대체, 이전 단계 없으면 명확한 오류"""
+        import optuna
+
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        rule = AbortRule(max_drawdown=1e-9)
+
+        def objective(trial):
+            params = {**self.params, "target_r": trial.suggest_float("target_r", 1.0, 3.0)}
+            metrics = self.evaluator.evaluate(params, abort=rule)
+            if metrics.abort_reason:
+                trial.set_user_attr("abort_reason", metrics.abort_reason)
+                raise optuna.TrialPruned()
+            return metrics.total_return
+
+        study = optuna.create_study(direction="maximize")
+        study.optimize(objective, n_trials=5)
+        self.assertTrue(all(t.state == optuna.trial.TrialState.PRUNED for t in study.trials))
+        self.assertIsNone(best_completed_trial(study))
+
+        with self.assertRaises(ValueError) as context:
+            stage_best(study, "1단계")
+        self.assertIn("완료된 시도 없음", str(context.exception))
+
+        params, score, fallback = stage_best(study, "2단계", (self.params, 0.5))
+        self.assertEqual((params, score, fallback), (self.params, 0.5, True))
+
+        print(f"✅ 전 시도 조기 중단: {len(study.trials)}개 가지치기 → 이전 단계 파라미터 사용")
+
+
+class TestProcessSupervisor(unittest.TestCase):
+    """프로세스 슈퍼바이저 코어 분배 / 지연시간 요약 테스트"""
+
+    def test_cpu_allocation(self):
+        """예약 코어 분리, 최적화 코어 예산 절단, 단일 코어 폴백"""
+        plan = plan_cpu_allocation([0, 1, 2, 3], reserved_cores=1)
+        self.assertEqual(plan, {"trading": [0], "optimizer": [1, 2, 3]})
+
+        plan = plan_cpu_allocation([0, 1, 2, 3], reserved_cores=1, optimizer_core_budget=2)
+        self.assertEqual(plan["optimizer"], [1, 2])
+
+        # 예약 코어 수는 1 이상 전체 코어 이하로 제한
+        self.assertEqual(plan_cpu_allocation([0, 1], reserved_cores=0)["trading"], [0])
+
+        # 단일 코어 - 분리 불가, 같은 코어 공유
+        self.assertEqual(plan_cpu_allocation([5], reserved_cores=1), {"trading": [5], "optimizer": [5]})
+
+        print("✅ 코어 분배: 예산 절단 / 단일 코어 폴백")
+
+    def test_latency_summary(self):
+        """최적화 실행중/유휴 구분, 분위수는 np.percentile 기준"""
+        idle = [10.0, 20.0, 30.0, 40.0]
+        busy = [float(v) for v in range(1, 21)]
+        samples = [{"latency_ms": v, "optimizer_busy": False} for v in idle]
+        samples += [{"latency_ms": v, "optimizer_busy": True} for v in reversed(busy)]
+
+        summary = summarize_latency(samples)
+
+        self.assertEqual(summary["idle"]["count"], 4)
+        self.assertEqual(summary["idle"]["p50_ms"], 25.0)  # 짝수 개 - 가운데 두 값 평균
+        self.assertEqual(summary["idle"]["max_ms"], 40.0)
+        self.assertEqual(summary["optimizer_busy"]["count"], 20)
+        self.assertAlmostEqual(summary["optimizer_busy"]["p95_ms"], np.percentile(busy, 95))
+        self.assertEqual(summary["optimizer_busy"]["max_ms"], 20.0)
+
+        self.assertEqual(summarize_latency([]), {"idle": {"count": 0}, "optimizer_busy": {"count": 0}})
+
+        print("✅ 지연시간 요약: 유휴/실행중 분리, p50/p95")
+
+    def test_commands_only_for_live_process(self):
+        """종료된 트레이딩 프로세스에는 stop 미전달, 리로드는 실행 중 프로세스가 있을 때만"""
+        supervisor = ProcessSupervisor(optimizer_nice=0)
+
+        # 이미 종료된 프로세스 - 남은 stop 명령이 다음 프로세스로 넘어가지 않음
+        commands = supervisor.commands = supervisor.ctx.Queue()
+        supervisor.trading_process = supervisor.ctx.Process(target=time.sleep, args=(0,))
+        supervisor.trading_process.start()
+        supervisor.trading_process.join()
+        supervisor.stop_trading()
+        self.assertIsNone(supervisor.trading_process)
+        self.assertIsNone(supervisor.commands)
+        self.assertTrue(commands.empty())
+
+        # 트레이딩 프로세스 없이 최적화 완료 - 리로드 명령 없음
+        with tempfile.TemporaryDirectory() as temp_dir:
+            script = os.path.join(temp_dir, "noop.py")
+            with open(script, "w") as f:
+                f.write("")
+            self.assertTrue(supervisor.run_optimization(script, timeout=60))
+        self.assertIsNone(supervisor.commands)
+
+        print("✅ 명령 큐: 종료된 프로세스에 stop/리로드 미전달")
+
+
 class TestSuite:
     """전체 테스트 스위트"""
 
@@ -524,6 +2144,23 @@ class TestSuite:
             TestDDScalingSystem,
             TestRealtimeMonitor,
             TestPerformanceOptimizer,
+            TestExchangeAdapter,
+            TestKlineStream,
+            TestRateLimitGovernor,
+            TestHistoricalDownloader,
+            TestMarketDataStore,
+            TestFastDataEngineLoading,
+            TestIndicatorBundle,
+            TestMemoryAdmission,
+            TestStrategyFrame,
+            TestStrategyEvaluator,
+            TestCancellationToken,
+            TestCPCVEngine,
+            TestSurrogateScreening,
+            TestStudyArchive,
+            TestParameterImportance,
+            TestEarlyTermination,
+            TestProcessSupervisor,
         ]
 
     def run_all_tests(self):